@@ -58,8 +58,9 @@ mkdir -p %{buildroot}%{_licensedir}/%{name}
 
 cp -r loofi-fedora-tweaks/* %{buildroot}%{_prefix}/lib/%{name}/
 
-# Remove the duplicate systemd service from the app tree
+# Remove the duplicate systemd service and SMART helper from the app tree
 rm -f %{buildroot}%{_prefix}/lib/%{name}/config/loofi-fedora-tweaks.service
+rm -f %{buildroot}%{_prefix}/lib/%{name}/config/loofi-smart-batch
 
 # Remove pre-compiled bytecode; rpmbuild generates fresh .pyc via brp-python-bytecompile
 find %{buildroot}%{_prefix}/lib/%{name} -type d -name '__pycache__' -exec rm -rf {} +  2>/dev/null || :
@@ -90,6 +91,7 @@ install -m 644 loofi-fedora-tweaks/config/org.loofi.fedora-tweaks.service-manage
 install -m 644 loofi-fedora-tweaks/config/org.loofi.fedora-tweaks.kernel.policy %{buildroot}%{_datadir}/polkit-1/actions/
 install -m 644 loofi-fedora-tweaks/config/org.loofi.fedora-tweaks.security.policy %{buildroot}%{_datadir}/polkit-1/actions/
 install -m 644 loofi-fedora-tweaks/config/loofi-fedora-tweaks.service %{buildroot}%{_userunitdir}/
+install -Dm 755 loofi-fedora-tweaks/config/loofi-smart-batch %{buildroot}%{_libexecdir}/loofi-smart-batch
 install -m 644 loofi-fedora-tweaks/assets/loofi-fedora-tweaks.png %{buildroot}%{_datadir}/icons/hicolor/128x128/apps/
 install -Dm 644 LICENSE %{buildroot}%{_licensedir}/%{name}/LICENSE
 install -Dm 644 %{name}.1 %{buildroot}%{_mandir}/man1/%{name}.1
@@ -112,6 +114,7 @@ PYTHONPATH=loofi-fedora-tweaks python3 -c "import main; print('Import OK')" || :
 %doc README.md
 %{_prefix}/lib/%{name}
 %attr(755,root,root) %{_bindir}/%{name}
+%attr(755,root,root) %{_libexecdir}/loofi-smart-batch
 %{_datadir}/applications/%{name}.desktop
 %{_datadir}/polkit-1/actions/org.loofi.fedora-tweaks.policy
 %{_datadir}/polkit-1/actions/org.loofi.fedora-tweaks.firewall.policy
@@ -4,8 +4,12 @@ Security:
 - Command allowlist enforced — only known-safe executables accepted.
 - All executions audit-logged via AuditLogger.
 - Bearer JWT required on all endpoints.
+
+Real executions are awaited on the event loop via ActionExecutor.run_async,
+so a long-running command does not hold a threadpool worker.
 """
 
+import asyncio
 import logging
 from typing import FrozenSet, List
 
@@ -85,7 +89,7 @@ def _validate_command(command: str, args: List[str]) -> None:
     response_model=ActionResponse,
     status_code=status.HTTP_200_OK,
 )
-def execute_action(
+async def execute_action(
     payload: ActionPayload,
     _auth: str = Depends(AuthManager.verify_bearer_token),
 ):
@@ -98,7 +102,8 @@ def execute_action(
 
     audit = AuditLogger()
 
-    preview_result = ActionExecutor.run(
+    preview_result = await asyncio.to_thread(
+        ActionExecutor.run,
         payload.command,
         payload.args,
         preview=True,
@@ -107,14 +112,15 @@ def execute_action(
     )
 
     if not payload.preview:
-        result = ActionExecutor.run(
+        result = await ActionExecutor.run_async(
             payload.command,
             payload.args,
             preview=False,
             pkexec=payload.pkexec,
             action_id=payload.action_id,
         )
-        audit.log(
+        await asyncio.to_thread(
+            audit.log,
             "api.execute",
             params={
                 "command": payload.command,
@@ -130,7 +136,8 @@ def execute_action(
             payload.args,
             action_id=payload.action_id,
         )
-        audit.log(
+        await asyncio.to_thread(
+            audit.log,
             "api.execute.preview",
             params={
                 "command": payload.command,
@@ -1,5 +1,10 @@
-"""Profile management API routes (v24.0)."""
+"""Profile management API routes (v24.0).
 
+Handlers are async; ProfileManager calls touch the disk (and apply may run
+commands), so they are dispatched to a worker thread.
+"""
+
+import asyncio
 from typing import Any, Dict
 
 from fastapi import APIRouter, Depends, status
@@ -32,21 +37,24 @@ class ProfileImportAllPayload(BaseModel):
 
 
 @router.get("/profiles")
-def list_profiles(_auth: str = Depends(AuthManager.verify_bearer_token)):
+async def list_profiles(_auth: str = Depends(AuthManager.verify_bearer_token)):
     """Return available profiles and currently active key."""
+    profiles = await asyncio.to_thread(ProfileManager.list_profiles)
+    active = await asyncio.to_thread(ProfileManager.get_active_profile)
     return {
-        "profiles": ProfileManager.list_profiles(),
-        "active_profile": ProfileManager.get_active_profile(),
+        "profiles": profiles,
+        "active_profile": active,
     }
 
 
 @router.post("/profiles/apply", status_code=status.HTTP_200_OK)
-def apply_profile(
+async def apply_profile(
     payload: ProfileApplyPayload,
     _auth: str = Depends(AuthManager.verify_bearer_token),
 ):
     """Apply a profile with optional snapshot hook."""
-    result = ProfileManager.apply_profile(
+    result = await asyncio.to_thread(
+        ProfileManager.apply_profile,
         payload.name,
         create_snapshot=payload.create_snapshot,
     )
@@ -58,21 +66,25 @@ def apply_profile(
 
 
 @router.get("/profiles/export-all")
-def export_all_profiles(
+async def export_all_profiles(
     include_builtins: bool = False,
     _auth: str = Depends(AuthManager.verify_bearer_token),
 ):
     """Export all profiles as a bundle payload."""
-    return ProfileManager.export_bundle_data(include_builtins=include_builtins)
+    return await asyncio.to_thread(
+        ProfileManager.export_bundle_data,
+        include_builtins=include_builtins,
+    )
 
 
 @router.post("/profiles/import-all", status_code=status.HTTP_200_OK)
-def import_all_profiles(
+async def import_all_profiles(
     payload: ProfileImportAllPayload,
     _auth: str = Depends(AuthManager.verify_bearer_token),
 ):
     """Import bundle payload."""
-    result = ProfileManager.import_bundle_data(
+    result = await asyncio.to_thread(
+        ProfileManager.import_bundle_data,
         payload.bundle,
         overwrite=payload.overwrite,
     )
@@ -84,24 +96,25 @@ def import_all_profiles(
 
 
 @router.get("/profiles/{name}/export")
-def export_profile(
+async def export_profile(
     name: str,
     _auth: str = Depends(AuthManager.verify_bearer_token),
 ):
     """Export one profile as payload."""
-    payload = ProfileManager.export_profile_data(name)
+    payload = await asyncio.to_thread(ProfileManager.export_profile_data, name)
     return payload or {
         "error": f"Profile '{name}' not found.",
     }
 
 
 @router.post("/profiles/import", status_code=status.HTTP_200_OK)
-def import_profile(
+async def import_profile(
     payload: ProfileImportPayload,
     _auth: str = Depends(AuthManager.verify_bearer_token),
 ):
     """Import one profile payload."""
-    result = ProfileManager.import_profile_data(
+    result = await asyncio.to_thread(
+        ProfileManager.import_profile_data,
         payload.profile,
         overwrite=payload.overwrite,
     )
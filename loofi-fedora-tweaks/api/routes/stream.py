@@ -0,0 +1,149 @@
+"""Live streaming API routes (server-sent events).
+
+Security:
+- Both streams require Bearer JWT authentication; the dashboard reads them
+  with ``fetch`` so the token travels in a header, never in the URL.
+- The token is checked again on every frame and keepalive, and a stream
+  is closed when its token expires, so it cannot outlive the token.
+
+Performance:
+- /stream/metrics is fed by one app-wide sampling loop shared by every
+  client; each client picks its fields and interval and has a bounded
+  queue, so a slow reader drops its own oldest snapshots instead of
+  slowing anyone else down.
+- /stream/events mirrors EventBus topics with one bus subscription per
+  topic, however many clients are listening.
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from utils.auth import AuthManager
+from utils.metrics_stream import (
+    DEFAULT_INTERVAL_SECONDS,
+    EventStreamBridge,
+    MetricsBroadcaster,
+    StreamSubscriber,
+    clamp_interval,
+    parse_fields,
+    parse_topics,
+)
+
+router = APIRouter()
+
+# Idle streams send an SSE comment this often so proxies keep them open
+# and disconnected clients are noticed.
+KEEPALIVE_SECONDS = 15.0
+
+_SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+
+def get_metrics_broadcaster(request: Request) -> MetricsBroadcaster:
+    """Return the app-scoped metrics broadcaster, creating it on first use."""
+    broadcaster = getattr(request.app.state, "metrics_broadcaster", None)
+    if broadcaster is None:
+        broadcaster = MetricsBroadcaster()
+        request.app.state.metrics_broadcaster = broadcaster
+    return broadcaster
+
+
+def get_event_bridge(request: Request) -> EventStreamBridge:
+    """Return the app-scoped EventBus bridge, creating it on first use."""
+    bridge = getattr(request.app.state, "event_bridge", None)
+    if bridge is None:
+        bridge = EventStreamBridge()
+        request.app.state.event_bridge = bridge
+    return bridge
+
+
+def format_sse(event: str, data: Dict[str, Any], event_id: Optional[int] = None) -> str:
+    """Encode one server-sent event frame."""
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'), default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def _sse_stream(
+    request: Request,
+    subscriber: StreamSubscriber,
+    event: str,
+    release: Callable[[StreamSubscriber], None],
+    token: str,
+) -> AsyncIterator[str]:
+    """Relay a subscriber's queue as SSE frames until the client leaves or *token* expires."""
+    try:
+        yield f"retry: {int(KEEPALIVE_SECONDS * 1000)}\n\n"
+        while True:
+            try:
+                expires_at = AuthManager.verify_token(token)
+            except HTTPException:
+                return
+            timeout = KEEPALIVE_SECONDS
+            if expires_at is not None:
+                timeout = min(timeout, max(expires_at - time.time(), 0.0))
+            try:
+                item = await asyncio.wait_for(subscriber.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    return
+                if expires_at is not None and expires_at <= time.time():
+                    return
+                yield ": keepalive\n\n"
+                continue
+            if subscriber.dropped:
+                item = dict(item, dropped=subscriber.dropped)
+            yield format_sse(event, item, item.get("seq"))
+    finally:
+        release(subscriber)
+
+
+@router.get("/stream/metrics")
+async def stream_metrics(
+    request: Request,
+    fields: Optional[str] = Query(None, description="Comma-separated metric groups"),
+    interval: float = Query(DEFAULT_INTERVAL_SECONDS, gt=0, description="Seconds between updates"),
+    token: str = Depends(AuthManager.verify_bearer_token),
+):
+    """Stream live metrics snapshots as server-sent events (authenticated)."""
+    try:
+        selection = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    broadcaster = get_metrics_broadcaster(request)
+    subscriber = broadcaster.subscribe(selection, clamp_interval(interval))
+    return StreamingResponse(
+        _sse_stream(request, subscriber, "metrics", broadcaster.unsubscribe, token),
+        media_type="text/event-stream",
+        headers=_SSE_HEADERS,
+    )
+
+
+@router.get("/stream/events")
+async def stream_events(
+    request: Request,
+    topics: Optional[str] = Query(None, description="Comma-separated EventBus topics"),
+    token: str = Depends(AuthManager.verify_bearer_token),
+):
+    """Stream EventBus events as server-sent events (authenticated)."""
+    try:
+        selection = parse_topics(topics)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    bridge = get_event_bridge(request)
+    subscriber = bridge.subscribe(selection)
+    return StreamingResponse(
+        _sse_stream(request, subscriber, "event", bridge.unsubscribe, token),
+        media_type="text/event-stream",
+        headers=_SSE_HEADERS,
+    )
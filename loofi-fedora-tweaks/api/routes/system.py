@@ -3,17 +3,34 @@
 Security:
 - /health is unauthenticated but does NOT expose version info.
 - /info and /agents require Bearer JWT authentication.
+
+Performance:
+- /info and /agents are served from a short-TTL single-flight snapshot
+  cache, so many concurrent pollers share one computation per window.
 """
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from pydantic import BaseModel
 from services.system import SystemManager
 from utils.agents import AgentRegistry
+from utils.async_cache import SingleFlightCache
 from utils.auth import AuthManager
 from utils.monitor import SystemMonitor
 
 router = APIRouter()
 
+# Seconds a /info or /agents snapshot is reused across requests.
+SNAPSHOT_TTL_SECONDS = 2.0
+
+
+def get_snapshot_cache(request: Request) -> SingleFlightCache:
+    """Return the app-scoped snapshot cache, creating it on first use."""
+    cache = getattr(request.app.state, "snapshot_cache", None)
+    if cache is None:
+        cache = SingleFlightCache(ttl=SNAPSHOT_TTL_SECONDS)
+        request.app.state.snapshot_cache = cache
+    return cache
+
 
 class HealthResponse(BaseModel):
     """Health response payload — no version info for unauthenticated callers."""
@@ -22,16 +39,22 @@ class HealthResponse(BaseModel):
 
 
 @router.get("/health", response_model=HealthResponse)
-def get_health():
+async def get_health():
     """Basic health check endpoint (unauthenticated, no version leak)."""
     return HealthResponse(status="ok")
 
 
 @router.get("/info")
-def get_info(
+async def get_info(
+    request: Request,
     _auth: str = Depends(AuthManager.verify_bearer_token),
 ):
     """Return system info and health metrics (authenticated)."""
+    return await get_snapshot_cache(request).get("info", _build_info)
+
+
+def _build_info() -> dict:
+    """Probe system info and health (blocking; runs in a worker thread)."""
     from version import __version__, __version_codename__
 
     health = SystemMonitor.get_system_health()
@@ -62,10 +85,16 @@ def get_info(
 
 
 @router.get("/agents")
-def get_agents(
+async def get_agents(
+    request: Request,
     _auth: str = Depends(AuthManager.verify_bearer_token),
 ):
     """Return agent configs and runtime states (authenticated)."""
+    return await get_snapshot_cache(request).get("agents", _build_agents)
+
+
+def _build_agents() -> dict:
+    """Collect agent configs and states (blocking; runs in a worker thread)."""
     registry = AgentRegistry.instance()
     agents = registry.list_agents()
     return {
@@ -4,6 +4,8 @@ Enables headless operation and scripting.
 """
 
 import argparse
+import functools
+import importlib
 import json as json_module
 import logging
 import os
@@ -12,35 +14,86 @@ import subprocess
 import sys
 from typing import List, Optional
 
+from version import __version__, __version_codename__
+
 logger = logging.getLogger(__name__)
 
-from services.hardware import (
-    BluetoothManager,  # noqa: E402
-    DiskManager,  # noqa: E402
-    TemperatureManager,  # noqa: E402
-)
-from services.system import (
-    ProcessManager,  # noqa: E402
-    SystemManager,  # noqa: E402
-)
-from utils.firewall_manager import FirewallManager  # noqa: E402
-from utils.focus_mode import FocusMode  # noqa: E402
-from utils.health_timeline import HealthTimeline  # noqa: E402
-from utils.journal import JournalManager  # noqa: E402
-from utils.monitor import SystemMonitor  # noqa: E402
-from utils.network_monitor import NetworkMonitor  # noqa: E402
-from utils.operations import AdvancedOps, CleanupOps, NetworkOps, TweakOps  # noqa: E402
-from utils.package_explorer import PackageExplorer  # noqa: E402
-from utils.plugin_base import PluginLoader  # noqa: E402
-from utils.plugin_installer import PluginInstaller  # noqa: E402
-from utils.plugin_marketplace import PluginMarketplace  # noqa: E402
-from utils.ports import PortAuditor  # noqa: E402
-from utils.presets import PresetManager  # noqa: E402
-from utils.profiles import ProfileManager  # noqa: E402
-from utils.service_explorer import ServiceExplorer, ServiceScope  # noqa: E402
-from utils.storage import StorageManager  # noqa: E402
-from utils.update_checker import UpdateChecker  # noqa: E402
-from version import __version__, __version_codename__  # noqa: E402
+
+class _LazyImport:
+    """Placeholder for a handler dependency that is imported on first use.
+
+    The CLI exposes 40+ subcommands backed by utils/services modules.
+    Importing all of them up front made every invocation (including
+    ``--cli info --json`` from monitoring scripts) pay for modules it never
+    touches.  Each placeholder resolves its target only when a handler
+    calls it or reads an attribute, so a subcommand loads just the modules
+    it needs.  Tests can still patch ``cli.main.<Name>`` as before.
+    """
+
+    __slots__ = ("_module", "_attr", "_target")
+
+    def __init__(self, module: str, attr: str):
+        self._module = module
+        self._attr = attr
+        self._target = None
+
+    def _resolve(self):
+        if self._target is None:
+            self._target = getattr(importlib.import_module(self._module), self._attr)
+        return self._target
+
+    @property
+    def __dict__(self):
+        # Lets unittest.mock patch attributes through the placeholder and
+        # restore staticmethod/classmethod descriptors unchanged afterwards.
+        return self._resolve().__dict__
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self, name, value):
+        if name in _LazyImport.__slots__:
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._resolve(), name, value)
+
+    def __delattr__(self, name):
+        delattr(self._resolve(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __repr__(self):
+        state = "resolved" if self._target is not None else "pending"
+        return f"<lazy {self._module}.{self._attr} ({state})>"
+
+
+BluetoothManager = _LazyImport("services.hardware", "BluetoothManager")
+DiskManager = _LazyImport("services.hardware", "DiskManager")
+TemperatureManager = _LazyImport("services.hardware", "TemperatureManager")
+ProcessManager = _LazyImport("services.system", "ProcessManager")
+SystemManager = _LazyImport("services.system", "SystemManager")
+FirewallManager = _LazyImport("utils.firewall_manager", "FirewallManager")
+FocusMode = _LazyImport("utils.focus_mode", "FocusMode")
+HealthTimeline = _LazyImport("utils.health_timeline", "HealthTimeline")
+JournalManager = _LazyImport("utils.journal", "JournalManager")
+SystemMonitor = _LazyImport("utils.monitor", "SystemMonitor")
+NetworkMonitor = _LazyImport("utils.network_monitor", "NetworkMonitor")
+AdvancedOps = _LazyImport("utils.operations", "AdvancedOps")
+CleanupOps = _LazyImport("utils.operations", "CleanupOps")
+NetworkOps = _LazyImport("utils.operations", "NetworkOps")
+TweakOps = _LazyImport("utils.operations", "TweakOps")
+PackageExplorer = _LazyImport("utils.package_explorer", "PackageExplorer")
+PluginLoader = _LazyImport("utils.plugin_base", "PluginLoader")
+PluginInstaller = _LazyImport("utils.plugin_installer", "PluginInstaller")
+PluginMarketplace = _LazyImport("utils.plugin_marketplace", "PluginMarketplace")
+PortAuditor = _LazyImport("utils.ports", "PortAuditor")
+PresetManager = _LazyImport("utils.presets", "PresetManager")
+ProfileManager = _LazyImport("utils.profiles", "ProfileManager")
+ServiceExplorer = _LazyImport("utils.service_explorer", "ServiceExplorer")
+ServiceScope = _LazyImport("utils.service_explorer", "ServiceScope")
+StorageManager = _LazyImport("utils.storage", "StorageManager")
+UpdateChecker = _LazyImport("utils.update_checker", "UpdateChecker")
 
 # Add parent to path for imports
 sys.path.insert(0, str(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -1906,6 +1959,7 @@ def cmd_snapshot(args):
         label = args.label or "manual-snapshot"
         _print(f"🔄 Creating snapshot: {label}")
         success = run_operation(SnapshotManager.create_snapshot(label))
+        SnapshotManager.invalidate_catalogue()
         return 0 if success else 1
 
     elif args.action == "delete":
@@ -1913,6 +1967,7 @@ def cmd_snapshot(args):
             _print("❌ Snapshot ID required")
             return 1
         success = run_operation(SnapshotManager.delete_snapshot(args.snapshot_id))
+        SnapshotManager.invalidate_catalogue()
         return 0 if success else 1
 
     elif args.action == "backends":
@@ -3149,8 +3204,13 @@ def cmd_backup(args):
     return 1
 
 
-def main(argv: Optional[List[str]] = None):
-    """Main CLI entrypoint."""
+@functools.lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the top-level parser and all subcommand parsers.
+
+    Construction is cached: a resident ``--cli-server`` reuses one parser
+    instead of rebuilding every subparser on each forwarded call.
+    """
     parser = argparse.ArgumentParser(
         prog="loofi",
         description=f'Loofi Fedora Tweaks v{__version__} "{__version_codename__}" - System management CLI',
@@ -3690,6 +3750,12 @@ def main(argv: Optional[List[str]] = None):
     )
     backup_parser.add_argument("--snapshot-id", help="Snapshot ID (for restore/delete)")
 
+    return parser
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main CLI entrypoint."""
+    parser = _build_parser()
     args = parser.parse_args(argv)
 
     # Set JSON mode
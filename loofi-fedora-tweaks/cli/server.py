@@ -0,0 +1,302 @@
+"""
+Resident CLI server for high-frequency scripted calls.
+
+``--cli-server`` keeps the CLI modules (and singletons such as
+``AgentRegistry`` and ``AuditLogger``) loaded in one process listening on a
+user-private unix socket.  ``--cli-client`` forwards argv to that process
+and streams back stdout/stderr and the exit code, so a fleet script calling
+``--cli ... --json`` in a loop skips interpreter start-up, argparse
+construction and module imports on every call.
+
+Wire protocol (newline-delimited JSON):
+
+    client -> server   {"argv": [...], "cwd": "/path"}
+    server -> client   {"stream": "stdout" | "stderr", "data": "..."}   (0..n)
+    server -> client   {"exit_code": 0}
+"""
+
+import contextlib
+import io
+import json
+import logging
+import os
+import socket
+import socketserver
+import stat
+import struct
+import sys
+import threading
+from typing import List, Optional, TextIO
+
+logger = logging.getLogger(__name__)
+
+SOCKET_DIR_NAME = "loofi-fedora-tweaks"
+SOCKET_NAME = "cli.sock"
+
+# Upper bound for a single request line; argv for any real subcommand is tiny.
+MAX_REQUEST_BYTES = 64 * 1024
+
+
+def get_socket_path() -> str:
+    """Return the per-user CLI server socket path.
+
+    Uses ``$XDG_RUNTIME_DIR`` (a tmpfs private to the user) and falls back to
+    a uid-suffixed directory under ``/tmp`` when it is not set.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        base = os.path.join(runtime_dir, SOCKET_DIR_NAME)
+    else:
+        base = os.path.join("/tmp", f"{SOCKET_DIR_NAME}-{os.getuid()}")
+    return os.path.join(base, SOCKET_NAME)
+
+
+def _peer_uid(conn: socket.socket) -> Optional[int]:
+    """Return the uid of the process on the other end of *conn*, if known."""
+    try:
+        creds = conn.getsockopt(
+            socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i")
+        )
+    except (AttributeError, OSError):
+        return None
+    _pid, uid, _gid = struct.unpack("3i", creds)
+    return uid
+
+
+def _send_frame(wfile, frame: dict) -> None:
+    wfile.write(json.dumps(frame).encode("utf-8") + b"\n")
+    wfile.flush()
+
+
+class _FrameWriter(io.TextIOBase):
+    """Text stream that forwards every write to the client as a frame."""
+
+    def __init__(self, wfile, stream: str):
+        super().__init__()
+        self._wfile = wfile
+        self._stream = stream
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: str) -> int:
+        if data:
+            _send_frame(self._wfile, {"stream": self._stream, "data": data})
+        return len(data)
+
+
+class _CliRequestHandler(socketserver.StreamRequestHandler):
+    """Runs one forwarded CLI invocation per connection."""
+
+    server: "_UnixServer"
+
+    def handle(self) -> None:
+        peer = _peer_uid(self.request)
+        if peer is not None and peer != os.getuid():
+            logger.warning("Rejected CLI server connection from uid %s", peer)
+            return
+
+        line = self.rfile.readline(MAX_REQUEST_BYTES + 1)
+        try:
+            if len(line) > MAX_REQUEST_BYTES:
+                raise ValueError("request too large")
+            request = json.loads(line)
+            argv = request["argv"]
+            if not isinstance(argv, list) or not all(isinstance(a, str) for a in argv):
+                raise ValueError("argv must be a list of strings")
+            cwd = request.get("cwd")
+        except (ValueError, KeyError, TypeError) as e:
+            _send_frame(self.wfile, {"stream": "stderr", "data": f"Invalid request: {e}\n"})
+            _send_frame(self.wfile, {"exit_code": 2})
+            return
+
+        try:
+            exit_code = self.server.cli_server.execute(argv, cwd, self.wfile)
+            _send_frame(self.wfile, {"exit_code": exit_code})
+        except (BrokenPipeError, ConnectionResetError):
+            logger.debug("CLI client disconnected before completion")
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, cli_server: "CliServer"):
+        self.cli_server = cli_server
+        super().__init__(path, _CliRequestHandler)
+
+
+class CliServer:
+    """Keeps ``cli.main`` warm and serves forwarded invocations.
+
+    The CLI keeps per-call state (``--json``, ``--timeout``, ``--dry-run``)
+    in module globals and writes to ``sys.stdout``, so invocations are
+    executed one at a time under a lock; concurrent clients queue.
+    """
+
+    def __init__(self, socket_path: Optional[str] = None):
+        self.socket_path = socket_path or get_socket_path()
+        self._lock = threading.Lock()
+        self._server: Optional[_UnixServer] = None
+
+    def warm_up(self) -> int:
+        """Import ``cli.main`` and resolve its lazy handler modules.
+
+        Returns the number of handler modules that could be loaded.
+        """
+        import cli.main as cli_main
+
+        loaded = 0
+        for value in list(vars(cli_main).values()):
+            if isinstance(value, cli_main._LazyImport):
+                try:
+                    value._resolve()
+                    loaded += 1
+                except (ImportError, AttributeError) as e:
+                    logger.debug("CLI warm-up skipped %r: %s", value, e)
+        return loaded
+
+    def execute(self, argv: List[str], cwd: Optional[str], wfile) -> int:
+        """Run one CLI invocation, streaming its output to *wfile*."""
+        import cli.main as cli_main
+
+        stdout = _FrameWriter(wfile, "stdout")
+        stderr = _FrameWriter(wfile, "stderr")
+        with self._lock:
+            previous_cwd = os.getcwd()
+            try:
+                if cwd:
+                    os.chdir(cwd)
+                with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                    try:
+                        result = cli_main.main(argv)
+                    except SystemExit as e:
+                        result = e.code
+            except OSError as e:
+                stderr.write(f"Error: {e}\n")
+                result = 1
+            finally:
+                os.chdir(previous_cwd)
+
+        if result is None:
+            return 0
+        if isinstance(result, int):
+            return result
+        return 1
+
+    def _prepare_socket_dir(self) -> None:
+        """Create the socket directory, or check that an existing one is ours.
+
+        The ``/tmp`` fallback is shared with every user, so anything already
+        there must be a real directory (not a symlink) owned by us with mode
+        0700; otherwise another user could own or redirect our socket.
+        """
+        directory = os.path.dirname(self.socket_path)
+        try:
+            os.mkdir(directory, 0o700)
+        except FileExistsError:
+            pass
+        st = os.lstat(directory)
+        if not stat.S_ISDIR(st.st_mode):
+            raise RuntimeError(f"Refusing to use {directory}: not a directory")
+        if st.st_uid != os.getuid():
+            raise RuntimeError(f"Refusing to use {directory}: owned by uid {st.st_uid}")
+        if stat.S_IMODE(st.st_mode) != 0o700:
+            raise RuntimeError(
+                f"Refusing to use {directory}: mode {stat.S_IMODE(st.st_mode):04o}, expected 0700"
+            )
+        if os.path.exists(self.socket_path):
+            if _server_alive(self.socket_path):
+                raise RuntimeError(f"CLI server already running on {self.socket_path}")
+            os.unlink(self.socket_path)
+
+    def start(self) -> None:
+        """Bind the socket; call :meth:`serve_forever` to handle requests."""
+        self._prepare_socket_dir()
+        old_umask = os.umask(0o177)
+        try:
+            self._server = _UnixServer(self.socket_path, self)
+        finally:
+            os.umask(old_umask)
+        logger.info("CLI server listening on %s", self.socket_path)
+
+    def serve_forever(self) -> None:
+        if self._server is None:
+            self.start()
+        assert self._server is not None
+        try:
+            self._server.serve_forever()
+        finally:
+            self.close()
+
+    def shutdown(self) -> None:
+        """Stop :meth:`serve_forever` from another thread."""
+        if self._server is not None:
+            self._server.shutdown()
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.server_close()
+            self._server = None
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.socket_path)
+
+
+def _server_alive(path: str) -> bool:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def run_client(
+    argv: List[str],
+    socket_path: Optional[str] = None,
+    stdout: Optional[TextIO] = None,
+    stderr: Optional[TextIO] = None,
+) -> Optional[int]:
+    """Forward *argv* to a running CLI server.
+
+    Returns the remote exit code, or ``None`` when no server is reachable
+    so the caller can fall back to running the CLI in-process.
+    """
+    path = socket_path or get_socket_path()
+    out = stdout or sys.stdout
+    err = stderr or sys.stderr
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        try:
+            sock.connect(path)
+        except OSError:
+            return None
+
+        # Anyone can bind the /tmp fallback first: never hand argv and cwd
+        # to a server run by another user.
+        peer = _peer_uid(sock)
+        if peer is not None and peer != os.getuid():
+            err.write(f"Ignoring CLI server on {path}: it runs as uid {peer}\n")
+            return None
+
+        request = {"argv": list(argv), "cwd": os.getcwd()}
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+
+        with sock.makefile("rb") as rfile:
+            for raw in rfile:
+                frame = json.loads(raw)
+                if "exit_code" in frame:
+                    out.flush()
+                    return int(frame["exit_code"])
+                target = err if frame.get("stream") == "stderr" else out
+                target.write(frame.get("data", ""))
+    except (OSError, ValueError) as e:
+        err.write(f"CLI server connection failed: {e}\n")
+        return 1
+    finally:
+        sock.close()
+
+    err.write("CLI server closed the connection without an exit code\n")
+    return 1
@@ -18,10 +18,14 @@ Usage:
 
     # Legacy classmethod API (backward compatible):
     result = ActionExecutor.run("dnf", ["check-update"], preview=True)
+
+    # From asyncio code (e.g. API handlers), without blocking the loop:
+    result = await ActionExecutor.run_async("dnf", ["check-update"])
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import os
@@ -106,6 +110,47 @@ class ActionExecutor(BaseActionExecutor):
         self._log_action(cmd, result)
         return result
 
+    async def execute_async(
+        self,
+        command: str,
+        args: Optional[List[str]] = None,
+        *,
+        privileged: bool = False,
+        timeout: int = COMMAND_TIMEOUT,
+        action_id: str = "",
+        env: Optional[Dict[str, str]] = None,
+    ) -> ActionResult:
+        """
+        Asyncio-native counterpart of :meth:`execute`.
+
+        The child process is awaited on the running event loop instead of
+        occupying a worker thread for up to ``timeout`` seconds.
+
+        Args:
+            command: The executable name or path.
+            args: Command arguments.
+            privileged: If True, use pkexec for privilege escalation.
+            timeout: Max seconds to wait; the child is killed on expiry.
+            action_id: Optional ID for correlating with action definitions.
+            env: Optional extra environment variables.
+
+        Returns:
+            ActionResult containing success status, output, and metadata.
+        """
+        args = args or []
+
+        if self._dry_run_global:
+            return self.preview(
+                command, args, privileged=privileged, action_id=action_id
+            )
+
+        cmd = self._build_command(command, args, privileged=privileged)
+        result = await self._execute_subprocess_async(
+            cmd, timeout=timeout, action_id=action_id, env=env
+        )
+        await asyncio.to_thread(self._log_action, cmd, result)
+        return result
+
     def preview(
         self,
         command: str,
@@ -180,6 +225,33 @@ class ActionExecutor(BaseActionExecutor):
                 env=env,
             )
 
+    @classmethod
+    async def run_async(
+        cls,
+        command: str,
+        args: Optional[List[str]] = None,
+        *,
+        preview: bool = False,
+        pkexec: bool = False,
+        timeout: int = COMMAND_TIMEOUT,
+        action_id: str = "",
+        env: Optional[Dict[str, str]] = None,
+    ) -> ActionResult:
+        """Awaitable variant of :meth:`run` for asyncio callers."""
+        executor = cls()
+        if preview:
+            return executor.preview(
+                command, args, privileged=pkexec, action_id=action_id
+            )
+        return await executor.execute_async(
+            command,
+            args,
+            privileged=pkexec,
+            timeout=timeout,
+            action_id=action_id,
+            env=env,
+        )
+
     def _build_command(
         self, command: str, args: List[str], *, privileged: bool = False
     ) -> List[str]:
@@ -218,27 +290,9 @@ class ActionExecutor(BaseActionExecutor):
                 env=run_env,
             )
 
-            stdout = (proc.stdout or "")[:MAX_STDOUT]
-            stderr = (proc.stderr or "")[:MAX_STDERR]
-
-            if proc.returncode == 0:
-                return ActionResult(
-                    success=True,
-                    message=stdout.strip()[:300] or "OK",
-                    exit_code=0,
-                    stdout=stdout,
-                    stderr=stderr,
-                    action_id=action_id,
-                )
-            else:
-                return ActionResult(
-                    success=False,
-                    message=f"Exit {proc.returncode}: {stderr.strip()[:300]}",
-                    exit_code=proc.returncode,
-                    stdout=stdout,
-                    stderr=stderr,
-                    action_id=action_id,
-                )
+            return self._result_from_output(
+                proc.returncode, proc.stdout, proc.stderr, action_id
+            )
 
         except subprocess.TimeoutExpired:
             return ActionResult.fail(
@@ -259,6 +313,90 @@ class ActionExecutor(BaseActionExecutor):
                 action_id=action_id,
             )
 
+    async def _execute_subprocess_async(
+        self,
+        cmd: List[str],
+        *,
+        timeout: int,
+        action_id: str,
+        env: Optional[Dict[str, str]],
+    ) -> ActionResult:
+        """Run the subprocess on the event loop and return an ActionResult."""
+        run_env = None
+        if env:
+            run_env = {**os.environ, **env}
+
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=run_env,
+            )
+        except FileNotFoundError:
+            return ActionResult.fail(
+                f"Command not found: {cmd[0]}",
+                exit_code=127,
+                action_id=action_id,
+            )
+        except OSError as exc:
+            return ActionResult.fail(
+                f"OS error: {exc}",
+                exit_code=-1,
+                action_id=action_id,
+            )
+
+        try:
+            out, err = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return ActionResult.fail(
+                f"Command timed out after {timeout}s",
+                exit_code=-1,
+                action_id=action_id,
+            )
+        except asyncio.CancelledError:
+            proc.kill()
+            await proc.wait()
+            raise
+
+        return self._result_from_output(
+            proc.returncode if proc.returncode is not None else -1,
+            out.decode("utf-8", errors="replace"),
+            err.decode("utf-8", errors="replace"),
+            action_id,
+        )
+
+    @staticmethod
+    def _result_from_output(
+        returncode: int,
+        stdout: Optional[str],
+        stderr: Optional[str],
+        action_id: str,
+    ) -> ActionResult:
+        """Build an ActionResult from a finished process's output."""
+        stdout = (stdout or "")[:MAX_STDOUT]
+        stderr = (stderr or "")[:MAX_STDERR]
+
+        if returncode == 0:
+            return ActionResult(
+                success=True,
+                message=stdout.strip()[:300] or "OK",
+                exit_code=0,
+                stdout=stdout,
+                stderr=stderr,
+                action_id=action_id,
+            )
+        return ActionResult(
+            success=False,
+            message=f"Exit {returncode}: {stderr.strip()[:300]}",
+            exit_code=returncode,
+            stdout=stdout,
+            stderr=stderr,
+            action_id=action_id,
+        )
+
     def _log_action(self, cmd: List[str], result: ActionResult):
         """Append action to JSON-lines log file."""
         try:
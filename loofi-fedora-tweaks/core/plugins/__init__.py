@@ -19,6 +19,7 @@ Public API:
     VerificationResult — integrity verification result (v26.0 Phase 1 T6)
     DependencyResolver — dependency resolution with version constraints (v26.0 Phase 1 T8)
     ResolverResult   — dependency resolution result (v26.0 Phase 1 T8)
+    PluginWatcher    — debounced filesystem-watch hot reload
 """
 
 from core.plugins.adapter import PluginAdapter
@@ -32,6 +33,7 @@ from core.plugins.registry import PluginRegistry
 from core.plugins.resolver import DependencyResolver, ResolverResult
 from core.plugins.sandbox import PluginSandbox, RestrictedImporter, create_sandbox
 from core.plugins.scanner import PluginScanner
+from core.plugins.watcher import PluginWatcher
 
 __all__ = [
     "PluginInterface",
@@ -51,4 +53,5 @@ __all__ = [
     "VerificationResult",
     "DependencyResolver",
     "ResolverResult",
+    "PluginWatcher",
 ]
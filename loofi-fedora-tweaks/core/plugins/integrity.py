@@ -1,17 +1,126 @@
 """
 Plugin integrity verification with SHA256 checksums and optional GPG signatures.
 Part of v26.0 Phase 1 (T6).
+
+File digests are remembered in a small on-disk cache keyed by each file's
+(inode, size, mtime_ns, ctime_ns) stamp, so plugin files that have not
+changed since the last verification are not read again.  Files that still
+need hashing are spread across a thread pool; hashlib releases the GIL
+while digesting large buffers.
 """
 import hashlib
 import logging
 import os
 import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from utils.json_store import JsonStore, is_racy
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "loofi-fedora-tweaks" / "integrity.json"
+CACHE_FORMAT = 1
+
+HASH_CHUNK_SIZE = 1024 * 1024
+HASH_WORKERS = min(8, os.cpu_count() or 1)
+# Blobs smaller than this are cheaper to hash inline than to hand to a worker.
+PARALLEL_MIN_BYTES = 256 * 1024
+
+_FileStamp = Tuple[int, int, int, int]
+
+
+def _file_stamp(st: os.stat_result) -> _FileStamp:
+    return (st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+
+
+def sha256_file(path: Path) -> str:
+    """Return the SHA256 hex digest of *path*, read in large chunks."""
+    sha256_hash = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            sha256_hash.update(chunk)
+    return sha256_hash.hexdigest()
+
+
+def sha256_blobs(blobs: Dict[str, bytes]) -> Dict[str, str]:
+    """Return SHA256 hex digests for in-memory files, hashing large ones in parallel."""
+    total = sum(len(content) for content in blobs.values())
+    if len(blobs) < 2 or total < PARALLEL_MIN_BYTES:
+        return {name: hashlib.sha256(content).hexdigest() for name, content in blobs.items()}
+    names = list(blobs)
+    with ThreadPoolExecutor(max_workers=HASH_WORKERS) as pool:
+        digests = pool.map(lambda name: hashlib.sha256(blobs[name]).hexdigest(), names)
+        return dict(zip(names, digests))
+
+
+class VerifiedFileCache(JsonStore):
+    """
+    Persistent map of file path -> (stamp, SHA256 digest).
+
+    A cached digest is only trusted while the file's inode, size, mtime and
+    ctime are unchanged.  ctime cannot be set from user space, so rewriting
+    a file and restoring its mtime still invalidates the entry.  Digests of
+    files whose stamp is still racy are not stored.
+    """
+
+    MAX_ENTRIES = 20000
+    FORMAT = CACHE_FORMAT
+    DATA_KEY = "files"
+    LABEL = "integrity cache"
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self._loaded = False
+        self._dirty = False
+
+    @classmethod
+    def default_path(cls) -> Path:
+        return DEFAULT_CACHE_PATH
+
+    def _load(self) -> Dict[str, list]:
+        # Read once: verification looks up many files in a row, and only
+        # this process's flush() writes the entries back.
+        if not self._loaded:
+            self._sync()
+            self._loaded = True
+        return self._data
+
+    def lookup(self, path: Path, st: os.stat_result) -> Optional[str]:
+        """Return the cached digest of *path* if its stamp still matches *st*."""
+        with self._lock:
+            entry = self._load().get(str(path))
+        if not isinstance(entry, list) or len(entry) != 5:
+            return None
+        if tuple(entry[:4]) != _file_stamp(st):
+            return None
+        return entry[4] if isinstance(entry[4], str) else None
+
+    def record(self, path: Path, st: os.stat_result, digest: str, now: Optional[float] = None) -> None:
+        """Remember *digest* for *path* unless the file was modified too recently."""
+        now = time.time() if now is None else now
+        if is_racy(st.st_mtime_ns, now):
+            return
+        with self._lock:
+            entries = self._load()
+            key = str(path)
+            entries.pop(key, None)
+            entries[key] = [*_file_stamp(st), digest]
+            while len(entries) > self.MAX_ENTRIES:
+                del entries[next(iter(entries))]
+            self._dirty = True
+
+    def flush(self) -> None:
+        """Write the cache to disk if anything was recorded since the last flush."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            self._write()
+
 
 @dataclass
 class VerificationResult:
@@ -86,14 +195,8 @@ class IntegrityVerifier:
 
             logger.info("Verifying checksum for %s", archive_path.name)
 
-            # Calculate SHA256 hash
-            sha256_hash = hashlib.sha256()
-            with open(archive_path, "rb") as f:
-                # Read in chunks to handle large files
-                for chunk in iter(lambda: f.read(65536), b""):
-                    sha256_hash.update(chunk)
-
-            actual_hash = sha256_hash.hexdigest()
+            # Archives are freshly downloaded, so they are never cache hits
+            actual_hash = sha256_file(archive_path)
 
             # Compare hashes (case-insensitive)
             if actual_hash.lower() == expected_hash.lower():
@@ -211,6 +314,61 @@ class IntegrityVerifier:
                 error=f"Signature verification error: {exc}"
             )
 
+    @staticmethod
+    def hash_files(paths: Iterable[Path], use_cache: bool = True) -> Dict[Path, Optional[str]]:
+        """
+        Return SHA256 digests for *paths*, reusing cached digests of unchanged files.
+
+        Files that must be read are hashed on a thread pool.
+
+        Args:
+            paths: Files to hash
+            use_cache: Consult and update the persistent verified-file cache
+
+        Returns:
+            Dictionary mapping each path to its hex digest, or None if unreadable
+        """
+        cache = VerifiedFileCache.shared() if use_cache else None
+        digests: Dict[Path, Optional[str]] = {}
+        pending: List[Tuple[Path, os.stat_result]] = []
+
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError as exc:
+                logger.warning("Failed to stat %s: %s", path, exc)
+                digests[path] = None
+                continue
+            cached = cache.lookup(path, st) if cache is not None else None
+            if cached is not None:
+                digests[path] = cached
+            else:
+                pending.append((path, st))
+
+        def _hash(item: Tuple[Path, os.stat_result]) -> Optional[str]:
+            path, st = item
+            try:
+                digest = sha256_file(path)
+            except OSError as exc:
+                logger.warning("Failed to hash %s: %s", path, exc)
+                return None
+            if cache is not None:
+                cache.record(path, st, digest)
+            return digest
+
+        if len(pending) > 1 and HASH_WORKERS > 1:
+            with ThreadPoolExecutor(max_workers=min(HASH_WORKERS, len(pending))) as pool:
+                for (path, _st), digest in zip(pending, pool.map(_hash, pending)):
+                    digests[path] = digest
+        else:
+            for item in pending:
+                digests[item[0]] = _hash(item)
+
+        if cache is not None and pending:
+            cache.flush()
+        logger.debug("Hashed %d file(s), %d from cache", len(pending), len(digests) - len(pending))
+        return digests
+
     @staticmethod
     def generate_checksums(plugin_dir: Path) -> Dict[str, str]:
         """
@@ -232,27 +390,17 @@ class IntegrityVerifier:
 
             logger.info("Generating checksums for %s", plugin_dir)
 
-            # Walk directory and hash all files
+            # Walk directory, then hash all files in one batch
+            file_paths: List[Path] = []
             for root, _, files in os.walk(plugin_dir):
                 for filename in files:
                     if filename == "CHECKSUMS.sha256":
                         continue  # Skip existing checksum file
+                    file_paths.append(Path(root) / filename)
 
-                    file_path = Path(root) / filename
-                    relative_path = file_path.relative_to(plugin_dir)
-
-                    try:
-                        sha256_hash = hashlib.sha256()
-                        with open(file_path, "rb") as f:
-                            for chunk in iter(lambda: f.read(65536), b""):
-                                sha256_hash.update(chunk)
-
-                        checksums[str(relative_path)] = sha256_hash.hexdigest()
-                        logger.debug("Hashed %s: %s", relative_path, checksums[str(relative_path)])
-
-                    except OSError as exc:
-                        logger.warning("Failed to hash %s: %s", relative_path, exc)
-                        continue
+            for file_path, digest in IntegrityVerifier.hash_files(file_paths).items():
+                if digest is not None:
+                    checksums[str(file_path.relative_to(plugin_dir))] = digest
 
             logger.info("Generated %d checksums", len(checksums))
 
@@ -284,24 +432,22 @@ class IntegrityVerifier:
 
             mismatches = []
             missing = []
+            present: Dict[Path, str] = {}
 
-            for relative_path, expected_hash in checksums.items():
+            for relative_path in checksums:
                 file_path = plugin_dir / relative_path
-
                 if not file_path.exists():
                     missing.append(relative_path)
                     logger.warning("Missing file: %s", relative_path)
                     continue
-
-                # Calculate actual hash
-                sha256_hash = hashlib.sha256()
-                with open(file_path, "rb") as f:
-                    for chunk in iter(lambda: f.read(65536), b""):
-                        sha256_hash.update(chunk)
-
-                actual_hash = sha256_hash.hexdigest()
-
-                if actual_hash.lower() != expected_hash.lower():
+                present[file_path] = relative_path
+
+            actual = IntegrityVerifier.hash_files(present)
+            for file_path, relative_path in present.items():
+                actual_hash = actual.get(file_path)
+                if actual_hash is None:
+                    raise OSError(f"Failed to read {relative_path}")
+                if actual_hash.lower() != checksums[relative_path].lower():
                     mismatches.append(relative_path)
                     logger.warning("Checksum mismatch for %s", relative_path)
 
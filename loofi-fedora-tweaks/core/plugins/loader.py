@@ -282,6 +282,10 @@ class PluginLoader:
         log.info("Loaded %d external plugin(s)", len(loaded))
         return loaded
 
+    def external_plugin_dirs(self) -> dict[str, Path]:
+        """Return map of plugin_id -> directory for loaded external plugins."""
+        return dict(self._external_plugin_dirs)
+
     def request_reload(self, request: HotReloadRequest) -> HotReloadResult:
         """
         Reload an already loaded external plugin if file changes are detected.
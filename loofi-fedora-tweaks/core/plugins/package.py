@@ -69,7 +69,6 @@ Usage:
 
 from __future__ import annotations
 
-import hashlib
 import io
 import json
 import tarfile
@@ -79,6 +78,8 @@ from typing import Any  # noqa: F401
 
 from utils.log import get_logger
 
+from core.plugins.integrity import sha256_blobs
+
 logger = get_logger(__name__)
 
 
@@ -426,12 +427,14 @@ class PluginPackage:
             logger.warning("No checksums found, skipping verification")
             return True
 
-        for filename, expected_hash in self.checksums.items():
+        for filename in self.checksums:
             if filename not in self.files:
                 logger.error("File %s in checksums but not in archive", filename)
                 return False
 
-            actual_hash = hashlib.sha256(self.files[filename]).hexdigest()
+        actual = sha256_blobs({name: self.files[name] for name in self.checksums})
+        for filename, expected_hash in self.checksums.items():
+            actual_hash = actual[filename]
             if actual_hash != expected_hash:
                 logger.error(
                     "Checksum mismatch for %s: expected %s, got %s",
@@ -447,11 +450,10 @@ class PluginPackage:
     @staticmethod
     def _compute_checksums(files: dict[str, bytes]) -> dict[str, str]:
         """Compute SHA256 checksums for all files."""
-        checksums = {}
-        for filename, content in files.items():
-            if filename != "CHECKSUMS.sha256" and filename != "SIGNATURE.asc":
-                checksums[filename] = hashlib.sha256(content).hexdigest()
-        return checksums
+        return sha256_blobs({
+            filename: content for filename, content in files.items()
+            if filename != "CHECKSUMS.sha256" and filename != "SIGNATURE.asc"
+        })
 
     @staticmethod
     def _format_checksums(checksums: dict[str, str]) -> str:
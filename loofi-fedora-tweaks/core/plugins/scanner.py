@@ -182,6 +182,10 @@ class PluginScanner:
     def detect_changed_plugins(self, previous_snapshots: Optional[dict[str, str]] = None) -> List[PluginChangeSet]:
         """
         Compare current snapshots with previous snapshots and return changed plugins.
+
+        This rescans and re-fingerprints every plugin; long-running callers
+        should use core.plugins.watcher.PluginWatcher, which only looks at
+        plugins the filesystem reports as changed.
         """
         previous = previous_snapshots or {}
         discovered = self.scan()
@@ -0,0 +1,260 @@
+"""
+core.plugins.watcher — Filesystem-watch driven plugin hot reload.
+
+Watches the directories of loaded external plugins and turns file changes
+into ``PluginLoader.request_reload`` calls for only the affected plugins.
+Bursts of writes (an editor saving several files, an update unpacking an
+archive) are debounced per plugin so each burst reloads the plugin once.
+
+With inotify the idle cost is zero: callers block in ``select()`` on
+:meth:`PluginWatcher.fileno` and call :meth:`PluginWatcher.poll` when it is
+readable or when :meth:`PluginWatcher.timeout` expires.  Without inotify
+the underlying FileWatcher compares stat stamps of the watched plugin
+directories on every ``poll()``, which is still limited to loaded plugins
+rather than a full rescan and re-fingerprint of the plugins directory.
+
+Usage:
+    from core.plugins.watcher import PluginWatcher
+
+    watcher = PluginWatcher(loader)
+    while running:
+        select.select([watcher.fileno()], [], [], watcher.timeout(1.0))
+        for result in watcher.poll():
+            print(result.plugin_id, result.message)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import select
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+from utils.file_watcher import FileWatcher
+
+from core.plugins.loader import HotReloadRequest, HotReloadResult, PluginLoader
+
+logger = logging.getLogger(__name__)
+
+# Entries that never affect plugin behaviour; __pycache__ is written by the
+# reload itself and must not trigger another one.
+_IGNORED_DIRS = frozenset({"__pycache__", ".git"})
+
+
+def _inode(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_ino
+    except OSError:
+        return None
+
+
+def _is_ignored(rel_parts: tuple[str, ...]) -> bool:
+    if any(part in _IGNORED_DIRS for part in rel_parts):
+        return True
+    name = rel_parts[-1] if rel_parts else ""
+    return name.endswith((".pyc", "~", ".swp")) or name.startswith(".#")
+
+
+@dataclass
+class _PendingReload:
+    """Changes collected for one plugin while its debounce window is open."""
+    first_seen: float
+    last_seen: float
+    changed_files: set[str] = field(default_factory=set)
+
+
+class PluginWatcher:
+    """
+    Debounced hot-reload driver for external plugins.
+
+    Attributes:
+        debounce: Quiet period after the last change before reloading
+        max_delay: Upper bound on how long a continuous burst defers reload
+    """
+
+    DEBOUNCE_SECONDS = 0.25
+    MAX_DELAY_SECONDS = 2.0
+
+    def __init__(
+        self,
+        loader: PluginLoader,
+        debounce: float = DEBOUNCE_SECONDS,
+        max_delay: float = MAX_DELAY_SECONDS,
+        use_inotify: bool = True,
+    ) -> None:
+        self._loader = loader
+        self.debounce = debounce
+        self.max_delay = max(max_delay, debounce)
+        self._watcher = FileWatcher(use_inotify=use_inotify)
+        self._plugin_dirs: dict[str, Path] = {}
+        self._owners: dict[Path, str] = {}
+        self._roots: dict[Path, set[str]] = {}
+        self._inodes: dict[Path, Optional[int]] = {}
+        self._pending: dict[str, _PendingReload] = {}
+        self.refresh()
+
+    @property
+    def uses_inotify(self) -> bool:
+        """True when change notifications come from the kernel."""
+        return self._watcher.uses_inotify
+
+    def fileno(self) -> Optional[int]:
+        """Return the inotify descriptor for ``select()``, or None when polling."""
+        return self._watcher.fileno()
+
+    def refresh(self) -> None:
+        """Synchronise watches with the loader's set of external plugins."""
+        current = {pid: Path(path) for pid, path in self._loader.external_plugin_dirs().items()}
+        if current == self._plugin_dirs:
+            return
+
+        for plugin_id, plugin_dir in self._plugin_dirs.items():
+            if current.get(plugin_id) != plugin_dir:
+                self._unwatch_plugin(plugin_dir)
+                self._pending.pop(plugin_id, None)
+        for plugin_id, plugin_dir in current.items():
+            if self._plugin_dirs.get(plugin_id) != plugin_dir:
+                self._watch_plugin(plugin_dir)
+
+        self._plugin_dirs = current
+        self._owners = {plugin_dir: pid for pid, plugin_dir in current.items()}
+
+        # The plugins root is watched for the plugin directory names only, so
+        # a directory swapped in by an update (rename over the old one) is
+        # noticed and re-watched.
+        roots: dict[Path, set[str]] = {}
+        for plugin_dir in current.values():
+            roots.setdefault(plugin_dir.parent, set()).add(plugin_dir.name)
+        for root in set(self._roots) - set(roots):
+            self._watcher.unwatch(root)
+        for root, names in roots.items():
+            if self._roots.get(root) != names:
+                self._watcher.watch(root, names=names)
+        self._roots = roots
+        logger.debug("Watching %d external plugin(s)", len(current))
+
+    def _watch_plugin(self, plugin_dir: Path) -> None:
+        self._inodes[plugin_dir] = _inode(plugin_dir)
+        self._watch_tree(plugin_dir)
+
+    def _unwatch_plugin(self, plugin_dir: Path) -> None:
+        self._inodes.pop(plugin_dir, None)
+        self._unwatch_subtree(plugin_dir)
+
+    def _unwatch_subtree(self, directory: Path) -> None:
+        for watched in self._watcher.watched:
+            if watched == directory or directory in watched.parents:
+                self._watcher.unwatch(watched)
+
+    def _watch_tree(self, directory: Path) -> None:
+        for dirpath, dirnames, _files in os.walk(directory):
+            dirnames[:] = [d for d in dirnames if d not in _IGNORED_DIRS]
+            self._watcher.watch(Path(dirpath))
+
+    def _owner_of(self, path: Path) -> Optional[tuple[str, Path]]:
+        for candidate in (path, *path.parents):
+            plugin_id = self._owners.get(candidate)
+            if plugin_id is not None:
+                return plugin_id, candidate
+        return None
+
+    def collect(self, now: Optional[float] = None) -> set[str]:
+        """Read pending filesystem changes; return the plugin ids they touched."""
+        now = time.monotonic() if now is None else now
+        self.refresh()
+        touched: set[str] = set()
+
+        for path in self._watcher.read_changes():
+            owner = self._owner_of(path)
+            if owner is None:
+                continue
+            plugin_id, plugin_dir = owner
+
+            if path == plugin_dir:
+                # Only a replaced, created or removed directory matters here;
+                # changes to its entries are reported by the tree watches.
+                if _inode(plugin_dir) == self._inodes.get(plugin_dir):
+                    continue
+                self._unwatch_plugin(plugin_dir)
+                self._watch_plugin(plugin_dir)
+                rel = ""
+            else:
+                parts = path.relative_to(plugin_dir).parts
+                if _is_ignored(parts):
+                    continue
+                if path.is_dir():
+                    if path in self._watcher.watched:
+                        # A subdirectory's own stamp; its entries report themselves.
+                        continue
+                    self._watch_tree(path)
+                elif path in self._watcher.watched:
+                    self._unwatch_subtree(path)
+                rel = "/".join(parts)
+
+            pending = self._pending.get(plugin_id)
+            if pending is None:
+                pending = self._pending[plugin_id] = _PendingReload(now, now)
+            pending.last_seen = now
+            if rel:
+                pending.changed_files.add(rel)
+            touched.add(plugin_id)
+        return touched
+
+    def next_deadline(self) -> Optional[float]:
+        """Monotonic time at which the next debounced reload becomes due."""
+        if not self._pending:
+            return None
+        return min(self._due_at(pending) for pending in self._pending.values())
+
+    def timeout(self, default: Optional[float] = None) -> Optional[float]:
+        """Seconds a caller may sleep before :meth:`poll` has work to do.
+
+        Polling watchers never sleep longer than *default*.
+        """
+        deadline = self.next_deadline()
+        if deadline is None:
+            return default
+        remaining = max(deadline - time.monotonic(), 0.0)
+        return remaining if default is None else min(remaining, default)
+
+    def _due_at(self, pending: _PendingReload) -> float:
+        return min(pending.last_seen + self.debounce, pending.first_seen + self.max_delay)
+
+    def poll(self, now: Optional[float] = None) -> List[HotReloadResult]:
+        """Collect changes and reload every plugin whose debounce window closed."""
+        now = time.monotonic() if now is None else now
+        self.collect(now)
+
+        results: List[HotReloadResult] = []
+        for plugin_id in [pid for pid, p in self._pending.items() if self._due_at(p) <= now]:
+            pending = self._pending.pop(plugin_id)
+            request = HotReloadRequest(
+                plugin_id=plugin_id,
+                changed_files=tuple(sorted(pending.changed_files)),
+                reason="filesystem",
+            )
+            result = self._loader.request_reload(request)
+            logger.info("Hot reload of '%s': %s", plugin_id, result.message)
+            results.append(result)
+        return results
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until a change is readable or *timeout* (capped by debounce) passes.
+
+        Returns True if the inotify descriptor became readable.
+        """
+        timeout = self.timeout(timeout)
+        fd = self.fileno()
+        if fd is None:
+            if timeout:
+                time.sleep(timeout)
+            return False
+        readable, _, _ = select.select([fd], [], [], timeout)
+        return bool(readable)
+
+    def close(self) -> None:
+        """Release the inotify descriptor."""
+        self._watcher.close()
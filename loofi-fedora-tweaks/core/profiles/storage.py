@@ -1,51 +1,214 @@
-"""Filesystem-backed profile storage and import/export helpers."""
+"""Filesystem-backed profile storage and import/export helpers.
+
+Parsed custom profiles are kept in a per-directory index shared by every
+ProfileStore for that directory.  Each file is re-parsed only when its
+(mtime_ns, size, inode) stamp changes, and the directory listing is re-read
+only when the directory's own stamp changes, so ``get_profile`` is a dict
+lookup plus one ``stat`` in the common case (an in-place edit that changes
+the key stored inside another file is picked up by the next listing).  Racy
+stamps (see :func:`utils.json_store.is_racy`) are not trusted.
+"""
 
 from __future__ import annotations
 
+import copy
 import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.profiles.models import SCHEMA_VERSION, ProfileBundle, ProfileRecord
+from utils.json_store import is_racy
+
+_READ_CHUNK = 64 * 1024
+
+_Stamp = Tuple[int, int, int]
+
+
+def _stamp_of(st: os.stat_result) -> _Stamp:
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _copy_record(record: ProfileRecord) -> ProfileRecord:
+    """Hand out a copy so callers cannot mutate the cached record."""
+    clone = copy.copy(record)
+    clone.settings = copy.deepcopy(record.settings)
+    return clone
+
+
+def _settled(st: os.stat_result, now: float) -> bool:
+    """True if *st* is old enough that a later write must change it."""
+    return not is_racy(st.st_mtime_ns, now)
+
+
+@dataclass
+class _CachedFile:
+    stamp: _Stamp
+    trusted: bool
+    record: Optional[ProfileRecord]
 
-from core.profiles.models import ProfileBundle, ProfileRecord
+
+@dataclass
+class _DirIndex:
+    """Parsed custom profiles of one directory, keyed by file name and key."""
+    dir_stamp: Optional[_Stamp] = None
+    dir_trusted: bool = False
+    files: Dict[str, _CachedFile] = field(default_factory=dict)
+    by_key: Dict[str, str] = field(default_factory=dict)
+
+    def rebuild_keys(self) -> None:
+        by_key: Dict[str, str] = {}
+        for name in sorted(self.files):
+            record = self.files[name].record
+            if record is not None:
+                by_key.setdefault(record.key, name)
+        self.by_key = by_key
 
 
 class ProfileStore:
     """Storage engine for built-in and custom profiles."""
 
+    _indexes: Dict[Path, _DirIndex] = {}
+    _lock = threading.RLock()
+
     def __init__(self, profiles_dir: str, builtin_profiles: Optional[Dict[str, dict]] = None):
         self.profiles_dir = Path(profiles_dir)
         self.builtin_profiles = builtin_profiles or {}
 
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop every parsed-profile index."""
+        with cls._lock:
+            cls._indexes.clear()
+
     def list_profiles(self) -> List[ProfileRecord]:
         """Return normalized built-in and custom profiles."""
-        profiles: List[ProfileRecord] = []
-
-        for key, payload in self.builtin_profiles.items():
-            profiles.append(
-                ProfileRecord(
-                    key=key,
-                    name=payload.get("name", key),
-                    description=payload.get("description", ""),
-                    icon=payload.get("icon", "\U0001f527"),
-                    builtin=True,
-                    settings=payload.get("settings") or {},
-                )
-            )
-
-        if self.profiles_dir.is_dir():
-            for path in sorted(self.profiles_dir.glob("*.json")):
-                record = self._read_custom_file(path)
-                if record:
-                    profiles.append(record)
-
-        return profiles
+        return list(self.iter_profiles())
+
+    def iter_profiles(self, include_builtins: bool = True) -> Iterator[ProfileRecord]:
+        """Yield built-in profiles, then custom profiles in file-name order."""
+        if include_builtins:
+            for key in self.builtin_profiles:
+                yield self._builtin_record(key)
+
+        with self._lock:
+            index = self._refresh_index()
+            records = [index.files[name].record for name in sorted(index.files)]
+        for record in records:
+            if record is not None:
+                yield _copy_record(record)
 
     def get_profile(self, key: str) -> Optional[ProfileRecord]:
         """Get one profile by key."""
-        for record in self.list_profiles():
-            if record.key == key:
-                return record
-        return None
+        if key in self.builtin_profiles:
+            return self._builtin_record(key)
+
+        with self._lock:
+            index = self._indexes.get(self.profiles_dir)
+            if index is None or not self._dir_unchanged(index):
+                index = self._refresh_index()
+            name = index.by_key.get(key)
+            if name is None:
+                return None
+            entry = self._refresh_file(index, name)
+            if entry is None or entry.record is None or entry.record.key != key:
+                index.rebuild_keys()
+                name = index.by_key.get(key)
+                entry = index.files.get(name) if name else None
+                if entry is None or entry.record is None:
+                    return None
+            return _copy_record(entry.record)
+
+    def _builtin_record(self, key: str) -> ProfileRecord:
+        payload = self.builtin_profiles[key]
+        return ProfileRecord(
+            key=key,
+            name=payload.get("name", key),
+            description=payload.get("description", ""),
+            icon=payload.get("icon", "\U0001f527"),
+            builtin=True,
+            settings=copy.deepcopy(payload.get("settings") or {}),
+        )
+
+    def _dir_unchanged(self, index: _DirIndex) -> bool:
+        if not index.dir_trusted:
+            return False
+        try:
+            return _stamp_of(os.stat(self.profiles_dir)) == index.dir_stamp
+        except OSError:
+            return index.dir_stamp is None
+
+    def _refresh_index(self) -> _DirIndex:
+        """Bring the index for this directory up to date; caller holds the lock."""
+        index = self._indexes.setdefault(self.profiles_dir, _DirIndex())
+        if self._dir_unchanged(index):
+            # Files rewritten in place do not touch the directory stamp.
+            for name in list(index.files):
+                self._refresh_file(index, name)
+            index.rebuild_keys()
+            return index
+
+        now = time.time()
+        try:
+            dir_st = os.stat(self.profiles_dir)
+            with os.scandir(self.profiles_dir) as entries:
+                names = {
+                    e.name for e in entries
+                    if e.name.endswith(".json") and e.is_file()
+                }
+        except OSError:
+            index.files.clear()
+            index.by_key.clear()
+            index.dir_stamp = None
+            index.dir_trusted = False
+            return index
+
+        for name in set(index.files) - names:
+            del index.files[name]
+        for name in names:
+            self._refresh_file(index, name, now)
+        index.dir_stamp = _stamp_of(dir_st)
+        index.dir_trusted = _settled(dir_st, now)
+        index.rebuild_keys()
+        return index
+
+    def _refresh_file(self, index: _DirIndex, name: str, now: Optional[float] = None) -> Optional[_CachedFile]:
+        """Re-parse *name* if its stamp changed; caller holds the lock."""
+        path = self.profiles_dir / name
+        try:
+            st = os.stat(path)
+        except OSError:
+            index.files.pop(name, None)
+            return None
+        cached = index.files.get(name)
+        stamp = _stamp_of(st)
+        if cached is not None and cached.trusted and cached.stamp == stamp:
+            return cached
+        now = time.time() if now is None else now
+        cached = _CachedFile(stamp, _settled(st, now), self._read_custom_file(path))
+        index.files[name] = cached
+        return cached
+
+    def _index_written_file(self, path: Path) -> None:
+        """Fold one file this store just wrote or deleted into the index.
+
+        The directory stamp is advanced to cover our own change, so the next
+        lookup stays O(1) instead of rescanning the directory.
+        """
+        with self._lock:
+            index = self._indexes.get(self.profiles_dir)
+            if index is None:
+                return
+            if index.dir_trusted:
+                try:
+                    index.dir_stamp = _stamp_of(os.stat(self.profiles_dir))
+                except OSError:
+                    index.dir_trusted = False
+            self._refresh_file(index, path.name)
+            index.rebuild_keys()
 
     def save_custom_profile(self, record: ProfileRecord, overwrite: bool = False) -> Tuple[bool, str, Optional[str]]:
         """Persist a custom profile record to disk."""
@@ -59,11 +222,11 @@ class ProfileStore:
             return False, f"Custom profile '{record.key}' already exists.", None
 
         try:
-            with path.open("w", encoding="utf-8") as fh:
-                json.dump(record.to_file_dict(), fh, indent=4, ensure_ascii=False)
+            self._write_json(str(path), record.to_file_dict(), indent=4)
         except OSError as exc:
             return False, f"Failed to save profile: {exc}", None
 
+        self._index_written_file(path)
         return True, f"Custom profile '{record.name}' saved.", str(path)
 
     def delete_custom_profile(self, key: str) -> Tuple[bool, str]:
@@ -80,6 +243,7 @@ class ProfileStore:
         except OSError as exc:
             return False, f"Failed to delete profile: {exc}"
 
+        self._index_written_file(path)
         return True, f"Profile '{key}' deleted."
 
     def export_profile_data(self, key: str) -> Tuple[bool, str, dict]:
@@ -123,11 +287,15 @@ class ProfileStore:
         except ValueError as exc:
             return False, f"Invalid bundle payload: {exc}", {}
 
+        return self._import_records(bundle.profiles, overwrite=overwrite)
+
+    def _import_records(self, records: Iterable[ProfileRecord], overwrite: bool = False) -> Tuple[bool, str, dict]:
+        """Save validated bundle records one at a time."""
         imported = []
         skipped = []
         errors = []
 
-        for record in bundle.profiles:
+        for record in records:
             if record.key in self.builtin_profiles:
                 skipped.append(record.key)
                 continue
@@ -168,26 +336,133 @@ class ProfileStore:
         return self.import_profile_data(payload, overwrite=overwrite)
 
     def export_bundle(self, path: str, include_builtins: bool = False) -> Tuple[bool, str]:
-        """Write bundle payload to a file."""
-        ok, message, payload = self.export_bundle_data(include_builtins=include_builtins)
-        if not ok:
-            return False, message
-
+        """Stream a bundle of profiles to a file, one profile at a time."""
+        target = Path(path)
+        tmp = target.with_name(f"{target.name}.tmp.{os.getpid()}")
         try:
-            self._write_json(path, payload)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with tmp.open("w", encoding="utf-8") as fh:
+                fh.write('{\n  "schema_version": %d,\n  "kind": "profile_bundle",\n  "profiles": [' % SCHEMA_VERSION)
+                for position, record in enumerate(self.iter_profiles(include_builtins=include_builtins)):
+                    body = json.dumps(record.to_dict(), indent=2, ensure_ascii=False)
+                    fh.write(("," if position else "") + "\n    " + body.replace("\n", "\n    "))
+                fh.write("\n  ]\n}\n")
+            os.replace(tmp, target)
         except OSError as exc:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
             return False, f"Failed to export bundle: {exc}"
 
         return True, f"Bundle exported to {path}."
 
     def import_bundle(self, path: str, overwrite: bool = False) -> Tuple[bool, str, dict]:
-        """Read bundle payload from file and import."""
+        """Import a bundle file without holding the whole bundle in memory.
+
+        A first pass decodes the file one entry at a time and checks it as
+        import_bundle_data() would, keeping nothing, so no profile is saved
+        unless the whole file reads and the bundle is valid.  A second pass
+        re-reads the file and saves each entry as it is decoded.
+        """
         try:
-            payload = self._read_json(path)
+            with Path(path).open("r", encoding="utf-8") as fh:
+                target = self._check_bundle(_JsonStream(fh))
+        except _InvalidBundle as exc:
+            return False, f"Invalid bundle payload: {exc}", {}
+        except (OSError, ValueError) as exc:
+            return False, f"Failed to read bundle file: {exc}", {}
+
+        result: List[Tuple[bool, str, dict]] = []
+
+        def save(key: str, occurrence: int, entries: Iterator[Any]) -> None:
+            if (key, occurrence) != target:
+                for _item in entries:
+                    pass
+                return
+            records = (self._bundle_record(item) for item in entries)
+            result.append(self._import_records(records, overwrite=overwrite))
+
+        try:
+            with Path(path).open("r", encoding="utf-8") as fh:
+                self._walk_bundle(_JsonStream(fh), save)
         except (OSError, ValueError) as exc:
+            # The file changed between the two passes.
             return False, f"Failed to read bundle file: {exc}", {}
+        if not result:
+            return False, "Failed to read bundle file: bundle changed while importing", {}
+        return result[0]
 
-        return self.import_bundle_data(payload, overwrite=overwrite)
+    @staticmethod
+    def _bundle_record(item: Any) -> ProfileRecord:
+        if not isinstance(item, dict):
+            raise ValueError("Each profile entry in bundle must be a dictionary")
+        return ProfileRecord.from_dict(item)
+
+    @classmethod
+    def _check_bundle(cls, reader: "_JsonStream") -> Tuple[str, int]:
+        """Validate a bundle like ProfileBundle.from_dict, one entry at a time.
+
+        Returns the (key, occurrence) of the profile list to import.  Raises
+        _InvalidBundle for a well-formed file that is not a valid bundle and
+        ValueError for one that is not JSON.
+        """
+        errors: Dict[Tuple[str, int], Optional[str]] = {}
+        last: Dict[str, int] = {}
+
+        def check(key: str, occurrence: int, entries: Iterator[Any]) -> None:
+            error = None
+            for item in entries:
+                if error is None:
+                    try:
+                        cls._bundle_record(item)
+                    except ValueError as exc:
+                        error = str(exc)
+            errors[(key, occurrence)] = error
+            last[key] = occurrence
+
+        members = cls._walk_bundle(reader, check)
+        key = "profiles"
+        if members.get(key) is None and "profile_bundle" in members:
+            key = "profile_bundle"
+        if members.get(key) is not _LIST_MEMBER:
+            raise _InvalidBundle("Bundle payload must contain a 'profiles' list")
+        target = (key, last[key])
+        if errors[target] is not None:
+            raise _InvalidBundle(errors[target])
+        try:
+            int(members.get("schema_version", SCHEMA_VERSION))
+        except (TypeError, ValueError) as exc:
+            raise _InvalidBundle(str(exc)) from exc
+        return target
+
+    @staticmethod
+    def _walk_bundle(reader: "_JsonStream", visit_list: Callable[[str, int, Iterator[Any]], None]) -> Dict[str, Any]:
+        """Walk the top-level members of a bundle document.
+
+        An array under ``profiles`` or ``profile_bundle`` is passed to
+        ``visit_list(key, occurrence, entries)``, which must consume it, and
+        is recorded as _LIST_MEMBER; other members are decoded.  As with
+        json.load, a repeated key keeps its last value.
+        """
+        members: Dict[str, Any] = {}
+        counts: Dict[str, int] = {}
+        if not reader.enter("{", "}"):
+            while True:
+                key = reader.value()
+                if not isinstance(key, str):
+                    raise ValueError("Expected an object key in JSON document")
+                reader.expect(":")
+                if key in ("profiles", "profile_bundle") and reader.peek() == "[":
+                    counts[key] = counts.get(key, -1) + 1
+                    visit_list(key, counts[key], reader.array())
+                    members[key] = _LIST_MEMBER
+                else:
+                    members[key] = reader.value()
+                if reader.next_item("}"):
+                    break
+        reader.expect_end()
+        return members
 
     def _read_custom_file(self, path: Path) -> Optional[ProfileRecord]:
         try:
@@ -205,8 +480,113 @@ class ProfileStore:
         return payload
 
     @staticmethod
-    def _write_json(path: str, payload: dict):
+    def _write_json(path: str, payload: dict, indent: int = 2):
         target = Path(path)
         target.parent.mkdir(parents=True, exist_ok=True)
-        with target.open("w", encoding="utf-8") as fh:
-            json.dump(payload, fh, indent=2, ensure_ascii=False)
+        tmp = target.with_name(f"{target.name}.tmp.{os.getpid()}")
+        try:
+            with tmp.open("w", encoding="utf-8") as fh:
+                json.dump(payload, fh, indent=indent, ensure_ascii=False)
+            os.replace(tmp, target)
+        except OSError:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            raise
+
+
+class _InvalidBundle(ValueError):
+    """A readable JSON file that is not a valid profile bundle."""
+
+
+# Stands in for a profile list in the members returned by _walk_bundle.
+_LIST_MEMBER = object()
+
+
+class _JsonStream:
+    """Minimal pull reader for one JSON document, decoding a value at a time."""
+
+    _decoder = json.JSONDecoder()
+
+    def __init__(self, fh):
+        self._fh = fh
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._fh.read(_READ_CHUNK)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON document")
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' in JSON document")
+        self._pos += 1
+
+    def enter(self, opening: str, closing: str) -> bool:
+        """Consume *opening*; return True if the container is empty (and consume *closing*)."""
+        self.expect(opening)
+        if self.peek() == closing:
+            self._pos += 1
+            return True
+        return False
+
+    def next_item(self, closing: str) -> bool:
+        """After a container item, consume ',' or *closing*; True at the end."""
+        if self.peek() == closing:
+            self._pos += 1
+            return True
+        self.expect(",")
+        return False
+
+    def array(self) -> Iterator[Any]:
+        """Decode an array one element at a time."""
+        if self.enter("[", "]"):
+            return
+        while True:
+            yield self.value()
+            if self.next_item("]"):
+                return
+
+    def expect_end(self) -> None:
+        """Raise ValueError unless only whitespace is left."""
+        try:
+            self.peek()
+        except ValueError:
+            return
+        raise ValueError("Extra data after JSON document")
+
+    def value(self) -> Any:
+        """Decode and consume the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            if end == len(self._buf) and not self._eof and self._buf[self._pos] not in "{[\"":
+                # A bare number may continue in the next chunk.
+                if self._fill():
+                    continue
+            self._pos = end
+            return value
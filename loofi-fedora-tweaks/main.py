@@ -89,6 +89,16 @@ def main():
     parser.add_argument(
         "--web", action="store_true", help="Run headless Loofi Web API server"
     )
+    parser.add_argument(
+        "--cli-server",
+        action="store_true",
+        help="Run a resident CLI server for fast repeated --cli-client calls",
+    )
+    parser.add_argument(
+        "--cli-client",
+        action="store_true",
+        help="Forward CLI args to a running --cli-server (falls back to --cli)",
+    )
     parser.add_argument(
         "--version", "-v", action="version", version=f"%(prog)s {__version__}"
     )
@@ -111,6 +121,28 @@ def main():
                 __import__("time").sleep(1)
         except KeyboardInterrupt:
             _log.info("Loofi Web API shutting down")
+    elif args.cli_server:
+        import signal
+
+        from cli.server import CliServer
+
+        server = CliServer()
+        server.warm_up()
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        _log.info("Loofi CLI server starting on %s", server.socket_path)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            _log.info("Loofi CLI server shutting down")
+    elif args.cli_client:
+        from cli.server import run_client
+
+        exit_code = run_client(remaining)
+        if exit_code is None:
+            from cli.main import main as cli_main
+
+            exit_code = cli_main(remaining)
+        sys.exit(exit_code)
     elif args.cli:
         # Run CLI mode
         from cli.main import main as cli_main
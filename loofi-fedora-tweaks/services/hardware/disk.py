@@ -7,7 +7,10 @@ import logging
 import shutil
 import subprocess
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import Callable, List, Optional, Tuple
+
+from utils.dir_sizes import largest_directories
+from utils.storage_inventory import StorageInventory
 
 logger = logging.getLogger(__name__)
 
@@ -76,6 +79,19 @@ class DiskManager:
         Returns:
             DiskUsage object or None on error.
         """
+        inventory = StorageInventory.shared()
+        if inventory is not None:
+            space = inventory.usage_for(path)
+            if space is None:
+                return None
+            return DiskUsage(
+                mount_point=path,
+                total_bytes=space.total,
+                used_bytes=space.used,
+                free_bytes=space.free,
+                percent_used=space.percent_used,
+            )
+
         try:
             usage = shutil.disk_usage(path)
             percent = (usage.used / usage.total * 100) if usage.total > 0 else 0
@@ -98,6 +114,21 @@ class DiskManager:
         Returns:
             List of DiskUsage objects for each mount point.
         """
+        inventory = StorageInventory.shared()
+        if inventory is not None:
+            return [
+                DiskUsage(
+                    mount_point=mount.target,
+                    total_bytes=usage.total,
+                    used_bytes=usage.used,
+                    free_bytes=usage.free,
+                    percent_used=float(usage.df_percent_value),
+                    filesystem=mount.source,
+                )
+                for mount, usage in inventory.filesystems()
+                if DiskManager._is_user_mount(mount.target)
+            ]
+
         results: List[DiskUsage] = []
         try:
             output = subprocess.run(
@@ -115,14 +146,7 @@ class DiskManager:
                 parts = line.split()
                 if len(parts) >= 6:
                     mount = parts[0]
-                    # Skip virtual filesystem mount points (not device sources)
-                    # e.g., /dev (devtmpfs), /sys, /proc
-                    # Keep /run/media (removable device auto-mounts)
-                    if mount.startswith("/run/media"):
-                        pass  # Allow removable media mounts
-                    elif mount.startswith(("/dev", "/run", "/sys", "/proc")):
-                        continue
-                    if mount in ("/boot", "/boot/efi"):
+                    if not DiskManager._is_user_mount(mount):
                         continue
                     try:
                         total = int(parts[1])
@@ -147,6 +171,18 @@ class DiskManager:
 
         return results
 
+    @staticmethod
+    def _is_user_mount(mount: str) -> bool:
+        """Whether *mount* belongs in the all-mounts view."""
+        # Skip virtual filesystem mount points (not device sources)
+        # e.g., /dev (devtmpfs), /sys, /proc
+        # Keep /run/media (removable device auto-mounts)
+        if mount.startswith("/run/media"):
+            return True
+        if mount.startswith(("/dev", "/run", "/sys", "/proc")):
+            return False
+        return mount not in ("/boot", "/boot/efi")
+
     @staticmethod
     def check_disk_health(path: str = "/") -> Tuple[str, str]:
         """
@@ -180,45 +216,33 @@ class DiskManager:
 
     @staticmethod
     def find_large_directories(
-        path: str = "/home", max_depth: int = 2, top_n: int = 5
+        path: str = "/home",
+        max_depth: int = 2,
+        top_n: int = 5,
+        progress: Optional[Callable[[List[LargeDirectory]], None]] = None,
+        refresh: bool = False,
     ) -> List[LargeDirectory]:
         """
         Find the largest directories under the given path.
 
+        Sizes match ``du -B1 --max-depth``; unchanged directories are served
+        from the persisted scan cache (see utils.dir_sizes).
+
         Args:
             path: Root path to search from.
             max_depth: Maximum directory depth to scan.
             top_n: Number of results to return.
+            progress: Optional callback receiving the largest directories
+                found so far while the scan runs.
+            refresh: Re-list every directory instead of trusting the cache.
 
         Returns:
             List of LargeDirectory objects, sorted by size descending.
         """
-        results: List[LargeDirectory] = []
-        try:
-            output = subprocess.run(
-                ["du", "-B1", f"--max-depth={max_depth}", path],
-                capture_output=True,
-                text=True,
-                check=False,
-                timeout=30,
-            )
-            if output.returncode not in (0, 1):  # du returns 1 on permission errors
-                return results
-
-            for line in output.stdout.strip().split("\n"):
-                parts = line.split("\t", 1)
-                if len(parts) == 2:
-                    try:
-                        size = int(parts[0])
-                        dir_path = parts[1]
-                        if dir_path != path:  # Skip the root itself
-                            results.append(
-                                LargeDirectory(path=dir_path, size_bytes=size)
-                            )
-                    except ValueError:
-                        continue
+        def wrap(sizes) -> List[LargeDirectory]:
+            return [LargeDirectory(path=p, size_bytes=size) for p, size in sizes]
 
-            results.sort(key=lambda d: d.size_bytes, reverse=True)
-            return results[:top_n]
-        except (subprocess.SubprocessError, OSError):
-            return results
+        on_sizes = (lambda sizes: progress(wrap(sizes))) if progress else None
+        return wrap(largest_directories(
+            path, max_depth=max_depth, top_n=top_n, progress=on_sizes, refresh=refresh
+        ))
@@ -10,6 +10,9 @@ import logging
 import subprocess
 from dataclasses import dataclass
 from enum import Enum
+from typing import Callable
+
+from utils.systemd_units import SystemdUnitCache
 
 logger = logging.getLogger(__name__)
 
@@ -81,6 +84,9 @@ class ServiceManager:
         """
         List systemd service units.
 
+        Reads the D-Bus-fed SystemdUnitCache when the bus is reachable,
+        otherwise ``systemctl list-units``.
+
         Args:
             scope: System or user services
             filter_type: "all", "gaming", "failed", or "active"
@@ -88,6 +94,14 @@ class ServiceManager:
         Returns:
             List of ServiceUnit objects.
         """
+        cache = SystemdUnitCache.shared(user=scope == UnitScope.USER)
+        if cache is not None:
+            units = (
+                cls._make_unit(record.name, record.active_state, record.description, scope)
+                for record in sorted(cache.services(), key=lambda r: r.name)
+            )
+            return [unit for unit in units if cls._matches(unit, filter_type)]
+
         try:
             cmd = ["systemctl"]
             if scope == UnitScope.USER:
@@ -118,43 +132,12 @@ class ServiceManager:
                     continue
 
                 name = parts[0].replace(".service", "")
-                parts[1]
-                active_state = parts[2].lower()
-                parts[3].lower()
+                active_state = parts[2]
                 description = " ".join(parts[4:]) if len(parts) > 4 else ""
 
-                # Parse state
-                if active_state == "active":
-                    state = UnitState.ACTIVE
-                elif active_state == "failed":
-                    state = UnitState.FAILED
-                elif active_state == "inactive":
-                    state = UnitState.INACTIVE
-                elif active_state == "activating":
-                    state = UnitState.ACTIVATING
-                else:
-                    state = UnitState.UNKNOWN
-
-                # Check if gaming-related
-                is_gaming = any(g in name.lower() for g in cls.GAMING_SERVICES)
-
-                unit = ServiceUnit(
-                    name=name,
-                    state=state,
-                    scope=scope,
-                    description=description,
-                    is_gaming=is_gaming,
-                )
-
-                # Apply filter
-                if filter_type == "gaming" and not is_gaming:
-                    continue
-                elif filter_type == "failed" and state != UnitState.FAILED:
-                    continue
-                elif filter_type == "active" and state != UnitState.ACTIVE:
-                    continue
-
-                units.append(unit)
+                unit = cls._make_unit(name, active_state, description, scope)
+                if cls._matches(unit, filter_type):
+                    units.append(unit)
 
             return units
 
@@ -162,6 +145,71 @@ class ServiceManager:
             logger.debug("Failed to list systemd units: %s", e)
             return []
 
+    @classmethod
+    def _make_unit(
+        cls, name: str, active_state: str, description: str, scope: UnitScope
+    ) -> ServiceUnit:
+        active_state = active_state.lower()
+
+        # Parse state
+        if active_state == "active":
+            state = UnitState.ACTIVE
+        elif active_state == "failed":
+            state = UnitState.FAILED
+        elif active_state == "inactive":
+            state = UnitState.INACTIVE
+        elif active_state == "activating":
+            state = UnitState.ACTIVATING
+        else:
+            state = UnitState.UNKNOWN
+
+        # Check if gaming-related
+        is_gaming = any(g in name.lower() for g in cls.GAMING_SERVICES)
+
+        return ServiceUnit(
+            name=name,
+            state=state,
+            scope=scope,
+            description=description,
+            is_gaming=is_gaming,
+        )
+
+    @staticmethod
+    def _matches(unit: ServiceUnit, filter_type: str) -> bool:
+        if filter_type == "gaming":
+            return unit.is_gaming
+        if filter_type == "failed":
+            return unit.state == UnitState.FAILED
+        if filter_type == "active":
+            return unit.state == UnitState.ACTIVE
+        return True
+
+    @classmethod
+    def add_change_listener(cls, callback: Callable[[], None]) -> bool:
+        """
+        Call *callback* whenever a system or user service changes state.
+
+        The callback runs on the D-Bus dispatch thread.
+
+        Returns:
+            False when neither unit cache is available (no live updates).
+        """
+        live = False
+        for user in (True, False):
+            cache = SystemdUnitCache.shared(user=user)
+            if cache is not None:
+                cache.add_listener(callback)
+                live = True
+        return live
+
+    @classmethod
+    def remove_change_listener(cls, callback: Callable[[], None]) -> None:
+        """Undo :meth:`add_change_listener`."""
+        for user in (True, False):
+            cache = SystemdUnitCache.shared(user=user)
+            if cache is not None:
+                cache.remove_listener(callback)
+
     @classmethod
     def get_failed_units(cls) -> list[ServiceUnit]:
         """Get all failed units across both user and system scopes."""
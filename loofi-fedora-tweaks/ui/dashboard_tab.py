@@ -41,6 +41,7 @@ from utils.history import HistoryManager
 from utils.log import get_logger
 from utils.monitor import SystemMonitor
 from utils.quick_actions_config import QuickActionsConfig
+from utils.storage_inventory import StorageInventory
 
 from ui.icon_pack import get_qicon
 from ui.tooltips import DASH_FOCUS_MODE, DASH_HEALTH_SCORE, DASH_QUICK_ACTIONS, DASH_SYSTEM_OVERVIEW
@@ -896,16 +897,21 @@ class DashboardTab(QWidget, PluginInterface):
     @staticmethod
     def _get_mount_points() -> list:
         mounts = ["/"]
-        try:
-            with open("/proc/mounts", "r") as f:
-                for line in f:
-                    parts = line.split()
-                    if len(parts) < 3:
-                        continue
-                    mp, fstype = parts[1], parts[2]
-                    if fstype in ("ext4", "btrfs", "xfs", "f2fs", "vfat", "ntfs"):
-                        if mp not in mounts and not mp.startswith("/snap"):
-                            mounts.append(mp)
-        except OSError:
-            logger.debug("Failed to read mount points", exc_info=True)
+        inventory = StorageInventory.shared()
+        if inventory is not None:
+            entries = [(m.target, m.fstype) for m in inventory.mounts()]
+        else:
+            entries = []
+            try:
+                with open("/proc/mounts", "r") as f:
+                    for line in f:
+                        parts = line.split()
+                        if len(parts) >= 3:
+                            entries.append((parts[1], parts[2]))
+            except OSError:
+                logger.debug("Failed to read mount points", exc_info=True)
+        for mp, fstype in entries:
+            if fstype in ("ext4", "btrfs", "xfs", "f2fs", "vfat", "ntfs"):
+                if mp not in mounts and not mp.startswith("/snap"):
+                    mounts.append(mp)
         return mounts[:6]
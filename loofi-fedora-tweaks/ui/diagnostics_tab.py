@@ -7,8 +7,12 @@ original WatchtowerTab (services, boot analysis, journal) and
 BootTab (kernel parameters, ZRAM, Secure Boot).
 """
 
+import threading
+import time
+from functools import partial
+
 from core.plugins.metadata import PluginMetadata
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from PyQt6.QtWidgets import (
     QCheckBox,
     QComboBox,
@@ -40,6 +44,24 @@ from utils.zram import ZramManager
 from ui.base_tab import BaseTab
 from ui.tab_utils import CONTENT_MARGINS, configure_top_tabs
 
+
+def _watch_services(closed: threading.Event, listener) -> None:
+    """Subscribe *listener* to service changes, then fire it once."""
+    ServiceManager.add_change_listener(listener)
+    if closed.is_set():
+        # The tab went away while we were connecting.
+        ServiceManager.remove_change_listener(listener)
+        return
+    listener()
+
+
+def _stop_watching_services(closed: threading.Event, listener) -> None:
+    """Undo :func:`_watch_services` (safe to call more than once)."""
+    if not closed.is_set():
+        closed.set()
+        ServiceManager.remove_change_listener(listener)
+
+
 # ---------------------------------------------------------------------------
 # Sub-tab: Watchtower
 # ---------------------------------------------------------------------------
@@ -56,6 +78,9 @@ class _WatchtowerSubTab(QWidget):
     - Internal QTabWidget for its own three sub-sections
     """
 
+    # Emitted (from the D-Bus thread) when any service unit changes.
+    services_changed = pyqtSignal()
+
     def __init__(self):
         super().__init__()
         self.init_ui()
@@ -152,9 +177,34 @@ class _WatchtowerSubTab(QWidget):
         self.service_log.setMaximumHeight(100)
         layout.addWidget(self.service_log)
 
-        self._refresh_services()
+        # Live updates: unit changes arrive on the D-Bus thread; the signal
+        # hops to the GUI thread and bursts collapse into one refresh.
+        self._service_refresh_timer = QTimer(self)
+        self._service_refresh_timer.setSingleShot(True)
+        self._service_refresh_timer.setInterval(300)
+        self._service_refresh_timer.timeout.connect(self._refresh_services)
+        self.services_changed.connect(self._service_refresh_timer.start)
+
+        # Connecting the unit caches lists every unit on both buses, so it
+        # runs on a worker; the first refresh follows once it is done.
+        self._services_listener = self.services_changed.emit
+        self._services_closed = threading.Event()
+        self.destroyed.connect(partial(
+            _stop_watching_services, self._services_closed, self._services_listener,
+        ))
+        self._services_thread = threading.Thread(
+            target=_watch_services,
+            args=(self._services_closed, self._services_listener),
+            name="diagnostics-services",
+            daemon=True,
+        )
+        self._services_thread.start()
         return widget
 
+    def cleanup(self):
+        """Stop following service changes — called on application exit."""
+        _stop_watching_services(self._services_closed, self._services_listener)
+
     # ==================== Boot Analysis ===================================
 
     def _create_boot_tab(self) -> QWidget:
@@ -186,6 +236,16 @@ class _WatchtowerSubTab(QWidget):
 
         layout.addWidget(slow_group)
 
+        # Recorded boots, from the persisted history (no systemd query)
+        history_group = QGroupBox(self.tr("Recent Boots"))
+        history_layout = QVBoxLayout(history_group)
+
+        self.boot_history_label = QLabel()
+        self.boot_history_label.setWordWrap(True)
+        history_layout.addWidget(self.boot_history_label)
+
+        layout.addWidget(history_group)
+
         # Optimisation suggestions
         opt_group = QGroupBox(
             self.tr("\U0001f4a1 Optimization Suggestions")
@@ -389,6 +449,8 @@ class _WatchtowerSubTab(QWidget):
                 summary += f"  \u2022 Bootloader: {stats.loader_time:.1f}s\n"
             if stats.kernel_time:
                 summary += f"  \u2022 Kernel: {stats.kernel_time:.1f}s\n"
+            if stats.initrd_time:
+                summary += f"  \u2022 Initrd: {stats.initrd_time:.1f}s\n"
             if stats.userspace_time:
                 summary += f"  \u2022 Userspace: {stats.userspace_time:.1f}s"
             self.boot_stats_label.setText(summary)
@@ -413,10 +475,36 @@ class _WatchtowerSubTab(QWidget):
                 self.tr("No services taking >5s to start")
             )
 
+        self._refresh_boot_history()
+
         # Suggestions
         suggestions = BootAnalyzer.get_optimization_suggestions()
         self.suggestions_label.setText("\n".join(suggestions))
 
+    def _refresh_boot_history(self):
+        """Chart total boot time of the recorded boots and list regressions."""
+        boots = [b for b in BootAnalyzer.get_history(limit=10) if b.stats.total_time]
+        if not boots:
+            self.boot_history_label.setText(self.tr("No boots recorded yet"))
+            return
+
+        longest = max(b.stats.total_time for b in boots)
+        current_id = BootAnalyzer.current_boot_id()
+        lines = []
+        for boot in boots:
+            bar = "\u2588" * max(1, round(20 * boot.stats.total_time / longest))
+            when = time.strftime("%Y-%m-%d %H:%M", time.localtime(boot.recorded_at))
+            marker = self.tr(" (this boot)") if boot.boot_id == current_id else ""
+            lines.append(f"{when}  {bar} {boot.stats.total_time:.1f}s{marker}")
+
+        for regression in BootAnalyzer.get_regressions()[:5]:
+            name = regression.name.removesuffix("_time") if regression.kind == "phase" else regression.name
+            lines.append(
+                f"\U0001f4c8 {name}: {regression.baseline_seconds:.1f}s "
+                f"\u2192 {regression.current_seconds:.1f}s"
+            )
+        self.boot_history_label.setText("\n".join(lines))
+
     # ==================== Journal logic ====================================
 
     def _refresh_journal(self):
@@ -967,7 +1055,12 @@ class DiagnosticsTab(BaseTab):
 
         self.tabs = QTabWidget()
         configure_top_tabs(self.tabs)
-        self.tabs.addTab(_WatchtowerSubTab(), self.tr("Watchtower"))
+        self._watchtower = _WatchtowerSubTab()
+        self.tabs.addTab(self._watchtower, self.tr("Watchtower"))
         self.tabs.addTab(_BootSubTab(), self.tr("Boot"))
 
         layout.addWidget(self.tabs)
+
+    def cleanup(self):
+        """Release live service updates — called on application exit."""
+        self._watchtower.cleanup()
@@ -49,8 +49,12 @@ class SnapshotTab(BaseTab):
 
     def __init__(self) -> None:
         super().__init__()
+        # Backend of the create/delete in flight; refreshed when it finishes
+        self._snapshot_op_pending = False
+        self._snapshot_op_backend = None
         self.init_ui()
         QTimer.singleShot(200, self._refresh_backends)
+        QTimer.singleShot(0, self._show_cached_snapshots)
 
     def init_ui(self) -> None:
         layout = QVBoxLayout()
@@ -138,7 +142,17 @@ class SnapshotTab(BaseTab):
     def _refresh_all(self):
         """Refresh backends and snapshot list (explicit user action)."""
         self._refresh_backends()
-        self._refresh_snapshots()
+        self._refresh_snapshots(refresh=True)
+
+    def _show_cached_snapshots(self):
+        """Fill the table from the snapshot catalogue without running any command."""
+        try:
+            snapshots = SnapshotManager.cached_snapshots()
+        except (RuntimeError, OSError, ValueError) as exc:
+            self.append_output(f"Error reading snapshot catalogue: {exc}\n")
+            return
+        if snapshots is not None:
+            self._populate_snapshots(snapshots)
 
     def _refresh_backends(self):
         """Update backend status labels."""
@@ -159,23 +173,32 @@ class SnapshotTab(BaseTab):
         except (RuntimeError, OSError, ValueError) as exc:
             self.append_output(f"Backend check failed: {exc}\n")
 
-    def _refresh_snapshots(self):
+    def _refresh_snapshots(self, refresh: bool = False):
         """Reload the snapshot table."""
         try:
-            snapshots = SnapshotManager.list_snapshots()
-            self.snap_table.clearSpans()
-            self.snap_table.setRowCount(0)
+            self._populate_snapshots(SnapshotManager.list_snapshots(refresh=refresh))
+        except (RuntimeError, OSError, ValueError) as exc:
+            self.set_table_empty_state(
+                self.snap_table, self.tr("Failed to load snapshots"), color="#e8556d"
+            )
+            self.append_output(f"Error listing snapshots: {exc}\n")
 
-            if not snapshots:
-                self.set_table_empty_state(
-                    self.snap_table, self.tr("No snapshots found")
-                )
-                self.append_output("Found 0 snapshot(s)\n")
-                return
+    def _populate_snapshots(self, snapshots):
+        """Replace the table contents with *snapshots*."""
+        self.snap_table.clearSpans()
+        self.snap_table.setRowCount(0)
+
+        if not snapshots:
+            self.set_table_empty_state(
+                self.snap_table, self.tr("No snapshots found")
+            )
+            self.append_output("Found 0 snapshot(s)\n")
+            return
 
-            for snap in snapshots:
-                row = self.snap_table.rowCount()
-                self.snap_table.insertRow(row)
+        self.snap_table.setUpdatesEnabled(False)
+        try:
+            self.snap_table.setRowCount(len(snapshots))
+            for row, snap in enumerate(snapshots):
                 self.snap_table.setItem(row, 0, self.make_table_item(snap.id))
                 self.snap_table.setItem(row, 1, self.make_table_item(snap.label))
                 self.snap_table.setItem(row, 2, self.make_table_item(snap.backend))
@@ -187,17 +210,14 @@ class SnapshotTab(BaseTab):
                 )
                 self.snap_table.setItem(row, 3, self.make_table_item(ts_str))
                 self.snap_table.setItem(row, 4, self.make_table_item(snap.size_str))
-            normalize = getattr(BaseTab, "ensure_table_row_heights", None)
-            if callable(normalize):
-                normalize(self.snap_table)
+        finally:
+            self.snap_table.setUpdatesEnabled(True)
+        normalize = getattr(BaseTab, "ensure_table_row_heights", None)
+        if callable(normalize):
+            normalize(self.snap_table)
 
-            count = self.snap_table.rowCount()
-            self.append_output(f"Found {count} snapshot(s)\n")
-        except (RuntimeError, OSError, ValueError) as exc:
-            self.set_table_empty_state(
-                self.snap_table, self.tr("Failed to load snapshots"), color="#e8556d"
-            )
-            self.append_output(f"Error listing snapshots: {exc}\n")
+        count = self.snap_table.rowCount()
+        self.append_output(f"Found {count} snapshot(s)\n")
 
     def _create_snapshot(self):
         """Create a new snapshot."""
@@ -209,8 +229,7 @@ class SnapshotTab(BaseTab):
 
         try:
             binary, args, desc = SnapshotManager.create_snapshot(label.strip())
-            self.run_command(binary, args, desc)
-            QTimer.singleShot(3000, self._refresh_snapshots)
+            self._start_snapshot_op(binary, args, desc, None)
         except (RuntimeError, OSError, ValueError) as exc:
             self.append_output(f"Error creating snapshot: {exc}\n")
 
@@ -237,7 +256,25 @@ class SnapshotTab(BaseTab):
 
         try:
             binary, args, desc = SnapshotManager.delete_snapshot(snap_id, backend)
-            self.run_command(binary, args, desc)
-            QTimer.singleShot(3000, self._refresh_snapshots)
+            self._start_snapshot_op(binary, args, desc, backend)
         except (RuntimeError, OSError, ValueError) as exc:
             self.append_output(f"Error deleting snapshot: {exc}\n")
+
+    def _start_snapshot_op(self, binary, args, desc, backend):
+        """Run a create/delete and remember to re-list when it finishes."""
+        self._snapshot_op_pending = True
+        self._snapshot_op_backend = backend
+        self.run_command(binary, args, desc)
+
+    def on_command_finished(self, exit_code):
+        """Re-list once a create/delete has completed (or failed)."""
+        super().on_command_finished(exit_code)
+        if not self._snapshot_op_pending:
+            return
+        self._snapshot_op_pending = False
+        try:
+            SnapshotManager.invalidate_catalogue(self._snapshot_op_backend)
+        except (RuntimeError, OSError, ValueError) as exc:
+            self.append_output(f"Error refreshing snapshots: {exc}\n")
+            return
+        self._refresh_snapshots()
@@ -2,7 +2,8 @@
 Storage Tab — disk information, SMART health, and filesystem management.
 Part of v17.0 "Atlas".
 
-Uses StorageManager from utils/storage.py for lsblk, smartctl, df, and fsck.
+Uses StorageManager from utils/storage.py (backed by the shared storage
+inventory) for disks, mounts, smartctl, and fsck.
 """
 
 from core.plugins.metadata import PluginMetadata
@@ -78,6 +79,7 @@ class StorageTab(BaseTab):
         self.disk_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
         self.disk_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
         self.disk_table.setProperty("maxVisibleRows", 3)
+        self.disk_table.itemSelectionChanged.connect(self._show_cached_smart)
         BaseTab.configure_table(self.disk_table)
         self.set_table_empty_state(self.disk_table, self.tr("Loading disks..."))
         self._fit_table_height(self.disk_table, max_visible_rows=3)
@@ -308,41 +310,53 @@ class StorageTab(BaseTab):
         self.append_output(f"Checking SMART for {device}...\n")
 
         try:
-            health = StorageManager.get_smart_health(device)
-            self.lbl_smart_model.setText(health.model or "—")
-            self.lbl_smart_serial.setText(health.serial or "—")
-
-            if health.health_passed:
-                self.lbl_smart_health.setText("✅ PASSED")
-                self.lbl_smart_health.setProperty("smartState", "passed")
-            else:
-                self.lbl_smart_health.setText("❌ FAILED")
-                self.lbl_smart_health.setProperty("smartState", "failed")
-            if self.lbl_smart_health.style() is not None:
-                self.lbl_smart_health.style().unpolish(self.lbl_smart_health)
-                self.lbl_smart_health.style().polish(self.lbl_smart_health)
-
-            self.lbl_smart_temp.setText(
-                f"{health.temperature_c}°C" if health.temperature_c else "—"
-            )
-            self.lbl_smart_hours.setText(
-                f"{health.power_on_hours:,}" if health.power_on_hours else "—"
-            )
-
-            realloc = health.reallocated_sectors
-            self.lbl_smart_realloc.setText(str(realloc))
-            if realloc > 0:
-                self.lbl_smart_realloc.setProperty("reallocState", "warning")
-            else:
-                self.lbl_smart_realloc.setProperty("reallocState", "ok")
-            if self.lbl_smart_realloc.style() is not None:
-                self.lbl_smart_realloc.style().unpolish(self.lbl_smart_realloc)
-                self.lbl_smart_realloc.style().polish(self.lbl_smart_realloc)
-
+            self._show_smart(StorageManager.get_smart_health(device))
             self.append_output(f"SMART check complete for {device}\n")
         except (RuntimeError, OSError, ValueError) as exc:
             self.append_output(f"SMART error: {exc}\n")
 
+    def _show_cached_smart(self):
+        """Show the cached SMART reading of the selected disk, if any, without prompting."""
+        row = self.disk_table.currentRow()
+        item = self.disk_table.item(row, 0) if row >= 0 else None
+        if item is None:
+            return
+        health = StorageManager.cached_smart_health(item.text())
+        if health is not None:
+            self._show_smart(health)
+
+    def _show_smart(self, health):
+        """Fill the SMART details group from a SmartHealth."""
+        self.lbl_smart_model.setText(health.model or "—")
+        self.lbl_smart_serial.setText(health.serial or "—")
+
+        if health.health_passed:
+            self.lbl_smart_health.setText("✅ PASSED")
+            self.lbl_smart_health.setProperty("smartState", "passed")
+        else:
+            self.lbl_smart_health.setText("❌ FAILED")
+            self.lbl_smart_health.setProperty("smartState", "failed")
+        if self.lbl_smart_health.style() is not None:
+            self.lbl_smart_health.style().unpolish(self.lbl_smart_health)
+            self.lbl_smart_health.style().polish(self.lbl_smart_health)
+
+        self.lbl_smart_temp.setText(
+            f"{health.temperature_c}°C" if health.temperature_c else "—"
+        )
+        self.lbl_smart_hours.setText(
+            f"{health.power_on_hours:,}" if health.power_on_hours else "—"
+        )
+
+        realloc = health.reallocated_sectors
+        self.lbl_smart_realloc.setText(str(realloc))
+        if realloc > 0:
+            self.lbl_smart_realloc.setProperty("reallocState", "warning")
+        else:
+            self.lbl_smart_realloc.setProperty("reallocState", "ok")
+        if self.lbl_smart_realloc.style() is not None:
+            self.lbl_smart_realloc.style().unpolish(self.lbl_smart_realloc)
+            self.lbl_smart_realloc.style().polish(self.lbl_smart_realloc)
+
     def _trim_ssd(self):
         """Run fstrim on all SSDs."""
         confirm = QMessageBox.question(
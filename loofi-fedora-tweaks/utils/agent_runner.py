@@ -9,13 +9,16 @@ Provides:
 - Safety: rate limiting, dry-run mode, severity gating
 """
 
+import heapq
 import logging
 import os
 import shutil
 import subprocess
 import threading
 import time
-from typing import Any, Callable, Dict, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from services.system import SystemManager
 
@@ -30,13 +33,26 @@ from utils.agents import (
     AgentStatus,
     TriggerType,
 )
-from utils.arbitrator import AgentRequest, Arbitrator, Priority
+from utils.arbitrator import AgentRequest, Arbitrator, Priority, ResourceSlots
+from utils.storage_inventory import StorageInventory
 
 logger = logging.getLogger(__name__)
 
 # Module constants
 COMMAND_TIMEOUT_SECONDS = 60
-SCHEDULER_POLL_SECONDS = 10
+# Upper bound on one scheduler sleep; agents are normally woken exactly on time
+SCHEDULER_MAX_SLEEP_SECONDS = 3600
+# Agents that may run at the same time (each also needs resource slots)
+AGENT_WORKERS = 4
+# Default wall-clock budget for one agent run; override with settings["timeout_seconds"]
+AGENT_RUN_TIMEOUT_SECONDS = 600
+# How long stop() lets in-flight agents finish their current action
+AGENT_STOP_GRACE_SECONDS = 2.0
+# How long a manual "run now" waits for a resource slot before reporting it busy
+RUN_NOW_SLOT_WAIT_SECONDS = 5.0
+# Operations and commands that take the package manager's exclusive slot
+PACKAGE_MANAGER_OPERATIONS = {"updates.check_dnf", "updates.check_flatpak", "cleanup.dnf_cache"}
+PACKAGE_MANAGER_COMMANDS = {"dnf", "rpm", "flatpak", "rpm-ostree", "pkcon"}
 PROTECTED_GIT_BRANCHES = {"master", "refs/heads/master"}
 GIT_BRANCH_TIMEOUT_SECONDS = 5
 
@@ -48,6 +64,7 @@ class AgentExecutor:
     """
 
     _arbitrator = Arbitrator()
+    _slots = ResourceSlots()
 
     @staticmethod
     def execute_action(
@@ -284,6 +301,40 @@ class AgentExecutor:
                 return "disk"
         return "background_process"
 
+    @staticmethod
+    def _infer_slots(action: AgentAction) -> Tuple[str, ...]:
+        """Resources whose concurrency slots an action occupies."""
+        resource = AgentExecutor._infer_resource(action)
+        if (
+            action.operation in PACKAGE_MANAGER_OPERATIONS
+            or os.path.basename(action.command or "") in PACKAGE_MANAGER_COMMANDS
+        ):
+            return (resource, "package_manager")
+        return (resource,)
+
+    @staticmethod
+    def execute_with_slots(
+        agent: AgentConfig,
+        action: AgentAction,
+        state: AgentState,
+        timeout: Optional[float] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> Optional[AgentResult]:
+        """
+        Execute an action once its resource slots are free.
+
+        Returns:
+            The action result, or None if *timeout* expired or *cancel* was
+            set before the slots became available.
+        """
+        slots = AgentExecutor._infer_slots(action)
+        if not AgentExecutor._slots.acquire(slots, timeout=timeout, cancel=cancel):
+            return None
+        try:
+            return AgentExecutor.execute_action(agent, action, state)
+        finally:
+            AgentExecutor._slots.release(slots)
+
     @staticmethod
     def _get_operation_handlers() -> Dict[str, Callable]:
         """Return mapping of operation names to handler functions."""
@@ -374,9 +425,14 @@ class AgentExecutor:
         """Check root disk usage against threshold."""
         threshold = settings.get("disk_threshold", 90)
         try:
-            st = os.statvfs("/")
-            total = st.f_blocks * st.f_frsize
-            free = st.f_bavail * st.f_frsize
+            inventory = StorageInventory.shared()
+            usage = inventory.usage("/") if inventory is not None else None
+            if usage is not None:
+                total, free = usage.total, usage.free
+            else:
+                st = os.statvfs("/")
+                total = st.f_blocks * st.f_frsize
+                free = st.f_bavail * st.f_frsize
             used_pct = ((total - free) / total) * 100 if total > 0 else 0
 
             if used_pct > threshold:
@@ -760,12 +816,26 @@ class AgentScheduler:
     """
     Manages background scheduling and execution of enabled agents.
     Runs agents on their configured interval triggers in a background thread.
+
+    Agents wait in a heap ordered by next fire time, so the thread sleeps
+    until the next agent is due (or the registry changes) instead of
+    polling, and only agent states that changed are persisted.  Due agents
+    run on a small worker pool; each action also takes per-resource slots
+    (see ``ResourceSlots``), so a long package-manager check never delays
+    quick /proc monitors.
     """
 
     def __init__(self) -> None:
         self._thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._rebuild = False
         self._on_result: Optional[Callable[[str, AgentResult], None]] = None
+        self._queue: List[Tuple[float, int, str]] = []  # (fire time, seq, agent_id)
+        self._seq = 0
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._inflight: Dict[str, Future] = {}
+        self.wakeups = 0
 
     def set_result_callback(self, callback: Callable[[str, AgentResult], None]):
         """Set a callback for when an agent produces a result."""
@@ -783,12 +853,19 @@ class AgentScheduler:
         logger.info("Agent scheduler started")
 
     def stop(self):
-        """Stop the agent scheduler."""
+        """Stop the agent scheduler and cancel agent runs in progress."""
         self._stop_event.set()
+        self._wake_event.set()
+        AgentExecutor._slots.interrupt()
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=5)
         logger.info("Agent scheduler stopped")
 
+    def reschedule(self):
+        """Rebuild the schedule, e.g. after agents were edited outside the registry."""
+        self._rebuild = True
+        self._wake_event.set()
+
     @property
     def is_running(self) -> bool:
         return (
@@ -797,50 +874,158 @@ class AgentScheduler:
             and self._thread.is_alive()
         )
 
+    @staticmethod
+    def _interval_for(agent: Optional[AgentConfig]) -> Optional[float]:
+        """Return the shortest interval trigger of an enabled agent, or None."""
+        if agent is None or not agent.enabled:
+            return None
+        intervals = [
+            trigger.config.get("seconds", 300)
+            for trigger in agent.triggers
+            if trigger.trigger_type == TriggerType.INTERVAL
+        ]
+        return min(intervals) if intervals else None
+
+    def _push(self, fire_time: float, agent_id: str) -> None:
+        self._seq += 1
+        heapq.heappush(self._queue, (fire_time, self._seq, agent_id))
+
+    def _rebuild_queue(self, registry: AgentRegistry) -> None:
+        """Queue every enabled interval agent at its next fire time."""
+        self._queue = []
+        for agent in registry.get_enabled_agents():
+            interval = self._interval_for(agent)
+            if interval is None:
+                continue
+            state = registry.get_state(agent.agent_id)
+            self._push(state.last_run + interval, agent.agent_id)
+
+    def _next_timeout(self, now: float) -> float:
+        if not self._queue:
+            return SCHEDULER_MAX_SLEEP_SECONDS
+        return min(max(self._queue[0][0] - now, 0.0), SCHEDULER_MAX_SLEEP_SECONDS)
+
+    def _dispatch(self, agent: AgentConfig, state: AgentState, registry: AgentRegistry) -> None:
+        """Start an agent run on the worker pool (inline if there is none)."""
+        timeout = agent.settings.get("timeout_seconds", AGENT_RUN_TIMEOUT_SECONDS)
+        deadline = time.monotonic() + timeout
+        if self._pool is None:
+            self._execute_agent(agent, state, registry, deadline)
+            return
+        future = self._pool.submit(self._execute_agent, agent, state, registry, deadline)
+        self._inflight[agent.agent_id] = future
+        future.add_done_callback(lambda _f: self._wake_event.set())
+
+    def _reap(self) -> int:
+        """Forget finished agent runs; returns how many finished."""
+        finished = [aid for aid, future in self._inflight.items() if future.done()]
+        for agent_id in finished:
+            future = self._inflight.pop(agent_id)
+            if not future.cancelled() and future.exception() is not None:
+                logger.error("Agent %s run failed: %s", agent_id, future.exception())
+        return len(finished)
+
+    def _run_due(self, registry: AgentRegistry, now: float) -> int:
+        """Start every agent whose fire time has passed; returns how many started."""
+        started = 0
+        while self._queue and self._queue[0][0] <= now and not self._stop_event.is_set():
+            _fire_time, _seq, agent_id = heapq.heappop(self._queue)
+            agent = registry.get_agent(agent_id)
+            interval = self._interval_for(agent)
+            if agent is None or interval is None:
+                continue  # Removed or disabled since it was queued
+
+            state = registry.get_state(agent_id)
+            if agent_id in self._inflight:
+                logger.debug("Agent %s still running; skipping this interval", agent_id)
+            elif state.status in (AgentStatus.IDLE, AgentStatus.RUNNING):
+                self._dispatch(agent, state, registry)
+                started += 1
+            # Agents that are paused or in error are checked again next interval
+            self._push(max(state.last_run, now) + interval, agent_id)
+        return started
+
     def _run_loop(self):
         """Main scheduler loop."""
         registry = AgentRegistry.instance()
+        registry.add_change_listener(self.reschedule)
+        self._pool = ThreadPoolExecutor(max_workers=AGENT_WORKERS, thread_name_prefix="AgentWorker")
+        self._rebuild_queue(registry)
 
-        while not self._stop_event.is_set():
-            now = time.time()
-            enabled_agents = registry.get_enabled_agents()
-
-            for agent in enabled_agents:
-                state = registry.get_state(agent.agent_id)
-
-                # Skip agents that aren't idle
-                if state.status not in (AgentStatus.IDLE, AgentStatus.RUNNING):
-                    continue
-
-                # Check interval triggers
-                for trigger in agent.triggers:
-                    if trigger.trigger_type == TriggerType.INTERVAL:
-                        interval = trigger.config.get("seconds", 300)
-                        if now - state.last_run >= interval:
-                            self._execute_agent(agent, state, registry)
-                            break
-
-            # Save state periodically
-            registry.save()
-
-            # Sleep between checks
-            self._stop_event.wait(timeout=SCHEDULER_POLL_SECONDS)
-
-    def _execute_agent(
+        try:
+            while not self._stop_event.is_set():
+                self.wakeups += 1
+                if self._reap():
+                    registry.save_dirty()
+                self._run_due(registry, time.time())
+
+                self._wake_event.wait(timeout=self._next_timeout(time.time()))
+                self._wake_event.clear()
+                if self._rebuild and not self._stop_event.is_set():
+                    self._rebuild = False
+                    self._rebuild_queue(registry)
+        finally:
+            registry.remove_change_listener(self.reschedule)
+            pool, self._pool = self._pool, None
+            if self._inflight:
+                wait_futures(list(self._inflight.values()), timeout=AGENT_STOP_GRACE_SECONDS)
+            pool.shutdown(wait=False, cancel_futures=True)
+            self._reap()
+            registry.save_dirty()
+
+    def _run_actions(
         self,
         agent: AgentConfig,
         state: AgentState,
         registry: AgentRegistry,
-    ):
-        """Execute all actions for an agent."""
-        state.status = AgentStatus.RUNNING
+        deadline: Optional[float],
+        cancel: Optional[threading.Event],
+        slot_wait: Optional[float] = None,
+    ) -> List[AgentResult]:
+        """Run an agent's actions in order until done, cancelled or out of time.
+
+        *slot_wait* caps how long each action waits for its resource slots;
+        an action that cannot get them in time ends the run as "resource busy".
+        """
+        results: List[AgentResult] = []
+        with registry.state_lock:
+            state.status = AgentStatus.RUNNING
 
         for action in agent.actions:
-            if self._stop_event.is_set():
+            if cancel is not None and cancel.is_set():
                 break
 
-            result = AgentExecutor.execute_action(agent, action, state)
-            state.record_action(result)
+            remaining = None if deadline is None else deadline - time.monotonic()
+            wait = remaining
+            if slot_wait is not None:
+                wait = slot_wait if remaining is None else min(remaining, slot_wait)
+            result = None
+            if remaining is None or remaining > 0:
+                result = AgentExecutor.execute_with_slots(
+                    agent, action, state, timeout=wait, cancel=cancel
+                )
+            if result is None:
+                if cancel is not None and cancel.is_set():
+                    break
+                if deadline is not None and time.monotonic() >= deadline:
+                    result = AgentResult(
+                        success=False,
+                        message=f"Agent '{agent.name}' timed out before '{action.name}'",
+                        action_id=action.action_id,
+                        data={"timeout": True},
+                    )
+                    logger.warning("Agent %s run timed out", agent.name)
+                else:
+                    result = AgentResult(
+                        success=False,
+                        message=f"Agent '{agent.name}' skipped '{action.name}': resource busy",
+                        action_id=action.action_id,
+                        data={"resource_busy": True},
+                    )
+                    logger.info("Agent %s: resources for %s busy", agent.name, action.name)
+            with registry.state_lock:
+                state.record_action(result)
+            results.append(result)
 
             if self._on_result:
                 try:
@@ -855,7 +1040,22 @@ class AgentScheduler:
             if result.data and result.data.get("alert"):
                 logger.warning("Agent %s alert: %s", agent.name, result.message)
 
-        state.status = AgentStatus.IDLE
+            if result.data and (result.data.get("timeout") or result.data.get("resource_busy")):
+                break
+
+        with registry.state_lock:
+            state.status = AgentStatus.IDLE
+        return results
+
+    def _execute_agent(
+        self,
+        agent: AgentConfig,
+        state: AgentState,
+        registry: AgentRegistry,
+        deadline: Optional[float] = None,
+    ):
+        """Execute all actions for an agent (on a worker thread when scheduled)."""
+        self._run_actions(agent, state, registry, deadline, self._stop_event)
 
     def run_agent_now(self, agent_id: str) -> List[AgentResult]:
         """Manually trigger an agent immediately. Returns results."""
@@ -865,25 +1065,18 @@ class AgentScheduler:
             return [AgentResult(success=False, message=f"Agent '{agent_id}' not found")]
 
         state = registry.get_state(agent_id)
-        results = []
-
-        state.status = AgentStatus.RUNNING
-        for action in agent.actions:
-            result = AgentExecutor.execute_action(agent, action, state)
-            state.record_action(result)
-            results.append(result)
-
-            if self._on_result:
-                try:
-                    self._on_result(agent_id, result)
-                except (RuntimeError, ValueError, TypeError, OSError) as exc:
-                    logger.error("Result callback error in run_agent_now: %s", exc)
-
-            # Send notifications
-            self._notify_result(agent, result)
-
-        state.status = AgentStatus.IDLE
+        timeout = agent.settings.get("timeout_seconds", AGENT_RUN_TIMEOUT_SECONDS)
+        # Called from the GUI thread: never wait long on a slot a scheduled
+        # agent holds, and give up at once if the scheduler is shutting down.
+        results = self._run_actions(
+            agent, state, registry,
+            deadline=time.monotonic() + timeout,
+            cancel=self._stop_event if self.is_running else None,
+            slot_wait=RUN_NOW_SLOT_WAIT_SECONDS,
+        )
         registry.save()
+        # Push the agent's next interval run back from this manual run
+        self.reschedule()
         return results
 
     def _notify_result(self, agent: AgentConfig, result: AgentResult):
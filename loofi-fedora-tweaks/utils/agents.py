@@ -13,16 +13,19 @@ Provides:
 import json
 import logging
 import os
+import threading
 import time
 import uuid
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
 # Module constants
 HISTORY_MAX_ENTRIES = 100
+# Journal records appended before the states file is rewritten (compacted)
+STATE_JOURNAL_MAX_RECORDS = 256
 DEFAULT_MAX_ACTIONS_PER_HOUR = 10
 AGENT_ID_LENGTH = 8
 
@@ -212,7 +215,11 @@ class AgentConfig:
 
 @dataclass
 class AgentState:
-    """Runtime state of an agent."""
+    """Runtime state of an agent.
+
+    Assigning any field marks the state dirty, so the registry persists
+    only states that changed since the last save.
+    """
     agent_id: str
     status: AgentStatus = AgentStatus.IDLE
     last_run: float = 0.0
@@ -223,6 +230,22 @@ class AgentState:
     hour_window_start: float = 0.0
     history: List[AgentResult] = field(default_factory=list)
 
+    def __post_init__(self) -> None:
+        self.mark_clean()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name != "_dirty":
+            super().__setattr__("_dirty", True)
+
+    @property
+    def is_dirty(self) -> bool:
+        """True if the state changed since it was loaded or last saved."""
+        return self._dirty
+
+    def mark_clean(self) -> None:
+        self._dirty = False
+
     def to_dict(self) -> dict:
         return {
             "agent_id": self.agent_id,
@@ -489,6 +512,12 @@ class AgentRegistry:
     def __init__(self) -> None:
         self._agents: Dict[str, AgentConfig] = {}
         self._states: Dict[str, AgentState] = {}
+        self._listeners: List[Callable[[], None]] = []
+        self._journal_records = 0
+        # Agents run on worker threads while the GUI thread edits and saves
+        # the registry.  Hold this lock to mutate an AgentState, or the
+        # registry's dicts, so a save never sees (or clears) half a change.
+        self.state_lock = threading.RLock()
         self._ensure_config_dir()
         self._load()
 
@@ -515,6 +544,24 @@ class AgentRegistry:
     def _states_file(self) -> str:
         return os.path.join(self._CONFIG_DIR, "states.json")
 
+    def _journal_file(self) -> str:
+        return os.path.join(self._CONFIG_DIR, "states.journal")
+
+    def add_change_listener(self, callback: Callable[[], None]) -> None:
+        """Call *callback* whenever agents are added, removed or reconfigured."""
+        self._listeners.append(callback)
+
+    def remove_change_listener(self, callback: Callable[[], None]) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify_changed(self) -> None:
+        for callback in list(getattr(self, "_listeners", ())):
+            try:
+                callback()
+            except (RuntimeError, ValueError, TypeError, OSError) as exc:
+                logger.error("Agent change listener error: %s", exc)
+
     def _load(self):
         """Load agents and states from disk."""
         # Load agent configs
@@ -546,23 +593,104 @@ class AgentRegistry:
             except (json.JSONDecodeError, OSError, KeyError) as exc:
                 logger.error("Failed to load agent states: %s", exc)
 
+        self._journal_records = self._replay_journal()
+        for state in self._states.values():
+            state.mark_clean()
+
+    def _replay_journal(self) -> int:
+        """Apply state records appended since the states file was written."""
+        journal_path = self._journal_file()
+        if not os.path.exists(journal_path):
+            return 0
+        records = 0
+        try:
+            with open(journal_path, "r") as fh:
+                for line in fh:
+                    try:
+                        state = AgentState.from_dict(json.loads(line))
+                    except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                        # A torn final line from an interrupted append
+                        continue
+                    current = self._states.get(state.agent_id)
+                    if current is None or state.run_count >= current.run_count:
+                        self._states[state.agent_id] = state
+                    records += 1
+        except OSError as exc:
+            logger.error("Failed to read agent state journal: %s", exc)
+        return records
+
+    @staticmethod
+    def _write_json(path: str, data: Any) -> None:
+        temp_path = f"{path}.tmp.{os.getpid()}.{threading.get_ident()}"
+        with open(temp_path, "w") as fh:
+            json.dump(data, fh, indent=2)
+        os.replace(temp_path, path)
+
     def save(self):
         """Persist agents and states to disk."""
+        with self.state_lock:
+            self._save_locked()
+
+    def _save_locked(self):
         try:
-            with open(self._agents_file(), "w") as fh:
-                json.dump([a.to_dict() for a in self._agents.values()], fh, indent=2)
+            self._write_json(self._agents_file(), [a.to_dict() for a in self._agents.values()])
         except OSError as exc:
             logger.error("Failed to save agents: %s", exc)
 
         try:
-            with open(self._states_file(), "w") as fh:
-                json.dump([s.to_dict() for s in self._states.values()], fh, indent=2)
+            self._write_json(self._states_file(), [s.to_dict() for s in self._states.values()])
         except OSError as exc:
             logger.error("Failed to save agent states: %s", exc)
+            return
+
+        # The states file now supersedes the journal
+        try:
+            os.unlink(self._journal_file())
+        except FileNotFoundError:
+            pass
+        except OSError as exc:
+            logger.error("Failed to truncate agent state journal: %s", exc)
+        self._journal_records = 0
+        for state in self._states.values():
+            state.mark_clean()
+
+    def save_dirty(self) -> int:
+        """
+        Persist only the agent states that changed since the last save.
+
+        Changed states are appended to a journal, so an idle registry writes
+        nothing; the journal is folded back into the states file once it
+        holds STATE_JOURNAL_MAX_RECORDS records.
+
+        Returns:
+            Number of states written.
+        """
+        with self.state_lock:
+            dirty = [s for s in self._states.values() if s.is_dirty]
+            if not dirty:
+                return 0
+
+            lines = "".join(
+                json.dumps(s.to_dict(), separators=(",", ":")) + "\n" for s in dirty
+            )
+            try:
+                with open(self._journal_file(), "a") as fh:
+                    fh.write(lines)
+            except OSError as exc:
+                logger.error("Failed to append agent states: %s", exc)
+                return 0
+
+            for state in dirty:
+                state.mark_clean()
+            self._journal_records += len(dirty)
+            if self._journal_records >= STATE_JOURNAL_MAX_RECORDS:
+                self._save_locked()
+            return len(dirty)
 
     def list_agents(self) -> List[AgentConfig]:
         """List all registered agents."""
-        return list(self._agents.values())
+        with self.state_lock:
+            return list(self._agents.values())
 
     def get_agent(self, agent_id: str) -> Optional[AgentConfig]:
         """Get agent config by ID."""
@@ -570,17 +698,20 @@ class AgentRegistry:
 
     def get_state(self, agent_id: str) -> AgentState:
         """Get or create agent state."""
-        if agent_id not in self._states:
-            self._states[agent_id] = AgentState(agent_id=agent_id)
-        return self._states[agent_id]
+        with self.state_lock:
+            if agent_id not in self._states:
+                self._states[agent_id] = AgentState(agent_id=agent_id)
+            return self._states[agent_id]
 
     def register_agent(self, config: AgentConfig) -> AgentConfig:
         """Register a new agent."""
         if not config.agent_id:
             config.agent_id = str(uuid.uuid4())[:8]
-        self._agents[config.agent_id] = config
-        self._states[config.agent_id] = AgentState(agent_id=config.agent_id)
-        self.save()
+        with self.state_lock:
+            self._agents[config.agent_id] = config
+            self._states[config.agent_id] = AgentState(agent_id=config.agent_id)
+            self._save_locked()
+        self._notify_changed()
         logger.info("Registered agent: %s (%s)", config.name, config.agent_id)
         return config
 
@@ -594,9 +725,11 @@ class AgentRegistry:
         if agent_id in builtin_ids:
             logger.warning("Cannot remove built-in agent: %s", agent_id)
             return False
-        del self._agents[agent_id]
-        self._states.pop(agent_id, None)
-        self.save()
+        with self.state_lock:
+            self._agents.pop(agent_id, None)
+            self._states.pop(agent_id, None)
+            self._save_locked()
+        self._notify_changed()
         logger.info("Removed agent: %s", agent_id)
         return True
 
@@ -605,10 +738,11 @@ class AgentRegistry:
         agent = self._agents.get(agent_id)
         if not agent:
             return False
-        agent.enabled = True
-        state = self.get_state(agent_id)
-        state.status = AgentStatus.IDLE
-        self.save()
+        with self.state_lock:
+            agent.enabled = True
+            self.get_state(agent_id).status = AgentStatus.IDLE
+            self._save_locked()
+        self._notify_changed()
         return True
 
     def disable_agent(self, agent_id: str) -> bool:
@@ -616,15 +750,17 @@ class AgentRegistry:
         agent = self._agents.get(agent_id)
         if not agent:
             return False
-        agent.enabled = False
-        state = self.get_state(agent_id)
-        state.status = AgentStatus.DISABLED
-        self.save()
+        with self.state_lock:
+            agent.enabled = False
+            self.get_state(agent_id).status = AgentStatus.DISABLED
+            self._save_locked()
+        self._notify_changed()
         return True
 
     def get_enabled_agents(self) -> List[AgentConfig]:
         """Get all enabled agents."""
-        return [a for a in self._agents.values() if a.enabled]
+        with self.state_lock:
+            return [a for a in self._agents.values() if a.enabled]
 
     def get_agent_summary(self) -> Dict[str, Any]:
         """Get summary of all agents."""
@@ -647,9 +783,9 @@ class AgentRegistry:
     def get_recent_activity(self, limit: int = 20) -> List[Dict[str, Any]]:
         """Get recent activity across all agents."""
         activity: List[Dict[str, Any]] = []
-        for agent in self._agents.values():
+        for agent in self.list_agents():
             state = self.get_state(agent.agent_id)
-            for result in state.history:
+            for result in list(state.history):
                 activity.append({
                     "agent_id": agent.agent_id,
                     "agent_name": agent.name,
@@ -667,8 +803,10 @@ class AgentRegistry:
         agent = self._agents.get(agent_id)
         if not agent:
             return False
-        agent.settings.update(settings)
-        self.save()
+        with self.state_lock:
+            agent.settings.update(settings)
+            self._save_locked()
+        self._notify_changed()
         return True
 
     def create_custom_agent(
@@ -720,14 +858,15 @@ class AgentRegistry:
                 # Load as AgentConfig
                 agent_config = AgentConfig.from_dict(agent_data)
 
-                # Register (or update if already exists)
-                self._agents[agent_config.agent_id] = agent_config
+                with self.state_lock:
+                    # Register (or update if already exists)
+                    self._agents[agent_config.agent_id] = agent_config
 
-                # Create state if doesn't exist
-                if agent_config.agent_id not in self._states:
-                    self._states[agent_config.agent_id] = AgentState(
-                        agent_id=agent_config.agent_id
-                    )
+                    # Create state if doesn't exist
+                    if agent_config.agent_id not in self._states:
+                        self._states[agent_config.agent_id] = AgentState(
+                            agent_id=agent_config.agent_id
+                        )
 
                 loaded_count += 1
                 logger.info(
@@ -742,6 +881,7 @@ class AgentRegistry:
 
         if loaded_count > 0:
             self.save()
+            self._notify_changed()
             logger.info("Loaded %d agents from %s", loaded_count, directory)
 
         return loaded_count
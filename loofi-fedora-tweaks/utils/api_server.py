@@ -7,13 +7,16 @@ from typing import Optional
 import uvicorn
 from api.routes import executor as executor_routes
 from api.routes import profiles as profiles_routes
+from api.routes import stream as stream_routes
 from api.routes import system as system_routes
 from fastapi import FastAPI, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 
+from utils.async_cache import SingleFlightCache
 from utils.auth import AuthManager
+from utils.metrics_stream import EventStreamBridge, MetricsBroadcaster
 
 
 class APIServer:
@@ -27,6 +30,11 @@ class APIServer:
 
     def _create_app(self) -> FastAPI:
         app = FastAPI(title="Loofi Web API", version="20.0.0")
+        app.state.snapshot_cache = SingleFlightCache(
+            ttl=system_routes.SNAPSHOT_TTL_SECONDS
+        )
+        app.state.metrics_broadcaster = MetricsBroadcaster()
+        app.state.event_bridge = EventStreamBridge()
         # v29.0: CORS restricted to localhost (was wildcard)
         allowed_origins = [
             f"http://{self.host}:{self.port}",
@@ -45,6 +53,7 @@ class APIServer:
         app.include_router(system_routes.router, prefix="/api")
         app.include_router(executor_routes.router, prefix="/api")
         app.include_router(profiles_routes.router, prefix="/api")
+        app.include_router(stream_routes.router, prefix="/api")
 
         @app.post("/api/token")
         def issue_token(api_key: str = Form(...)):
@@ -2,12 +2,15 @@
 Agent Arbitrator - Coordinates resource access across agents.
 
 Provides a small policy layer to prevent background agents from
-over-consuming resources when system conditions are constrained.
+over-consuming resources when system conditions are constrained, and
+per-resource concurrency slots for agents that run in parallel.
 """
 
+import threading
+import time
 from dataclasses import dataclass
 from enum import Enum
-from typing import Iterable
+from typing import Dict, Iterable, Optional
 
 from services.hardware import TemperatureManager
 
@@ -16,6 +19,16 @@ from utils.pulse import PowerState, SystemPulse
 
 logger = get_logger(__name__)
 
+# How many agent actions may use each resource at once.  Read-only /proc
+# checks ("cpu") run side by side; package-manager work is serialized.
+RESOURCE_CONCURRENCY: Dict[str, int] = {
+    "cpu": 4,
+    "network": 2,
+    "disk": 1,
+    "background_process": 2,
+    "package_manager": 1,
+}
+
 
 class Priority(Enum):
     CRITICAL = 3  # Security/heat
@@ -75,6 +88,66 @@ class Arbitrator:
         return state == PowerState.BATTERY.value
 
 
+class ResourceSlots:
+    """
+    Counting slots per resource, shared by concurrently running agents.
+
+    An action acquires every resource it needs at once (all or nothing),
+    so two actions can never deadlock holding one slot each.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, int]] = None):
+        self._limits = dict(RESOURCE_CONCURRENCY if limits is None else limits)
+        self._in_use: Dict[str, int] = {}
+        self._cond = threading.Condition()
+
+    def limit(self, resource: str) -> int:
+        """Concurrency cap for *resource*; unknown resources are exclusive."""
+        return self._limits.get(resource, 1)
+
+    def in_use(self, resource: str) -> int:
+        with self._cond:
+            return self._in_use.get(resource, 0)
+
+    def acquire(
+        self,
+        resources: Iterable[str],
+        timeout: Optional[float] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> bool:
+        """
+        Wait for a slot on every resource in *resources*.
+
+        Returns:
+            False if *timeout* expired or *cancel* was set first.
+        """
+        wanted = set(resources)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if cancel is not None and cancel.is_set():
+                    return False
+                if all(self._in_use.get(r, 0) < self.limit(r) for r in wanted):
+                    for r in wanted:
+                        self._in_use[r] = self._in_use.get(r, 0) + 1
+                    return True
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+
+    def release(self, resources: Iterable[str]) -> None:
+        with self._cond:
+            for r in set(resources):
+                self._in_use[r] = max(self._in_use.get(r, 0) - 1, 0)
+            self._cond.notify_all()
+
+    def interrupt(self) -> None:
+        """Wake all waiters so they re-check their cancel events."""
+        with self._cond:
+            self._cond.notify_all()
+
+
 def _max_temp(sensors: Iterable) -> float:
     max_temp = 0.0
     for sensor in sensors:
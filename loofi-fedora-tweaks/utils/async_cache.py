@@ -0,0 +1,81 @@
+"""
+Short-TTL, single-flight snapshot cache for async API handlers.
+
+Many dashboards polling ``/info`` at once should cost one computation per
+TTL window, not one per request.  Concurrent callers that miss the cache
+await the same in-flight computation; the blocking producer runs in a
+worker thread so the event loop stays free.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlightCache:
+    """Async TTL cache that coalesces concurrent misses per key.
+
+    Failed computations are not cached; every waiter of the failed flight
+    receives the exception and the next caller starts a new flight.
+    """
+
+    def __init__(self, ttl: float):
+        """Initialize the cache.
+
+        Args:
+            ttl: Seconds a computed value stays fresh.
+        """
+        self.ttl = ttl
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._inflight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self._lock = threading.Lock()
+        self.computations = 0
+
+    def _fresh(self, key: Hashable) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return True, entry[1]
+        return False, None
+
+    async def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for *key*, computing it at most once per TTL.
+
+        Args:
+            key: Cache key.
+            compute: Blocking zero-argument callable producing the value.
+        """
+        hit, value = self._fresh(key)
+        if hit:
+            return value
+
+        loop = asyncio.get_running_loop()
+        flight = self._inflight.get(key)
+        if flight is None or flight.get_loop() is not loop:
+            flight = loop.create_task(self._compute(key, compute))
+            self._inflight[key] = flight
+        # Shield so one client disconnecting does not cancel the shared flight.
+        return await asyncio.shield(flight)
+
+    async def _compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        try:
+            self.computations += 1
+            value = await asyncio.to_thread(compute)
+            with self._lock:
+                self._entries[key] = (time.monotonic() + self.ttl, value)
+            return value
+        finally:
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one cached key, or every key when *key* is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
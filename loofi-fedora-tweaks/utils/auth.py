@@ -1,9 +1,15 @@
 """Authentication utilities for Loofi Web API."""
 
+import hashlib
+import hmac
 import logging
+import os
 import secrets
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 import bcrypt
 import jwt
@@ -16,12 +22,27 @@ logger = logging.getLogger(__name__)
 
 
 class AuthManager:
-    """Manage API auth credentials and JWT verification."""
+    """Manage API auth credentials and JWT verification.
+
+    Auth state parsed from ``config.json`` is cached in memory and reloaded
+    only when the file's (mtime, size, inode) stamp changes.  Tokens that
+    passed signature verification are remembered in a small LRU until their
+    ``exp``, and the last API key that passed bcrypt is remembered by
+    digest, so repeated dashboard polling does not touch the disk, decode
+    JWTs or run bcrypt on every request.
+    """
 
     _ALGORITHM = "HS256"
     _CONFIG_KEY = "api_auth"
     _CONFIG_FILE = "api_auth.json"
     _TOKEN_LIFETIME_SECONDS = 3600
+    _VERIFIED_TOKEN_CACHE_SIZE = 256
+
+    _cache_lock = threading.Lock()
+    _auth_cache: Optional[dict] = None
+    _auth_cache_stamp: Optional[Tuple[int, int, int]] = None
+    _verified_tokens: "OrderedDict[str, int]" = OrderedDict()
+    _verified_key: Optional[Tuple[str, str]] = None  # (api_key_hash, key digest)
 
     security = HTTPBearer(auto_error=False)
 
@@ -47,11 +68,90 @@ class AuthManager:
         config = ConfigManager.load_config() or {}
         config[cls._CONFIG_KEY] = data
         ConfigManager.save_config(config)
+        cls.clear_cache()
         try:
             cls._auth_path().write_text("1")
         except (OSError, IOError) as e:
             logger.debug("Failed to write auth marker file: %s", e)
 
+    @classmethod
+    def _config_stamp(cls) -> Optional[Tuple[int, int, int]]:
+        """Return a cheap change token for ``config.json``, or None if absent."""
+        try:
+            st = os.stat(ConfigManager.CONFIG_FILE)
+        except (OSError, TypeError, ValueError):
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    @classmethod
+    def _get_auth_data(cls) -> dict:
+        """Return auth state, re-reading config.json only when it changed.
+
+        Nothing is cached while the config file does not exist, so the
+        ephemeral secret from :meth:`_ensure_secret` is never pinned.
+        """
+        stamp = cls._config_stamp()
+        with cls._cache_lock:
+            if stamp is not None and stamp == cls._auth_cache_stamp and cls._auth_cache is not None:
+                return cls._auth_cache
+        data = cls._load_auth_data()
+        with cls._cache_lock:
+            if stamp != cls._auth_cache_stamp or cls._auth_cache is None:
+                cls._verified_tokens.clear()
+                cls._verified_key = None
+            cls._auth_cache = data if stamp is not None else None
+            cls._auth_cache_stamp = stamp
+        return data
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop cached auth state, verified tokens and the verified key."""
+        with cls._cache_lock:
+            cls._auth_cache = None
+            cls._auth_cache_stamp = None
+            cls._verified_tokens.clear()
+            cls._verified_key = None
+
+    @staticmethod
+    def _key_digest(api_key: str) -> str:
+        return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def _check_api_key(cls, api_key: str, stored_hash: str) -> bool:
+        """bcrypt-check *api_key*, skipping bcrypt for the last accepted key."""
+        digest = cls._key_digest(api_key)
+        with cls._cache_lock:
+            cached = cls._verified_key
+        if cached is not None and cached[0] == stored_hash and hmac.compare_digest(cached[1], digest):
+            return True
+        if not bcrypt.checkpw(api_key.encode("utf-8"), stored_hash.encode("utf-8")):
+            return False
+        with cls._cache_lock:
+            cls._verified_key = (stored_hash, digest)
+        return True
+
+    @classmethod
+    def _remember_token(cls, token: str, exp) -> None:
+        if not isinstance(exp, int) or exp <= int(time.time()):
+            return
+        with cls._cache_lock:
+            cls._verified_tokens[token] = exp
+            cls._verified_tokens.move_to_end(token)
+            while len(cls._verified_tokens) > cls._VERIFIED_TOKEN_CACHE_SIZE:
+                cls._verified_tokens.popitem(last=False)
+
+    @classmethod
+    def _remembered_exp(cls, token: str) -> Optional[int]:
+        with cls._cache_lock:
+            exp = cls._verified_tokens.get(token)
+            if exp is None:
+                return None
+            if exp <= int(time.time()):
+                del cls._verified_tokens[token]
+                return None
+            cls._verified_tokens.move_to_end(token)
+            return exp
+
     @classmethod
     def _hash_key(cls, api_key: str) -> str:
         result = bcrypt.hashpw(api_key.encode("utf-8"), bcrypt.gensalt())  # type: ignore[no-any-return]
@@ -70,30 +170,37 @@ class AuthManager:
     @classmethod
     def issue_token(cls, api_key: str) -> str:
         """Issue a JWT for a valid API key."""
-        data = cls._load_auth_data()
+        data = cls._get_auth_data()
         stored_hash = data.get("api_key_hash")
-        if not stored_hash or not bcrypt.checkpw(
-            api_key.encode("utf-8"), stored_hash.encode("utf-8")
-        ):
+        if not stored_hash or not cls._check_api_key(api_key, stored_hash):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API key"
             )
         payload = {
             "sub": "loofi-api",
-            "exp": int(__import__("time").time()) + cls._TOKEN_LIFETIME_SECONDS,
+            "exp": int(time.time()) + cls._TOKEN_LIFETIME_SECONDS,
         }
         return str(jwt.encode(payload, data["jwt_secret"], algorithm=cls._ALGORITHM))
 
     @classmethod
-    def verify_token(cls, token: str) -> None:
-        data = cls._load_auth_data()
+    def verify_token(cls, token: str) -> Optional[int]:
+        """Raise 401 unless *token* is valid; return its ``exp`` if it has one."""
+        data = cls._get_auth_data()
+        exp = cls._remembered_exp(token)
+        if exp is not None:
+            return exp
         try:
-            jwt.decode(token, data["jwt_secret"], algorithms=[cls._ALGORITHM])
+            payload = jwt.decode(token, data["jwt_secret"], algorithms=[cls._ALGORITHM])
         except (jwt.InvalidTokenError, KeyError, ValueError) as e:
             logger.debug("JWT token verification failed: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
             )
+        if not isinstance(payload, dict):
+            return None
+        exp = payload.get("exp")
+        cls._remember_token(token, exp)
+        return exp if isinstance(exp, int) else None
 
     @classmethod
     def verify_bearer_token(
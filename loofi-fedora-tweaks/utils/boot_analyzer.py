@@ -3,15 +3,54 @@ Boot analysis utilities.
 Part of v7.5 "Watchtower" update.
 
 Parses systemd-analyze output to help users identify slow boot services.
+
+Boot data only changes once per boot, so a full analysis (phase times,
+blame list, critical chain) is gathered once, in parallel, and recorded in
+a persisted :class:`BootHistory` keyed by the kernel's boot ID.  Phase and
+unit times come from the systemd manager's monotonic timestamps over D-Bus
+when dbus-python is available, falling back to ``systemd-analyze`` output;
+the critical chain is always ``systemd-analyze critical-chain`` text.  The
+history of previous boots lets :meth:`BootAnalyzer.get_regressions` compare
+this boot with recent ones without re-running anything.
 """
 
 import logging
+import re
+import statistics
 import subprocess
-from dataclasses import dataclass
-from typing import Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from utils.json_store import JsonStore
 
 logger = logging.getLogger(__name__)
 
+try:
+    import dbus
+
+    DBUS_AVAILABLE = True
+except ImportError:
+    DBUS_AVAILABLE = False
+    dbus = None
+
+_DBusException = dbus.exceptions.DBusException if dbus is not None else OSError
+
+SYSTEMD_BUS_NAME = "org.freedesktop.systemd1"
+SYSTEMD_PATH = "/org/freedesktop/systemd1"
+MANAGER_INTERFACE = "org.freedesktop.systemd1.Manager"
+UNIT_INTERFACE = "org.freedesktop.systemd1.Unit"
+PROPERTIES_INTERFACE = "org.freedesktop.DBus.Properties"
+
+BOOT_ID_PATH = Path("/proc/sys/kernel/random/boot_id")
+DEFAULT_HISTORY_PATH = Path.home() / ".cache" / "loofi-fedora-tweaks" / "boot_history.json"
+HISTORY_FORMAT = 1
+
+# BootStats fields, in boot order; also the phase names used by regressions.
+BOOT_PHASES = ("firmware_time", "loader_time", "kernel_time", "initrd_time", "userspace_time", "total_time")
+
 
 @dataclass
 class ServiceTime:
@@ -31,6 +70,164 @@ class BootStats:
     kernel_time: Optional[float] = None
     userspace_time: Optional[float] = None
     total_time: Optional[float] = None
+    initrd_time: Optional[float] = None
+
+
+@dataclass
+class BootAnalysis:
+    """Everything known about one boot."""
+
+    boot_id: str
+    recorded_at: float
+    stats: BootStats
+    blame: List[ServiceTime] = field(default_factory=list)  # slowest first
+    critical_chain: str = ""
+    source: str = "systemd-analyze"  # or "dbus"
+
+
+@dataclass
+class BootRegression:
+    """A boot phase or unit that got slower than in recent boots."""
+
+    name: str  # a BOOT_PHASES field or a unit name
+    baseline_seconds: float  # median over the compared boots
+    current_seconds: float
+    kind: str = "unit"  # "phase" or "unit"
+
+    @property
+    def delta_seconds(self) -> float:
+        return self.current_seconds - self.baseline_seconds
+
+
+def stats_from_timestamps(props: Mapping[str, int]) -> BootStats:
+    """Compute boot phases from the manager's *TimestampMonotonic properties.
+
+    Mirrors ``systemd-analyze time``.  Returns empty stats while the boot
+    has not finished (FinishTimestampMonotonic is 0).
+    """
+    finish = int(props.get("FinishTimestampMonotonic", 0))
+    if finish <= 0:
+        return BootStats()
+    firmware = int(props.get("FirmwareTimestampMonotonic", 0))
+    loader = int(props.get("LoaderTimestampMonotonic", 0))
+    initrd = int(props.get("InitRDTimestampMonotonic", 0))
+    userspace = int(props.get("UserspaceTimestampMonotonic", 0))
+    kernel_done = initrd or userspace
+
+    def seconds(usec: int) -> float:
+        return round(usec / 1e6, 3)
+
+    return BootStats(
+        firmware_time=seconds(firmware - loader) if firmware else None,
+        loader_time=seconds(loader) if loader else None,
+        kernel_time=seconds(kernel_done) if kernel_done else None,
+        initrd_time=seconds(userspace - initrd) if initrd else None,
+        userspace_time=seconds(finish - userspace),
+        total_time=seconds(firmware + finish),
+    )
+
+
+def blame_from_timestamps(
+    units: Iterable[Tuple[str, Mapping[str, int]]], slow_threshold: float
+) -> List[ServiceTime]:
+    """Compute per-unit activation times like ``systemd-analyze blame``."""
+    services = []
+    for name, props in units:
+        activating = int(props.get("InactiveExitTimestampMonotonic", 0))
+        if activating <= 0:
+            continue
+        activated = int(props.get("ActiveEnterTimestampMonotonic", 0))
+        deactivated = int(props.get("ActiveExitTimestampMonotonic", 0))
+        if activated >= activating:
+            usec = activated - activating
+        elif deactivated >= activating:
+            usec = deactivated - activating
+        else:
+            continue
+        if usec <= 0:
+            continue
+        seconds = round(usec / 1e6, 3)
+        services.append(ServiceTime(service=name, time_seconds=seconds, is_slow=seconds >= slow_threshold))
+    services.sort(key=lambda s: s.time_seconds, reverse=True)
+    return services
+
+
+def _analysis_to_dict(analysis: BootAnalysis) -> dict:
+    return {
+        "boot_id": analysis.boot_id,
+        "recorded_at": analysis.recorded_at,
+        "source": analysis.source,
+        "stats": asdict(analysis.stats),
+        "blame": [[s.service, s.time_seconds] for s in analysis.blame],
+        "critical_chain": analysis.critical_chain,
+    }
+
+
+def _analysis_from_dict(raw: dict, slow_threshold: float) -> BootAnalysis:
+    return BootAnalysis(
+        boot_id=raw["boot_id"],
+        recorded_at=float(raw.get("recorded_at", 0.0)),
+        stats=BootStats(**raw.get("stats", {})),
+        blame=[
+            ServiceTime(service=name, time_seconds=seconds, is_slow=seconds >= slow_threshold)
+            for name, seconds in raw.get("blame", [])
+        ],
+        critical_chain=raw.get("critical_chain", ""),
+        source=raw.get("source", "systemd-analyze"),
+    )
+
+
+class BootHistory(JsonStore):
+    """
+    Persistent list of finished-boot analyses, oldest first.
+
+    A boot is recorded once, after its analysis shows the boot finished;
+    its data can no longer change.  Only the last MAX_BOOTS are kept.
+    """
+
+    MAX_BOOTS = 30
+    FORMAT = HISTORY_FORMAT
+    DATA_KEY = "boots"
+    DATA_TYPE = list
+    LABEL = "boot history"
+
+    @classmethod
+    def default_path(cls) -> Path:
+        return DEFAULT_HISTORY_PATH
+
+    def get(self, boot_id: str, slow_threshold: float) -> Optional[BootAnalysis]:
+        """Return the recorded analysis of *boot_id*, if any."""
+        with self._lock:
+            self._sync()
+            for raw in reversed(self._data):
+                if raw.get("boot_id") == boot_id:
+                    try:
+                        return _analysis_from_dict(raw, slow_threshold)
+                    except (KeyError, TypeError, ValueError):
+                        return None
+        return None
+
+    def boots(self, slow_threshold: float) -> List[BootAnalysis]:
+        """Return every recorded boot, oldest first."""
+        with self._lock:
+            self._sync()
+            raw_boots = list(self._data)
+        boots = []
+        for raw in raw_boots:
+            try:
+                boots.append(_analysis_from_dict(raw, slow_threshold))
+            except (KeyError, TypeError, ValueError):
+                continue
+        return boots
+
+    def record(self, analysis: BootAnalysis) -> None:
+        """Add (or replace) *analysis* and trim the history to MAX_BOOTS."""
+        with self._lock:
+            self._sync()
+            boots = [raw for raw in self._data if raw.get("boot_id") != analysis.boot_id]
+            boots.append(_analysis_to_dict(analysis))
+            self._data = boots[-self.MAX_BOOTS:]
+            self._write()
 
 
 class BootAnalyzer:
@@ -42,58 +239,169 @@ class BootAnalyzer:
     """
 
     SLOW_THRESHOLD = 5.0  # Seconds - services taking longer are flagged
+    REGRESSION_SECONDS = 1.0  # Slowdowns smaller than this are noise
+    REGRESSION_BASELINE_BOOTS = 5
+
+    @staticmethod
+    def current_boot_id() -> Optional[str]:
+        """Return the kernel's ID for this boot, or None if unavailable."""
+        try:
+            return BOOT_ID_PATH.read_text().strip() or None
+        except OSError:
+            return None
 
     @classmethod
-    def get_boot_stats(cls) -> BootStats:
+    def analyze(cls, refresh: bool = False) -> BootAnalysis:
         """
-        Get overall boot timing statistics.
+        Return the analysis of the current boot.
 
-        Returns:
-            BootStats with timing breakdown.
+        Served from the boot history once the boot has finished; otherwise
+        gathered from systemd (and recorded if it shows a finished boot).
+
+        Args:
+            refresh: Gather again even if this boot is already recorded.
         """
+        boot_id = cls.current_boot_id()
+        history = BootHistory.shared()
+        if boot_id and not refresh:
+            cached = history.get(boot_id, cls.SLOW_THRESHOLD)
+            if cached is not None:
+                return cached
+
+        analysis = cls._collect(boot_id or "")
+        if boot_id and analysis.stats.total_time is not None:
+            history.record(analysis)
+        return analysis
+
+    @classmethod
+    def _collect(cls, boot_id: str) -> BootAnalysis:
+        """Gather times, blame and the critical chain concurrently."""
+        with ThreadPoolExecutor(max_workers=3, thread_name_prefix="BootAnalyze") as pool:
+            chain = pool.submit(cls._run_critical_chain)
+            structured = pool.submit(cls._dbus_boot_data) if DBUS_AVAILABLE else None
+            times_and_blame = structured.result() if structured is not None else None
+            if times_and_blame is not None:
+                source = "dbus"
+                stats, blame = times_and_blame
+            else:
+                source = "systemd-analyze"
+                stats_future = pool.submit(cls._run_time)
+                blame = cls._run_blame()
+                stats = stats_future.result()
+            return BootAnalysis(
+                boot_id=boot_id,
+                recorded_at=time.time(),
+                stats=stats,
+                blame=blame,
+                critical_chain=chain.result(),
+                source=source,
+            )
+
+    @classmethod
+    def _dbus_boot_data(cls) -> Optional[Tuple[BootStats, List[ServiceTime]]]:
+        """Boot phases and unit times from the system manager, or None."""
+        try:
+            bus = dbus.SystemBus()
+            manager = bus.get_object(SYSTEMD_BUS_NAME, SYSTEMD_PATH)
+            props = manager.GetAll(MANAGER_INTERFACE, dbus_interface=PROPERTIES_INTERFACE)
+            stats = stats_from_timestamps(props)
+            if stats.total_time is None:
+                return stats, []
+            units = []
+            for unit in manager.ListUnits(dbus_interface=MANAGER_INTERFACE):
+                unit_obj = bus.get_object(SYSTEMD_BUS_NAME, unit[6])
+                units.append(
+                    (str(unit[0]), unit_obj.GetAll(UNIT_INTERFACE, dbus_interface=PROPERTIES_INTERFACE))
+                )
+        except (_DBusException, OSError) as e:
+            logger.debug("Boot data unavailable over D-Bus: %s", e)
+            return None
+        return stats, blame_from_timestamps(units, cls.SLOW_THRESHOLD)
+
+    @staticmethod
+    def _systemd_analyze(*args: str) -> Optional[str]:
         try:
             result = subprocess.run(
-                ["systemd-analyze", "--no-pager"],
+                ["systemd-analyze", *args, "--no-pager"],
                 capture_output=True,
                 text=True,
                 timeout=30,
             )
+        except (subprocess.SubprocessError, OSError) as e:
+            logger.debug("systemd-analyze %s failed: %s", " ".join(args), e)
+            return None
+        return result.stdout if result.returncode == 0 else None
 
-            if result.returncode != 0:
-                return BootStats()
-
-            stats = BootStats()
-            output = result.stdout
-
-            # Parse output like:
-            # Startup finished in 2.5s (firmware) + 1.2s (loader) + 3.1s (kernel) + 15.2s (userspace) = 22.0s
-            import re
-
-            firmware_match = re.search(r"([\d.]+)s \(firmware\)", output)
-            if firmware_match:
-                stats.firmware_time = float(firmware_match.group(1))
-
-            loader_match = re.search(r"([\d.]+)s \(loader\)", output)
-            if loader_match:
-                stats.loader_time = float(loader_match.group(1))
+    @classmethod
+    def _run_time(cls) -> BootStats:
+        output = cls._systemd_analyze()
+        return cls._parse_time(output) if output is not None else BootStats()
 
-            kernel_match = re.search(r"([\d.]+)s \(kernel\)", output)
-            if kernel_match:
-                stats.kernel_time = float(kernel_match.group(1))
+    @classmethod
+    def _run_blame(cls) -> List[ServiceTime]:
+        output = cls._systemd_analyze("blame")
+        return cls._parse_blame(output) if output is not None else []
 
-            userspace_match = re.search(r"([\d.]+)s \(userspace\)", output)
-            if userspace_match:
-                stats.userspace_time = float(userspace_match.group(1))
+    @classmethod
+    def _run_critical_chain(cls) -> str:
+        return cls._systemd_analyze("critical-chain") or ""
+
+    @staticmethod
+    def _parse_time(output: str) -> BootStats:
+        # Parse output like:
+        # Startup finished in 2.5s (firmware) + 1.2s (loader) + 3.1s (kernel) + 15.2s (userspace) = 22.0s
+        stats = BootStats()
+        for phase in ("firmware", "loader", "kernel", "initrd", "userspace"):
+            match = re.search(rf"([\d.]+)s \({phase}\)", output)
+            if match:
+                setattr(stats, f"{phase}_time", float(match.group(1)))
+
+        total_match = re.search(r"= ([\d.]+)s", output)
+        if total_match:
+            stats.total_time = float(total_match.group(1))
+        return stats
 
-            total_match = re.search(r"= ([\d.]+)s", output)
-            if total_match:
-                stats.total_time = float(total_match.group(1))
+    @classmethod
+    def _parse_blame(cls, output: str) -> List[ServiceTime]:
+        services = []
+        for line in output.strip().split("\n"):
+            line = line.strip()
+            if not line:
+                continue
+
+            # Parse lines like "15.234s NetworkManager.service"
+            match = re.match(r"([\d.]+)(ms|s|min)\s+(.+)", line)
+            if match:
+                value = float(match.group(1))
+                unit = match.group(2)
+                service = match.group(3).strip()
+
+                # Convert to seconds
+                if unit == "ms":
+                    time_seconds = value / 1000
+                elif unit == "min":
+                    time_seconds = value * 60
+                else:
+                    time_seconds = value
+
+                services.append(
+                    ServiceTime(
+                        service=service,
+                        time_seconds=time_seconds,
+                        is_slow=time_seconds >= cls.SLOW_THRESHOLD,
+                    )
+                )
+        return services
 
-            return stats
+    @classmethod
+    def get_boot_stats(cls) -> BootStats:
+        """
+        Get overall boot timing statistics.
 
-        except (subprocess.SubprocessError, OSError) as e:
-            logger.debug("Failed to get boot stats: %s", e)
-            return BootStats()
+        Returns:
+            BootStats with timing breakdown.
+        """
+        return cls.analyze().stats
 
     @classmethod
     def get_blame_data(cls, limit: int = 30) -> list[ServiceTime]:
@@ -106,53 +414,7 @@ class BootAnalyzer:
         Returns:
             List of ServiceTime objects, slowest first.
         """
-        try:
-            result = subprocess.run(
-                ["systemd-analyze", "blame", "--no-pager"],
-                capture_output=True,
-                text=True,
-                timeout=30,
-            )
-
-            if result.returncode != 0:
-                return []
-
-            services = []
-            import re
-
-            for line in result.stdout.strip().split("\n")[:limit]:
-                line = line.strip()
-                if not line:
-                    continue
-
-                # Parse lines like "15.234s NetworkManager.service"
-                match = re.match(r"([\d.]+)(ms|s|min)\s+(.+)", line)
-                if match:
-                    value = float(match.group(1))
-                    unit = match.group(2)
-                    service = match.group(3).strip()
-
-                    # Convert to seconds
-                    if unit == "ms":
-                        time_seconds = value / 1000
-                    elif unit == "min":
-                        time_seconds = value * 60
-                    else:
-                        time_seconds = value
-
-                    services.append(
-                        ServiceTime(
-                            service=service,
-                            time_seconds=time_seconds,
-                            is_slow=time_seconds >= cls.SLOW_THRESHOLD,
-                        )
-                    )
-
-            return services
-
-        except (subprocess.SubprocessError, OSError) as e:
-            logger.debug("Failed to get blame data: %s", e)
-            return []
+        return cls.analyze().blame[:limit]
 
     @classmethod
     def get_slow_services(cls, threshold: Optional[float] = None) -> list[ServiceTime]:
@@ -181,17 +443,74 @@ class BootAnalyzer:
         Returns:
             Critical chain output as string.
         """
-        try:
-            result = subprocess.run(
-                ["systemd-analyze", "critical-chain", "--no-pager"],
-                capture_output=True,
-                text=True,
-                timeout=30,
-            )
-            return result.stdout if result.returncode == 0 else ""
-        except (subprocess.SubprocessError, OSError) as e:
-            logger.debug("Failed to get critical chain: %s", e)
-            return ""
+        return cls.analyze().critical_chain
+
+    @classmethod
+    def get_history(cls, limit: Optional[int] = None) -> List[BootAnalysis]:
+        """
+        Get recorded boots, oldest first.
+
+        Args:
+            limit: Only return the most recent *limit* boots.
+
+        Returns:
+            List of BootAnalysis objects (no systemd query is made).
+        """
+        boots = BootHistory.shared().boots(cls.SLOW_THRESHOLD)
+        return boots[-limit:] if limit else boots
+
+    @classmethod
+    def get_regressions(
+        cls,
+        min_delta: Optional[float] = None,
+        baseline_boots: Optional[int] = None,
+    ) -> List[BootRegression]:
+        """
+        Compare this boot with the median of the boots recorded before it.
+
+        Only recorded boots are used; until the current boot has been
+        analysed (and finished) there is nothing to compare.
+
+        Args:
+            min_delta: Seconds a phase or unit must have slowed down by
+                (default: REGRESSION_SECONDS).
+            baseline_boots: How many previous boots form the baseline
+                (default: REGRESSION_BASELINE_BOOTS).
+
+        Returns:
+            List of BootRegression objects, largest slowdown first.
+        """
+        min_delta = cls.REGRESSION_SECONDS if min_delta is None else min_delta
+        baseline_boots = baseline_boots or cls.REGRESSION_BASELINE_BOOTS
+        boot_id = cls.current_boot_id()
+        boots = cls.get_history()
+        index = next((i for i, b in enumerate(boots) if b.boot_id == boot_id), None)
+        if index is None or index == 0:
+            return []
+        current = boots[index]
+        previous = boots[max(0, index - baseline_boots):index]
+
+        regressions = []
+        for phase in BOOT_PHASES:
+            now = getattr(current.stats, phase)
+            before = [getattr(b.stats, phase) for b in previous if getattr(b.stats, phase) is not None]
+            if now is not None and before:
+                regressions.append(BootRegression(phase, statistics.median(before), now, kind="phase"))
+
+        unit_times: Dict[str, List[float]] = {}
+        for boot in previous:
+            for service in boot.blame:
+                unit_times.setdefault(service.service, []).append(service.time_seconds)
+        for service in current.blame:
+            if service.service in unit_times:
+                regressions.append(
+                    BootRegression(service.service, statistics.median(unit_times[service.service]),
+                                   service.time_seconds)
+                )
+
+        regressions = [r for r in regressions if r.delta_seconds >= min_delta]
+        regressions.sort(key=lambda r: r.delta_seconds, reverse=True)
+        return regressions
 
     @classmethod
     def get_optimization_suggestions(cls) -> list[str]:
@@ -222,6 +541,19 @@ class BootAnalyzer:
                 "Consider masking if not needed."
             )
 
+        # Flag what got slower than in recent boots
+        for regression in cls.get_regressions()[:3]:
+            if regression.name == "total_time":
+                suggestions.append(
+                    f"📈 This boot took {regression.delta_seconds:.1f}s longer "
+                    "than recent boots."
+                )
+            elif regression.kind == "unit":
+                suggestions.append(
+                    f"📈 {regression.name} took {regression.delta_seconds:.1f}s longer "
+                    "than in recent boots."
+                )
+
         # Check for known problematic services
         problematic = {
             "NetworkManager-wait-online.service": "Usually not needed for desktops",
@@ -15,8 +15,9 @@ This daemon runs as a systemd user service and performs ONLY these operations:
    Unknown/disallowed actions are rejected and audit logged.
 
 2. Power State Monitoring:
-   - Reads /sys/class/power_supply/* (read-only)
-   - Uses upower command (read-only query)
+   - Listens for UPower OnBattery changes via SystemPulse (D-Bus signals)
+   - Falls back to reading /sys/class/power_supply/* and the upower
+     command (read-only) when D-Bus is unavailable
    - Triggers tasks on battery/AC transitions
 
 3. Plugin Update Checking:
@@ -32,6 +33,15 @@ SAFETY GUARANTEES
 - Audit logging for all task executions (successful and failed)
 - Graceful shutdown on SIGTERM/SIGINT
 
+SCHEDULING
+----------
+The main loop keeps a heap of deadlines (next scheduled task, plugin
+update check, power polling when D-Bus is unavailable) and sleeps in
+select() until the earliest one, a scheduler.json change (inotify) or a
+wake-up from a signal or power event.  An idle daemon wakes at most once
+per MAX_SLEEP; get_wakeup_stats() reports how often it woke with nothing
+to do.
+
 DATA ACCESS
 -----------
 - Reads: ~/.config/loofi-fedora-tweaks/scheduler.json
@@ -41,12 +51,19 @@ DATA ACCESS
 See utils/scheduler.py for task action definitions.
 """
 
+import heapq
+import os
+import select
 import signal
 import subprocess
+import threading
 import time
+from collections import deque
 from pathlib import Path
+from typing import Dict, List, Optional
 
 from utils.config_manager import ConfigManager
+from utils.file_watcher import FileWatcher
 from utils.log import get_logger
 from utils.plugin_base import PluginLoader
 from utils.plugin_installer import PluginInstaller
@@ -57,19 +74,120 @@ logger = get_logger(__name__)
 class Daemon:
     """Background daemon for automated task execution."""
 
-    CHECK_INTERVAL = 300  # Check every 5 minutes
-    POWER_CHECK_INTERVAL = 30  # Check power state every 30 seconds
+    CHECK_INTERVAL = 300  # Re-read scheduler.json every 5 minutes without inotify
+    POWER_CHECK_INTERVAL = 30  # Poll power state every 30 seconds without D-Bus
     PLUGIN_UPDATE_INTERVAL = 86400  # Check for plugin updates every 24 hours
+    MAX_SLEEP = 3600  # Longest uninterrupted sleep (clock jumps, suspend)
+
+    # Timer names
+    JOB_TASKS = "tasks"
+    JOB_POWER = "power"
+    JOB_PLUGINS = "plugin_updates"
+    JOB_CONFIG = "config_poll"
 
     _running = True
     _last_power_state = None
     _last_plugin_check = 0
 
+    # Deadline heap of (wall-clock time, job); _deadlines holds the live
+    # deadline per job so superseded heap entries can be skipped.
+    _timers: List[tuple] = []
+    _deadlines: Dict[str, float] = {}
+    _wake_fds: Optional[tuple] = None
+    _watcher: Optional[FileWatcher] = None
+    _pulse = None
+    _power_events: deque = deque()
+    _started_at = 0.0
+    _wakeups = 0
+    _idle_wakeups = 0
+
     @classmethod
     def signal_handler(cls, signum, frame):
         """Handle shutdown signals."""
         logger.info("Received signal %s, shutting down...", signum)
         cls._running = False
+        cls.wake()
+
+    # ==================== TIMERS AND WAKE-UPS ====================
+
+    @classmethod
+    def schedule(cls, job: str, deadline: Optional[float]) -> None:
+        """Set (or clear, with None) the wall-clock deadline of *job*."""
+        if deadline is None:
+            cls._deadlines.pop(job, None)
+            return
+        cls._deadlines[job] = deadline
+        heapq.heappush(cls._timers, (deadline, job))
+
+    @classmethod
+    def next_deadline(cls) -> Optional[float]:
+        """Return the earliest live deadline, discarding superseded entries."""
+        while cls._timers:
+            deadline, job = cls._timers[0]
+            if cls._deadlines.get(job) == deadline:
+                return deadline
+            heapq.heappop(cls._timers)
+        return None
+
+    @classmethod
+    def pop_expired(cls, now: float) -> List[str]:
+        """Remove and return the jobs whose deadline is at or before *now*."""
+        jobs = []
+        while True:
+            deadline = cls.next_deadline()
+            if deadline is None or deadline > now:
+                return jobs
+            _deadline, job = heapq.heappop(cls._timers)
+            del cls._deadlines[job]
+            jobs.append(job)
+
+    @classmethod
+    def wake(cls) -> None:
+        """Interrupt the main loop's sleep (safe from signal handlers and threads)."""
+        if cls._wake_fds is None:
+            return
+        try:
+            os.write(cls._wake_fds[1], b"\0")
+        except (BlockingIOError, OSError):
+            # Pipe full means a wake-up is already pending.
+            pass
+
+    @classmethod
+    def _wait(cls, timeout: float) -> bool:
+        """
+        Sleep up to *timeout* seconds.
+
+        Returns:
+            True if woken by a wake() call or a watched file change,
+            False if the timeout expired.
+        """
+        fds = []
+        if cls._wake_fds is not None:
+            fds.append(cls._wake_fds[0])
+        if cls._watcher is not None and cls._watcher.fileno() is not None:
+            fds.append(cls._watcher.fileno())
+        if not fds:
+            time.sleep(timeout)
+            return False
+
+        readable, _, _ = select.select(fds, [], [], max(timeout, 0))
+        if cls._wake_fds is not None and cls._wake_fds[0] in readable:
+            try:
+                while os.read(cls._wake_fds[0], 4096):
+                    pass
+            except (BlockingIOError, OSError):
+                pass
+        return bool(readable)
+
+    @classmethod
+    def get_wakeup_stats(cls) -> dict:
+        """Return how often the main loop woke up, and how often for nothing."""
+        hours = max(time.time() - cls._started_at, 1.0) / 3600 if cls._started_at else 0
+        return {
+            "wakeups": cls._wakeups,
+            "idle_wakeups": cls._idle_wakeups,
+            "idle_wakeups_per_hour": round(cls._idle_wakeups / hours, 2) if hours else 0.0,
+        }
 
     @classmethod
     def get_power_state(cls) -> str:
@@ -113,9 +231,15 @@ class Daemon:
     @classmethod
     def check_power_triggers(cls):
         """Check for power state changes and trigger tasks."""
+        cls.handle_power_state(cls.get_power_state())
+
+    @classmethod
+    def handle_power_state(cls, current_state: str):
+        """Run power-triggered tasks if *current_state* differs from the last one."""
         from utils.scheduler import TaskScheduler
 
-        current_state = cls.get_power_state()
+        if current_state not in ("ac", "battery"):
+            return
 
         if cls._last_power_state is None:
             cls._last_power_state = current_state
@@ -170,7 +294,7 @@ class Daemon:
     def check_plugin_updates(cls):
         """Check for plugin updates and auto-update if enabled."""
         # Check if auto-update is enabled in config
-        config = ConfigManager.load_config()
+        config = ConfigManager.load_config() or {}
         if not config.get("plugin_auto_update", False):
             return
 
@@ -179,39 +303,209 @@ class Daemon:
         try:
             loader = PluginLoader()
             installer = PluginInstaller()
-            plugins = loader.list_plugins()
+            enabled = [
+                plugin["name"]
+                for plugin in loader.list_plugins()
+                if plugin.get("enabled", True)  # Skip disabled plugins
+            ]
+            if not enabled:
+                return
+
+            # One index fetch, diffed against every installed version
+            check = installer.check_updates(enabled)
+            if not check.success:
+                logger.warning("Plugin update check failed: %s", check.error)
+                return
+
+            updates = check.data or []
+            for update in updates:
+                logger.info(
+                    "Update available for %s: %s", update["plugin_id"], update["new_version"]
+                )
+
+            # Downloads run in parallel; installs are applied one at a time
+            for result in installer.update_many(updates):
+                if result.success:
+                    logger.info("Successfully updated %s to %s", result.plugin_id, result.version)
+                else:
+                    logger.warning("Failed to update %s: %s", result.plugin_id, result.error)
+
+        except (ImportError, AttributeError, OSError) as e:
+            logger.error("Error checking plugin updates: %s", e, exc_info=True)
+
+    @classmethod
+    def _on_pulse_power_state(cls, state: str) -> None:
+        """SystemPulse slot; runs on the Pulse thread."""
+        cls._power_events.append(state)
+        cls.wake()
+
+    @classmethod
+    def _run_pulse(cls, pulse) -> None:
+        pulse.start(polling_fallback=False)
+        if cls._running:
+            # start() returned: no system bus.  None tells the main loop to
+            # poll power state itself.
+            cls._power_events.append(None)
+            cls.wake()
 
-            for plugin in plugins:
-                if not plugin.get("enabled", True):
-                    continue  # Skip disabled plugins
+    @classmethod
+    def start_power_listener(cls) -> bool:
+        """
+        Subscribe to power transitions through SystemPulse D-Bus signals.
+
+        Returns:
+            True if the listener thread was started, False if the caller
+            should poll get_power_state() instead.
+        """
+        try:
+            from PyQt6.QtCore import Qt
+
+            from utils.pulse import SystemPulse
+        except ImportError as e:
+            logger.debug("SystemPulse unavailable: %s", e)
+            return False
+
+        if not SystemPulse.is_available():
+            return False
+
+        pulse = SystemPulse()
+        # The daemon has no Qt event loop: deliver on the Pulse thread.
+        pulse.power_state_changed.connect(
+            cls._on_pulse_power_state, Qt.ConnectionType.DirectConnection
+        )
+        cls._pulse = pulse
+        threading.Thread(
+            target=cls._run_pulse, args=(pulse,), name="DaemonPulse", daemon=True
+        ).start()
+        return True
+
+    @classmethod
+    def schedule_tasks(cls, after_run: bool = False):
+        """
+        Arm the task timer at the earliest scheduled task deadline.
 
-                plugin_name = plugin["name"]
-                logger.debug("Checking updates for plugin: %s", plugin_name)
+        Args:
+            after_run: The due tasks just ran.  A task that is still due
+                (it failed without recording last_run) is retried
+                CHECK_INTERVAL later instead of immediately.
+        """
+        from utils.scheduler import TaskScheduler
 
-                result = installer.check_update(plugin_name)
+        next_due = TaskScheduler.get_next_due_time()
+        if next_due is None:
+            cls.schedule(cls.JOB_TASKS, None)
+            return
+        deadline = next_due.timestamp()
+        now = time.time()
+        if after_run and deadline <= now:
+            deadline = now + cls.CHECK_INTERVAL
+        cls.schedule(cls.JOB_TASKS, deadline)
 
-                if (
-                    result.success
-                    and result.data
-                    and result.data.get("update_available")
-                ):
-                    new_version = result.data.get("new_version")
-                    logger.info("Update available for %s: %s", plugin_name, new_version)
+    @classmethod
+    def _run_job(cls, job: str, now: float) -> None:
+        if job == cls.JOB_TASKS:
+            cls.run_due_tasks()
+            cls.schedule_tasks(after_run=True)
+        elif job == cls.JOB_POWER:
+            cls.check_power_triggers()
+            if cls._pulse is None:
+                cls.schedule(cls.JOB_POWER, now + cls.POWER_CHECK_INTERVAL)
+        elif job == cls.JOB_PLUGINS:
+            cls.check_plugin_updates()
+            cls._last_plugin_check = now
+            cls.schedule(cls.JOB_PLUGINS, now + cls.PLUGIN_UPDATE_INTERVAL)
+        elif job == cls.JOB_CONFIG:
+            cls.schedule_tasks()
+            cls.schedule(cls.JOB_CONFIG, now + cls.CHECK_INTERVAL)
 
-                    # Auto-update the plugin
-                    update_result = installer.update(plugin_name)
+    @classmethod
+    def _setup(cls) -> None:
+        from utils.scheduler import TaskScheduler
 
-                    if update_result.success:
-                        logger.info(
-                            "Successfully updated %s to %s", plugin_name, new_version
-                        )
-                    else:
-                        logger.warning(
-                            "Failed to update %s: %s", plugin_name, update_result.error
-                        )
+        cls._timers = []
+        cls._deadlines = {}
+        cls._power_events.clear()
+        cls._wakeups = 0
+        cls._idle_wakeups = 0
+        cls._started_at = time.time()
+
+        read_fd, write_fd = os.pipe()
+        os.set_blocking(read_fd, False)
+        os.set_blocking(write_fd, False)
+        cls._wake_fds = (read_fd, write_fd)
+
+        TaskScheduler.ensure_dirs()
+        cls._watcher = FileWatcher()
+        cls._watcher.watch(TaskScheduler.CONFIG_DIR, names={TaskScheduler.CONFIG_FILE.name})
+
+        now = time.time()
+        cls.check_power_triggers()
+        if not cls.start_power_listener():
+            cls.schedule(cls.JOB_POWER, now + cls.POWER_CHECK_INTERVAL)
+        if not cls._watcher.uses_inotify:
+            cls.schedule(cls.JOB_CONFIG, now + cls.CHECK_INTERVAL)
+        cls.schedule(cls.JOB_PLUGINS, now)
+        cls.schedule_tasks()
 
-        except (ImportError, AttributeError, OSError) as e:
-            logger.error("Error checking plugin updates: %s", e, exc_info=True)
+    @classmethod
+    def _teardown(cls) -> None:
+        from utils.scheduler import TaskScheduler
+
+        TaskScheduler.flush()
+        if cls._pulse is not None:
+            cls._pulse.stop()
+            cls._pulse = None
+        if cls._watcher is not None:
+            cls._watcher.close()
+            cls._watcher = None
+        if cls._wake_fds is not None:
+            for fd in cls._wake_fds:
+                os.close(fd)
+            cls._wake_fds = None
+
+    @classmethod
+    def run_once(cls) -> bool:
+        """
+        Run one iteration of the main loop: handle pending events, run
+        expired timers, then sleep until the next deadline.
+
+        Returns:
+            True if any work was done before sleeping.
+        """
+        did_work = False
+
+        while cls._power_events:
+            state = cls._power_events.popleft()
+            if state is None:
+                logger.info("Power events unavailable, polling every %ss", cls.POWER_CHECK_INTERVAL)
+                cls._pulse = None
+                cls.schedule(cls.JOB_POWER, time.time() + cls.POWER_CHECK_INTERVAL)
+            else:
+                cls.handle_power_state(state)
+            did_work = True
+
+        if cls._watcher is not None and cls._watcher.uses_inotify and cls._watcher.read_changes():
+            logger.debug("scheduler.json changed, recomputing deadlines")
+            cls.schedule_tasks()
+            did_work = True
+
+        now = time.time()
+        for job in cls.pop_expired(now):
+            cls._run_job(job, now)
+            did_work = True
+
+        if cls._wakeups and not did_work:
+            # The last sleep ended and there was nothing to do.
+            cls._idle_wakeups += 1
+
+        if not cls._running:
+            return did_work
+
+        deadline = cls.next_deadline()
+        timeout = cls.MAX_SLEEP if deadline is None else min(deadline - time.time(), cls.MAX_SLEEP)
+        cls._wait(max(timeout, 0))
+        cls._wakeups += 1
+        return did_work
 
     @classmethod
     def run(cls):
@@ -225,37 +519,18 @@ class Daemon:
         # Run boot tasks on startup
         cls.run_boot_tasks()
 
-        last_task_check = 0
-        last_power_check = 0
-        last_plugin_update_check = 0
-
-        while cls._running:
-            try:
-                now = time.time()
-
-                # Check for due tasks
-                if now - last_task_check >= cls.CHECK_INTERVAL:
-                    cls.run_due_tasks()
-                    last_task_check = now
-
-                # Check power state
-                if now - last_power_check >= cls.POWER_CHECK_INTERVAL:
-                    cls.check_power_triggers()
-                    last_power_check = now
-
-                # Check for plugin updates (daily)
-                if now - last_plugin_update_check >= cls.PLUGIN_UPDATE_INTERVAL:
-                    cls.check_plugin_updates()
-                    last_plugin_update_check = now
-
-                # Sleep briefly
-                time.sleep(10)
-
-            except (OSError, RuntimeError, ValueError, subprocess.SubprocessError) as e:
-                logger.error("Error in main loop: %s", e, exc_info=True)
-                time.sleep(60)  # Back off on error
-
-        logger.info("Daemon stopped.")
+        try:
+            cls._setup()
+            while cls._running:
+                try:
+                    cls.run_once()
+                except (OSError, RuntimeError, ValueError, subprocess.SubprocessError) as e:
+                    logger.error("Error in main loop: %s", e, exc_info=True)
+                    cls._wait(60)  # Back off on error
+        finally:
+            cls._teardown()
+
+        logger.info("Daemon stopped. %s", cls.get_wakeup_stats())
 
 
 def main():
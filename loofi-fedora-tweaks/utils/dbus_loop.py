@@ -0,0 +1,48 @@
+"""
+The process-wide GLib main loop that dispatches dbus-python signals.
+
+dbus-python delivers signals on the default GLib main context only (its
+``DBusGMainLoop`` cannot be bound to another context), and a context is
+iterated by one thread at a time, so every D-Bus listener in the process
+(utils.pulse, utils.systemd_units) shares one loop.  :func:`ensure_running`
+installs the D-Bus integration and starts that loop on a daemon thread the
+first time it is called; later callers reuse it.
+"""
+
+import logging
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    from dbus.mainloop.glib import DBusGMainLoop
+    from gi.repository import GLib
+
+    GLIB_AVAILABLE = True
+except ImportError:
+    GLIB_AVAILABLE = False
+    DBusGMainLoop = None  # type: ignore[assignment,misc]
+    GLib = None
+
+_lock = threading.Lock()
+_thread: Optional[threading.Thread] = None
+
+
+def ensure_running() -> None:
+    """Start the shared D-Bus signal loop unless it is already running.
+
+    Raises:
+        OSError: dbus-python or PyGObject is missing.
+    """
+    global _thread
+    if not GLIB_AVAILABLE:
+        raise OSError("dbus-python and PyGObject are required")
+    with _lock:
+        if _thread is not None and _thread.is_alive():
+            return
+        DBusGMainLoop(set_as_default=True)
+        loop = GLib.MainLoop()
+        _thread = threading.Thread(target=loop.run, name="dbus-glib-loop", daemon=True)
+        _thread.start()
+        logger.debug("Started the shared D-Bus signal loop")
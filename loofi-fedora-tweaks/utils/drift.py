@@ -1,19 +1,29 @@
 """
 Configuration Drift Detection - Monitor for unexpected system changes.
 Tracks system state and alerts when it deviates from applied presets.
+
+State sources are collected concurrently.  Every source except sysctl has
+a cheap change token (boot id, rpmdb/dnf.conf stat, unit directory
+mtimes); while the token is unchanged the previous value is reused, so a
+periodic check_drift on an idle system spawns no processes at all.
 """
 
 import hashlib
 import json
 import logging
+import os
 import shutil
 import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from services.system import SystemManager
+from utils.json_store import is_racy
 
 logger = logging.getLogger(__name__)
 
@@ -72,8 +82,49 @@ class DriftDetector:
     SNAPSHOTS_DIR = Path.home() / ".local/share/loofi-fedora-tweaks/snapshots"
     CURRENT_SNAPSHOT = SNAPSHOTS_DIR / "current.json"
 
+    BOOT_ID = Path("/proc/sys/kernel/random/boot_id")
+    SYSCTL_ROOT = Path("/proc/sys")
+    DNF_CONF = Path("/etc/dnf/dnf.conf")
+    RPMDB_PATHS = (
+        Path("/usr/lib/sysimage/rpm/rpmdb.sqlite"),
+        Path("/usr/lib/sysimage/rpm/rpmdb.sqlite-wal"),
+        Path("/var/lib/rpm/rpmdb.sqlite"),
+        Path("/var/lib/rpm/Packages"),
+    )
+    # rpm-ostree leaves the booted rpmdb alone until reboot; new deployments
+    # appear under /ostree/deploy/<stateroot>/deploy/ and staged ones in /run.
+    OSTREE_DEPLOY_ROOT = Path("/ostree/deploy")
+    OSTREE_STAGED = Path("/run/ostree/staged-deployment")
+    USER_UNIT_DIRS = (
+        Path.home() / ".config/systemd/user",
+        Path("/etc/systemd/user"),
+        Path("/usr/lib/systemd/user"),
+    )
+    SYSCTL_KEYS = (
+        "vm.swappiness",
+        "net.ipv4.tcp_congestion_control",
+        "net.core.default_qdisc",
+    )
+
+    # (state key, change token method or None to always collect, collector)
+    _SOURCES = (
+        ("kernel_params", "_kernel_params_token", "_get_kernel_params"),
+        ("layered_packages", "_packages_token", "_get_layered_packages"),
+        ("user_services", "_user_services_token", "_get_user_services"),
+        ("dnf_config", "_dnf_config_token", "_get_dnf_config"),
+        ("sysctl_values", None, "_get_sysctl_values"),
+    )
+    COLLECT_WORKERS = 4
+
     def __init__(self):
         self.SNAPSHOTS_DIR.mkdir(parents=True, exist_ok=True)
+        self._cache_lock = threading.Lock()
+        self._source_cache: Dict[str, Tuple[object, object]] = {}
+
+    def clear_cache(self) -> None:
+        """Forget cached source values so the next capture collects everything."""
+        with self._cache_lock:
+            self._source_cache.clear()
 
     def capture_snapshot(self, preset_name: str = "manual") -> SystemSnapshot:
         """
@@ -88,11 +139,12 @@ class DriftDetector:
         timestamp = datetime.now().isoformat()
 
         # Gather system state
-        kernel_params = self._get_kernel_params()
-        layered_packages = self._get_layered_packages()
-        user_services = self._get_user_services()
-        dnf_config = self._get_dnf_config()
-        sysctl_values = self._get_sysctl_values()
+        state = self._collect_state()
+        kernel_params = state["kernel_params"]
+        layered_packages = state["layered_packages"]
+        user_services = state["user_services"]
+        dnf_config = state["dnf_config"]
+        sysctl_values = state["sysctl_values"]
 
         snapshot = SystemSnapshot(
             timestamp=timestamp,
@@ -238,6 +290,87 @@ class DriftDetector:
             logger.debug("Failed to clear baseline: %s", e)
             return False
 
+    def _collect_state(self) -> Dict[str, object]:
+        """Return every source's value, re-collecting only changed sources in parallel."""
+        with self._cache_lock:
+            state: Dict[str, object] = {}
+            stale = {}
+            for name, token_method, collector in self._SOURCES:
+                token = getattr(self, token_method)() if token_method else None
+                cached = self._source_cache.get(name)
+                if token is not None and cached is not None and cached[0] == token:
+                    state[name] = cached[1]
+                else:
+                    stale[name] = (token, getattr(self, collector))
+
+            if len(stale) > 1:
+                with ThreadPoolExecutor(
+                    max_workers=min(self.COLLECT_WORKERS, len(stale)),
+                    thread_name_prefix="DriftCollect",
+                ) as pool:
+                    futures = {name: pool.submit(fn) for name, (_token, fn) in stale.items()}
+                    results = {name: future.result() for name, future in futures.items()}
+            else:
+                results = {name: fn() for name, (_token, fn) in stale.items()}
+
+            for name, value in results.items():
+                token = stale[name][0]
+                if token is not None:
+                    self._source_cache[name] = (token, value)
+                state[name] = value
+
+        # Hand out copies so callers cannot mutate the cached lists.
+        return {name: list(value) if isinstance(value, list) else value for name, value in state.items()}
+
+    # Change tokens (None means "unknown, collect again")
+
+    def _stat_stamp(self, paths) -> Optional[tuple]:
+        """Stat stamps of *paths* (None for missing ones); None if any is racy."""
+        now = time.time()
+        stamps = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                stamps.append(None)
+                continue
+            if is_racy(st.st_mtime_ns, now):
+                return None
+            stamps.append((st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns))
+        return tuple(stamps)
+
+    def _kernel_params_token(self) -> Optional[str]:
+        """The command line only changes across boots."""
+        try:
+            return self.BOOT_ID.read_text().strip() or None
+        except OSError:
+            return None
+
+    def _packages_token(self) -> Optional[tuple]:
+        paths = list(self.RPMDB_PATHS) + [self.OSTREE_STAGED, self.OSTREE_DEPLOY_ROOT]
+        try:
+            with os.scandir(self.OSTREE_DEPLOY_ROOT) as entries:
+                stateroots = sorted(e.path for e in entries if e.is_dir(follow_symlinks=False))
+        except OSError:
+            stateroots = []
+        paths.extend(os.path.join(root, "deploy") for root in stateroots)
+        return self._stat_stamp(paths)
+
+    def _user_services_token(self) -> Optional[tuple]:
+        """Enabling a unit adds a symlink to a .wants/ directory, bumping its mtime."""
+        paths = []
+        for unit_dir in self.USER_UNIT_DIRS:
+            paths.append(unit_dir)
+            try:
+                with os.scandir(unit_dir) as entries:
+                    paths.extend(sorted(e.path for e in entries if e.is_dir(follow_symlinks=False)))
+            except OSError:
+                continue
+        return self._stat_stamp(paths)
+
+    def _dnf_config_token(self) -> Optional[tuple]:
+        return self._stat_stamp((self.DNF_CONF,))
+
     # System state gathering methods
 
     def _get_kernel_params(self) -> List[str]:
@@ -302,32 +435,22 @@ class DriftDetector:
     def _get_dnf_config(self) -> str:
         """Get DNF configuration content."""
         try:
-            with open("/etc/dnf/dnf.conf", "r") as f:
+            with open(self.DNF_CONF, "r") as f:
                 return f.read()
         except OSError as e:
             logger.debug("Failed to read dnf config: %s", e)
             return ""
 
     def _get_sysctl_values(self) -> str:
-        """Get relevant sysctl values."""
-        keys = [
-            "vm.swappiness",
-            "net.ipv4.tcp_congestion_control",
-            "net.core.default_qdisc"
-        ]
-
+        """Get relevant sysctl values, read directly from /proc/sys."""
         values = []
-        for key in keys:
+        for key in self.SYSCTL_KEYS:
             try:
-                result = subprocess.run(
-                    ["sysctl", "-n", key],
-                    capture_output=True, text=True, check=False,
-                    timeout=15,
-                )
-                if result.returncode == 0:
-                    values.append(f"{key}={result.stdout.strip()}")
-            except (subprocess.SubprocessError, OSError) as e:
+                value = (self.SYSCTL_ROOT / key.replace(".", "/")).read_text().strip()
+            except OSError as e:
                 logger.debug("Failed to read sysctl %s: %s", key, e)
+                continue
+            values.append(f"{key}={value}")
 
         return "\n".join(values)
 
@@ -0,0 +1,241 @@
+"""
+FileWatcher - change notifications for config and plugin files.
+
+Uses Linux inotify (through libc via ctypes, no extra dependency) so a
+long-running process can block in ``select()`` on :meth:`FileWatcher.fileno`
+and wake only when a watched file changes.  Where inotify is unavailable
+(non-Linux, exhausted watch limits, seccomp sandboxes) the watcher falls
+back to comparing ``(mtime_ns, size, inode)`` stamps whenever
+:meth:`FileWatcher.read_changes` is called, and ``fileno()`` returns None so
+callers know they have to poll.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import struct
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+# Events that mean "the file's content may now be different".  Editors and
+# atomic writers replace files via rename, so directory-level events are
+# watched rather than the file inode itself.
+WATCH_MASK = (
+    IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE
+    | IN_ATTRIB | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+)
+
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+_Stamp = Optional[Tuple[int, int, int]]
+
+
+def _load_libc():
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        return libc
+    except (OSError, AttributeError) as e:
+        logger.debug("inotify not available: %s", e)
+        return None
+
+
+def _stamp(path: Path) -> _Stamp:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class FileWatcher:
+    """Watches a set of directories for changes to (optionally) named entries.
+
+    Example::
+
+        watcher = FileWatcher()
+        watcher.watch(config_dir, names={"scheduler.json"})
+        select.select([watcher.fileno()], [], [], timeout)
+        changed = watcher.read_changes()   # {Path(".../scheduler.json")}
+    """
+
+    def __init__(self, use_inotify: bool = True):
+        self._fd: Optional[int] = None
+        self._wds: Dict[int, Path] = {}
+        self._names: Dict[Path, Optional[Set[str]]] = {}
+        self._stamps: Dict[Path, _Stamp] = {}
+        if use_inotify:
+            self._init_inotify()
+
+    def _init_inotify(self) -> None:
+        libc = _load_libc()
+        if libc is None:
+            return
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            logger.debug("inotify_init1 failed: %s", os.strerror(ctypes.get_errno()))
+            return
+        self._libc = libc
+        self._fd = fd
+
+    @property
+    def uses_inotify(self) -> bool:
+        """True when change notifications come from the kernel."""
+        return self._fd is not None
+
+    def fileno(self) -> Optional[int]:
+        """Return the inotify descriptor for ``select()``, or None when polling."""
+        return self._fd
+
+    def watch(self, directory: Path, names: Optional[Iterable[str]] = None) -> bool:
+        """Watch *directory*; report only *names* inside it when given.
+
+        Returns False if the directory cannot be watched (it is still
+        covered by stamp polling).
+        """
+        directory = Path(directory)
+        self._names[directory] = set(names) if names is not None else None
+        for path in self._polled_paths(directory):
+            self._stamps[path] = _stamp(path)
+
+        if self._fd is None:
+            return False
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(str(directory)), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            logger.debug("inotify_add_watch(%s) failed: %s", directory, os.strerror(err))
+            if err in (errno.ENOSPC, errno.EMFILE):
+                self._fall_back_to_polling()
+            return False
+        self._wds[wd] = directory
+        return True
+
+    def unwatch(self, directory: Path) -> None:
+        """Stop watching *directory*; unknown directories are ignored."""
+        directory = Path(directory)
+        if self._names.pop(directory, ()) == ():
+            return
+        for path in [p for p in self._stamps if p.parent == directory]:
+            del self._stamps[path]
+        for wd in [wd for wd, watched in self._wds.items() if watched == directory]:
+            del self._wds[wd]
+            if self._fd is not None:
+                self._libc.inotify_rm_watch(self._fd, wd)
+
+    @property
+    def watched(self) -> Set[Path]:
+        """Directories currently being watched."""
+        return set(self._names)
+
+    def _polled_paths(self, directory: Path) -> Set[Path]:
+        names = self._names.get(directory)
+        if names is not None:
+            return {directory / name for name in names}
+        try:
+            return set(directory.iterdir())
+        except OSError:
+            return set()
+
+    def _fall_back_to_polling(self) -> None:
+        logger.info("inotify watch limit reached, falling back to polling")
+        self.close()
+
+    def read_changes(self) -> Set[Path]:
+        """Return the watched paths that changed since the last call.
+
+        Never blocks.  With inotify this drains pending events; otherwise it
+        compares file stamps.
+        """
+        if self._fd is None:
+            return self._poll_changes()
+
+        changed: Set[Path] = set()
+        while True:
+            try:
+                buf = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                logger.debug("inotify read failed: %s", e)
+                break
+            if not buf:
+                break
+            changed |= self._parse_events(buf)
+        return changed
+
+    def _parse_events(self, buf: bytes) -> Set[Path]:
+        changed: Set[Path] = set()
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(buf):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(buf, offset)
+            offset += _EVENT_HEADER.size
+            raw_name = buf[offset:offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were lost; report every watched entry as changed.
+                for directory in self._names:
+                    changed |= self._polled_paths(directory)
+                continue
+            directory = self._wds.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                del self._wds[wd]
+                continue
+            if not raw_name:
+                changed.add(directory)
+                continue
+            name = os.fsdecode(raw_name)
+            names = self._names.get(directory)
+            if names is None or name in names:
+                changed.add(directory / name)
+        return changed
+
+    def _poll_changes(self) -> Set[Path]:
+        changed: Set[Path] = set()
+        current: Dict[Path, _Stamp] = {}
+        for directory in self._names:
+            for path in self._polled_paths(directory):
+                current[path] = _stamp(path)
+        for path in set(current) | set(self._stamps):
+            if current.get(path) != self._stamps.get(path):
+                changed.add(path)
+        self._stamps = current
+        return changed
+
+    def close(self) -> None:
+        """Release the inotify descriptor; the watcher keeps working by polling."""
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+            self._fd = None
+            self._wds.clear()
+            for directory in self._names:
+                for path in self._polled_paths(directory):
+                    self._stamps[path] = _stamp(path)
@@ -17,9 +17,10 @@ import sqlite3
 import statistics
 import subprocess
 import time
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from utils.containers import Result
+from utils.storage_inventory import StorageInventory
 
 logger = logging.getLogger(__name__)
 
@@ -134,6 +135,42 @@ class HealthTimeline:
         except sqlite3.Error as e:
             return Result(False, f"Database error: {e}")
 
+    def record_metrics(
+        self, samples: List[Tuple[str, float, str, Optional[dict]]]
+    ) -> Result:
+        """
+        Record several metric data points in one transaction.
+
+        Args:
+            samples: (metric_type, value, unit, metadata) tuples.
+
+        Returns:
+            Result indicating success or failure.
+        """
+        if any(not sample[0] for sample in samples):
+            return Result(False, "Metric type cannot be empty.")
+
+        ts = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime())
+        rows = [
+            (ts, metric_type, value, unit, json.dumps(metadata) if metadata else "")
+            for metric_type, value, unit, metadata in samples
+        ]
+
+        try:
+            conn = self._get_conn()
+            try:
+                conn.executemany(
+                    "INSERT INTO metrics (timestamp, metric_type, value, unit, metadata) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                conn.commit()
+            finally:
+                self._close_conn(conn)
+            return Result(True, f"Recorded {len(rows)} metrics")
+        except sqlite3.Error as e:
+            return Result(False, f"Database error: {e}")
+
     def record_snapshot(self) -> Result:
         """
         Record a full system snapshot: CPU temp, RAM %, disk %, load avg.
@@ -510,6 +547,10 @@ class HealthTimeline:
         Returns:
             Disk usage as a percentage (0-100).
         """
+        inventory = StorageInventory.shared()
+        usage = inventory.usage("/") if inventory is not None else None
+        if usage is not None:
+            return usage.percent_used
         try:
             st = os.statvfs("/")
             total = st.f_blocks * st.f_frsize
@@ -0,0 +1,136 @@
+"""
+Persisted JSON stores shared by the CLI and the GUI.
+
+The small caches under ``~/.cache/loofi-fedora-tweaks`` (snapshot listings,
+directory sizes, boot history, SMART readings, plugin digests) are each one
+``{"format": N, "<key>": ...}`` document that every process reads and
+rewrites whole.  :class:`JsonStore` holds that plumbing once: one instance
+per path and process, a reload when another process replaced the file, and
+private atomic writes.
+
+:func:`is_racy` is the single check for stamps that cannot be trusted yet:
+a file or directory modified within ``RACY_SECONDS`` may be changed again
+inside the same timestamp tick without its stamp moving.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Type, TypeVar
+
+logger = logging.getLogger(__name__)
+
+RACY_SECONDS = 2.0
+
+_Store = TypeVar("_Store", bound="JsonStore")
+
+
+def is_racy(mtime_ns: int, now: Optional[float] = None) -> bool:
+    """True if something last modified at *mtime_ns* is too recent to trust."""
+    now = time.time() if now is None else now
+    return now - mtime_ns / 1e9 < RACY_SECONDS
+
+
+def write_private_json(path: Path, payload: Any) -> os.stat_result:
+    """
+    Atomically replace *path* with *payload* as compact JSON, mode 0600.
+
+    The temporary name carries the process and thread id so concurrent
+    writers never share it.  Returns the new file's stat; raises OSError
+    after removing the temporary file.
+    """
+    data = json.dumps(payload, separators=(",", ":"))
+    tmp = f"{path}.tmp.{os.getpid()}.{threading.get_ident()}"
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        return os.stat(path)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class JsonStore:
+    """
+    Base class for a persisted ``{"format": FORMAT, DATA_KEY: ...}`` document.
+
+    Subclasses set FORMAT, DATA_KEY, DATA_TYPE and LABEL and implement
+    :meth:`default_path`.  Methods hold ``self._lock``, call :meth:`_sync`
+    before reading ``self._data`` and :meth:`_write` after changing it.
+    A file with another format version, or that cannot be parsed, reads as
+    empty.
+    """
+
+    FORMAT = 1
+    DATA_KEY = "entries"
+    DATA_TYPE: type = dict
+    LABEL = "JSON store"
+
+    _instances: Dict[Tuple[type, Path], "JsonStore"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._data: Any = self.DATA_TYPE()
+        self._file_stamp: Optional[tuple] = None
+
+    @classmethod
+    def default_path(cls) -> Path:
+        """Path used by :meth:`shared` when none is given."""
+        raise NotImplementedError
+
+    @classmethod
+    def shared(cls: Type[_Store], path: Optional[Path] = None) -> _Store:
+        """Return the process-wide instance for *path* (default: :meth:`default_path`)."""
+        path = Path(path or cls.default_path())
+        with cls._instances_lock:
+            store = cls._instances.get((cls, path))
+            if store is None:
+                store = cls._instances[(cls, path)] = cls(path)
+            return store  # type: ignore[return-value]
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Forget this class's in-memory instances (the files on disk are kept)."""
+        with cls._instances_lock:
+            for key in [key for key in cls._instances if key[0] is cls]:
+                del cls._instances[key]
+
+    def _sync(self) -> None:
+        """Reload the file if it changed on disk since we last read or wrote it."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return
+        stamp = (st.st_ino, st.st_size, st.st_mtime_ns)
+        if stamp == self._file_stamp:
+            return
+        self._file_stamp = stamp
+        data = self.DATA_TYPE()
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+            if isinstance(raw, dict) and raw.get("format") == self.FORMAT:
+                if isinstance(raw.get(self.DATA_KEY), self.DATA_TYPE):
+                    data = raw[self.DATA_KEY]
+        except (OSError, ValueError) as exc:
+            logger.debug("%s not loaded: %s", self.LABEL, exc)
+        self._data = data
+
+    def _write(self) -> None:
+        """Persist ``self._data``; a failed write only loses the cache."""
+        try:
+            st = write_private_json(self.path, {"format": self.FORMAT, self.DATA_KEY: self._data})
+        except OSError as exc:
+            logger.debug("Failed to write %s: %s", self.LABEL, exc)
+            return
+        self._file_stamp = (st.st_ino, st.st_size, st.st_mtime_ns)
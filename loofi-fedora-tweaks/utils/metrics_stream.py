@@ -0,0 +1,340 @@
+"""
+Live metrics and event fan-out for the Web API streaming endpoints.
+
+One ``MetricsBroadcaster`` per app runs a single sampling loop, no matter
+how many dashboards are connected.  Each client gets a ``StreamSubscriber``
+with its own field selection, interval and bounded queue; a slow client
+only loses its own oldest snapshots and never stalls the sampler or other
+clients.  ``EventStreamBridge`` does the same for EventBus topics, holding
+one bus subscription per topic regardless of client count.
+"""
+
+import asyncio
+import logging
+import re
+import threading
+import time
+from dataclasses import asdict
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from utils.event_bus import Event, EventBus
+
+logger = logging.getLogger(__name__)
+
+# Metric groups a client may select with ``fields=``.
+METRIC_FIELDS = ("cpu", "memory", "load", "network", "disk_io")
+
+DEFAULT_INTERVAL_SECONDS = 2.0
+MIN_INTERVAL_SECONDS = 0.5
+MAX_INTERVAL_SECONDS = 60.0
+
+# Per-client queue depth; when full the oldest pending item is dropped.
+CLIENT_QUEUE_SIZE = 8
+
+# Subscribers due within this window share the sample being taken now.
+_DUE_SLACK_SECONDS = 0.05
+
+# EventBus topics mirrored when a client does not pick its own.
+DEFAULT_EVENT_TOPICS = (
+    "system.power.battery",
+    "system.thermal.throttling",
+    "system.storage.low",
+    "security.firewall.panic",
+    "network.connection.public",
+)
+MAX_EVENT_TOPICS = 32
+_TOPIC_RE = re.compile(r"^[A-Za-z0-9_.\-]{1,128}$")
+
+
+def parse_fields(raw: Optional[str]) -> FrozenSet[str]:
+    """Parse a comma-separated ``fields=`` value.
+
+    Raises:
+        ValueError: If an unknown metric group is requested.
+    """
+    if not raw:
+        return frozenset(METRIC_FIELDS)
+    fields = {f.strip() for f in raw.split(",") if f.strip()}
+    unknown = sorted(fields - set(METRIC_FIELDS))
+    if unknown:
+        raise ValueError(f"Unknown metric fields: {', '.join(unknown)}")
+    return frozenset(fields) or frozenset(METRIC_FIELDS)
+
+
+def parse_topics(raw: Optional[str]) -> FrozenSet[str]:
+    """Parse a comma-separated ``topics=`` value.
+
+    Raises:
+        ValueError: If a topic name is malformed or too many are requested.
+    """
+    if not raw:
+        return frozenset(DEFAULT_EVENT_TOPICS)
+    topics = {t.strip() for t in raw.split(",") if t.strip()}
+    bad = sorted(t for t in topics if not _TOPIC_RE.match(t))
+    if bad:
+        raise ValueError(f"Invalid event topics: {', '.join(bad)}")
+    if len(topics) > MAX_EVENT_TOPICS:
+        raise ValueError(f"At most {MAX_EVENT_TOPICS} topics per stream")
+    return frozenset(topics) or frozenset(DEFAULT_EVENT_TOPICS)
+
+
+def clamp_interval(interval: float) -> float:
+    """Clamp a requested interval into the supported range."""
+    return min(max(float(interval), MIN_INTERVAL_SECONDS), MAX_INTERVAL_SECONDS)
+
+
+class StreamSubscriber:
+    """One connected client: its selection and a bounded drop-oldest queue."""
+
+    def __init__(
+        self,
+        selection: FrozenSet[str],
+        interval: float = 0.0,
+        queue_size: int = CLIENT_QUEUE_SIZE,
+    ):
+        self.selection = selection
+        self.interval = interval
+        self.next_due = 0.0
+        self.dropped = 0
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=queue_size)
+        self.loop = asyncio.get_running_loop()
+
+    def offer(self, item: Dict[str, Any]) -> None:
+        """Enqueue *item*, evicting the oldest pending item if the client lags."""
+        if self.queue.full():
+            try:
+                self.queue.get_nowait()
+                self.dropped += 1
+            except asyncio.QueueEmpty:
+                pass
+        self.queue.put_nowait(item)
+
+    def offer_threadsafe(self, item: Dict[str, Any]) -> None:
+        """Enqueue *item* from a thread other than the subscriber's loop."""
+        try:
+            self.loop.call_soon_threadsafe(self.offer, item)
+        except RuntimeError:
+            # Loop already closed; the client is gone.
+            pass
+
+    async def get(self) -> Dict[str, Any]:
+        """Wait for the next item."""
+        return await self.queue.get()
+
+
+class MetricsBroadcaster:
+    """Single sampling loop fanned out to every metrics subscriber.
+
+    The loop only runs while at least one client is subscribed.  Each tick
+    samples the union of fields wanted by the subscribers that are due and
+    hands every one of them the same snapshot, filtered to its selection.
+    New subscribers are phase-aligned to the last sample so clients with
+    equal intervals share every sample.
+    """
+
+    def __init__(
+        self,
+        sampler: Optional[Callable[[FrozenSet[str]], Dict[str, Any]]] = None,
+        queue_size: int = CLIENT_QUEUE_SIZE,
+    ):
+        """Initialize the broadcaster.
+
+        Args:
+            sampler: Blocking callable returning ``{field: value}`` for the
+                requested fields.  Defaults to a ``PerformanceCollector``.
+            queue_size: Per-client queue depth.
+        """
+        self._sampler = sampler or self._default_sampler
+        self._queue_size = queue_size
+        self._subscribers: List[StreamSubscriber] = []
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._collector = None
+        self._last_sample: Optional[Dict[str, Any]] = None
+        self._last_sample_time = 0.0
+        self._pending: Optional[Tuple[List[StreamSubscriber], FrozenSet[str], float]] = None
+        self._seq = 0
+        self.samples = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(
+        self,
+        fields: Optional[Iterable[str]] = None,
+        interval: float = DEFAULT_INTERVAL_SECONDS,
+    ) -> StreamSubscriber:
+        """Register a client and make sure the sampling loop is running.
+
+        Must be called from the event loop that will consume the stream.
+        """
+        selection = frozenset(fields) if fields else frozenset(METRIC_FIELDS)
+        subscriber = StreamSubscriber(selection, clamp_interval(interval), self._queue_size)
+
+        now = time.monotonic()
+        last = self._last_sample
+        if (
+            last is not None
+            and now - self._last_sample_time < MIN_INTERVAL_SECONDS
+            and selection <= last.keys()
+        ):
+            subscriber.offer(self._message(last, selection))
+            subscriber.next_due = self._last_sample_time + subscriber.interval
+        elif self._pending is not None and selection <= self._pending[1]:
+            # Join the sample that is being taken right now.
+            self._pending[0].append(subscriber)
+            subscriber.next_due = self._pending[2] + subscriber.interval
+        else:
+            subscriber.next_due = now
+
+        self._subscribers.append(subscriber)
+        self._ensure_running()
+        return subscriber
+
+    def unsubscribe(self, subscriber: StreamSubscriber) -> None:
+        """Remove a client; the loop stops on its own when none are left."""
+        if subscriber in self._subscribers:
+            self._subscribers.remove(subscriber)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _ensure_running(self) -> None:
+        loop = asyncio.get_running_loop()
+        task = self._task
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._run())
+        elif self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        wakeup = self._wakeup
+        assert wakeup is not None
+        try:
+            while self._subscribers:
+                now = time.monotonic()
+                due = [s for s in self._subscribers if s.next_due <= now + _DUE_SLACK_SECONDS]
+                if due:
+                    await self._tick(due, now)
+                    continue
+
+                delay = min(s.next_due for s in self._subscribers) - time.monotonic()
+                wakeup.clear()
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=max(delay, 0.0))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if self._task is asyncio.current_task():
+                self._task = None
+
+    async def _tick(self, due: List[StreamSubscriber], now: float) -> None:
+        fields: Set[str] = set()
+        for subscriber in due:
+            fields |= subscriber.selection
+            subscriber.next_due = now + subscriber.interval
+
+        self._pending = (due, frozenset(fields), now)
+        try:
+            snapshot = await asyncio.to_thread(self._sampler, frozenset(fields))
+        except (OSError, ValueError, TypeError, RuntimeError) as e:
+            logger.debug("Metrics sampling failed: %s", e)
+            return
+        finally:
+            self._pending = None
+
+        self.samples += 1
+        self._seq += 1
+        self._last_sample = snapshot
+        self._last_sample_time = now
+        for subscriber in due:
+            if subscriber in self._subscribers:
+                subscriber.offer(self._message(snapshot, subscriber.selection))
+
+    def _message(self, snapshot: Dict[str, Any], selection: FrozenSet[str]) -> Dict[str, Any]:
+        message: Dict[str, Any] = {"seq": self._seq, "timestamp": time.time()}
+        message.update({k: v for k, v in snapshot.items() if k in selection})
+        return message
+
+    def _default_sampler(self, fields: FrozenSet[str]) -> Dict[str, Any]:
+        """Sample the requested metric groups (blocking; runs in a worker thread)."""
+        from utils.monitor import SystemMonitor
+        from utils.performance import PerformanceCollector
+
+        if self._collector is None:
+            self._collector = PerformanceCollector()
+        collectors = {
+            "cpu": self._collector.collect_cpu,
+            "memory": self._collector.collect_memory,
+            "network": self._collector.collect_network,
+            "disk_io": self._collector.collect_disk_io,
+            "load": SystemMonitor.get_cpu_info,
+        }
+        snapshot: Dict[str, Any] = {}
+        for field in fields:
+            sample = collectors[field]()
+            snapshot[field] = asdict(sample) if sample is not None else None
+        return snapshot
+
+
+class EventStreamBridge:
+    """Mirrors EventBus topics onto per-client streams.
+
+    Holds one bus subscription per topic while any client wants it.  Bus
+    callbacks run on EventBus worker threads and are handed to each
+    client's event loop thread-safely.
+    """
+
+    def __init__(self, bus: Optional[EventBus] = None, queue_size: int = CLIENT_QUEUE_SIZE):
+        self._bus = bus or EventBus()
+        self._queue_size = queue_size
+        self._lock = threading.Lock()
+        self._by_topic: Dict[str, List[StreamSubscriber]] = {}
+
+    @property
+    def topics(self) -> FrozenSet[str]:
+        with self._lock:
+            return frozenset(self._by_topic)
+
+    def subscribe(self, topics: Iterable[str]) -> StreamSubscriber:
+        """Register a client for *topics*; call from the consuming event loop."""
+        subscriber = StreamSubscriber(frozenset(topics), queue_size=self._queue_size)
+        new_topics = []
+        with self._lock:
+            for topic in subscriber.selection:
+                if topic not in self._by_topic:
+                    self._by_topic[topic] = []
+                    new_topics.append(topic)
+                self._by_topic[topic].append(subscriber)
+        for topic in new_topics:
+            self._bus.subscribe(topic, self._on_event, subscriber_id="web-api-stream")
+        return subscriber
+
+    def unsubscribe(self, subscriber: StreamSubscriber) -> None:
+        """Remove a client and release bus subscriptions nobody needs."""
+        idle_topics = []
+        with self._lock:
+            for topic in subscriber.selection:
+                clients = self._by_topic.get(topic)
+                if not clients:
+                    continue
+                if subscriber in clients:
+                    clients.remove(subscriber)
+                if not clients:
+                    del self._by_topic[topic]
+                    idle_topics.append(topic)
+        for topic in idle_topics:
+            self._bus.unsubscribe(topic, self._on_event, subscriber_id="web-api-stream")
+
+    def _on_event(self, event: Event) -> None:
+        with self._lock:
+            clients = list(self._by_topic.get(event.topic, ()))
+        message = {
+            "topic": event.topic,
+            "data": event.data,
+            "source": event.source,
+            "timestamp": time.time(),
+        }
+        for subscriber in clients:
+            subscriber.offer_threadsafe(message)
@@ -0,0 +1,305 @@
+"""
+Netlink helpers - kernel network state without spawning ``ip``/``ss``.
+
+Talks rtnetlink over a plain ``AF_NETLINK`` socket from the standard
+library (no pyroute2).  :class:`LinkAddressCache` dumps links and IPv4
+addresses once, then stays subscribed to the link/address multicast groups
+so later changes are queued by the kernel and applied by a non-blocking
+drain in :meth:`LinkAddressCache.refresh`.  An idle refresh is a single
+``recv`` that returns EAGAIN, whatever the number of interfaces.
+
+:func:`inet_diag_dump` lists TCP/UDP sockets through NETLINK_SOCK_DIAG,
+one binary dump instead of formatting and re-parsing /proc/net text.
+
+Everything degrades to "unavailable" (constructors raise OSError) on
+kernels or sandboxes without netlink; callers keep their sysfs/subprocess
+fallbacks for that case.
+"""
+
+import errno
+import logging
+import os
+import socket
+import struct
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# linux/netlink.h
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+NLM_F_REQUEST = 0x1
+NLM_F_MULTI = 0x2
+NLM_F_DUMP = 0x300
+
+# linux/sock_diag.h, linux/inet_diag.h
+NETLINK_SOCK_DIAG = 4
+SOCK_DIAG_BY_FAMILY = 20
+
+# linux/rtnetlink.h
+RTM_NEWLINK = 16
+RTM_DELLINK = 17
+RTM_GETLINK = 18
+RTM_NEWADDR = 20
+RTM_DELADDR = 21
+RTM_GETADDR = 22
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+
+# linux/if_link.h, linux/if_addr.h
+IFLA_IFNAME = 3
+IFLA_OPERSTATE = 16
+IF_OPER_UP = 6
+IFA_ADDRESS = 1
+IFA_LOCAL = 2
+
+NLMSGHDR = struct.Struct("=IHHII")
+NLMSGERR = struct.Struct("=i")
+IFINFOMSG = struct.Struct("=BxHiII")
+IFADDRMSG = struct.Struct("=BBBBI")
+RTATTR = struct.Struct("=HH")
+# inet_diag_req_v2: family, protocol, ext, pad, states, inet_diag_sockid
+INET_DIAG_REQ_V2 = struct.Struct("=BBBxI48s")
+# inet_diag_msg: family, state, timer, retrans, sport, dport (big endian),
+# src, dst, if, cookie, expires, rqueue, wqueue, uid, inode
+INET_DIAG_MSG = struct.Struct("=BBBB2s2s16s16sI8sIIIII")
+
+_RECV_SIZE = 256 * 1024
+
+
+def _align(length: int) -> int:
+    return (length + 3) & ~3
+
+
+def iter_messages(buf: bytes) -> Iterator[Tuple[int, int, bytes]]:
+    """Yield ``(type, flags, payload)`` for every netlink message in *buf*."""
+    offset = 0
+    while offset + NLMSGHDR.size <= len(buf):
+        length, msg_type, flags, _seq, _pid = NLMSGHDR.unpack_from(buf, offset)
+        if length < NLMSGHDR.size or offset + length > len(buf):
+            break
+        yield msg_type, flags, buf[offset + NLMSGHDR.size:offset + length]
+        offset += _align(length)
+
+
+def parse_attrs(buf: bytes, offset: int = 0) -> Dict[int, bytes]:
+    """Parse a run of rtattr/nlattr records into ``{type: payload}``."""
+    attrs: Dict[int, bytes] = {}
+    while offset + RTATTR.size <= len(buf):
+        length, attr_type = RTATTR.unpack_from(buf, offset)
+        if length < RTATTR.size:
+            break
+        attrs[attr_type & 0x3FFF] = buf[offset + RTATTR.size:offset + length]
+        offset += _align(length)
+    return attrs
+
+
+def open_socket(protocol: int, groups: int = 0) -> socket.socket:
+    """Open a non-blocking netlink socket; raises OSError when unsupported."""
+    if not hasattr(socket, "AF_NETLINK"):
+        raise OSError(errno.EAFNOSUPPORT, "netlink is not available on this platform")
+    sock = socket.socket(
+        socket.AF_NETLINK, socket.SOCK_RAW | socket.SOCK_CLOEXEC, protocol
+    )
+    try:
+        sock.bind((0, groups))
+        sock.setblocking(False)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def dump(protocol: int, msg_type: int, payload: bytes, timeout: float = 2.0) -> List[Tuple[int, bytes]]:
+    """Send a dump request and collect ``(type, payload)`` replies until NLMSG_DONE."""
+    sock = open_socket(protocol)
+    try:
+        sock.settimeout(timeout)
+        header = NLMSGHDR.pack(
+            NLMSGHDR.size + len(payload), msg_type, NLM_F_REQUEST | NLM_F_DUMP, 1, 0
+        )
+        sock.send(header + payload)
+        replies: List[Tuple[int, bytes]] = []
+        while True:
+            buf = sock.recv(_RECV_SIZE)
+            if not buf:
+                return replies
+            for reply_type, _flags, body in iter_messages(buf):
+                if reply_type == NLMSG_DONE:
+                    return replies
+                if reply_type == NLMSG_ERROR:
+                    code = NLMSGERR.unpack_from(body)[0] if len(body) >= 4 else -errno.EIO
+                    if code:
+                        raise OSError(-code, os.strerror(-code))
+                    continue
+                replies.append((reply_type, body))
+    finally:
+        sock.close()
+
+
+def inet_diag_dump(family: int, protocol: int) -> List[Tuple[int, bytes, int, bytes, int, int]]:
+    """
+    List every socket of *family*/*protocol* through NETLINK_SOCK_DIAG.
+
+    Returns:
+        ``(state, src, sport, dst, dport, inode)`` tuples; addresses are raw
+        network-order bytes (4 significant bytes for AF_INET, 16 for AF_INET6).
+
+    Raises:
+        OSError: sock_diag (or the protocol's diag module) is unavailable.
+    """
+    request = INET_DIAG_REQ_V2.pack(family, protocol, 0, 0xFFFFFFFF, b"\0" * 48)
+    sockets = []
+    for msg_type, body in dump(NETLINK_SOCK_DIAG, SOCK_DIAG_BY_FAMILY, request):
+        if msg_type != SOCK_DIAG_BY_FAMILY or len(body) < INET_DIAG_MSG.size:
+            continue
+        (_family, state, _timer, _retrans, sport, dport, src, dst,
+         _if, _cookie, _expires, _rq, _wq, _uid, inode) = INET_DIAG_MSG.unpack_from(body)
+        sockets.append((
+            state, src, int.from_bytes(sport, "big"), dst, int.from_bytes(dport, "big"), inode,
+        ))
+    return sockets
+
+
+@dataclass
+class _Link:
+    name: str
+    is_up: bool
+    addresses: List[str] = field(default_factory=list)
+
+
+class LinkAddressCache:
+    """
+    Interface up/down state and IPv4 addresses, kept current by rtnetlink.
+
+    ``is_up`` follows the kernel operstate, matching
+    ``/sys/class/net/<iface>/operstate == "up"``.  ``ipv4`` is the first
+    (primary) local IPv4 address, as ``ip -4 addr show`` would list it.
+
+    Example::
+
+        cache = LinkAddressCache()
+        cache.refresh()             # applies queued change notifications
+        cache.get("eth0")           # (True, "192.168.1.5")
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._links: Dict[int, _Link] = {}
+        self._by_name: Dict[str, int] = {}
+        self._sock = open_socket(socket.NETLINK_ROUTE, RTMGRP_LINK | RTMGRP_IPV4_IFADDR)
+        try:
+            self._resync()
+        except OSError:
+            self._sock.close()
+            raise
+
+    def fileno(self) -> int:
+        """Descriptor that becomes readable when link/address changes are queued."""
+        return self._sock.fileno()
+
+    def _resync(self) -> None:
+        """Replace the cached state with a full dump (subscription already open)."""
+        links: Dict[int, _Link] = {}
+        for msg_type, body in dump(socket.NETLINK_ROUTE, RTM_GETLINK, IFINFOMSG.pack(0, 0, 0, 0, 0)):
+            self._apply(links, msg_type, body)
+        for msg_type, body in dump(
+            socket.NETLINK_ROUTE, RTM_GETADDR, IFADDRMSG.pack(socket.AF_INET, 0, 0, 0, 0)
+        ):
+            self._apply(links, msg_type, body)
+        self._links = links
+        self._by_name = {link.name: index for index, link in links.items()}
+
+    @staticmethod
+    def _apply(links: Dict[int, _Link], msg_type: int, body: bytes) -> None:
+        if msg_type in (RTM_NEWLINK, RTM_DELLINK) and len(body) >= IFINFOMSG.size:
+            _family, _type, index, _flags, _change = IFINFOMSG.unpack_from(body)
+            if msg_type == RTM_DELLINK:
+                links.pop(index, None)
+                return
+            attrs = parse_attrs(body, IFINFOMSG.size)
+            link = links.get(index)
+            name = attrs.get(IFLA_IFNAME, b"").split(b"\0", 1)[0].decode(errors="replace")
+            operstate = attrs.get(IFLA_OPERSTATE)
+            is_up = bool(operstate) and operstate[0] == IF_OPER_UP
+            if link is None:
+                links[index] = _Link(name=name, is_up=is_up)
+            else:
+                link.name = name or link.name
+                if operstate is not None:
+                    link.is_up = is_up
+        elif msg_type in (RTM_NEWADDR, RTM_DELADDR) and len(body) >= IFADDRMSG.size:
+            family, _prefix, _flags, _scope, index = IFADDRMSG.unpack_from(body)
+            if family != socket.AF_INET:
+                return
+            attrs = parse_attrs(body, IFADDRMSG.size)
+            raw = attrs.get(IFA_LOCAL) or attrs.get(IFA_ADDRESS)
+            if not raw or len(raw) != 4:
+                return
+            address = socket.inet_ntoa(raw)
+            link = links.get(index)
+            if link is None:
+                return
+            if msg_type == RTM_NEWADDR:
+                if address not in link.addresses:
+                    link.addresses.append(address)
+            elif address in link.addresses:
+                link.addresses.remove(address)
+
+    def refresh(self) -> bool:
+        """Apply queued change notifications; returns True if anything changed."""
+        with self._lock:
+            changed = False
+            while True:
+                try:
+                    buf = self._sock.recv(_RECV_SIZE)
+                except BlockingIOError:
+                    break
+                except OSError as e:
+                    if e.errno != errno.ENOBUFS:
+                        logger.debug("rtnetlink read failed: %s", e)
+                        break
+                    # The kernel dropped notifications; start over from a dump.
+                    logger.debug("rtnetlink queue overflow, resynchronising")
+                    self._drain()
+                    self._resync()
+                    return True
+                if not buf:
+                    break
+                for msg_type, _flags, body in iter_messages(buf):
+                    self._apply(self._links, msg_type, body)
+                    changed = True
+            if changed:
+                self._by_name = {link.name: index for index, link in self._links.items()}
+            return changed
+
+    def _drain(self) -> None:
+        while True:
+            try:
+                if not self._sock.recv(_RECV_SIZE):
+                    return
+            except OSError:
+                return
+
+    def get(self, name: str) -> Optional[Tuple[bool, str]]:
+        """Return ``(is_up, ipv4)`` for interface *name*, or None if unknown."""
+        with self._lock:
+            index = self._by_name.get(name)
+            link = self._links.get(index) if index is not None else None
+            if link is None:
+                return None
+            return link.is_up, (link.addresses[0] if link.addresses else "")
+
+    def snapshot(self) -> Dict[str, Tuple[bool, str]]:
+        """Return ``{name: (is_up, ipv4)}`` for every known interface."""
+        with self._lock:
+            return {
+                link.name: (link.is_up, link.addresses[0] if link.addresses else "")
+                for link in self._links.values()
+            }
+
+    def close(self) -> None:
+        """Stop listening for changes."""
+        self._sock.close()
@@ -2,9 +2,10 @@
 Network Monitor - Per-interface and per-application network traffic tracking.
 Part of v9.2 "Pulse" update.
 
-Reads traffic stats from /proc/net/dev, interface state from /sys/class/net,
-and active connections from /proc/net/tcp{,6} and /proc/net/udp{,6}.
-No external dependencies (no psutil).
+Reads traffic stats from /proc/net/dev, interface state and addresses from
+an rtnetlink-fed cache (falling back to /sys/class/net and ``ip``), and
+active connections from a sock_diag netlink dump (falling back to
+/proc/net/tcp{,6} and /proc/net/udp{,6}).  No external dependencies (no psutil).
 """
 
 import logging
@@ -12,12 +13,17 @@ import os
 import socket
 import struct
 import subprocess
+import threading
 import time
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Set, Tuple
+
+from utils.netlink import LinkAddressCache, inet_diag_dump
 
 logger = logging.getLogger(__name__)
 
+_V4_MAPPED_PREFIX = b"\x00" * 10 + b"\xff\xff"
+
 
 @dataclass
 class InterfaceStats:
@@ -65,6 +71,15 @@ class ConnectionInfo:
     process_name: str
 
 
+@dataclass
+class _PidSockets:
+    """Socket inodes held by one process when its fd table was last read."""
+
+    fd_count: Optional[int]
+    name: str
+    inodes: Tuple[str, ...]
+
+
 class NetworkMonitor:
     """
     Monitors network interfaces and active connections.
@@ -76,6 +91,37 @@ class NetworkMonitor:
     # Previous readings for rate calculation: {iface_name: (timestamp, bytes_sent, bytes_recv)}
     _previous_readings: Dict[str, Tuple[float, int, int]] = {}
 
+    # Link state/address cache kept current by rtnetlink notifications.
+    # None = not tried yet, False = netlink unavailable (use sysfs + ``ip``).
+    _link_cache = None
+    _link_cache_lock = threading.Lock()
+    # Interface classification by name; only used while the link cache is live.
+    _type_cache: Dict[str, str] = {}
+
+    # Socket inode -> (pid, name) map, refreshed incrementally by
+    # _build_inode_pid_map().  Every process is re-read at least this often.
+    FULL_SCAN_INTERVAL = 30.0
+    _owner_lock = threading.Lock()
+    _pid_sockets: Dict[int, _PidSockets] = {}
+    _inode_owners: Dict[str, Tuple[int, str]] = {}
+    _unresolved_inodes: frozenset = frozenset()
+    _last_full_scan: Optional[float] = None
+    # Protocols whose sock_diag dump failed; read from /proc from then on.
+    _diag_unavailable: Set[str] = set()
+
+    # Every caller (Network tab, PortAuditor, CLI) within this many seconds
+    # shares one connection snapshot: (monotonic time, connections).
+    SNAPSHOT_TTL = 1.0
+    _snapshot: Optional[Tuple[float, List[ConnectionInfo]]] = None
+    _snapshot_lock = threading.Lock()
+
+    _SOCKET_TABLES = (
+        ("tcp", "/proc/net/tcp", False),
+        ("tcp6", "/proc/net/tcp6", True),
+        ("udp", "/proc/net/udp", False),
+        ("udp6", "/proc/net/udp6", True),
+    )
+
     # TCP connection states mapped from the hex value in /proc/net/tcp
     _TCP_STATES = {
         "01": "ESTABLISHED",
@@ -100,9 +146,12 @@ class NetworkMonitor:
         """
         Return traffic statistics for every network interface.
 
-        Reads counters from /proc/net/dev, link state from
-        /sys/class/net/<iface>/operstate, and classifies type by
-        name pattern and /sys/class/net/<iface>/type.
+        Reads counters from /proc/net/dev and link state and IPv4 address
+        from the rtnetlink cache (one non-blocking read per call, whatever
+        the interface count).  Without netlink it falls back to
+        /sys/class/net/<iface>/operstate and ``ip -4 addr show`` per
+        interface.  Type is classified by name pattern and
+        /sys/class/net/<iface>/type.
 
         Returns:
             List of InterfaceStats, one per interface.  Empty list on error.
@@ -113,6 +162,13 @@ class NetworkMonitor:
 
         now = time.monotonic()
         results: List[InterfaceStats] = []
+        link_cache = cls._address_cache()
+        link_states: Dict[str, Tuple[bool, str]] = {}
+        if link_cache is not None:
+            link_cache.refresh()
+            link_states = link_cache.snapshot()
+            if set(cls._type_cache) - set(raw_stats):
+                cls._type_cache = {n: t for n, t in cls._type_cache.items() if n in raw_stats}
 
         for name, counters in raw_stats.items():
             bytes_recv = counters["bytes_recv"]
@@ -132,9 +188,18 @@ class NetworkMonitor:
 
             cls._previous_readings[name] = (now, bytes_sent, bytes_recv)
 
-            iface_type = cls._classify_interface(name)
-            is_up = cls._is_interface_up(name)
-            ip_address = cls.get_interface_ip(name) if is_up else ""
+            state = link_states.get(name)
+            if state is not None:
+                iface_type = cls._type_cache.get(name)
+                if iface_type is None:
+                    iface_type = cls._type_cache[name] = cls._classify_interface(name)
+                is_up, ip_address = state
+                if not is_up:
+                    ip_address = ""
+            else:
+                iface_type = cls._classify_interface(name)
+                is_up = cls._is_interface_up(name)
+                ip_address = cls.get_interface_ip(name) if is_up else ""
 
             results.append(
                 InterfaceStats(
@@ -158,28 +223,61 @@ class NetworkMonitor:
         """
         Return all active TCP/UDP connections with process information.
 
-        Parses /proc/net/tcp, /proc/net/tcp6, /proc/net/udp, /proc/net/udp6
-        and resolves PIDs by mapping socket inodes through /proc/[pid]/fd.
+        Socket tables come from a sock_diag netlink dump, or from
+        /proc/net/tcp, /proc/net/tcp6, /proc/net/udp, /proc/net/udp6 where
+        sock_diag is unavailable.  PIDs are resolved by mapping socket
+        inodes through /proc/[pid]/fd; that map is cached and only
+        re-reads processes whose fd tables changed since the last call.
+        Unreadable /proc entries (permission errors) are silently skipped.
 
-        This may be slow on systems with many processes.  Unreadable
-        /proc entries (permission errors) are silently skipped.
+        Callers within SNAPSHOT_TTL seconds of each other share one
+        snapshot of the socket tables.
 
         Returns:
             List of ConnectionInfo.  Empty list on error.
         """
-        inode_to_pid: Dict[str, Tuple[int, str]] = cls._build_inode_pid_map()
+        return list(cls._connection_snapshot())
 
-        connections: List[ConnectionInfo] = []
+    @classmethod
+    def get_listening_sockets(cls) -> List[ConnectionInfo]:
+        """
+        Return listening sockets, as ``ss -tuln`` lists them.
 
-        proto_files = [
-            ("tcp", "/proc/net/tcp", False),
-            ("tcp6", "/proc/net/tcp6", True),
-            ("udp", "/proc/net/udp", False),
-            ("udp6", "/proc/net/udp6", True),
+        That is TCP sockets in LISTEN state and unconnected UDP sockets,
+        taken from the same snapshot as :meth:`get_active_connections`.
+        """
+        return [
+            conn for conn in cls._connection_snapshot()
+            if conn.state == "LISTEN" or (conn.protocol.startswith("udp") and conn.state == "CLOSE")
         ]
 
-        for proto, path, is_v6 in proto_files:
-            entries = cls._parse_proc_net_socket(path, is_v6)
+    @classmethod
+    def _connection_snapshot(cls) -> List[ConnectionInfo]:
+        """Return the shared connection list, rescanning once it is SNAPSHOT_TTL old."""
+        with cls._snapshot_lock:
+            snapshot = cls._snapshot
+            if snapshot is not None and time.monotonic() - snapshot[0] < cls.SNAPSHOT_TTL:
+                return snapshot[1]
+            connections = cls._scan_connections()
+            cls._snapshot = (time.monotonic(), connections)
+            return connections
+
+    @classmethod
+    def _scan_connections(cls) -> List[ConnectionInfo]:
+        """Read the socket tables and resolve owning processes."""
+        tables = [
+            (proto, cls._read_socket_table(proto, path, is_v6))
+            for proto, path, is_v6 in cls._SOCKET_TABLES
+        ]
+        wanted = {
+            entry["inode"] for _proto, entries in tables for entry in entries
+            if entry["inode"] != "0"
+        }
+        inode_to_pid: Dict[str, Tuple[int, str]] = cls._build_inode_pid_map(wanted)
+
+        connections: List[ConnectionInfo] = []
+
+        for proto, entries in tables:
             for entry in entries:
                 inode = entry["inode"]
                 pid = 0
@@ -239,6 +337,19 @@ class NetworkMonitor:
             "total_recv_rate": round(total_recv_rate, 2),
         }
 
+    @classmethod
+    def _address_cache(cls) -> Optional[LinkAddressCache]:
+        """Return the shared rtnetlink link/address cache, or None if unavailable."""
+        if cls._link_cache is None:
+            with cls._link_cache_lock:
+                if cls._link_cache is None:
+                    try:
+                        cls._link_cache = LinkAddressCache()
+                    except OSError as e:
+                        logger.debug("rtnetlink unavailable, using sysfs and ip: %s", e)
+                        cls._link_cache = False
+        return cls._link_cache or None
+
     @staticmethod
     def get_interface_ip(name: str) -> str:
         """
@@ -368,9 +479,70 @@ class NetworkMonitor:
             return False
 
     # ------------------------------------------------------------------ #
-    #  /proc/net/tcp & udp parsing
+    #  Socket tables: sock_diag, /proc/net/tcp & udp parsing
     # ------------------------------------------------------------------ #
 
+    @classmethod
+    def _read_socket_table(cls, proto: str, path: str, is_v6: bool) -> List[dict]:
+        """Return the entries of one socket table, preferring sock_diag over *path*."""
+        entries = cls._diag_socket_table(proto, is_v6)
+        if entries is None:
+            entries = cls._parse_proc_net_socket(path, is_v6)
+        return entries
+
+    @classmethod
+    def _diag_socket_table(cls, proto: str, is_v6: bool) -> Optional[List[dict]]:
+        """
+        Dump one socket table through NETLINK_SOCK_DIAG.
+
+        Returns:
+            Entries shaped like :meth:`_parse_proc_net_socket` output, or None
+            when sock_diag (or the udp_diag module) is unavailable.
+        """
+        if proto in cls._diag_unavailable:
+            return None
+        family = socket.AF_INET6 if is_v6 else socket.AF_INET
+        protocol = socket.IPPROTO_UDP if proto.startswith("udp") else socket.IPPROTO_TCP
+        try:
+            sockets = inet_diag_dump(family, protocol)
+        except OSError as e:
+            logger.debug("sock_diag unavailable for %s, reading /proc: %s", proto, e)
+            cls._diag_unavailable.add(proto)
+            return None
+
+        # Few distinct addresses repeat across many sockets; format each once.
+        addresses: Dict[bytes, str] = {}
+
+        def address(raw: bytes) -> str:
+            text = addresses.get(raw)
+            if text is None:
+                text = addresses[raw] = cls._format_raw_address(raw, is_v6)
+            return text
+
+        entries: List[dict] = []
+        for state, src, sport, dst, dport, inode in sockets:
+            entries.append(
+                {
+                    "local_addr": address(src),
+                    "local_port": sport,
+                    "remote_addr": address(dst),
+                    "remote_port": dport,
+                    # TCP_NEW_SYN_RECV (12) is listed as SYN_RECV in /proc
+                    "state": "%02X" % (3 if state == 12 else state),
+                    "inode": str(inode),
+                }
+            )
+        return entries
+
+    @staticmethod
+    def _format_raw_address(raw: bytes, is_v6: bool) -> str:
+        """Format a network-order address the way :meth:`_decode_address` does."""
+        if not is_v6:
+            return socket.inet_ntoa(raw[:4])
+        if raw[:12] == _V4_MAPPED_PREFIX:
+            return socket.inet_ntoa(raw[12:16])
+        return socket.inet_ntop(socket.AF_INET6, raw[:16])
+
     @classmethod
     def _parse_proc_net_socket(cls, path: str, is_v6: bool) -> List[dict]:
         """
@@ -446,7 +618,7 @@ class NetworkMonitor:
                 byte_groups.append(struct.pack("!I", val))
             raw = b"".join(byte_groups)
             # Check if it is an IPv4-mapped address (::ffff:x.x.x.x)
-            if raw[:12] == b"\x00" * 10 + b"\xff\xff":
+            if raw[:12] == _V4_MAPPED_PREFIX:
                 addr = socket.inet_ntoa(raw[12:])
             else:
                 try:
@@ -465,49 +637,120 @@ class NetworkMonitor:
 
         return (addr, port)
 
-    @staticmethod
-    def _build_inode_pid_map() -> Dict[str, Tuple[int, str]]:
+    @classmethod
+    def _build_inode_pid_map(cls, wanted: Optional[Set[str]] = None) -> Dict[str, Tuple[int, str]]:
         """
-        Build a mapping from socket inode to (pid, process_name).
+        Return a mapping from socket inode to (pid, process_name).
 
         Scans /proc/[pid]/fd for symlinks of the form ``socket:[inode]``.
+        The result is kept between calls and refreshed incrementally: only
+        new processes and processes whose fd count (``st_size`` of
+        /proc/[pid]/fd) changed are re-read, and exited processes are
+        evicted.  A process can swap a socket without changing its fd
+        count, so every process is re-read when *wanted* contains inodes
+        that are neither mapped nor already known to be unowned, and at
+        least every FULL_SCAN_INTERVAL seconds.
         Processes that cannot be read (permission errors) are silently skipped.
 
+        Args:
+            wanted: Socket inodes the caller is about to resolve.
+
         Returns:
             {inode_string: (pid, process_name)}
         """
-        inode_map: Dict[str, Tuple[int, str]] = {}
+        with cls._owner_lock:
+            try:
+                pids = [int(entry) for entry in os.listdir("/proc") if entry.isdigit()]
+            except OSError as e:
+                logger.debug("Failed to list /proc entries: %s", e)
+                return {}
+
+            now = time.monotonic()
+            full = cls._last_full_scan is None or now - cls._last_full_scan >= cls.FULL_SCAN_INTERVAL
+            if full:
+                cls._last_full_scan = now
+
+            visited: Set[int] = set()
+            for pid in pids:
+                fd_count = cls._fd_count(pid)
+                known = cls._pid_sockets.get(pid)
+                if full or known is None or fd_count is None or known.fd_count != fd_count:
+                    cls._read_pid_sockets(pid, fd_count)
+                    visited.add(pid)
+
+            for pid in set(cls._pid_sockets).difference(pids):
+                cls._forget_pid(pid)
+
+            if wanted and not full:
+                missing = wanted.difference(cls._inode_owners)
+                if missing - cls._unresolved_inodes:
+                    cls._last_full_scan = now
+                    for pid in pids:
+                        if pid not in visited and pid in cls._pid_sockets:
+                            cls._read_pid_sockets(pid, cls._pid_sockets[pid].fd_count)
+
+            if wanted is not None:
+                cls._unresolved_inodes = frozenset(wanted.difference(cls._inode_owners))
+            return dict(cls._inode_owners)
+
+    @staticmethod
+    def _fd_count(pid: int) -> Optional[int]:
+        """Number of open fds of *pid*, or None if /proc/[pid]/fd is unreadable."""
+        fd_dir = f"/proc/{pid}/fd"
         try:
-            pids = [entry for entry in os.listdir("/proc") if entry.isdigit()]
-        except OSError as e:
-            logger.debug("Failed to list /proc entries: %s", e)
-            return inode_map
+            # Linux 6.2+ reports the fd count as the directory size.
+            count = os.stat(fd_dir).st_size
+            return count if count else len(os.listdir(fd_dir))
+        except OSError:
+            return None
 
-        for pid_str in pids:
-            fd_dir = f"/proc/{pid_str}/fd"
+    @classmethod
+    def _read_pid_sockets(cls, pid: int, fd_count: Optional[int]) -> None:
+        """Re-read the socket links of *pid* and update the inode map."""
+        fd_dir = f"/proc/{pid}/fd"
+        inodes: List[str] = []
+        try:
+            fds = os.listdir(fd_dir)
+        except (PermissionError, FileNotFoundError, OSError):
+            fds = []
+
+        for fd_name in fds:
+            fd_path = os.path.join(fd_dir, fd_name)
             try:
-                fds = os.listdir(fd_dir)
+                target = os.readlink(fd_path)
             except (PermissionError, FileNotFoundError, OSError):
                 continue
+            if target.startswith("socket:["):
+                inodes.append(target[8:-1])  # strip "socket:[" and "]"
 
-            pid = int(pid_str)
-            process_name = ""
+        cls._forget_pid(pid)
+        # Lazily resolve process name only when we find a socket
+        name = cls._get_process_name(pid) if inodes else ""
+        cls._pid_sockets[pid] = _PidSockets(fd_count, name, tuple(inodes))
+        for inode in inodes:
+            cls._inode_owners[inode] = (pid, name)
 
-            for fd_name in fds:
-                fd_path = os.path.join(fd_dir, fd_name)
-                try:
-                    target = os.readlink(fd_path)
-                except (PermissionError, FileNotFoundError, OSError):
-                    continue
-
-                if target.startswith("socket:["):
-                    inode = target[8:-1]  # strip "socket:[" and "]"
-                    # Lazily resolve process name only when we find a socket
-                    if not process_name:
-                        process_name = NetworkMonitor._get_process_name(pid)
-                    inode_map[inode] = (pid, process_name)
+    @classmethod
+    def _forget_pid(cls, pid: int) -> None:
+        known = cls._pid_sockets.pop(pid, None)
+        if known is None:
+            return
+        for inode in known.inodes:
+            owner = cls._inode_owners.get(inode)
+            if owner is not None and owner[0] == pid:
+                del cls._inode_owners[inode]
 
-        return inode_map
+    @classmethod
+    def clear_socket_cache(cls) -> None:
+        """Drop the connection snapshot and inode map and retry sock_diag (used by tests)."""
+        with cls._snapshot_lock:
+            cls._snapshot = None
+        with cls._owner_lock:
+            cls._pid_sockets = {}
+            cls._inode_owners = {}
+            cls._unresolved_inodes = frozenset()
+            cls._last_full_scan = None
+            cls._diag_unavailable = set()
 
     @staticmethod
     def _get_process_name(pid: int) -> str:
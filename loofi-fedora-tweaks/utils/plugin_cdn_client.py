@@ -1,13 +1,22 @@
-"""CDN client for plugin marketplace index retrieval with instance cache."""
+"""CDN client for plugin marketplace index retrieval with instance and disk cache."""
 
+import hashlib
+import json
 import logging
-from dataclasses import dataclass
-from typing import Callable, Dict, List, Optional
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_CDN_BASE_URL = "https://cdn.loofi.software/plugins"
 DEFAULT_CACHE_TTL_SECONDS = 3600
+DEFAULT_INDEX_CACHE_DIR = Path(os.path.expanduser("~/.cache/loofi-fedora-tweaks/marketplace"))
+
+# Bumped whenever the on-disk layout changes; older files are ignored.
+INDEX_CACHE_FORMAT = 1
 
 
 @dataclass(frozen=True)
@@ -15,6 +24,112 @@ class CdnFetchConfig:
     """CDN fetch settings for plugin index retrieval."""
     base_url: str = DEFAULT_CDN_BASE_URL
     cache_ttl_seconds: int = DEFAULT_CACHE_TTL_SECONDS
+    cache_dir: Optional[str] = None  # None: DEFAULT_INDEX_CACHE_DIR
+    disk_cache: bool = True
+
+
+@dataclass
+class IndexCacheEntry:
+    """Parsed marketplace index as persisted between runs.
+
+    ``rows`` holds one list of values per plugin, in ``fields`` order, so the
+    file stays small and loads without re-parsing or re-verifying entries.
+    ``etag``/``last_modified`` are the validators of ``url`` used to
+    revalidate the entry with a conditional request once it is stale.
+    """
+    fields: List[str]
+    rows: List[List[Any]]
+    url: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float = field(default_factory=time.time)
+
+    def is_fresh(self, ttl_seconds: float, now: Optional[float] = None) -> bool:
+        """True while the entry is younger than *ttl_seconds*."""
+        age = (time.time() if now is None else now) - self.fetched_at
+        return 0 <= age < ttl_seconds
+
+    @property
+    def validators(self) -> Dict[str, str]:
+        """Request headers that revalidate this entry against ``url``."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class IndexDiskCache:
+    """One compact JSON file per marketplace source under a cache directory."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    @staticmethod
+    def key_for(*parts: str) -> str:
+        """Derive a file-name-safe key from the values identifying a source."""
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()[:16]
+
+    def path_for(self, key: str) -> Path:
+        return self.directory / f"index-{key}.json"
+
+    def load(self, key: str) -> Optional[IndexCacheEntry]:
+        """Return the stored entry for *key*, or None if absent or unreadable."""
+        path = self.path_for(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.debug("Ignoring unreadable index cache %s: %s", path, exc)
+            return None
+
+        if not isinstance(raw, dict) or raw.get("format") != INDEX_CACHE_FORMAT:
+            return None
+        fields = raw.get("fields")
+        rows = raw.get("rows")
+        if not isinstance(fields, list) or not isinstance(rows, list):
+            return None
+        try:
+            return IndexCacheEntry(
+                fields=fields,
+                rows=rows,
+                url=raw.get("url"),
+                etag=raw.get("etag"),
+                last_modified=raw.get("last_modified"),
+                fetched_at=float(raw.get("fetched_at", 0)),
+            )
+        except (TypeError, ValueError):
+            return None
+
+    def store(self, key: str, entry: IndexCacheEntry) -> bool:
+        """Atomically write *entry*; returns False if the cache is not writable."""
+        path = self.path_for(key)
+        tmp_path = path.with_name(f"{path.name}.tmp.{os.getpid()}")
+        payload = {
+            "format": INDEX_CACHE_FORMAT,
+            "url": entry.url,
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+            "fetched_at": entry.fetched_at,
+            "fields": entry.fields,
+            "rows": entry.rows,
+        }
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, separators=(",", ":"), ensure_ascii=False)
+            os.replace(tmp_path, path)
+            return True
+        except (OSError, TypeError, ValueError) as exc:
+            logger.debug("Failed to write index cache %s: %s", path, exc)
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            return False
 
 
 class PluginCdnClient:
@@ -23,6 +138,20 @@ class PluginCdnClient:
     def __init__(self, config: Optional[CdnFetchConfig] = None):
         self.config = config or CdnFetchConfig()
         self._cached_index: Optional[Dict] = None
+        # URL that produced the last index fetched over the network.
+        self.source_url: Optional[str] = None
+
+    @property
+    def disk_cache(self) -> Optional[IndexDiskCache]:
+        """Persistent index cache, or None when disabled in the config."""
+        if not self.config.disk_cache:
+            return None
+        return IndexDiskCache(Path(self.config.cache_dir) if self.config.cache_dir
+                              else DEFAULT_INDEX_CACHE_DIR)
+
+    def cache_key(self, repo_owner: str, repo_name: str, branch: str) -> str:
+        """Disk cache key for one marketplace repository."""
+        return IndexDiskCache.key_for(self.config.base_url, repo_owner, repo_name, branch)
 
     def fetch_index(
         self,
@@ -40,6 +169,7 @@ class PluginCdnClient:
             data = fetch_json(url)
             if data and self._is_valid_signed_index(data):
                 self._cached_index = data
+                self.source_url = url
                 return data
 
         return self._cached_index
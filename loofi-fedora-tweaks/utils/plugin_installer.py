@@ -4,14 +4,16 @@ Part of v26.0 Phase 1 (T5).
 """
 import json
 import logging
+import os
 import shutil
 import tarfile
 import tempfile
 import urllib.error
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from core.plugins.integrity import IntegrityVerifier
 from core.plugins.package import PluginManifest
@@ -21,6 +23,9 @@ from utils.plugin_marketplace import PluginMarketplace
 
 logger = logging.getLogger(__name__)
 
+# Plugin archives downloaded and verified in parallel by update_many()
+UPDATE_DOWNLOAD_WORKERS = 4
+
 
 @dataclass
 class InstallerResult:
@@ -72,12 +77,14 @@ class PluginInstaller:
             return {}
 
     def _save_state(self, state: Dict[str, Dict]) -> bool:
-        """Save plugin state to state.json."""
+        """Save plugin state to state.json (atomically replaced)."""
+        temp_path = f"{self.state_file}.tmp.{os.getpid()}"
         try:
-            with open(self.state_file, 'w') as f:
+            with open(temp_path, 'w') as f:
                 json.dump(state, f, indent=2)
+            os.replace(temp_path, self.state_file)
             return True
-        except (OSError, json.JSONDecodeError) as exc:
+        except (OSError, TypeError, ValueError) as exc:
             logger.error("Failed to save state: %s", exc)
             return False
 
@@ -183,6 +190,36 @@ class PluginInstaller:
             logger.error("Failed to parse manifest: %s", exc)
             return None
 
+    def _stage_archive(
+        self, archive_path: Path, extract_dir: Path, plugin_id: str
+    ) -> Tuple[Optional[Path], Optional[PluginManifest], Optional[str]]:
+        """
+        Extract an archive and validate the plugin inside it.
+
+        Returns:
+            (plugin source directory, manifest, None) or (None, None, error)
+        """
+        if not self._extract_archive(archive_path, extract_dir):
+            return None, None, "Failed to extract plugin archive"
+
+        # Validate manifest (support archives with root directory)
+        install_source = extract_dir
+        manifest = self._validate_manifest(install_source)
+        if not manifest:
+            subdirs = [p for p in extract_dir.iterdir() if p.is_dir()]
+            if len(subdirs) == 1:
+                install_source = subdirs[0]
+                manifest = self._validate_manifest(install_source)
+        if not manifest:
+            return None, None, "Invalid or missing plugin manifest"
+
+        # Verify plugin ID matches
+        if manifest.id != plugin_id:
+            logger.error("Plugin ID mismatch: expected %s, got %s", plugin_id, manifest.id)
+            return None, None, f"Plugin ID mismatch in manifest: {manifest.id}"
+
+        return install_source, manifest, None
+
     def install(self, plugin_id_or_meta, version: Optional[str] = None, skip_deps: bool = False) -> InstallerResult:
         """
         Download and install plugin from marketplace.
@@ -279,38 +316,12 @@ class PluginInstaller:
                         error=f"Integrity verification failed: {verify_result.error}"
                     )
 
-                # Extract to temp location
-                extract_dir = Path(temp_dir) / "extracted"
-                if not self._extract_archive(archive_path, extract_dir):
-                    return InstallerResult(
-                        success=False,
-                        plugin_id=plugin_id,
-                        error="Failed to extract plugin archive"
-                    )
-
-                # Validate manifest (support archives with root directory)
-                install_source = extract_dir
-                manifest = self._validate_manifest(install_source)
-                if not manifest:
-                    subdirs = [p for p in extract_dir.iterdir() if p.is_dir()]
-                    if len(subdirs) == 1:
-                        install_source = subdirs[0]
-                        manifest = self._validate_manifest(install_source)
-                if not manifest:
-                    return InstallerResult(
-                        success=False,
-                        plugin_id=plugin_id,
-                        error="Invalid or missing plugin manifest"
-                    )
-
-                # Verify plugin ID matches
-                if manifest.id != plugin_id:
-                    logger.error("Plugin ID mismatch: expected %s, got %s", plugin_id, manifest.id)
-                    return InstallerResult(
-                        success=False,
-                        plugin_id=plugin_id,
-                        error=f"Plugin ID mismatch in manifest: {manifest.id}"
-                    )
+                # Extract to temp location and validate
+                install_source, manifest, error = self._stage_archive(
+                    archive_path, Path(temp_dir) / "extracted", plugin_id
+                )
+                if error:
+                    return InstallerResult(success=False, plugin_id=plugin_id, error=error)
 
                 # Move to final location
                 logger.info("Installing to %s", plugin_dir)
@@ -601,6 +612,172 @@ class PluginInstaller:
                 error=f"Check update error: {exc}"
             )
 
+    def check_updates(self, plugin_ids: Optional[Iterable[str]] = None) -> InstallerResult:
+        """
+        Check many installed plugins for updates against one index fetch.
+
+        Args:
+            plugin_ids: Plugins to check (default: every installed plugin).
+                IDs that are not installed are ignored.
+
+        Returns:
+            InstallerResult whose data is a list of dicts with plugin_id,
+            current_version, new_version and metadata (PluginMetadata).
+        """
+        state = self._load_state()
+        candidates = list(state) if plugin_ids is None else [p for p in plugin_ids if p in state]
+        if not candidates:
+            return InstallerResult(success=True, plugin_id="", data=[])
+
+        index = self.marketplace.fetch_index()
+        if not index.success:
+            return InstallerResult(
+                success=False,
+                plugin_id="",
+                error=index.error or "Failed to fetch plugin index",
+                data=[],
+            )
+
+        latest = {meta.id: meta for meta in index.data or []}
+        updates = []
+        for plugin_id in candidates:
+            meta = latest.get(plugin_id)
+            current_version = state[plugin_id].get("version")
+            if meta is None or meta.version == current_version:
+                continue
+            updates.append({
+                "plugin_id": plugin_id,
+                "current_version": current_version,
+                "new_version": meta.version,
+                "metadata": meta,
+            })
+
+        logger.info("%d of %d plugin(s) have updates", len(updates), len(candidates))
+        return InstallerResult(success=True, plugin_id="", data=updates)
+
+    def _download_verified(self, plugin_meta, archive_path: Path) -> Optional[str]:
+        """Download and checksum one archive; returns an error message or None."""
+        try:
+            req = urllib.request.Request(
+                plugin_meta.download_url,
+                headers={'User-Agent': 'Loofi-Fedora-Tweaks'}
+            )
+            with urllib.request.urlopen(req, timeout=60) as response:
+                with open(archive_path, 'wb') as f:
+                    shutil.copyfileobj(response, f)
+        except (OSError, urllib.error.URLError, ValueError) as exc:
+            logger.error("Download failed for %s: %s", plugin_meta.id, exc)
+            return f"Download error: {exc}"
+
+        verify_result = self.verifier.verify_checksum(archive_path, plugin_meta.checksum_sha256)
+        if not verify_result.success:
+            return f"Integrity verification failed: {verify_result.error}"
+        return None
+
+    def _apply_update(self, plugin_id: str, archive_path: Path, work_dir: Path) -> InstallerResult:
+        """
+        Swap a verified archive in for the installed plugin.
+
+        The new version is staged next to the old one and exchanged by
+        rename, so the plugin directory is never left half-written; the old
+        version becomes the rollback backup.
+        """
+        plugin_dir = self.plugins_dir / plugin_id
+        current = self._validate_manifest(plugin_dir) if plugin_dir.exists() else None
+        if not current:
+            return InstallerResult(
+                success=False,
+                plugin_id=plugin_id,
+                error="Invalid plugin manifest (cannot update)"
+            )
+
+        source, manifest, error = self._stage_archive(archive_path, work_dir, plugin_id)
+        if error:
+            return InstallerResult(success=False, plugin_id=plugin_id, error=f"Update failed: {error}")
+
+        staged = self.plugins_dir / f".staging-{plugin_id}"
+        retired = self.plugins_dir / f".retired-{plugin_id}"
+        backup_path = self.backups_dir / f"{plugin_id}-{current.version}"
+        try:
+            for leftover in (staged, retired):
+                if leftover.exists():
+                    shutil.rmtree(leftover)
+            shutil.move(str(source), str(staged))
+
+            os.rename(plugin_dir, retired)
+            try:
+                os.rename(staged, plugin_dir)
+            except OSError:
+                os.rename(retired, plugin_dir)
+                raise
+
+            if backup_path.exists():
+                shutil.rmtree(backup_path)
+            os.rename(retired, backup_path)
+        except OSError as exc:
+            logger.error("Update failed for %s: %s", plugin_id, exc)
+            shutil.rmtree(staged, ignore_errors=True)
+            return InstallerResult(success=False, plugin_id=plugin_id, error=f"Update error: {exc}")
+
+        state = self._load_state()
+        state[plugin_id] = {
+            "version": manifest.version,
+            "enabled": state.get(plugin_id, {}).get("enabled", True),
+            "installed_at": str(plugin_dir)
+        }
+        self._save_state(state)
+
+        logger.info("Successfully updated %s from %s to %s", plugin_id, current.version, manifest.version)
+        return InstallerResult(
+            success=True,
+            plugin_id=plugin_id,
+            version=manifest.version,
+            installed_path=plugin_dir,
+            backup_path=backup_path
+        )
+
+    def update_many(
+        self, updates: List[Dict[str, Any]], max_workers: int = UPDATE_DOWNLOAD_WORKERS
+    ) -> List[InstallerResult]:
+        """
+        Apply updates found by check_updates().
+
+        Archives are downloaded and checksummed concurrently (at most
+        *max_workers* at a time); each verified archive is then installed
+        one at a time on the calling thread.
+
+        Returns:
+            One InstallerResult per update.
+        """
+        if not updates:
+            return []
+
+        results: List[InstallerResult] = []
+        with tempfile.TemporaryDirectory() as temp_dir:
+            work = Path(temp_dir)
+
+            def fetch(update: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+                plugin_id = update["plugin_id"]
+                return plugin_id, self._download_verified(
+                    update["metadata"], work / f"{plugin_id}.loofi-plugin"
+                )
+
+            workers = max(1, min(max_workers, len(updates)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="PluginDownload") as pool:
+                futures = [pool.submit(fetch, update) for update in updates]
+                # Install each plugin as soon as its download is verified
+                for future in as_completed(futures):
+                    plugin_id, error = future.result()
+                    if error:
+                        results.append(InstallerResult(
+                            success=False, plugin_id=plugin_id, error=f"Update failed: {error}"
+                        ))
+                        continue
+                    results.append(self._apply_update(
+                        plugin_id, work / f"{plugin_id}.loofi-plugin", work / plugin_id
+                    ))
+        return results
+
     def list_installed(self) -> InstallerResult:
         """
         List all installed plugins.
@@ -4,15 +4,17 @@ Part of v26.0 Phase 1 (T7).
 """
 import json
 import logging
+import time
 import urllib.error
 import urllib.request
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from core.plugins.integrity import IntegrityVerifier
 
-from utils.plugin_cdn_client import PluginCdnClient
+from utils.plugin_cdn_client import IndexCacheEntry, PluginCdnClient
+from utils.plugin_search import PluginSearchIndex
 
 logger = logging.getLogger(__name__)
 
@@ -173,6 +175,9 @@ class PluginMarketplace:
         self.base_url = f"https://raw.githubusercontent.com/{repo_owner}/{repo_name}/{branch}"
         self.cdn_client = PluginCdnClient()
         self._cache: Optional[List[PluginMetadata]] = None
+        self._search_index: Optional[PluginSearchIndex] = None
+        # ETag / Last-Modified seen per URL, kept for the disk cache.
+        self._response_validators: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
 
     def _fetch_json(self, url: str, timeout: int = 10) -> Optional[Dict]:
         """
@@ -196,6 +201,7 @@ class PluginMarketplace:
             with urllib.request.urlopen(req, timeout=timeout) as response:
                 data = response.read()
                 result: Dict = json.loads(data.decode('utf-8'))
+                self._remember_validators(url, response)
                 return result
 
         except urllib.error.HTTPError as exc:
@@ -211,6 +217,46 @@ class PluginMarketplace:
             logger.error("Unexpected error fetching %s: %s", url, exc)
             return None
 
+    def _remember_validators(self, url: str, response: Any) -> None:
+        headers = getattr(response, "headers", None)
+        if headers is None:
+            return
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        self._response_validators[url] = (
+            etag if isinstance(etag, str) else None,
+            last_modified if isinstance(last_modified, str) else None,
+        )
+
+    def _fetch_json_conditional(
+        self, url: str, headers: Dict[str, str], timeout: int = 10
+    ) -> Tuple[int, Optional[Dict]]:
+        """
+        Revalidate a cached document with a conditional GET.
+
+        Returns:
+            ``(304, None)`` if unchanged, ``(200, data)`` with the new
+            document, or ``(0, None)`` if the request failed.
+        """
+        try:
+            req = urllib.request.Request(
+                url,
+                headers={'User-Agent': 'Loofi-Fedora-Tweaks', **headers}
+            )
+            with urllib.request.urlopen(req, timeout=timeout) as response:
+                result: Dict = json.loads(response.read().decode('utf-8'))
+                self._remember_validators(url, response)
+                return 200, result
+        except urllib.error.HTTPError as exc:
+            if exc.code == 304:
+                return 304, None
+            logger.warning("HTTP error revalidating %s: %s", url, exc)
+        except urllib.error.URLError as exc:
+            logger.warning("URL error revalidating %s: %s", url, exc)
+        except (OSError, ValueError) as exc:
+            logger.warning("Failed to revalidate %s: %s", url, exc)
+        return 0, None
+
     def _post_json(self, url: str, payload: Dict[str, Any], timeout: int = 15) -> Optional[Dict]:
         """Send JSON POST request and return parsed response."""
         try:
@@ -546,10 +592,96 @@ class PluginMarketplace:
         except (TypeError, ValueError):
             return default
 
+    @staticmethod
+    def _plugins_to_entry(plugins: List[PluginMetadata]) -> IndexCacheEntry:
+        names = [f.name for f in fields(PluginMetadata)]
+        return IndexCacheEntry(
+            fields=names,
+            rows=[[getattr(plugin, name) for name in names] for plugin in plugins],
+        )
+
+    @staticmethod
+    def _plugins_from_entry(entry: IndexCacheEntry) -> Optional[List[PluginMetadata]]:
+        known = {f.name for f in fields(PluginMetadata)}
+        columns = [(i, name) for i, name in enumerate(entry.fields) if name in known]
+        try:
+            return [
+                PluginMetadata(**{name: row[i] for i, name in columns})
+                for row in entry.rows
+            ]
+        except (IndexError, TypeError) as exc:
+            logger.debug("Discarding malformed index cache: %s", exc)
+            return None
+
+    def _parse_index(self, data: Dict) -> List[PluginMetadata]:
+        plugins = []
+        for entry in data["plugins"]:
+            plugin = self._parse_plugin_entry(entry)
+            if plugin:
+                plugins.append(plugin)
+        return plugins
+
+    def _store_index(self, plugins: List[PluginMetadata], url: Optional[str]) -> None:
+        disk = self.cdn_client.disk_cache
+        if disk is None:
+            return
+        entry = self._plugins_to_entry(plugins)
+        entry.url = url
+        if url:
+            entry.etag, entry.last_modified = self._response_validators.get(url, (None, None))
+        disk.store(self._index_cache_key(), entry)
+
+    def _index_cache_key(self) -> str:
+        return self.cdn_client.cache_key(self.repo_owner, self.repo_name, self.branch)
+
+    def _load_disk_index(self) -> Tuple[Optional[IndexCacheEntry], Optional[List[PluginMetadata]]]:
+        disk = self.cdn_client.disk_cache
+        if disk is None:
+            return None, None
+        entry = disk.load(self._index_cache_key())
+        if entry is None:
+            return None, None
+        plugins = self._plugins_from_entry(entry)
+        if plugins is None:
+            return None, None
+        return entry, plugins
+
+    def _revalidate_index(
+        self, entry: IndexCacheEntry, plugins: List[PluginMetadata]
+    ) -> Optional[MarketplaceResult]:
+        """Refresh a stale disk entry with one conditional request to its source."""
+        if not entry.url or not entry.validators:
+            return None
+        status, data = self._fetch_json_conditional(entry.url, entry.validators)
+        if status == 304:
+            logger.debug("Plugin index not modified since last fetch")
+            entry.fetched_at = time.time()
+            disk = self.cdn_client.disk_cache
+            if disk is not None:
+                disk.store(self._index_cache_key(), entry)
+            self._cache = plugins
+            return MarketplaceResult(success=True, data=plugins, source="cache")
+        if status == 200 and data:
+            if not self.cdn_client._is_valid_signed_index(data):
+                # Same check as a CDN fetch.  Keep the entry we trust on disk
+                # untouched (still stale, so it is revalidated next time).
+                self._cache = plugins
+                return MarketplaceResult(success=True, data=plugins, source="cache")
+            fresh = self._parse_index(data)
+            self._cache = fresh
+            self._store_index(fresh, entry.url)
+            return MarketplaceResult(success=True, data=fresh, source="network")
+        return None
+
     def fetch_index(self, force_refresh: bool = False) -> MarketplaceResult:
         """
         Fetch complete plugin index from marketplace.
 
+        The parsed index is also kept on disk.  Within the CDN cache TTL it
+        is served from there without touching the network; once stale it is
+        revalidated with ETag/If-Modified-Since, and it remains the offline
+        fallback when no source is reachable.
+
         Args:
             force_refresh: If True, bypass cache and fetch fresh data
 
@@ -562,6 +694,17 @@ class PluginMarketplace:
                 "Returning cached plugin index (%d plugins)", len(self._cache))
             return MarketplaceResult(success=True, data=self._cache, source="cache")
 
+        disk_entry, disk_plugins = self._load_disk_index()
+        if disk_entry is not None and disk_plugins is not None:
+            if not force_refresh and disk_entry.is_fresh(self.cdn_client.config.cache_ttl_seconds):
+                logger.debug(
+                    "Returning plugin index from disk cache (%d plugins)", len(disk_plugins))
+                self._cache = disk_plugins
+                return MarketplaceResult(success=True, data=disk_plugins, source="cache")
+            revalidated = self._revalidate_index(disk_entry, disk_plugins)
+            if revalidated is not None:
+                return revalidated
+
         try:
             data = self.cdn_client.fetch_index(
                 repo_owner=self.repo_owner,
@@ -573,13 +716,17 @@ class PluginMarketplace:
 
             if data:
                 logger.info("Fetched plugin index from CDN")
+                source_url = self.cdn_client.source_url
             else:
                 fallback_url = f"{self.base_url}/plugins.json"
                 logger.warning(
                     "CDN unavailable or invalid index, falling back to %s", fallback_url)
                 data = self._fetch_json(fallback_url)
+                source_url = fallback_url
 
             if not data:
+                if self._cache is None and disk_plugins is not None:
+                    self._cache = disk_plugins
                 if self._cache is not None:
                     logger.warning(
                         "Marketplace network unavailable; returning cached index")
@@ -603,16 +750,13 @@ class PluginMarketplace:
                     error="Invalid index format"
                 )
 
-            plugins = []
-            for entry in data["plugins"]:
-                plugin = self._parse_plugin_entry(entry)
-                if plugin:
-                    plugins.append(plugin)
+            plugins = self._parse_index(data)
 
             logger.info("Fetched %d plugins from marketplace", len(plugins))
 
             # Cache the result
             self._cache = plugins
+            self._store_index(plugins, source_url)
 
             return MarketplaceResult(success=True, data=plugins, source="network")
 
@@ -625,13 +769,20 @@ class PluginMarketplace:
                 source="network",
             )
 
-    def search(self, query: str = "", category: Optional[str] = None) -> MarketplaceResult:
+    def search(
+        self, query: str = "", category: Optional[str] = None, limit: Optional[int] = None
+    ) -> MarketplaceResult:
         """
         Search plugins by name, description, or tags.
 
+        Every query word must match a word (or the start or middle of one)
+        in the plugin's name, tags or description.  Results are ranked by
+        relevance and rating; without a query they keep index order.
+
         Args:
             query: Search query string (case-insensitive)
             category: Optional category filter
+            limit: Optional maximum number of results (type-ahead)
 
         Returns:
             MarketplaceResult with filtered plugin list
@@ -641,26 +792,21 @@ class PluginMarketplace:
 
         if not index_result.success or not index_result.data:
             return index_result
-        query_lower = query.lower() if query else ""
-        results = []
 
-        for plugin in index_result.data:
-            # Category filter
-            if category and plugin.category.lower() != category.lower():
-                continue
-
-            # Search in name, description, tags (if query provided)
-            if not query or (
-                query_lower in plugin.name.lower()
-                or query_lower in plugin.description.lower()
-                or any(query_lower in tag.lower() for tag in plugin.tags)
-            ):
-                results.append(plugin)
+        results = self._get_search_index(index_result.data).search(query or "", category, limit)
 
         logger.info("Search '%s' found %d results", query, len(results))
 
         return MarketplaceResult(success=True, data=results)
 
+    def _get_search_index(self, plugins: List[PluginMetadata]) -> PluginSearchIndex:
+        """Return the search index for *plugins*, building it once per fetched list."""
+        index = self._search_index
+        if index is None or index.plugins is not plugins:
+            index = PluginSearchIndex(plugins)
+            self._search_index = index
+        return index
+
     def get_plugin(self, plugin_id: str) -> MarketplaceResult:
         """
         Get detailed information for a specific plugin.
@@ -0,0 +1,333 @@
+"""
+Prebuilt search index over the plugin marketplace catalogue.
+
+``PluginMarketplace.search`` used to lowercase every name, description and
+tag of every plugin on each query.  ``PluginSearchIndex`` does that work once
+per index fetch and answers type-ahead queries from in-memory structures:
+
+- per-field token postings (name, tags, description)
+- a sorted vocabulary for prefix lookups (``bisect``)
+- a trigram -> vocabulary map for infix lookups ("ackup" finds "backup")
+- a category map for the category filter
+
+Every query word must match (as a whole token, a prefix or an infix) some
+word of the plugin's name, tags or description.  Results are ranked by
+where and how well the words matched; plugins that match equally well are
+ordered by rating (Bayesian-averaged) and rating count.
+"""
+
+import heapq
+import math
+import re
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import AbstractSet, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Field weights: a hit in the name beats a tag, which beats the description.
+NAME_WEIGHT = 3.0
+TAG_WEIGHT = 2.0
+DESCRIPTION_WEIGHT = 1.0
+
+# How a query word matched an indexed word.
+EXACT_MATCH = 1.0
+PREFIX_MATCH = 0.75
+INFIX_MATCH = 0.4
+
+# Bonus when a multi-word query appears verbatim in the name (more at the start).
+NAME_PHRASE_BONUS = 1.5
+NAME_START_BONUS = 1.5
+
+_FIELD_WEIGHTS = (NAME_WEIGHT, TAG_WEIGHT, DESCRIPTION_WEIGHT)
+_MATCH_QUALITIES = (EXACT_MATCH, PREFIX_MATCH, INFIX_MATCH)
+
+# Bayesian rating prior: a few 5-star votes do not outrank many 4.8s.
+RATING_PRIOR = 3.0
+RATING_PRIOR_WEIGHT = 5
+
+QUERY_CACHE_SIZE = 64
+
+
+def tokenize(text: str) -> List[str]:
+    """Split *text* into lowercase word tokens."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _trigrams(token: str) -> Set[str]:
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+class PluginSearchIndex:
+    """Immutable search index over one list of ``PluginMetadata``.
+
+    ``plugins`` is kept by reference; callers rebuild the index when the
+    marketplace hands out a different list.  Internally plugins are numbered
+    by popularity rank, so ordering matches by popularity is ordering plain
+    integers.  Every posting is kept both as a frozenset (for set algebra)
+    and as a sorted tuple (so the top *limit* hits of a tier can be read
+    off the front without materialising the whole tier).
+    """
+
+    def __init__(self, plugins: Sequence):
+        self.plugins = plugins
+        popularity = [self._popularity_score(plugin) for plugin in plugins]
+        # Internal id -> catalogue position, most popular first.
+        self._order: List[int] = sorted(range(len(plugins)), key=lambda p: -popularity[p])
+        self._doc_of: List[int] = [0] * len(plugins)
+        self._docs: List = []
+        self._names: List[str] = []
+        category_ids: Dict[str, Set[int]] = {}
+        # One posting dict per field, same order as _FIELD_WEIGHTS.
+        field_postings: Tuple[Dict[str, List[int]], ...] = ({}, {}, {})
+
+        for doc, pos in enumerate(self._order):
+            plugin = plugins[pos]
+            self._doc_of[pos] = doc
+            self._docs.append(plugin)
+            name = (plugin.name or "").lower()
+            self._names.append(name)
+            category_ids.setdefault((plugin.category or "").lower(), set()).add(doc)
+            texts = (name, " ".join(plugin.tags or []), plugin.description or "")
+            for postings, text in zip(field_postings, texts):
+                for token in set(tokenize(text)):
+                    # Docs are visited in id order, so each list stays sorted.
+                    postings.setdefault(token, []).append(doc)
+
+        self._category_positions: Dict[str, List[int]] = {}
+        for pos, plugin in enumerate(plugins):
+            self._category_positions.setdefault((plugin.category or "").lower(), []).append(pos)
+        self._by_category: Dict[str, FrozenSet[int]] = {
+            k: frozenset(v) for k, v in category_ids.items()
+        }
+
+        vocab: Set[str] = set()
+        for postings in field_postings:
+            vocab.update(postings)
+        self._vocab: List[str] = sorted(vocab)
+        self._sorted_postings: Tuple[List[Tuple[int, ...]], ...] = tuple(
+            [tuple(postings.get(t, ())) for t in self._vocab] for postings in field_postings
+        )
+        self._set_postings: Tuple[List[FrozenSet[int]], ...] = tuple(
+            [frozenset(docs) for docs in lists] for lists in self._sorted_postings
+        )
+        self._trigram_vocab: Dict[str, List[int]] = {}
+        for vid, token in enumerate(self._vocab):
+            for gram in _trigrams(token):
+                self._trigram_vocab.setdefault(gram, []).append(vid)
+        # Searches run from the UI thread and marketplace workers at once.
+        self._query_lock = threading.Lock()
+        self._query_cache: "OrderedDict[Tuple[str, str, Optional[int]], List[int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.plugins)
+
+    @staticmethod
+    def _popularity_score(plugin) -> float:
+        """Bayesian-averaged rating plus a log bonus for the rating count."""
+        count = max(int(getattr(plugin, "rating_count", 0) or 0), 0)
+        average = getattr(plugin, "rating_average", None)
+        rating = RATING_PRIOR
+        if average is not None and count:
+            rating = (RATING_PRIOR * RATING_PRIOR_WEIGHT + float(average) * count) / (
+                RATING_PRIOR_WEIGHT + count)
+        return rating / 5.0 + 0.4 * math.log10(1 + count)
+
+    def _matching_vocab(self, word: str) -> Tuple[List[int], List[int], List[int]]:
+        """Vocabulary ids matching *word* exactly, as a prefix and as an infix."""
+        exact: List[int] = []
+        prefix: List[int] = []
+        infix: List[int] = []
+        start = bisect_left(self._vocab, word)
+        vid = start
+        while vid < len(self._vocab) and self._vocab[vid].startswith(word):
+            (exact if self._vocab[vid] == word else prefix).append(vid)
+            vid += 1
+        if len(word) < 3:
+            return exact, prefix, infix
+
+        grams = sorted((self._trigram_vocab.get(g, []) for g in _trigrams(word)), key=len)
+        if not grams[0]:
+            return exact, prefix, infix
+        candidates = set(grams[0])
+        for ids in grams[1:]:
+            candidates.intersection_update(ids)
+        prefix_ids = range(start, vid)
+        infix = [c for c in candidates if c not in prefix_ids and word in self._vocab[c]]
+        return exact, prefix, infix
+
+    def _word_tiers(self, word: str) -> List[Tuple[float, int, List[int]]]:
+        """``(score, field, vocab ids)`` groups matching *word*, best first."""
+        tiers = []
+        for quality, vids in zip(_MATCH_QUALITIES, self._matching_vocab(word)):
+            if vids:
+                for field_index, weight in enumerate(_FIELD_WEIGHTS):
+                    tiers.append((weight * quality, field_index, vids))
+        tiers.sort(key=lambda tier: -tier[0])
+        return tiers
+
+    def _search_docs(self, query: str, category: Optional[str], limit: Optional[int]) -> List[int]:
+        """Internal ids of the matches, best first (empty query: catalogue order)."""
+        key = (query.strip().lower(), (category or "").lower(), limit)
+        with self._query_lock:
+            cached = self._query_cache.get(key)
+            if cached is not None:
+                self._query_cache.move_to_end(key)
+                return cached
+
+        phrase, category_key, _limit = key
+        allowed: Optional[FrozenSet[int]] = None
+        if category:
+            allowed = self._by_category.get(category_key, frozenset())
+
+        words = sorted(set(tokenize(phrase)), key=len, reverse=True)
+        if not words:
+            positions = (range(len(self.plugins)) if allowed is None
+                         else self._category_positions.get(category_key, []))
+            docs = list(map(self._doc_of.__getitem__, positions[:limit]))
+        elif len(words) > 1:
+            docs = self._rank_words(words, phrase, allowed, limit)
+        elif limit is None:
+            docs = self._rank_word(words[0], allowed)
+        else:
+            docs = self._top_word(words[0], allowed, limit)
+
+        with self._query_lock:
+            self._query_cache[key] = docs
+            if len(self._query_cache) > QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+        return docs
+
+    def search_positions(
+        self, query: str = "", category: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[int]:
+        """Return catalogue positions matching *query*, best match first.
+
+        Without a query, every plugin (in the category) is returned in
+        catalogue order.  *limit* caps the result for type-ahead callers
+        and lets ranking stop early.
+        """
+        return list(map(self._order.__getitem__, self._search_docs(query, category, limit)))
+
+    def search(
+        self, query: str = "", category: Optional[str] = None, limit: Optional[int] = None
+    ) -> List:
+        """Return matching plugins, best match first."""
+        return list(map(self._docs.__getitem__, self._search_docs(query, category, limit)))
+
+    def _rank_word(self, word: str, allowed: Optional[FrozenSet[int]]) -> List[int]:
+        """Every match of one word: tier by tier, popularity order within a tier."""
+        result: List[int] = []
+        seen: Set[int] = set()
+        for _score, field_index, vids in self._word_tiers(word):
+            postings = self._set_postings[field_index]
+            fresh = set().union(*(postings[v] for v in vids))
+            fresh -= seen
+            if allowed is not None:
+                fresh &= allowed
+            if fresh:
+                seen |= fresh
+                result.extend(sorted(fresh))
+        return result
+
+    def _top_word(self, word: str, allowed: Optional[FrozenSet[int]], limit: int) -> List[int]:
+        """First *limit* results of :meth:`_rank_word`, merging sorted postings lazily."""
+        result: List[int] = []
+        seen: Set[int] = set()
+        for _score, field_index, vids in self._word_tiers(word):
+            postings = self._sorted_postings[field_index]
+            merged = heapq.merge(*(postings[v] for v in vids)) if len(vids) > 1 else postings[vids[0]]
+            for doc in merged:
+                if doc in seen or (allowed is not None and doc not in allowed):
+                    continue
+                seen.add(doc)
+                result.append(doc)
+                if len(result) >= limit:
+                    return result
+        return result
+
+    def _exclusive_tiers(
+        self, tiers: List[Tuple[float, int, List[int]]], within: Optional[AbstractSet[int]]
+    ) -> List[Tuple[float, Set[int]]]:
+        """Split a word's matches (restricted to *within*) by their best tier."""
+        seen: Set[int] = set()
+        result = []
+        for score, field_index, vids in tiers:
+            postings = self._set_postings[field_index]
+            if within is None:
+                docs = set().union(*(postings[v] for v in vids))
+            else:
+                docs = set()
+                for vid in vids:
+                    docs |= within.intersection(postings[vid])
+            docs -= seen
+            if docs:
+                seen |= docs
+                result.append((score, docs))
+        return result
+
+    def _rank_words(
+        self,
+        words: List[str],
+        phrase: str,
+        allowed: Optional[FrozenSet[int]],
+        limit: Optional[int],
+    ) -> List[int]:
+        """Rank plugins matching every word.
+
+        Scores are sums of a handful of tier values, so matches are kept as
+        ``{score: ids}`` groups and each further word splits the groups
+        with set intersections.  Only plugins whose name may contain the
+        whole phrase are inspected one by one, for the name bonus.
+        """
+        per_word = [self._word_tiers(word) for word in words]
+        sizes = [
+            sum(len(self._sorted_postings[f][v]) for _s, f, vids in tiers for v in vids)
+            for tiers in per_word
+        ]
+        per_word = [tiers for _size, tiers in sorted(zip(sizes, per_word), key=lambda x: x[0])]
+
+        groups: Dict[float, Set[int]] = dict(self._exclusive_tiers(per_word[0], allowed))
+        for tiers in per_word[1:]:
+            if not groups:
+                return []
+            within = set().union(*groups.values())
+            combined: Dict[float, Set[int]] = {}
+            for word_score, word_docs in self._exclusive_tiers(tiers, within):
+                for group_score, group_docs in groups.items():
+                    hits = group_docs & word_docs
+                    if hits:
+                        combined.setdefault(round(group_score + word_score, 6), set()).update(hits)
+            groups = combined
+        if not groups:
+            return []
+
+        # Name bonus: only plugins matching every word in the name can qualify.
+        matched = set().union(*groups.values())
+        name_postings = self._set_postings[0]
+        in_name = matched
+        for tiers in per_word:
+            hits: Set[int] = set()
+            for _score, field_index, vids in tiers:
+                if field_index == 0:
+                    for vid in vids:
+                        hits |= in_name.intersection(name_postings[vid])
+            in_name = hits
+        for score in list(groups):
+            for doc in groups[score] & in_name:
+                name = self._names[doc]
+                if phrase not in name:
+                    continue
+                bonus = NAME_PHRASE_BONUS + (NAME_START_BONUS if name.startswith(phrase) else 0.0)
+                groups[score].discard(doc)
+                groups.setdefault(round(score + bonus, 6), set()).add(doc)
+
+        ranked: List[int] = []
+        for score in sorted(groups, reverse=True):
+            docs = groups[score]
+            if limit is not None and len(ranked) + len(docs) >= limit:
+                ranked.extend(heapq.nsmallest(limit - len(ranked), docs))
+                break
+            ranked.extend(sorted(docs))
+        return ranked
@@ -7,12 +7,13 @@ and provides firewall management via firewall-cmd.
 """
 
 import logging
-import re
 import shutil
 import subprocess
 from dataclasses import dataclass
 from typing import Optional
 
+from utils.network_monitor import NetworkMonitor
+
 logger = logging.getLogger(__name__)
 
 
@@ -66,122 +67,43 @@ class PortAuditor:
     def scan_ports(cls) -> list[OpenPort]:
         """
         Scan all open listening ports.
-        Uses ss (socket statistics) for accuracy.
+
+        Reads listening TCP and unconnected UDP sockets from the socket
+        snapshot shared with NetworkMonitor, so the audit, the security
+        score and the Network tab do not each run ``ss``.  Owning
+        processes are resolved from /proc (best effort without root).
         """
         ports = []
 
-        try:
-            # ss -tulwn: TCP/UDP listening with numeric ports
-            result = subprocess.run(
-                ["ss", "-tulwn"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+        for sock in NetworkMonitor.get_listening_sockets():
+            port = sock.local_port
+            address = sock.local_addr
 
-            if result.returncode != 0:
-                return []
-
-            for line in result.stdout.strip().split("\n")[1:]:  # Skip header
-                if not line.strip():
-                    continue
-
-                parts = line.split()
-                if len(parts) < 5:
-                    continue
-
-                protocol = parts[0].lower()
-                local_addr = parts[4]
-
-                # Parse address:port
-                if ":" in local_addr:
-                    addr_parts = local_addr.rsplit(":", 1)
-                    address = addr_parts[0]
-                    try:
-                        port = int(addr_parts[1])
-                    except ValueError:
-                        continue
-                else:
-                    continue
-
-                # Get process info
-                process = "unknown"
-                pid = 0
-
-                # Check if risky
-                is_risky = False
-                risk_reason = ""
+            # Check if risky
+            is_risky = False
+            risk_reason = ""
 
+            if port in cls.RISKY_PORTS:
+                is_risky = True
+                risk_reason = cls.RISKY_PORTS[port][1]
+
+            # World-exposed is risky
+            if address in ["0.0.0.0", "*", "[::]", "::"]:
                 if port in cls.RISKY_PORTS:
                     is_risky = True
-                    risk_reason = cls.RISKY_PORTS[port][1]
-
-                # World-exposed is risky
-                if address in ["0.0.0.0", "*", "[::]", "::"]:
-                    if port in cls.RISKY_PORTS:
-                        is_risky = True
-                        risk_reason = f"{cls.RISKY_PORTS[port][0]}: {cls.RISKY_PORTS[port][1]}"
-
-                ports.append(OpenPort(
-                    protocol=protocol.replace("tcp", "TCP").replace("udp", "UDP"),
-                    port=port,
-                    address=address,
-                    process=process,
-                    pid=pid,
-                    is_risky=is_risky,
-                    risk_reason=risk_reason
-                ))
-
-            # Enhance with process info from ss -tulpn (requires sudo)
-            cls._enhance_with_process_info(ports)
-
-            return ports
-
-        except (subprocess.TimeoutExpired, subprocess.SubprocessError, OSError) as e:
-            logger.debug("Port scan failed: %s", e)
-            return []
-
-    @classmethod
-    def _enhance_with_process_info(cls, ports: list[OpenPort]):
-        """Add process information to ports (best effort)."""
-        try:
-            result = subprocess.run(
-                ["ss", "-tulpn"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-
-            if result.returncode != 0:
-                return
-
-            for line in result.stdout.strip().split("\n")[1:]:
-                if not line.strip():
-                    continue
-
-                # Look for pattern: users:(("process",pid=123,...))
-                match = re.search(r'users:\(\("([^"]+)",pid=(\d+)', line)
-                if match:
-                    process_name = match.group(1)
-                    pid = int(match.group(2))
-
-                    # Match to port
-                    parts = line.split()
-                    if len(parts) >= 5:
-                        local_addr = parts[4]
-                        if ":" in local_addr:
-                            try:
-                                port_num = int(local_addr.rsplit(":", 1)[1])
-                                for p in ports:
-                                    if p.port == port_num:
-                                        p.process = process_name
-                                        p.pid = pid
-                                        break
-                            except ValueError:
-                                pass
-
-        except (subprocess.TimeoutExpired, subprocess.SubprocessError, OSError) as e:
-            logger.debug("Failed to enhance port info: %s", e)
+                    risk_reason = f"{cls.RISKY_PORTS[port][0]}: {cls.RISKY_PORTS[port][1]}"
+
+            ports.append(OpenPort(
+                protocol=sock.protocol.rstrip("6").upper(),
+                port=port,
+                address=address,
+                process=sock.process_name or "unknown",
+                pid=sock.pid,
+                is_risky=is_risky,
+                risk_reason=risk_reason
+            ))
+
+        return ports
 
     @classmethod
     def get_risky_ports(cls) -> list[OpenPort]:
@@ -203,6 +203,7 @@ class ProfileManager:
                 warnings.append(f"Snapshot creation failed ({backend}): {err}")
         except (subprocess.TimeoutExpired, OSError) as exc:
             warnings.append(f"Snapshot creation failed ({backend}): {exc}")
+        SnapshotManager.invalidate_catalogue(backend)
 
     # ==================== CUSTOM PROFILE CRUD ====================
 
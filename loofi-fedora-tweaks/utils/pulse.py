@@ -9,10 +9,11 @@ import subprocess
 import threading
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Optional
+from typing import Optional
 
 from PyQt6.QtCore import QObject, QThread, pyqtSignal
 
+from utils import dbus_loop
 from utils.log import get_logger
 
 logger = get_logger(__name__)
@@ -20,15 +21,11 @@ logger = get_logger(__name__)
 # DBus imports with graceful fallback
 try:
     import dbus
-    from dbus.mainloop.glib import DBusGMainLoop
-    from gi.repository import GLib
 
-    DBUS_AVAILABLE = True
+    DBUS_AVAILABLE = dbus_loop.GLIB_AVAILABLE
 except ImportError:
     DBUS_AVAILABLE = False
     dbus = None
-    DBusGMainLoop = None  # type: ignore[assignment,misc]
-    GLib = None
 
 # Safe exception alias — avoids AttributeError when dbus is None
 _DBusException = dbus.exceptions.DBusException if dbus is not None else Exception
@@ -87,7 +84,7 @@ class SystemPulse(QObject):
 
     def __init__(self) -> None:
         super().__init__()
-        self._loop: Optional[Any] = None
+        self._matches: list = []
         self._stop_event = threading.Event()
         self._system_bus = None
         self._last_power_state: Optional[str] = None
@@ -99,15 +96,26 @@ class SystemPulse(QObject):
         """Check if DBus is available on this system."""
         return DBUS_AVAILABLE
 
-    def start(self):
-        """Start the DBus listener loop. Call from QThread."""
+    def start(self, polling_fallback: bool = True):
+        """Listen for DBus signals until :meth:`stop`. Call from QThread.
+
+        Handlers run on the process-wide loop of utils.dbus_loop (shared
+        with the systemd unit cache); this thread only holds the
+        subscriptions until stopped.
+
+        Args:
+            polling_fallback: When DBus is unavailable, poll every few
+                seconds instead. Pass False to return immediately so the
+                caller can fall back to its own, cheaper schedule.
+        """
         if not DBUS_AVAILABLE:
             logger.info("[Pulse] DBus not available, falling back to polling")
-            self._run_polling_fallback()
+            if polling_fallback:
+                self._run_polling_fallback()
             return
 
         try:
-            DBusGMainLoop(set_as_default=True)
+            dbus_loop.ensure_running()
             self._system_bus = dbus.SystemBus()
             self._stop_event.clear()
 
@@ -116,13 +124,12 @@ class SystemPulse(QObject):
             self._register_networkmanager_signals()
             self._register_monitor_signals()
 
-            logger.info("[Pulse] Event listeners registered, starting main loop")
-
-            # Start GLib main loop
-            self._loop = GLib.MainLoop()
-            self._loop.run()
+            logger.info("[Pulse] Event listeners registered on the shared D-Bus loop")
+            self._stop_event.wait()
+            self._remove_signal_receivers()
 
         except (_DBusException, OSError, RuntimeError) as e:
+            self._remove_signal_receivers()
             if self._is_expected_dbus_unavailable(e):
                 logger.info(
                     "[Pulse] DBus not accessible (%s), using polling fallback",
@@ -130,7 +137,8 @@ class SystemPulse(QObject):
                 )
             else:
                 logger.warning("[Pulse] Error starting DBus listener: %s", e)
-            self._run_polling_fallback()
+            if polling_fallback:
+                self._run_polling_fallback()
 
     @staticmethod
     def _is_expected_dbus_unavailable(exc: Exception) -> bool:
@@ -150,10 +158,17 @@ class SystemPulse(QObject):
         return any(fragment in msg for fragment in expected_fragments)
 
     def stop(self):
-        """Stop the DBus listener loop."""
+        """Stop listening; the shared loop keeps serving other listeners."""
         self._stop_event.set()
-        if self._loop:
-            self._loop.quit()
+
+    def _remove_signal_receivers(self):
+        """Detach every handler :meth:`start` registered."""
+        for match in self._matches:
+            try:
+                match.remove()
+            except (_DBusException, OSError) as e:
+                logger.debug("[Pulse] Could not remove signal receiver: %s", e)
+        self._matches = []
 
     # -------------------------------------------------------------------------
     # UPower (Power Management)
@@ -165,22 +180,22 @@ class SystemPulse(QObject):
             return
 
         try:
-            self._system_bus.add_signal_receiver(
+            self._matches.append(self._system_bus.add_signal_receiver(
                 self._on_upower_properties_changed,
                 bus_name="org.freedesktop.UPower",
                 path="/org/freedesktop/UPower",
                 dbus_interface="org.freedesktop.DBus.Properties",
                 signal_name="PropertiesChanged",
-            )
+            ))
 
             # Also watch battery level changes
-            self._system_bus.add_signal_receiver(
+            self._matches.append(self._system_bus.add_signal_receiver(
                 self._on_battery_properties_changed,
                 bus_name="org.freedesktop.UPower",
                 path="/org/freedesktop/UPower/devices/DisplayDevice",
                 dbus_interface="org.freedesktop.DBus.Properties",
                 signal_name="PropertiesChanged",
-            )
+            ))
 
             logger.info("[Pulse] UPower signals registered")
         except _DBusException as e:
@@ -297,21 +312,21 @@ class SystemPulse(QObject):
             return
 
         try:
-            self._system_bus.add_signal_receiver(
+            self._matches.append(self._system_bus.add_signal_receiver(
                 self._on_nm_state_changed,
                 bus_name="org.freedesktop.NetworkManager",
                 path="/org/freedesktop/NetworkManager",
                 dbus_interface="org.freedesktop.NetworkManager",
                 signal_name="StateChanged",
-            )
+            ))
 
-            self._system_bus.add_signal_receiver(
+            self._matches.append(self._system_bus.add_signal_receiver(
                 self._on_nm_properties_changed,
                 bus_name="org.freedesktop.NetworkManager",
                 path="/org/freedesktop/NetworkManager",
                 dbus_interface="org.freedesktop.DBus.Properties",
                 signal_name="PropertiesChanged",
-            )
+            ))
 
             logger.info("[Pulse] NetworkManager signals registered")
         except _DBusException as e:
@@ -452,12 +467,12 @@ class SystemPulse(QObject):
         try:
             # KDE Plasma uses kscreen
             session_bus = dbus.SessionBus()
-            session_bus.add_signal_receiver(
+            self._matches.append(session_bus.add_signal_receiver(
                 self._on_monitor_changed,
                 bus_name="org.kde.KScreen",
                 dbus_interface="org.kde.KScreen.Backend",
                 signal_name="configChanged",
-            )
+            ))
             logger.info("[Pulse] KDE monitor signals registered")
             return
         except (_DBusException, OSError) as e:
@@ -466,12 +481,12 @@ class SystemPulse(QObject):
         try:
             # GNOME/Mutter uses org.gnome.Mutter.DisplayConfig
             session_bus = dbus.SessionBus()
-            session_bus.add_signal_receiver(
+            self._matches.append(session_bus.add_signal_receiver(
                 self._on_monitor_changed,
                 bus_name="org.gnome.Mutter.DisplayConfig",
                 dbus_interface="org.gnome.Mutter.DisplayConfig",
                 signal_name="MonitorsChanged",
-            )
+            ))
             logger.info("[Pulse] GNOME/Mutter monitor signals registered")
         except (_DBusException, OSError) as e:
             logger.warning("[Pulse] Could not register monitor signals: %s", e)
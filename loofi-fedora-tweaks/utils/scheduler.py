@@ -3,15 +3,19 @@ Task Scheduler - Manages scheduled automation tasks.
 Supports time-based and power-state triggers.
 """
 
+import atexit
+import bisect
 import json
 import logging
+import os
 import shutil
 import subprocess
-from dataclasses import asdict, dataclass
+import threading
+from dataclasses import asdict, dataclass, replace
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 from services.system import SystemManager
 
@@ -45,6 +49,14 @@ class TaskSchedule(Enum):
     HOURLY = "hourly"
 
 
+# Repeat period of each time-based schedule
+_SCHEDULE_PERIODS = {
+    TaskSchedule.HOURLY.value: timedelta(hours=1),
+    TaskSchedule.DAILY.value: timedelta(days=1),
+    TaskSchedule.WEEKLY.value: timedelta(weeks=1),
+}
+
+
 @dataclass
 class ScheduledTask:
     """Represents a scheduled task."""
@@ -64,17 +76,39 @@ class ScheduledTask:
     def from_dict(cls, data: dict) -> "ScheduledTask":
         return cls(**data)
 
+    def next_due(self, now: Optional[datetime] = None) -> Optional[datetime]:
+        """
+        Return when this task is next due, or None if it is not time-based.
+
+        Disabled, boot and power-triggered tasks return None.  A task that
+        never ran (or whose last_run cannot be parsed) is due at *now*.
+        """
+        if not self.enabled:
+            return None
+
+        period = _SCHEDULE_PERIODS.get(self.schedule)
+        if period is None:
+            # on_boot and power triggers are handled specially
+            return None
+
+        now = now or datetime.now()
+        if not self.last_run:
+            return now
+
+        try:
+            return datetime.fromisoformat(self.last_run) + period
+        except ValueError as e:
+            logger.debug("Failed to parse last_run timestamp: %s", e)
+            return now
+
     def is_due(self) -> bool:
         """Check if task is due to run."""
         if not self.enabled:
             return False
 
-        if self.schedule == TaskSchedule.ON_BOOT.value:
-            # Always due on boot (handled specially)
-            return False
-
-        if self.schedule in [TaskSchedule.ON_BATTERY.value, TaskSchedule.ON_AC.value]:
-            # Power triggers handled specially
+        period = _SCHEDULE_PERIODS.get(self.schedule)
+        if period is None:
+            # on_boot and power triggers are handled specially
             return False
 
         if not self.last_run:
@@ -82,61 +116,223 @@ class ScheduledTask:
 
         try:
             last = datetime.fromisoformat(self.last_run)
-            now = datetime.now()
-
-            if self.schedule == TaskSchedule.HOURLY.value:
-                return (now - last) >= timedelta(hours=1)
-            elif self.schedule == TaskSchedule.DAILY.value:
-                return (now - last) >= timedelta(days=1)
-            elif self.schedule == TaskSchedule.WEEKLY.value:
-                return (now - last) >= timedelta(weeks=1)
+            return (datetime.now() - last) >= period
         except ValueError as e:
             logger.debug("Failed to parse last_run timestamp: %s", e)
             return True
 
-        return False
-
 
 class TaskScheduler:
-    """Manages scheduled tasks and their execution."""
+    """Manages scheduled tasks and their execution.
+
+    Tasks live in a process-wide in-memory store.  ``scheduler.json`` is
+    read once and re-read only when its ``(mtime_ns, size, inode)`` stamp
+    changes (another process saved it), writes go through a temp file and
+    ``os.replace`` so readers never see a half-written file, and frequent
+    ``last_run`` updates are batched into one write per
+    ``SAVE_DEBOUNCE_SECONDS``.  A batch holding only ``last_run`` stamps
+    re-reads a changed file before writing, so edits saved by another
+    process in the meantime are kept.  Tasks are indexed by schedule type and by
+    next-due time, so the daemon's queries never scan or re-parse the file.
+    """
 
     CONFIG_DIR = Path.home() / ".config" / "loofi-fedora-tweaks"
     CONFIG_FILE = CONFIG_DIR / "scheduler.json"
 
+    # Delay before a batched (debounced) save reaches disk
+    SAVE_DEBOUNCE_SECONDS = 1.0
+
+    _store_lock = threading.RLock()
+    _tasks: Optional[Dict[str, ScheduledTask]] = None
+    _stamp: Optional[Tuple[int, int, int]] = None
+    _by_schedule: Dict[str, List[str]] = {}
+    _due_times: List[datetime] = []  # sorted next-due times ...
+    _due_ids: List[str] = []  # ... and the matching task ids
+    _pending_last_run: Dict[str, str] = {}
+    _dirty = False
+    _edits_pending = False  # unsaved changes beyond _pending_last_run
+    _flush_timer: Optional[threading.Timer] = None
+    _atexit_registered = False
+
     @classmethod
     def ensure_dirs(cls):
         """Ensure config directories exist."""
         cls.CONFIG_DIR.mkdir(parents=True, exist_ok=True)
 
     @classmethod
-    def list_tasks(cls) -> list:
-        """Get all scheduled tasks."""
-        cls.ensure_dirs()
+    def clear_cache(cls) -> None:
+        """Drop the in-memory store (pending batched writes are discarded)."""
+        with cls._store_lock:
+            if cls._flush_timer is not None:
+                cls._flush_timer.cancel()
+                cls._flush_timer = None
+            cls._tasks = None
+            cls._stamp = None
+            cls._by_schedule = {}
+            cls._due_times = []
+            cls._due_ids = []
+            cls._pending_last_run = {}
+            cls._dirty = False
+            cls._edits_pending = False
 
-        if not cls.CONFIG_FILE.exists():
-            return []
+    @classmethod
+    def _file_stamp(cls) -> Optional[Tuple[int, int, int]]:
+        """Return a cheap change token for ``scheduler.json``, or None."""
+        try:
+            st = cls.CONFIG_FILE.stat()
+        except (OSError, TypeError, ValueError):
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
 
+    @classmethod
+    def _read_file(cls) -> Dict[str, ScheduledTask]:
         try:
             with open(cls.CONFIG_FILE, "r") as f:
                 data = json.load(f)
-            return [ScheduledTask.from_dict(t) for t in data.get("tasks", [])]
-        except (OSError, json.JSONDecodeError) as e:
+            tasks = [ScheduledTask.from_dict(t) for t in data.get("tasks", [])]
+        except (OSError, json.JSONDecodeError, TypeError, AttributeError) as e:
             logger.debug("Failed to load tasks: %s", e)
-            return []
+            return {}
+        return {t.id: t for t in tasks}
+
+    @classmethod
+    def _set_store(cls, tasks: Dict[str, ScheduledTask]) -> None:
+        """Replace the store and rebuild both indexes (caller holds the lock)."""
+        by_schedule: Dict[str, List[str]] = {}
+        due_index: List[Tuple[datetime, str]] = []
+        for task in tasks.values():
+            by_schedule.setdefault(task.schedule, []).append(task.id)
+            if task.enabled and task.schedule in _SCHEDULE_PERIODS:
+                # Never-run and unparsable tasks are due immediately
+                due = task.next_due(datetime.min) or datetime.min
+                due_index.append((due, task.id))
+        due_index.sort()
+        cls._tasks = tasks
+        cls._by_schedule = by_schedule
+        cls._due_times = [due for due, _task_id in due_index]
+        cls._due_ids = [task_id for _due, task_id in due_index]
 
     @classmethod
-    def save_tasks(cls, tasks: list) -> bool:
-        """Save all tasks to config."""
+    def _store(cls) -> Dict[str, ScheduledTask]:
+        """Return the live store, reloading it if the file changed on disk.
+
+        Caller holds the lock and must not hand out the returned tasks.
+        """
+        if not cls.CONFIG_FILE.exists():
+            if not cls._dirty:
+                cls._set_store({})
+                cls._stamp = None
+            return cls._tasks or {}
+
+        stamp = cls._file_stamp()
+        if cls._tasks is not None and stamp is not None and stamp == cls._stamp:
+            return cls._tasks
+
+        tasks = cls._read_file()
+        # Keep batched last_run updates that have not reached disk yet
+        for task_id, last_run in cls._pending_last_run.items():
+            task = tasks.get(task_id)
+            if task is not None and (task.last_run or "") < last_run:
+                task.last_run = last_run
+        cls._set_store(tasks)
+        cls._stamp = stamp
+        return tasks
+
+    @classmethod
+    def list_tasks(cls) -> list:
+        """Get all scheduled tasks (copies; use save_tasks to persist edits)."""
         cls.ensure_dirs()
+        with cls._store_lock:
+            return [replace(t) for t in cls._store().values()]
 
+    @classmethod
+    def save_tasks(cls, tasks: list, debounce: bool = False) -> bool:
+        """
+        Save all tasks to config.
+
+        Args:
+            tasks: The complete task list.
+            debounce: Batch this save with others made in the next
+                SAVE_DEBOUNCE_SECONDS instead of writing immediately.
+
+        Returns:
+            True if the tasks were written (or queued for writing).
+        """
+        cls.ensure_dirs()
+        with cls._store_lock:
+            if not (debounce and cls._only_last_run_changed(tasks)):
+                cls._edits_pending = True
+            cls._set_store({t.id: replace(t) for t in tasks})
+            cls._dirty = True
+            if debounce:
+                cls._schedule_flush()
+                return True
+            return cls._flush_locked()
+
+    @classmethod
+    def _only_last_run_changed(cls, tasks: list) -> bool:
+        """True if *tasks* differ from the store only by batched last_run stamps."""
+        current = cls._tasks or {}
+        if len(tasks) != len(current):
+            return False
+        for task in tasks:
+            old = current.get(task.id)
+            if old is None or replace(task, last_run=old.last_run) != old:
+                return False
+            if task.last_run != old.last_run and task.last_run != cls._pending_last_run.get(task.id):
+                return False
+        return True
+
+    @classmethod
+    def _schedule_flush(cls) -> None:
+        if not cls._atexit_registered:
+            atexit.register(cls.flush)
+            cls._atexit_registered = True
+        if cls._flush_timer is None:
+            timer = threading.Timer(cls.SAVE_DEBOUNCE_SECONDS, cls.flush)
+            timer.daemon = True
+            cls._flush_timer = timer
+            timer.start()
+
+    @classmethod
+    def flush(cls) -> bool:
+        """Write any batched changes to disk now."""
+        with cls._store_lock:
+            if not cls._dirty:
+                return True
+            return cls._flush_locked()
+
+    @classmethod
+    def _flush_locked(cls) -> bool:
+        if cls._flush_timer is not None:
+            cls._flush_timer.cancel()
+            cls._flush_timer = None
+        if not cls._edits_pending:
+            # Only last_run stamps are pending: pick up tasks another
+            # process saved since, then re-apply the stamps on top.
+            cls._store()
+
+        path = str(cls.CONFIG_FILE)
+        temp_path = f"{path}.tmp.{os.getpid()}.{threading.get_ident()}"
+        data = {"tasks": [t.to_dict() for t in (cls._tasks or {}).values()]}
         try:
-            with open(cls.CONFIG_FILE, "w") as f:
-                json.dump({"tasks": [t.to_dict() for t in tasks]}, f, indent=2)
-            return True
-        except (OSError, json.JSONDecodeError) as e:
+            with open(temp_path, "w") as f:
+                json.dump(data, f, indent=2)
+            os.replace(temp_path, path)
+        except (OSError, TypeError, ValueError) as e:
             logger.debug("Failed to save tasks: %s", e)
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
             return False
 
+        cls._stamp = cls._file_stamp()
+        cls._pending_last_run = {}
+        cls._dirty = False
+        cls._edits_pending = False
+        return True
+
     @classmethod
     def add_task(cls, task: ScheduledTask) -> bool:
         """Add a new scheduled task."""
@@ -175,20 +371,66 @@ class TaskScheduler:
 
     @classmethod
     def update_last_run(cls, task_id: str) -> bool:
-        """Update last_run time for a task."""
-        tasks = cls.list_tasks()
+        """Update last_run time for a task (written in the next batch)."""
+        with cls._store_lock:
+            tasks = cls.list_tasks()
 
-        for task in tasks:
-            if task.id == task_id:
-                task.last_run = datetime.now().isoformat()
-                return cls.save_tasks(tasks)
+            for task in tasks:
+                if task.id == task_id:
+                    task.last_run = datetime.now().isoformat()
+                    cls._pending_last_run[task_id] = task.last_run
+                    return cls.save_tasks(tasks, debounce=True)
 
         return False
 
     @classmethod
     def get_due_tasks(cls) -> list:
         """Get all tasks that are due to run."""
-        return [t for t in cls.list_tasks() if t.is_due()]
+        cls.ensure_dirs()
+        with cls._store_lock:
+            store = cls._store()
+            end = bisect.bisect_right(cls._due_times, datetime.now())
+            return [replace(store[task_id]) for task_id in cls._due_ids[:end]]
+
+    @classmethod
+    def get_next_due_time(cls, tasks: Optional[list] = None) -> Optional[datetime]:
+        """
+        Get the earliest time any time-based task is due.
+
+        Args:
+            tasks: Tasks to consider; defaults to all configured tasks.
+
+        Returns:
+            datetime of the next deadline, or None if no task is time-based.
+        """
+        now = datetime.now()
+        if tasks is not None:
+            deadlines = [due for due in (t.next_due(now) for t in tasks) if due is not None]
+            return min(deadlines) if deadlines else None
+
+        cls.ensure_dirs()
+        with cls._store_lock:
+            cls._store()
+            if not cls._due_times:
+                return None
+            # datetime.min marks tasks that never ran; they are due now
+            immediate = bisect.bisect_right(cls._due_times, datetime.min)
+            if immediate == 0:
+                return cls._due_times[0]
+            if immediate < len(cls._due_times):
+                return min(now, cls._due_times[immediate])
+            return now
+
+    @classmethod
+    def _tasks_for_schedule(cls, schedule: str) -> list:
+        cls.ensure_dirs()
+        with cls._store_lock:
+            store = cls._store()
+            return [
+                replace(store[task_id])
+                for task_id in cls._by_schedule.get(schedule, ())
+                if store[task_id].enabled
+            ]
 
     @classmethod
     def get_power_trigger_tasks(cls, on_battery: bool) -> list:
@@ -196,16 +438,12 @@ class TaskScheduler:
         trigger = (
             TaskSchedule.ON_BATTERY.value if on_battery else TaskSchedule.ON_AC.value
         )
-        return [t for t in cls.list_tasks() if t.enabled and t.schedule == trigger]
+        return cls._tasks_for_schedule(trigger)
 
     @classmethod
     def get_boot_tasks(cls) -> list:
         """Get tasks that run on boot."""
-        return [
-            t
-            for t in cls.list_tasks()
-            if t.enabled and t.schedule == TaskSchedule.ON_BOOT.value
-        ]
+        return cls._tasks_for_schedule(TaskSchedule.ON_BOOT.value)
 
     @classmethod
     def execute_task(cls, task: ScheduledTask) -> tuple:
@@ -4,6 +4,9 @@ Part of v16.0 "Horizon".
 
 Goes beyond the gaming-focused ServiceManager to provide full systemd
 service browsing, control, and inspection for both system and user scopes.
+
+Listings come from the D-Bus-fed SystemdUnitCache when the bus is
+reachable, and from ``systemctl list-units``/``is-enabled`` otherwise.
 """
 
 import logging
@@ -13,6 +16,7 @@ from enum import Enum
 from typing import List, Optional
 
 from utils.commands import PrivilegedCommand
+from utils.systemd_units import SystemdUnitCache
 
 logger = logging.getLogger(__name__)
 
@@ -108,6 +112,14 @@ class ServiceExplorer:
     System-scope operations that mutate state use pkexec via PrivilegedCommand.
     """
 
+    _STATE_MAP = {
+        "active": ServiceState.ACTIVE,
+        "inactive": ServiceState.INACTIVE,
+        "failed": ServiceState.FAILED,
+        "activating": ServiceState.ACTIVATING,
+        "deactivating": ServiceState.DEACTIVATING,
+    }
+
     # ------------------------------------------------------------------ list
     @classmethod
     def list_services(cls, scope: ServiceScope = ServiceScope.SYSTEM,
@@ -123,6 +135,37 @@ class ServiceExplorer:
         Returns:
             List of ServiceInfo objects sorted by name.
         """
+        cache = SystemdUnitCache.shared(user=scope == ServiceScope.USER)
+        if cache is not None:
+            return cls._list_cached(cache, scope, filter_state, search)
+        return cls._list_systemctl(scope, filter_state, search)
+
+    @classmethod
+    def _list_cached(cls, cache: SystemdUnitCache, scope: ServiceScope,
+                     filter_state: Optional[str], search: str) -> List[ServiceInfo]:
+        """Build the listing from the in-memory unit cache."""
+        needle = search.lower()
+        services: List[ServiceInfo] = []
+        for unit in cache.services():
+            state = cls._STATE_MAP.get(unit.active_state.lower(), ServiceState.UNKNOWN)
+            if filter_state and state.value != filter_state:
+                continue
+            if needle and needle not in unit.name.lower() and needle not in unit.description.lower():
+                continue
+            services.append(ServiceInfo(
+                name=unit.name,
+                description=unit.description,
+                state=state,
+                sub_state=unit.sub_state.lower(),
+                enabled=unit.unit_file_state,
+                scope=scope,
+            ))
+        return sorted(services, key=lambda s: s.name)
+
+    @classmethod
+    def _list_systemctl(cls, scope: ServiceScope, filter_state: Optional[str],
+                        search: str) -> List[ServiceInfo]:
+        """Build the listing from ``systemctl list-units`` and ``is-enabled``."""
         try:
             cmd = ["systemctl"]
             if scope == ServiceScope.USER:
@@ -152,14 +195,7 @@ class ServiceExplorer:
                 sub = parts[3].lower()
                 desc = " ".join(parts[4:]) if len(parts) > 4 else ""
 
-                state_map = {
-                    "active": ServiceState.ACTIVE,
-                    "inactive": ServiceState.INACTIVE,
-                    "failed": ServiceState.FAILED,
-                    "activating": ServiceState.ACTIVATING,
-                    "deactivating": ServiceState.DEACTIVATING,
-                }
-                state = state_map.get(active, ServiceState.UNKNOWN)
+                state = cls._STATE_MAP.get(active, ServiceState.UNKNOWN)
 
                 if filter_state and state.value != filter_state:
                     continue
@@ -239,14 +275,7 @@ class ServiceExplorer:
 
             info.description = props.get("Description", "")
             active = props.get("ActiveState", "unknown").lower()
-            state_map = {
-                "active": ServiceState.ACTIVE,
-                "inactive": ServiceState.INACTIVE,
-                "failed": ServiceState.FAILED,
-                "activating": ServiceState.ACTIVATING,
-                "deactivating": ServiceState.DEACTIVATING,
-            }
-            info.state = state_map.get(active, ServiceState.UNKNOWN)
+            info.state = cls._STATE_MAP.get(active, ServiceState.UNKNOWN)
             info.sub_state = props.get("SubState", "")
             info.enabled = props.get("UnitFileState", "")
             info.active_enter = props.get("ActiveEnterTimestamp", "")
@@ -42,6 +42,7 @@ class AppSettings:
     plugin_analytics_enabled: bool = False
     plugin_analytics_anonymous_id: str = ""
     plugin_analytics_endpoint: str = "https://api.loofi.software/marketplace/v1/analytics/events"
+    smart_cache_ttl_minutes: int = 30
 
     # Version tracking
     last_seen_version: str = "0.0.0"
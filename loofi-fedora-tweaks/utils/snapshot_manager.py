@@ -4,17 +4,27 @@ Part of v15.0 "Nebula".
 
 Provides a consistent interface for creating, listing, and managing system
 snapshots via Timeshift, Snapper, or raw Btrfs subvolumes.
+
+Listings are kept in a persisted :class:`SnapshotCatalogue` so repeated
+calls (counts, retention, reopening the Snapshots tab) do not re-run the
+privileged list commands.  A catalogue entry is dropped when we build a
+create/delete operation for that backend, and is only trusted while the
+backend's snapshot directory stamp is unchanged (or, where that directory
+is not visible, for a short TTL).
 """
 
 import logging
+import os
 import re
 import shutil
 import subprocess
 import time
-from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 from utils.commands import PrivilegedCommand  # noqa: F401 — keep for pattern consistency
+from utils.json_store import JsonStore, is_racy
 
 logger = logging.getLogger(__name__)
 
@@ -71,6 +81,125 @@ class SnapshotBackend:
 _BACKEND_PRIORITY = ["snapper", "timeshift", "btrfs"]
 
 
+# ---------------------------------------------------------------------------
+# Snapshot catalogue cache
+# ---------------------------------------------------------------------------
+
+DEFAULT_CATALOGUE_PATH = Path.home() / ".cache" / "loofi-fedora-tweaks" / "snapshots.json"
+CATALOGUE_FORMAT = 1
+
+# Directories whose mtime changes when a backend adds or removes a snapshot.
+_SNAPSHOT_DIRS: Dict[str, Tuple[str, ...]] = {
+    "snapper": ("/.snapshots",),
+    "timeshift": ("/timeshift/snapshots", "/run/timeshift/backup/timeshift-btrfs/snapshots"),
+    "btrfs": ("/.snapshots",),
+}
+
+
+def _dir_stamp(backend: str) -> Optional[List[list]]:
+    """Return ``[path, inode, mtime_ns]`` for each visible snapshot directory.
+
+    ``None`` means none of the backend's directories can be stat'ed, so a
+    cached listing cannot be verified against the filesystem.
+    """
+    stamp = []
+    for path in _SNAPSHOT_DIRS.get(backend, ()):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        stamp.append([path, st.st_ino, st.st_mtime_ns])
+    return stamp or None
+
+
+class SnapshotCatalogue(JsonStore):
+    """
+    Persistent map of backend -> last parsed snapshot listing.
+
+    Each backend has a generation counter that :meth:`invalidate` bumps; a
+    listing is only stored if the generation did not move while it was being
+    produced, so a slow list racing a create/delete cannot resurrect a stale
+    catalogue.  Stored listings carry the snapshot directory stamp taken
+    before listing and are served while it still matches.  Backends without
+    a visible directory (Timeshift keeps its snapshots on an unmounted
+    device) fall back to UNVERIFIED_TTL.
+    """
+
+    UNVERIFIED_TTL = 300.0
+    FORMAT = CATALOGUE_FORMAT
+    DATA_KEY = "backends"
+    LABEL = "snapshot catalogue"
+
+    @classmethod
+    def default_path(cls) -> Path:
+        return DEFAULT_CATALOGUE_PATH
+
+    def generation(self, backend: str) -> int:
+        """Return the current generation of *backend*'s catalogue."""
+        with self._lock:
+            self._sync()
+            return int(self._data.get(backend, {}).get("generation", 0))
+
+    def lookup(self, backend: str, now: Optional[float] = None) -> Optional[List[SnapshotInfo]]:
+        """Return the cached listing for *backend* if it is still valid."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._sync()
+            entry = self._data.get(backend)
+            if not entry or entry.get("snapshots") is None:
+                return None
+            stamp = _dir_stamp(backend)
+            if stamp != entry.get("stamp"):
+                return None
+            if stamp is None and now - entry.get("saved_at", 0) > self.UNVERIFIED_TTL:
+                return None
+            try:
+                return [SnapshotInfo(**item) for item in entry["snapshots"]]
+            except TypeError:
+                return None
+
+    def store(
+        self,
+        backend: str,
+        generation: int,
+        stamp: Optional[List[list]],
+        snapshots: List[SnapshotInfo],
+        now: Optional[float] = None,
+    ) -> bool:
+        """Record a listing produced at *generation* with directory *stamp*.
+
+        Returns False (and stores nothing) if the catalogue was invalidated
+        meanwhile or the directory was modified too recently to trust.
+        """
+        now = time.time() if now is None else now
+        if stamp is not None and any(is_racy(mtime_ns, now) for _p, _i, mtime_ns in stamp):
+            return False
+        with self._lock:
+            self._sync()
+            entry = self._data.get(backend, {})
+            if int(entry.get("generation", 0)) != generation:
+                return False
+            self._data[backend] = {
+                "generation": generation,
+                "stamp": stamp,
+                "saved_at": now,
+                "snapshots": [asdict(snap) for snap in snapshots],
+            }
+            self._write()
+            return True
+
+    def invalidate(self, backend: str) -> None:
+        """Drop *backend*'s listing and bump its generation."""
+        with self._lock:
+            self._sync()
+            entry = self._data.get(backend)
+            if entry is not None and entry.get("snapshots") is None:
+                return  # already invalidated (e.g. a batch of retention deletes)
+            generation = int((entry or {}).get("generation", 0)) + 1
+            self._data[backend] = {"generation": generation, "snapshots": None}
+            self._write()
+
+
 # ---------------------------------------------------------------------------
 # SnapshotManager
 # ---------------------------------------------------------------------------
@@ -153,12 +282,16 @@ class SnapshotManager:
     # -----------------------------------------------------------------
 
     @staticmethod
-    def list_snapshots(backend: Optional[str] = None) -> List[SnapshotInfo]:
+    def list_snapshots(backend: Optional[str] = None, refresh: bool = False) -> List[SnapshotInfo]:
         """List existing snapshots for the given (or auto-detected) backend.
 
+        Served from the :class:`SnapshotCatalogue` while it is valid.
+
         Args:
             backend: One of ``"timeshift"``, ``"snapper"``, ``"btrfs"``.
                      If *None*, the preferred backend is auto-detected.
+            refresh: Re-run the backend's list command even if the
+                     catalogue is valid.
 
         Returns:
             A list of :class:`SnapshotInfo` sorted by *timestamp* descending
@@ -181,31 +314,85 @@ class SnapshotManager:
             logger.error("Unknown snapshot backend: %s", backend)
             return []
 
+        catalogue = SnapshotCatalogue.shared()
+        if not refresh:
+            cached = catalogue.lookup(backend)
+            if cached is not None:
+                return cached
+
+        generation = catalogue.generation(backend)
+        stamp = _dir_stamp(backend)
         try:
             snapshots = parser()
         except (OSError, subprocess.SubprocessError, FileNotFoundError) as exc:
             logger.error("Failed to list %s snapshots: %s", backend, exc)
             return []
+        if snapshots is None:
+            # Cancelled prompt or backend error: nothing to catalogue.
+            return []
 
         # Sort newest-first
         snapshots.sort(key=lambda s: s.timestamp, reverse=True)
+        catalogue.store(backend, generation, stamp, snapshots)
         return snapshots
 
+    @staticmethod
+    def cached_snapshots(backend: Optional[str] = None) -> Optional[List[SnapshotInfo]]:
+        """Return the catalogued listing without running any command.
+
+        Returns ``None`` when there is no valid catalogue for the backend,
+        e.g. so a UI can show the last known listing on open and leave the
+        privileged list command to an explicit refresh.
+        """
+        if backend is None:
+            backend = SnapshotManager.get_preferred_backend()
+        if backend is None:
+            return None
+        return SnapshotCatalogue.shared().lookup(backend)
+
+    @staticmethod
+    def invalidate_catalogue(backend: Optional[str] = None) -> None:
+        """Drop the catalogued listing once a create or delete has finished.
+
+        Building the operation already invalidates the catalogue, but a
+        listing taken while the command was still waiting on its pkexec
+        prompt (or still running) is stored afterwards without the change.
+        Whoever runs the operation calls this when it completes.
+        """
+        if backend is None:
+            backend = SnapshotManager.get_preferred_backend()
+        if backend in _SNAPSHOT_DIRS:
+            SnapshotCatalogue.shared().invalidate(backend)
+
+    @staticmethod
+    def _run_list(cmd: List[str]) -> Optional[str]:
+        """Run a privileged list command and return its output.
+
+        Returns ``None`` on a non-zero exit (cancelled or denied pkexec
+        prompt, backend configuration error) or empty output, so a failed
+        run is never mistaken for an empty listing.
+        """
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+        if result.returncode != 0 or not result.stdout.strip():
+            logger.warning(
+                "%s exited with %s: %s", " ".join(cmd[1:3]), result.returncode,
+                (result.stderr or "").strip() or "no output",
+            )
+            return None
+        return result.stdout
+
     # -- Timeshift -------------------------------------------------------
 
     @staticmethod
-    def _list_timeshift() -> List[SnapshotInfo]:
-        result = subprocess.run(
-            ["pkexec", "timeshift", "--list"],
-            capture_output=True,
-            text=True,
-            timeout=60,
-        )
+    def _list_timeshift() -> Optional[List[SnapshotInfo]]:
+        output = SnapshotManager._run_list(["pkexec", "timeshift", "--list"])
+        if output is None:
+            return None
 
         snapshots: List[SnapshotInfo] = []
         in_table = False
 
-        for line in result.stdout.splitlines():
+        for line in output.splitlines():
             stripped = line.strip()
 
             # Detect the table body after dashes separator
@@ -284,16 +471,13 @@ class SnapshotManager:
     # -- Snapper ---------------------------------------------------------
 
     @staticmethod
-    def _list_snapper() -> List[SnapshotInfo]:
-        result = subprocess.run(
-            ["pkexec", "snapper", "list", "--columns", "number,date,description"],
-            capture_output=True,
-            text=True,
-            timeout=60,
-        )
+    def _list_snapper() -> Optional[List[SnapshotInfo]]:
+        output = SnapshotManager._run_list(["pkexec", "snapper", "list", "--columns", "number,date,description"])
+        if output is None:
+            return None
 
         snapshots: List[SnapshotInfo] = []
-        lines = result.stdout.splitlines()
+        lines = output.splitlines()
 
         for line in lines:
             stripped = line.strip()
@@ -359,17 +543,14 @@ class SnapshotManager:
     # -- Btrfs -----------------------------------------------------------
 
     @staticmethod
-    def _list_btrfs() -> List[SnapshotInfo]:
-        result = subprocess.run(
-            ["pkexec", "btrfs", "subvolume", "list", "/"],
-            capture_output=True,
-            text=True,
-            timeout=60,
-        )
+    def _list_btrfs() -> Optional[List[SnapshotInfo]]:
+        output = SnapshotManager._run_list(["pkexec", "btrfs", "subvolume", "list", "/"])
+        if output is None:
+            return None
 
         snapshots: List[SnapshotInfo] = []
 
-        for line in result.stdout.splitlines():
+        for line in output.splitlines():
             stripped = line.strip()
             if not stripped:
                 continue
@@ -443,6 +624,9 @@ class SnapshotManager:
             logger.error("No snapshot backend available for create")
             return ("echo", ["No snapshot backend available"], "Error: no backend")
 
+        if backend in _SNAPSHOT_DIRS:
+            SnapshotCatalogue.shared().invalidate(backend)
+
         if backend == "timeshift":
             return (
                 "pkexec",
@@ -490,6 +674,9 @@ class SnapshotManager:
             logger.error("No snapshot backend available for delete")
             return ("echo", ["No snapshot backend available"], "Error: no backend")
 
+        if backend in _SNAPSHOT_DIRS:
+            SnapshotCatalogue.shared().invalidate(backend)
+
         if backend == "timeshift":
             return (
                 "pkexec",
@@ -523,7 +710,8 @@ class SnapshotManager:
     def get_snapshot_count(backend: Optional[str] = None) -> int:
         """Return the number of snapshots for the given backend.
 
-        This is a convenience wrapper around :meth:`list_snapshots`.
+        This is a convenience wrapper around :meth:`list_snapshots`, so it
+        is answered from the catalogue when that is valid.
         """
         return len(SnapshotManager.list_snapshots(backend=backend))
 
@@ -539,6 +727,8 @@ class SnapshotManager:
         """Generate delete operations for snapshots exceeding *max_snapshots*.
 
         The oldest snapshots beyond *max_snapshots* are selected for removal.
+        The listing comes from the catalogue when valid, so evaluating the
+        policy is an in-memory sort.
 
         Args:
             max_snapshots: Maximum number of snapshots to keep.
@@ -558,8 +748,9 @@ class SnapshotManager:
         if len(snapshots) <= max_snapshots:
             return []
 
-        # Snapshots are already sorted newest-first; keep the first N
-        to_delete = snapshots[max_snapshots:]
+        # Keep the newest N
+        ordered = sorted(snapshots, key=lambda snap: snap.timestamp, reverse=True)
+        to_delete = ordered[max_snapshots:]
 
         operations: List[Tuple[str, List[str], str]] = []
         for snap in to_delete:
@@ -2,20 +2,45 @@
 Storage Manager — disk information, SMART health, and mount management.
 Part of v17.0 "Atlas".
 
-Wraps ``lsblk``, ``smartctl``, ``findmnt``, ``df``, and ``udisksctl`` for
-unified disk and storage management. All privileged operations go through
-pkexec.
+Block devices and mounts come from the shared in-process
+:class:`~utils.storage_inventory.StorageInventory`, with ``lsblk`` and ``df``
+as fallbacks where it is unavailable.  Wraps ``smartctl``, ``fsck`` and
+``fstrim`` for the rest. All privileged operations go through pkexec.
+
+SMART data is collected by :class:`SmartCollector`: every stale disk is
+queried with ``smartctl --json`` by the fixed ``loofi-smart-batch`` helper
+under one pkexec invocation (one prompt however many disks there are),
+results are kept in a persisted cache for
+``smart_cache_ttl_minutes`` and each collection is recorded in the health
+timeline.
 """
 
 import json
 import logging
+import os
 import re
+import sqlite3
 import subprocess
-from dataclasses import dataclass, field
-from typing import Dict, List
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from utils.json_store import JsonStore
+from utils.storage_inventory import StorageInventory, df_size, lsblk_size
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SMART_CACHE_PATH = Path.home() / ".cache" / "loofi-fedora-tweaks" / "smart.json"
+SMART_CACHE_FORMAT = 1
+
+# Installed by the package (config/loofi-smart-batch): runs smartctl for each
+# block device given as an argument, one compact JSON document per line.
+SMART_BATCH_HELPER = "/usr/libexec/loofi-smart-batch"
+_DEVICE_PATH = re.compile(r"^/dev/[A-Za-z0-9/_.:-]+$")
+# Disks lsblk lists that have no SMART data.
+_NO_SMART_PREFIXES = ("zram", "loop", "ram", "nbd")
+
 
 # ---------------------------------------------------------------------------
 # Dataclasses
@@ -65,6 +90,9 @@ class SmartHealth:
     power_on_hours: int = 0
     reallocated_sectors: int = 0
     raw_output: str = ""
+    # Raw values by ATA attribute name, or the NVMe health log fields.
+    attributes: Dict[str, int] = field(default_factory=dict)
+    collected_at: float = 0.0
 
     def to_dict(self) -> dict:
         return {
@@ -75,9 +103,174 @@ class SmartHealth:
             "temperature_c": self.temperature_c,
             "power_on_hours": self.power_on_hours,
             "reallocated_sectors": self.reallocated_sectors,
+            "attributes": dict(self.attributes),
         }
 
 
+def parse_smartctl_json(doc: dict, device: str = "") -> SmartHealth:
+    """Build a SmartHealth from one ``smartctl --json --all`` document."""
+    health = SmartHealth(device=device or doc.get("device", {}).get("name", ""))
+    health.model = doc.get("model_name", "")
+    health.serial = doc.get("serial_number", "")
+    health.health_passed = bool(doc.get("smart_status", {}).get("passed", True))
+    health.temperature_c = int(doc.get("temperature", {}).get("current", 0))
+    health.power_on_hours = int(doc.get("power_on_time", {}).get("hours", 0))
+
+    for attr in doc.get("ata_smart_attributes", {}).get("table", []):
+        raw = attr.get("raw", {}).get("value")
+        if isinstance(raw, int):
+            health.attributes[attr.get("name", str(attr.get("id")))] = raw
+            if attr.get("id") == 5:
+                health.reallocated_sectors = raw
+    for key, value in doc.get("nvme_smart_health_information_log", {}).items():
+        if isinstance(value, int):
+            health.attributes[key] = value
+    return health
+
+
+class SmartCollector(JsonStore):
+    """
+    Batched, cached SMART health for all disks.
+
+    :meth:`collect` returns cached entries younger than the TTL and queries
+    the rest together in one privileged ``smartctl --json`` batch.  The
+    cache is persisted so the CLI and GUI share it; serial numbers keep it
+    private to the user.  Failed queries (cancelled prompt, missing
+    smartctl) are not cached.
+    """
+
+    DEFAULT_TTL = 1800.0
+    TIMEOUT_PER_DEVICE = 30
+
+    FORMAT = SMART_CACHE_FORMAT
+    DATA_KEY = "devices"
+    LABEL = "SMART cache"
+
+    def __init__(self, path: Path, ttl: Optional[float] = None):
+        super().__init__(path)
+        self._ttl = ttl
+
+    @classmethod
+    def default_path(cls) -> Path:
+        return DEFAULT_SMART_CACHE_PATH
+
+    @property
+    def ttl(self) -> float:
+        """Seconds a reading stays fresh (the smart_cache_ttl_minutes setting)."""
+        if self._ttl is not None:
+            return self._ttl
+        from utils.settings import SettingsManager
+
+        try:
+            return float(SettingsManager.instance().get("smart_cache_ttl_minutes")) * 60
+        except (TypeError, ValueError):
+            return self.DEFAULT_TTL
+
+    def lookup(self, device: str, now: Optional[float] = None) -> Optional[SmartHealth]:
+        """Return the cached reading of *device* if it is younger than the TTL."""
+        now = time.time() if now is None else now
+        ttl = self.ttl
+        with self._lock:
+            self._sync()
+            entry = self._data.get(device)
+        if not entry or now - entry.get("collected_at", 0) > ttl:
+            return None
+        try:
+            return SmartHealth(**entry)
+        except TypeError:
+            return None
+
+    def collect(
+        self, devices: Iterable[str], refresh: bool = False, now: Optional[float] = None
+    ) -> Dict[str, SmartHealth]:
+        """Return SMART health for *devices*, querying the stale ones in one batch.
+
+        Devices that could not be queried map to a default SmartHealth.
+        """
+        now = time.time() if now is None else now
+        results: Dict[str, SmartHealth] = {}
+        stale: List[str] = []
+        for device in dict.fromkeys(devices):
+            cached = None if refresh else self.lookup(device, now)
+            if cached is not None:
+                results[device] = cached
+            else:
+                stale.append(device)
+
+        if stale:
+            fresh = self._run_batch(stale)
+            for health in fresh.values():
+                health.collected_at = now
+            if fresh:
+                with self._lock:
+                    self._sync()
+                    for device, health in fresh.items():
+                        self._data[device] = asdict(health)
+                    self._write()
+                self._record_history(fresh.values())
+            for device in stale:
+                results[device] = fresh.get(device) or SmartHealth(device=device)
+        return results
+
+    def _run_batch(self, devices: List[str]) -> Dict[str, SmartHealth]:
+        devices = [d for d in devices if _DEVICE_PATH.match(d)]
+        if not devices:
+            return {}
+        if os.access(SMART_BATCH_HELPER, os.X_OK):
+            commands = [["pkexec", SMART_BATCH_HELPER, *devices]]
+        else:
+            # Running from a source checkout: one prompt per disk.
+            commands = [["pkexec", "smartctl", "--json=c", "--all", device] for device in devices]
+        timeout = self.TIMEOUT_PER_DEVICE * len(devices) // len(commands)
+
+        output: List[str] = []
+        for cmd in commands:
+            try:
+                result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+            except (OSError, subprocess.TimeoutExpired) as exc:
+                logger.warning("smartctl failed for %s: %s", " ".join(devices), exc)
+                break
+            if not result.stdout.strip() and result.returncode in (126, 127):
+                break  # prompt dismissed or not authorized; do not ask again
+            output.append(result.stdout)
+
+        healths: Dict[str, SmartHealth] = {}
+        for line in "\n".join(output).splitlines():
+            try:
+                doc = json.loads(line)
+            except ValueError:
+                continue
+            device = doc.get("device", {}).get("name", "") if isinstance(doc, dict) else ""
+            # smartctl exits non-zero for merely worrying disks; only a
+            # document without device data means the query itself failed.
+            if device in devices and ("model_name" in doc or "smart_status" in doc):
+                health = parse_smartctl_json(doc, device)
+                health.raw_output = line
+                healths[device] = health
+        return healths
+
+    @staticmethod
+    def _record_history(healths: Iterable[SmartHealth]) -> None:
+        from utils.health_timeline import HealthTimeline
+
+        samples = []
+        for health in healths:
+            meta = {"device": health.device, "model": health.model, "serial": health.serial}
+            samples.extend([
+                ("smart_health_passed", 1.0 if health.health_passed else 0.0, "", meta),
+                ("smart_temperature", float(health.temperature_c), "C", meta),
+                ("smart_power_on_hours", float(health.power_on_hours), "h", meta),
+                ("smart_reallocated_sectors", float(health.reallocated_sectors), "", meta),
+            ])
+        try:
+            result = HealthTimeline().record_metrics(samples)
+        except (OSError, sqlite3.Error) as exc:
+            logger.debug("SMART history not recorded: %s", exc)
+            return
+        if not result.success:
+            logger.debug("SMART history not recorded: %s", result.message)
+
+
 @dataclass
 class MountInfo:
     """A filesystem mount point."""
@@ -123,11 +316,32 @@ class StorageManager:
 
     @classmethod
     def list_block_devices(cls) -> List[BlockDevice]:
-        """List all block devices using lsblk.
+        """List all block devices (from the storage inventory, else lsblk).
 
         Returns:
             Flat list of BlockDevice objects (disks + partitions).
         """
+        inventory = StorageInventory.shared()
+        if inventory is not None:
+            return [
+                BlockDevice(
+                    name=rec.name,
+                    path=rec.path,
+                    size=lsblk_size(rec.size_bytes),
+                    device_type=rec.device_type,
+                    fstype=rec.fstype,
+                    mountpoint=rec.mountpoint,
+                    label=rec.label,
+                    uuid=rec.uuid,
+                    model=rec.model,
+                    serial=rec.serial,
+                    ro=rec.ro,
+                    rm=rec.rm,
+                    hotplug=rec.hotplug,
+                )
+                for rec in inventory.block_devices()
+            ]
+
         devices: List[BlockDevice] = []
         try:
             result = subprocess.run(
@@ -181,59 +395,70 @@ class StorageManager:
     # ----------------------------------------------------------- SMART health
 
     @classmethod
-    def get_smart_health(cls, device: str) -> SmartHealth:
+    def get_smart_health(cls, device: str, refresh: bool = False) -> SmartHealth:
         """Get SMART health data for a disk device.
 
+        A cached reading younger than the TTL is returned as is; otherwise
+        every other stale disk is refreshed in the same privileged batch.
+
         Args:
             device: Device path like /dev/sda or /dev/nvme0n1.
+            refresh: Query smartctl even if a fresh reading is cached.
 
         Returns:
             SmartHealth with parsed data.
         """
-        health = SmartHealth(device=device)
-        try:
-            result = subprocess.run(
-                ["pkexec", "smartctl", "-a", device],
-                capture_output=True, text=True, timeout=30
-            )
-            output = result.stdout
-            health.raw_output = output
-
-            for line in output.splitlines():
-                line_stripped = line.strip()
-                if "Device Model:" in line or "Model Number:" in line:
-                    health.model = line_stripped.split(":", 1)[1].strip()
-                elif "Serial Number:" in line:
-                    health.serial = line_stripped.split(":", 1)[1].strip()
-                elif "SMART overall-health" in line:
-                    health.health_passed = "PASSED" in line
-                elif "Temperature_Celsius" in line or "Temperature:" in line:
-                    # SMART attribute line: "194 Temperature_Celsius ... 30"
-                    # Or NVMe: "Temperature: 30 Celsius"
-                    temp_match = re.search(r"(\d+)\s*$", line_stripped)
-                    if temp_match:
-                        health.temperature_c = int(temp_match.group(1))
-                elif "Power_On_Hours" in line:
-                    hours_match = re.search(r"(\d+)\s*$", line_stripped)
-                    if hours_match:
-                        health.power_on_hours = int(hours_match.group(1))
-                elif "Reallocated_Sector" in line:
-                    sect_match = re.search(r"(\d+)\s*$", line_stripped)
-                    if sect_match:
-                        health.reallocated_sectors = int(sect_match.group(1))
-        except (OSError, subprocess.TimeoutExpired) as exc:
-            logger.warning("smartctl failed for %s: %s", device, exc)
-        return health
+        collector = SmartCollector.shared()
+        if not refresh:
+            cached = collector.lookup(device)
+            if cached is not None:
+                return cached
+        devices = [device] + [path for path in cls._smart_disks() if path != device]
+        return collector.collect(devices, refresh=refresh)[device]
+
+    @classmethod
+    def get_all_smart_health(cls, refresh: bool = False) -> Dict[str, SmartHealth]:
+        """Get SMART health for every disk, with at most one privileged prompt.
+
+        Returns:
+            Dict mapping device path to SmartHealth.
+        """
+        return SmartCollector.shared().collect(cls._smart_disks(), refresh=refresh)
+
+    @classmethod
+    def cached_smart_health(cls, device: str) -> Optional[SmartHealth]:
+        """Return the cached SMART reading of *device* without querying smartctl."""
+        return SmartCollector.shared().lookup(device)
+
+    @classmethod
+    def _smart_disks(cls) -> List[str]:
+        return [d.path for d in cls.list_disks() if not d.name.startswith(_NO_SMART_PREFIXES)]
 
     # ----------------------------------------------------------- mounts
 
     @classmethod
     def list_mounts(cls) -> List[MountInfo]:
-        """List mounted filesystems using df.
+        """List mounted filesystems (from the storage inventory, else df).
 
         Returns:
             List of MountInfo for real filesystems (excludes tmpfs, devtmpfs).
         """
+        inventory = StorageInventory.shared()
+        if inventory is not None:
+            return [
+                MountInfo(
+                    source=mount.source,
+                    target=mount.target,
+                    fstype=mount.fstype,
+                    options=mount.options,
+                    size=df_size(usage.total),
+                    used=df_size(usage.used),
+                    avail=df_size(usage.free),
+                    use_percent=usage.df_percent,
+                )
+                for mount, usage in inventory.filesystems(real_only=True)
+            ]
+
         mounts: List[MountInfo] = []
         try:
             result = subprocess.run(
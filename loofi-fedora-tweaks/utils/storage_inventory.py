@@ -0,0 +1,502 @@
+"""
+Storage inventory - block devices, mounts and filesystem usage in-process.
+
+Replaces the ``lsblk``/``df``/``findmnt`` subprocesses behind the Storage tab,
+the dashboard storage card, health scoring and the agents' disk checks with
+one shared view built from:
+
+* ``/proc/self/mountinfo`` - kept open and polled; the kernel flags the file
+  with POLLPRI whenever the mount table changes, so an unchanged table costs
+  a single ``poll()`` call.
+* ``/sys/block`` (plus ``/run/udev/data`` for filesystem type, label, UUID
+  and serial) - re-read when a block uevent arrives on NETLINK_KOBJECT_UEVENT,
+  or after BLOCK_TTL where uevents cannot be received.
+* ``os.statvfs`` - per mount, memoised for USAGE_TTL so the consumers of one
+  refresh tick share a single call.
+
+:meth:`StorageInventory.shared` returns None where ``/proc/self/mountinfo``
+or ``/sys/block`` is unavailable; callers keep their subprocess fallbacks.
+"""
+
+import logging
+import math
+import os
+import select
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from utils import netlink
+
+logger = logging.getLogger(__name__)
+
+NETLINK_KOBJECT_UEVENT = 15
+# Kernel uevents and udev's re-broadcast after it has updated /run/udev/data.
+_UEVENT_GROUPS = 0x1 | 0x2
+
+# Filesystems df leaves out unless given -a.
+_PSEUDO_FS = frozenset({
+    "autofs", "binfmt_misc", "bpf", "cgroup", "cgroup2", "configfs", "debugfs",
+    "devpts", "efivarfs", "fusectl", "hugetlbfs", "mqueue", "nsfs", "proc",
+    "pstore", "rpc_pipefs", "securityfs", "selinuxfs", "sysfs", "tracefs",
+})
+
+
+@dataclass
+class MountRecord:
+    """One line of /proc/self/mountinfo."""
+    source: str
+    target: str
+    fstype: str
+    options: str
+    dev: str        # "major:minor" of the superblock
+    root: str       # path of the mount's root within its filesystem
+
+
+@dataclass
+class BlockRecord:
+    """A block device as lsblk would list it."""
+    name: str
+    path: str
+    size_bytes: int
+    device_type: str
+    dev: str
+    parent: str = ""
+    fstype: str = ""
+    mountpoint: str = ""
+    label: str = ""
+    uuid: str = ""
+    model: str = ""
+    serial: str = ""
+    ro: bool = False
+    rm: bool = False
+    hotplug: bool = False
+
+
+@dataclass
+class SpaceUsage:
+    """statvfs figures for a mounted filesystem, in bytes."""
+    total: int
+    used: int
+    free: int           # available to unprivileged users (f_bavail)
+    percent_used: float  # used / total, as shutil.disk_usage reports it
+
+    @property
+    def df_percent_value(self) -> int:
+        """Use% the way df computes it: used / (used + available), rounded up."""
+        denominator = self.used + self.free
+        if denominator <= 0:
+            return 0
+        return math.ceil(self.used * 100 / denominator)
+
+    @property
+    def df_percent(self) -> str:
+        """Use% as df prints it ("19%", or "-" for an empty filesystem)."""
+        return f"{self.df_percent_value}%" if self.used + self.free > 0 else "-"
+
+
+def _unescape(field: str) -> str:
+    """Decode mountinfo's octal escapes (``\\040`` for a space, ...)."""
+    if "\\" not in field:
+        return field
+    return field.encode().decode("unicode_escape").encode("latin-1").decode(errors="replace")
+
+
+def parse_mountinfo(text: str) -> List[MountRecord]:
+    """Parse the contents of a mountinfo file."""
+    mounts = []
+    for line in text.splitlines():
+        fields = line.split()
+        try:
+            sep = fields.index("-", 6)
+        except ValueError:
+            continue
+        if len(fields) < sep + 3:
+            continue
+        mounts.append(MountRecord(
+            source=_unescape(fields[sep + 2]),
+            target=_unescape(fields[4]),
+            fstype=fields[sep + 1],
+            options=fields[5],
+            dev=fields[2],
+            root=_unescape(fields[3]),
+        ))
+    return mounts
+
+
+def lsblk_size(num_bytes: int) -> str:
+    """Format a size like lsblk: binary units, one optional decimal ("476.9G")."""
+    value = float(num_bytes)
+    for suffix in ("B", "K", "M", "G", "T", "P"):
+        if value < 1024:
+            break
+        value /= 1024
+    else:
+        suffix = "E"
+    rounded = round(value, 1)
+    if rounded == int(rounded):
+        return f"{int(rounded)}{suffix}"
+    return f"{rounded:.1f}{suffix}"
+
+
+def df_size(num_bytes: int) -> str:
+    """Format a size like ``df -h``: binary units, rounded up, a decimal below 10."""
+    if num_bytes < 1024:
+        return str(num_bytes)
+    value = float(num_bytes)
+    for suffix in ("K", "M", "G", "T", "P", "E"):
+        value /= 1024
+        if value < 1024:
+            break
+    if value < 10:
+        value = math.ceil(value * 10) / 10
+        if value < 10:
+            return f"{value:.1f}{suffix}"
+    return f"{math.ceil(value)}{suffix}"
+
+
+class StorageInventory:
+    """
+    Shared, change-driven view of block devices and mounts.
+
+    Every accessor first applies pending change notifications, so callers
+    never see a mount table older than the last ``poll()``.
+
+    Example::
+
+        inventory = StorageInventory.shared()
+        if inventory is not None:
+            root = inventory.usage_for("/")
+            disks = [dev for dev in inventory.block_devices() if dev.device_type == "disk"]
+    """
+
+    BLOCK_TTL = 10.0
+    USAGE_TTL = 2.0
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        mountinfo: str = "/proc/self/mountinfo",
+        sys_block: str = "/sys/block",
+        udev_data: str = "/run/udev/data",
+        watch_uevents: bool = True,
+    ):
+        self._sys_block = sys_block
+        self._udev_data = udev_data
+        self._lock = threading.Lock()
+        if not os.path.isdir(sys_block):
+            raise OSError(f"{sys_block} is not available")
+        # Kept open: poll() on it reports POLLPRI when the mount table changes.
+        self._mount_file = open(mountinfo, "rb")
+        self._poller = select.poll()
+        self._poller.register(self._mount_file.fileno(), select.POLLPRI | select.POLLERR)
+        self._uevents = None
+        if watch_uevents:
+            try:
+                self._uevents = netlink.open_socket(NETLINK_KOBJECT_UEVENT, _UEVENT_GROUPS)
+            except OSError as exc:
+                logger.debug("Block uevents unavailable, polling every %ss: %s", self.BLOCK_TTL, exc)
+        self._mounts: List[MountRecord] = []
+        self._blocks: Optional[List[BlockRecord]] = None
+        self._blocks_read_at = 0.0
+        self._usage: Dict[str, Tuple[float, SpaceUsage]] = {}
+        self.generation = 0
+        self._read_mounts()
+
+    @classmethod
+    def shared(cls) -> Optional["StorageInventory"]:
+        """Return the process-wide inventory, or None if it cannot be built here."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                try:
+                    cls._instance = cls()
+                except OSError as exc:
+                    logger.debug("Storage inventory unavailable: %s", exc)
+                    cls._instance = False
+            return cls._instance or None
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Close and forget the shared inventory."""
+        with cls._instance_lock:
+            if cls._instance:
+                cls._instance.close()
+            cls._instance = None
+
+    def close(self) -> None:
+        """Release the mountinfo descriptor and uevent socket."""
+        self._mount_file.close()
+        if self._uevents is not None:
+            self._uevents.close()
+
+    # ----------------------------------------------------------- change tracking
+
+    def refresh(self) -> bool:
+        """Apply pending mount/device changes; returns True if anything changed."""
+        with self._lock:
+            return self._refresh_locked()
+
+    def _refresh_locked(self) -> bool:
+        changed = False
+        if self._poller.poll(0):
+            self._read_mounts()
+            changed = True
+        if self._blocks is not None and self._block_events_pending():
+            self._blocks = None
+            changed = True
+        if changed:
+            self.generation += 1
+            self._usage.clear()
+        return changed
+
+    def _read_mounts(self) -> None:
+        self._mount_file.seek(0)
+        self._mounts = parse_mountinfo(self._mount_file.read().decode(errors="replace"))
+        # Mountpoints of block devices come from the mount table.
+        self._blocks = None
+
+    def _block_events_pending(self) -> bool:
+        if self._uevents is None:
+            return time.monotonic() - self._blocks_read_at > self.BLOCK_TTL
+        pending = False
+        while True:
+            try:
+                buf = self._uevents.recv(64 * 1024)
+            except BlockingIOError:
+                return pending
+            except OSError as exc:
+                # ENOBUFS: events were dropped, so assume the worst.
+                logger.debug("uevent read failed: %s", exc)
+                return True
+            if not buf:
+                return pending
+            if b"SUBSYSTEM=block" in buf:
+                pending = True
+
+    # ----------------------------------------------------------- mounts
+
+    def mounts(self) -> List[MountRecord]:
+        """Return every mount in the current namespace, in mountinfo order."""
+        with self._lock:
+            self._refresh_locked()
+            return list(self._mounts)
+
+    def mount_for(self, path: str) -> Optional[MountRecord]:
+        """Return the mount containing *path* (the last, i.e. top-most, match)."""
+        real = os.path.realpath(path)
+        best: Optional[MountRecord] = None
+        for mount in self.mounts():
+            target = mount.target
+            if real == target or real.startswith(target.rstrip("/") + "/"):
+                if best is None or len(target) >= len(best.target):
+                    best = mount
+        return best
+
+    def usage(self, target: str) -> Optional[SpaceUsage]:
+        """statvfs figures for mount point *target*, memoised for USAGE_TTL."""
+        now = time.monotonic()
+        with self._lock:
+            self._refresh_locked()
+            cached = self._usage.get(target)
+            if cached is not None and now - cached[0] < self.USAGE_TTL:
+                return cached[1]
+        try:
+            st = os.statvfs(target)
+        except OSError as exc:
+            logger.debug("statvfs failed for %s: %s", target, exc)
+            return None
+        total = st.f_blocks * st.f_frsize
+        used = (st.f_blocks - st.f_bfree) * st.f_frsize
+        usage = SpaceUsage(
+            total=total,
+            used=used,
+            free=st.f_bavail * st.f_frsize,
+            percent_used=round(used / total * 100, 1) if total > 0 else 0.0,
+        )
+        with self._lock:
+            self._usage[target] = (now, usage)
+        return usage
+
+    def usage_for(self, path: str) -> Optional[SpaceUsage]:
+        """Usage of the filesystem holding *path*; None if *path* does not exist."""
+        if not os.path.exists(path):
+            return None
+        mount = self.mount_for(path)
+        return self.usage(mount.target if mount else path)
+
+    def filesystems(self, real_only: bool = False) -> List[Tuple[MountRecord, SpaceUsage]]:
+        """Mounted filesystems with their usage, filtered and de-duplicated like df.
+
+        Pseudo filesystems and those reporting no blocks are skipped; of
+        several mounts of the same filesystem (bind mounts) the shortest
+        target is kept.  *real_only* additionally drops mounts whose source
+        is not a path (tmpfs, overlay, network shares...).
+        """
+        chosen: Dict[int, Tuple[MountRecord, SpaceUsage]] = {}
+        order: List[int] = []
+        for mount in self.mounts():
+            if mount.fstype in _PSEUDO_FS:
+                continue
+            if real_only and not mount.source.startswith("/"):
+                continue
+            try:
+                st_dev = os.stat(mount.target).st_dev
+            except OSError:
+                continue
+            current = chosen.get(st_dev)
+            if current is not None and len(current[0].target) <= len(mount.target):
+                continue
+            usage = self.usage(mount.target)
+            if usage is None or usage.total == 0:
+                continue
+            if current is None:
+                order.append(st_dev)
+            chosen[st_dev] = (mount, usage)
+        return [chosen[dev] for dev in order]
+
+    # ----------------------------------------------------------- block devices
+
+    def block_devices(self) -> List[BlockRecord]:
+        """Top-level devices each followed by their partitions and holders."""
+        with self._lock:
+            self._refresh_locked()
+            if self._blocks is None:
+                self._blocks = self._read_blocks()
+                self._blocks_read_at = time.monotonic()
+            return list(self._blocks)
+
+    def _read(self, *parts: str) -> str:
+        try:
+            with open(os.path.join(*parts), "r", encoding="utf-8", errors="replace") as f:
+                return f.read().strip()
+        except OSError:
+            return ""
+
+    def _udev_props(self, dev: str) -> Dict[str, str]:
+        props: Dict[str, str] = {}
+        text = self._read(self._udev_data, f"b{dev}")
+        for line in text.splitlines():
+            if line.startswith("E:") and "=" in line:
+                key, _, value = line[2:].partition("=")
+                props[key] = value
+        return props
+
+    def _mount_index(self) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """Map "major:minor" and /dev path to the first mountpoint using them."""
+        by_dev: Dict[str, str] = {}
+        by_source: Dict[str, str] = {}
+        for mount in self._mounts:
+            by_dev.setdefault(mount.dev, mount.target)
+            if mount.source.startswith("/dev/"):
+                by_source.setdefault(os.path.realpath(mount.source), mount.target)
+        return by_dev, by_source
+
+    def _read_blocks(self) -> List[BlockRecord]:
+        by_dev, by_source = self._mount_index()
+        try:
+            names = sorted(os.listdir(self._sys_block))
+        except OSError as exc:
+            logger.debug("Cannot list %s: %s", self._sys_block, exc)
+            return []
+
+        devices: List[BlockRecord] = []
+        for name in names:
+            sys_dir = os.path.join(self._sys_block, name)
+            if name.startswith("ram") or self._has_entries(os.path.join(sys_dir, "slaves")):
+                continue  # RAM disks are hidden by lsblk; stacked devices are listed as holders
+            if name.startswith("loop") and not self._read(sys_dir, "loop", "backing_file"):
+                continue  # unattached loop device
+            disk = self._block_record(sys_dir, name, None, by_dev, by_source)
+            devices.append(disk)
+            for child_dir, child_name in self._children(sys_dir):
+                devices.append(self._block_record(child_dir, child_name, disk, by_dev, by_source))
+        return devices
+
+    @staticmethod
+    def _has_entries(path: str) -> bool:
+        try:
+            return bool(os.listdir(path))
+        except OSError:
+            return False
+
+    def _children(self, sys_dir: str) -> List[Tuple[str, str]]:
+        children = []
+        try:
+            entries = sorted(os.listdir(sys_dir))
+        except OSError:
+            return children
+        for entry in entries:
+            if os.path.exists(os.path.join(sys_dir, entry, "partition")):
+                children.append((os.path.join(sys_dir, entry), entry))
+        holders = os.path.join(sys_dir, "holders")
+        try:
+            for holder in sorted(os.listdir(holders)):
+                children.append((os.path.join(self._sys_block, holder), holder))
+        except OSError:
+            pass
+        return children
+
+    def _block_record(
+        self,
+        sys_dir: str,
+        name: str,
+        parent: Optional[BlockRecord],
+        by_dev: Dict[str, str],
+        by_source: Dict[str, str],
+    ) -> BlockRecord:
+        dev = self._read(sys_dir, "dev")
+        props = self._udev_props(dev) if dev else {}
+        try:
+            size = int(self._read(sys_dir, "size") or 0) * 512
+        except ValueError:
+            size = 0
+
+        device_type = "disk"
+        display = name
+        path = f"/dev/{name}"
+        if os.path.exists(os.path.join(sys_dir, "partition")):
+            device_type = "part"
+        elif name.startswith("loop"):
+            device_type = "loop"
+        elif name.startswith("sr"):
+            device_type = "rom"
+        elif name.startswith("dm-"):
+            dm_uuid = self._read(sys_dir, "dm", "uuid")
+            device_type = "lvm" if dm_uuid.startswith("LVM-") else "crypt" if dm_uuid.startswith("CRYPT-") else "dm"
+            display = self._read(sys_dir, "dm", "name") or name
+            path = f"/dev/mapper/{display}"
+        elif name.startswith("md"):
+            device_type = self._read(sys_dir, "md", "level") or "md"
+
+        removable = self._read(sys_dir, "removable") == "1" or bool(parent and parent.rm)
+        model = self._read(sys_dir, "device", "model") or props.get("ID_MODEL", "").replace("_", " ")
+        serial = self._read(sys_dir, "device", "serial") or props.get("ID_SERIAL_SHORT", "")
+        if parent is not None and device_type == "part":
+            model = serial = ""
+        hotplug = removable or "/usb" in os.path.realpath(sys_dir)
+
+        mountpoint = by_dev.get(dev, "") or by_source.get(os.path.realpath(f"/dev/{name}"), "")
+        fstype = props.get("ID_FS_TYPE", "")
+        if not fstype and mountpoint:
+            fstype = next((m.fstype for m in self._mounts if m.target == mountpoint), "")
+
+        return BlockRecord(
+            name=display,
+            path=path,
+            size_bytes=size,
+            device_type=device_type,
+            dev=dev,
+            parent=parent.name if parent else "",
+            fstype=fstype,
+            mountpoint=mountpoint,
+            label=props.get("ID_FS_LABEL", ""),
+            uuid=props.get("ID_FS_UUID", ""),
+            model=model.strip(),
+            serial=serial.strip(),
+            ro=self._read(sys_dir, "ro") == "1",
+            rm=removable,
+            hotplug=hotplug,
+        )
@@ -16,6 +16,7 @@ import subprocess
 from typing import Optional
 
 from utils.log import get_logger
+from utils.storage_inventory import StorageInventory, df_size
 
 logger = get_logger(__name__)
 
@@ -80,6 +81,10 @@ def get_ram_usage() -> str:
 
 def get_disk_usage() -> str:
     """Return root partition usage summary."""
+    inventory = StorageInventory.shared()
+    usage = inventory.usage("/") if inventory is not None else None
+    if usage is not None:
+        return f"{df_size(usage.used)}/{df_size(usage.total)} ({usage.df_percent} used)"
     try:
         result = subprocess.run(
             ["df", "-h", "/"], capture_output=True, text=True, timeout=10
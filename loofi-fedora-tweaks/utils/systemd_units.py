@@ -0,0 +1,334 @@
+"""
+systemd unit cache - service unit state from the systemd D-Bus API.
+
+Listing services through ``systemctl list-units --all`` followed by
+``systemctl is-enabled`` costs two processes and a full unit enumeration
+on every call.  :class:`SystemdUnitCache` asks the manager once
+(``ListUnits`` + ``ListUnitFiles``), subscribes, and from then on keeps its
+service records current from ``UnitNew``/``UnitRemoved``,
+``UnitFilesChanged``/``Reloading`` and the units' ``PropertiesChanged``
+signals.  Listing, filtering and searching are in-memory operations, and
+listeners registered with :meth:`SystemdUnitCache.add_listener` hear about
+every change.
+
+Signals are dispatched by the process-wide loop of utils.dbus_loop, which
+utils.pulse shares.  This needs dbus-python and PyGObject; without them, or
+without a reachable bus, :meth:`SystemdUnitCache.shared` returns None and callers
+keep their ``systemctl`` path.
+
+Usage:
+    cache = SystemdUnitCache.shared(user=False)
+    if cache is not None:
+        for unit in cache.services():
+            print(unit.name, unit.active_state, unit.unit_file_state)
+"""
+
+import copy
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from utils import dbus_loop
+
+logger = logging.getLogger(__name__)
+
+try:
+    import dbus
+
+    DBUS_AVAILABLE = dbus_loop.GLIB_AVAILABLE
+except ImportError:
+    DBUS_AVAILABLE = False
+    dbus = None
+
+_DBusException = dbus.exceptions.DBusException if dbus is not None else OSError
+
+SYSTEMD_BUS_NAME = "org.freedesktop.systemd1"
+SYSTEMD_PATH = "/org/freedesktop/systemd1"
+MANAGER_INTERFACE = "org.freedesktop.systemd1.Manager"
+UNIT_INTERFACE = "org.freedesktop.systemd1.Unit"
+PROPERTIES_INTERFACE = "org.freedesktop.DBus.Properties"
+
+SERVICE_SUFFIX = ".service"
+
+# Unit properties mirrored into UnitRecord fields.
+_TRACKED_PROPERTIES = {
+    "Description": "description",
+    "ActiveState": "active_state",
+    "SubState": "sub_state",
+}
+
+
+@dataclass
+class UnitRecord:
+    """Cached state of one service unit."""
+    name: str                  # without the ".service" suffix
+    description: str = ""
+    active_state: str = ""     # active, inactive, failed, activating, ...
+    sub_state: str = ""        # running, exited, dead, ...
+    unit_file_state: str = ""  # enabled, disabled, static, masked, ...
+    path: str = ""             # D-Bus object path
+
+
+class SystemdUnitCache:
+    """
+    Service units of one systemd manager, kept current by D-Bus signals.
+
+    One instance per bus: the system manager, or the user manager on the
+    session bus.  Use :meth:`shared` rather than constructing directly.
+    """
+
+    _instances: Dict[str, object] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, user: bool = False):
+        self.user = user
+        self._lock = threading.RLock()
+        self._units: Dict[str, UnitRecord] = {}
+        self._by_path: Dict[str, str] = {}
+        self._file_states: Dict[str, str] = {}
+        self._listeners: List[Callable[[], None]] = []
+        self._bus = None
+        self._manager = None
+        self._matches: list = []
+
+    # ------------------------------------------------------------ lifecycle
+    @classmethod
+    def shared(cls, user: bool = False) -> Optional["SystemdUnitCache"]:
+        """Return the connected cache for the system (or user) manager, or None."""
+        key = "user" if user else "system"
+        with cls._instances_lock:
+            cache = cls._instances.get(key)
+            if cache is None:
+                cache = cls(user=user)
+                try:
+                    cache.connect()
+                except (_DBusException, OSError) as e:
+                    logger.debug("systemd %s manager unavailable over D-Bus: %s", key, e)
+                    cache = False
+                cls._instances[key] = cache
+        return cache or None
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Disconnect and forget the shared caches (used by tests)."""
+        with cls._instances_lock:
+            for cache in cls._instances.values():
+                if cache:
+                    cache.close()
+            cls._instances = {}
+
+    def connect(self) -> None:
+        """Subscribe to the manager and load the initial unit list.
+
+        Raises:
+            OSError: dbus-python/PyGObject are missing.
+            DBusException: the bus or the systemd manager is unreachable.
+        """
+        if not DBUS_AVAILABLE:
+            raise OSError("dbus-python and PyGObject are required")
+        dbus_loop.ensure_running()
+        bus = dbus.SessionBus() if self.user else dbus.SystemBus()
+        manager = dbus.Interface(bus.get_object(SYSTEMD_BUS_NAME, SYSTEMD_PATH), MANAGER_INTERFACE)
+
+        # Match rules go in before the dump so no change between the two is lost.
+        for signal_name, handler in (
+            ("UnitNew", self._on_unit_new),
+            ("UnitRemoved", self._on_unit_removed),
+            ("UnitFilesChanged", self._on_unit_files_changed),
+            ("Reloading", self._on_reloading),
+        ):
+            self._matches.append(bus.add_signal_receiver(
+                handler, signal_name=signal_name, dbus_interface=MANAGER_INTERFACE,
+                bus_name=SYSTEMD_BUS_NAME, path=SYSTEMD_PATH,
+            ))
+        self._matches.append(bus.add_signal_receiver(
+            self._on_properties_changed, signal_name="PropertiesChanged",
+            dbus_interface=PROPERTIES_INTERFACE, bus_name=SYSTEMD_BUS_NAME,
+            path_keyword="path",
+        ))
+        self._bus, self._manager = bus, manager
+        try:
+            manager.Subscribe()
+            self.resync()
+        except _DBusException:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        """Stop following the manager."""
+        for match in self._matches:
+            match.remove()
+        self._matches = []
+        if self._manager is not None:
+            try:
+                self._manager.Unsubscribe()
+            except _DBusException as e:
+                logger.debug("systemd Unsubscribe failed: %s", e)
+        self._bus = self._manager = None
+
+    def resync(self) -> None:
+        """Replace the cached state with a fresh ListUnits/ListUnitFiles dump."""
+        self.load(self._manager.ListUnits(), self._manager.ListUnitFiles())
+
+    # ------------------------------------------------------------ queries
+    def services(self) -> List[UnitRecord]:
+        """Return copies of every cached service record."""
+        with self._lock:
+            return [copy.copy(unit) for unit in self._units.values()]
+
+    def get(self, name: str) -> Optional[UnitRecord]:
+        """Return a copy of the record for service *name* (no suffix), or None."""
+        with self._lock:
+            unit = self._units.get(name)
+            return copy.copy(unit) if unit is not None else None
+
+    def add_listener(self, callback: Callable[[], None]) -> None:
+        """Call *callback* (on the D-Bus thread) after every change."""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    # ------------------------------------------------------------ updates
+    def load(self, units: Iterable[Sequence], unit_files: Iterable[Sequence]) -> None:
+        """Rebuild from ``ListUnits`` rows and ``ListUnitFiles`` (path, state) pairs."""
+        file_states = {os.path.basename(str(path)): str(state) for path, state in unit_files}
+        records: Dict[str, UnitRecord] = {}
+        for row in units:
+            unit_id, description, _load, active, sub, _following, path = row[:7]
+            unit_id = str(unit_id)
+            if not unit_id.endswith(SERVICE_SUFFIX):
+                continue
+            name = unit_id[:-len(SERVICE_SUFFIX)]
+            records[name] = UnitRecord(
+                name=name,
+                description=str(description),
+                active_state=str(active),
+                sub_state=str(sub),
+                unit_file_state=self._file_state(file_states, unit_id),
+                path=str(path),
+            )
+        with self._lock:
+            self._units = records
+            self._by_path = {unit.path: name for name, unit in records.items()}
+            self._file_states = file_states
+        self._notify()
+
+    def apply_unit_new(self, unit_id: str, path: str, properties: dict) -> None:
+        """Add or refresh a unit from its ``org.freedesktop.systemd1.Unit`` properties."""
+        name = unit_id[:-len(SERVICE_SUFFIX)]
+        with self._lock:
+            unit = self._units.get(name)
+            if unit is None:
+                unit = self._units[name] = UnitRecord(
+                    name=name, unit_file_state=self._file_state(self._file_states, unit_id),
+                )
+            unit.path = path
+            self._by_path[path] = name
+            self._update_fields(unit, properties)
+        self._notify()
+
+    def apply_unit_removed(self, unit_id: str) -> None:
+        with self._lock:
+            unit = self._units.pop(unit_id[:-len(SERVICE_SUFFIX)], None)
+            if unit is None:
+                return
+            self._by_path.pop(unit.path, None)
+        self._notify()
+
+    def apply_properties(self, path: str, changed: dict) -> bool:
+        """Merge changed unit properties; returns False for unknown paths."""
+        with self._lock:
+            name = self._by_path.get(path)
+            if name is None:
+                return False
+            if not self._update_fields(self._units[name], changed):
+                return True
+        self._notify()
+        return True
+
+    def apply_unit_files(self, unit_files: Iterable[Sequence]) -> None:
+        """Refresh enablement states from ``ListUnitFiles`` pairs."""
+        file_states = {os.path.basename(str(path)): str(state) for path, state in unit_files}
+        with self._lock:
+            self._file_states = file_states
+            for name, unit in self._units.items():
+                unit.unit_file_state = self._file_state(file_states, name + SERVICE_SUFFIX)
+        self._notify()
+
+    @staticmethod
+    def _file_state(file_states: Dict[str, str], unit_id: str) -> str:
+        state = file_states.get(unit_id)
+        if state is None and "@" in unit_id:
+            # Template instances share the template's unit file.
+            state = file_states.get(unit_id.split("@", 1)[0] + "@" + SERVICE_SUFFIX)
+        return state or ""
+
+    @staticmethod
+    def _update_fields(unit: UnitRecord, properties: dict) -> bool:
+        changed = False
+        for prop, attr in _TRACKED_PROPERTIES.items():
+            if prop in properties:
+                value = str(properties[prop])
+                if getattr(unit, attr) != value:
+                    setattr(unit, attr, value)
+                    changed = True
+        return changed
+
+    def _notify(self) -> None:
+        with self._lock:
+            listeners = list(self._listeners)
+        for callback in listeners:
+            try:
+                callback()
+            except (RuntimeError, OSError) as e:
+                # e.g. a Qt signal whose widget is gone; keep dispatching.
+                logger.debug("systemd unit listener failed: %s", e)
+
+    # ------------------------------------------------------------ D-Bus handlers
+    def _unit_properties(self, path: str) -> dict:
+        unit = self._bus.get_object(SYSTEMD_BUS_NAME, path)
+        return dict(unit.GetAll(UNIT_INTERFACE, dbus_interface=PROPERTIES_INTERFACE))
+
+    def _on_unit_new(self, unit_id, path) -> None:
+        if not str(unit_id).endswith(SERVICE_SUFFIX):
+            return
+        try:
+            self.apply_unit_new(str(unit_id), str(path), self._unit_properties(str(path)))
+        except _DBusException as e:
+            logger.debug("Could not read new unit %s: %s", unit_id, e)
+
+    def _on_unit_removed(self, unit_id, _path) -> None:
+        if str(unit_id).endswith(SERVICE_SUFFIX):
+            self.apply_unit_removed(str(unit_id))
+
+    def _on_unit_files_changed(self) -> None:
+        try:
+            self.apply_unit_files(self._manager.ListUnitFiles())
+        except _DBusException as e:
+            logger.debug("ListUnitFiles failed: %s", e)
+
+    def _on_reloading(self, active) -> None:
+        if active:
+            return
+        try:
+            self.resync()
+        except _DBusException as e:
+            logger.debug("systemd resync after reload failed: %s", e)
+
+    def _on_properties_changed(self, interface, changed, invalidated, path=None) -> None:
+        if str(interface) != UNIT_INTERFACE or path is None:
+            return
+        path = str(path)
+        if any(str(prop) in _TRACKED_PROPERTIES for prop in invalidated):
+            try:
+                changed = self._unit_properties(path)
+            except _DBusException as e:
+                logger.debug("Could not re-read unit %s: %s", path, e)
+                return
+        self.apply_properties(path, changed)
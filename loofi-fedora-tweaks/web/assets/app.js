@@ -3,10 +3,14 @@
 const API_BASE = window.location.origin;
 const TOKEN_KEY = 'loofi_jwt_token';
 const REFRESH_INTERVAL = 10000; // 10 seconds
+const METRICS_STREAM = '/api/stream/metrics?fields=cpu,memory,load,network&interval=2';
+const STREAM_RETRY_DELAY = 5000; // 5 seconds
 
 // State Management
 let authToken = null;
 let refreshTimer = null;
+let metricsStream = null;
+let metricsRetryTimer = null;
 
 // DOM Elements
 const loginScreen = document.getElementById('login-screen');
@@ -21,6 +25,8 @@ const agentStatusContainer = document.getElementById('agent-status');
 const executeForm = document.getElementById('execute-form');
 const executeResult = document.getElementById('execute-result');
 const executeOutput = document.getElementById('execute-output');
+const liveMetricsContainer = document.getElementById('live-metrics');
+const liveMetricsStatus = document.getElementById('live-metrics-status');
 
 // Initialization
 document.addEventListener('DOMContentLoaded', () => {
@@ -49,6 +55,7 @@ function showLogin() {
     loginScreen.classList.remove('hidden');
     dashboardScreen.classList.add('hidden');
     clearInterval(refreshTimer);
+    stopMetricsStream();
 }
 
 function showDashboard() {
@@ -56,6 +63,7 @@ function showDashboard() {
     dashboardScreen.classList.remove('hidden');
     loadDashboardData();
     startAutoRefresh();
+    startMetricsStream();
 }
 
 async function handleLogin(e) {
@@ -251,6 +259,99 @@ function displayExecuteResult(result) {
     executeOutput.textContent = JSON.stringify(result, null, 2);
 }
 
+// Live metrics (server-sent events read with fetch so the token stays in a header)
+async function startMetricsStream() {
+    stopMetricsStream();
+    const controller = new AbortController();
+    metricsStream = controller;
+    liveMetricsStatus.textContent = 'Connecting...';
+
+    try {
+        const response = await fetch(`${API_BASE}${METRICS_STREAM}`, {
+            headers: { 'Authorization': `Bearer ${authToken}` },
+            signal: controller.signal,
+        });
+        if (response.status === 401) {
+            handleLogout();
+            return;
+        }
+        if (!response.ok || !response.body) {
+            throw new Error(`Request failed: ${response.status}`);
+        }
+
+        liveMetricsStatus.textContent = 'Live';
+        const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+        let buffer = '';
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += value;
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                handleStreamFrame(buffer.slice(0, boundary));
+                buffer = buffer.slice(boundary + 2);
+            }
+        }
+        throw new Error('Stream closed');
+    } catch (error) {
+        if (controller.signal.aborted) return;
+        liveMetricsStatus.textContent = `Reconnecting (${error.message})`;
+        metricsRetryTimer = setTimeout(startMetricsStream, STREAM_RETRY_DELAY);
+    }
+}
+
+function stopMetricsStream() {
+    clearTimeout(metricsRetryTimer);
+    if (metricsStream) {
+        metricsStream.abort();
+        metricsStream = null;
+    }
+}
+
+function handleStreamFrame(frame) {
+    const data = frame.split('\n')
+        .filter(line => line.startsWith('data:'))
+        .map(line => line.slice(5).trim())
+        .join('\n');
+    if (data) {
+        renderLiveMetrics(JSON.parse(data));
+    }
+}
+
+function renderLiveMetrics(sample) {
+    const cpu = sample.cpu || {};
+    const memory = sample.memory || {};
+    const load = sample.load || {};
+    const network = sample.network || {};
+
+    const items = [
+        { label: 'CPU Usage', value: cpu.percent !== undefined ? `${cpu.percent}%` : 'N/A' },
+        { label: 'Memory Usage', value: memory.percent !== undefined ? `${memory.percent}%` : 'N/A' },
+        { label: 'Load (1m)', value: load.load_1min !== undefined ? load.load_1min : 'N/A' },
+        { label: 'Network Down', value: network.recv_rate !== undefined ? formatRate(network.recv_rate) : 'N/A' },
+        { label: 'Network Up', value: network.send_rate !== undefined ? formatRate(network.send_rate) : 'N/A' },
+    ];
+
+    liveMetricsContainer.innerHTML = items.map(item => `
+        <div class="info-item">
+            <div class="info-label">${item.label}</div>
+            <div class="info-value">${escapeHtml(String(item.value))}</div>
+        </div>
+    `).join('');
+    liveMetricsStatus.textContent = `Live, ${new Date(sample.timestamp * 1000).toLocaleTimeString()}`;
+}
+
+function formatRate(bytesPerSecond) {
+    const units = ['B/s', 'KB/s', 'MB/s', 'GB/s'];
+    let value = bytesPerSecond;
+    let unit = 0;
+    while (value >= 1024 && unit < units.length - 1) {
+        value /= 1024;
+        unit++;
+    }
+    return `${value.toFixed(1)} ${units[unit]}`;
+}
+
 // Auto-refresh
 function startAutoRefresh() {
     clearInterval(refreshTimer);
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Load test for the Loofi Web API polling endpoints.
+
+Starts the uvicorn app from utils/api_server.py in a child process on a free
+local port with a throwaway HOME, issues a token, then runs N concurrent pollers
+against /api/info (and optionally /api/agents) and reports latency
+percentiles per concurrency level. Flat p50/p99 as concurrency grows shows
+that requests are coalesced by the snapshot cache instead of each one
+re-probing the system.
+
+Requires the ``api`` extra (fastapi, uvicorn, httpx, PyJWT, bcrypt).
+
+Usage:
+    python3 scripts/bench_api_load.py
+    python3 scripts/bench_api_load.py --concurrency 50 200 500 --requests 5
+    python3 scripts/bench_api_load.py --endpoint /api/agents
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+APP_DIR = ROOT / "loofi-fedora-tweaks"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+_SERVER_CODE = """
+import sys
+import uvicorn
+sys.path.insert(0, sys.argv[2])
+from utils.api_server import APIServer
+server = APIServer(port=int(sys.argv[1]))
+uvicorn.run(server.app, host="127.0.0.1", port=int(sys.argv[1]), log_level="warning", backlog=4096)
+"""
+
+
+def _start_server(port: int, env: dict) -> subprocess.Popen:
+    proc = subprocess.Popen(
+        [sys.executable, "-c", _SERVER_CODE, str(port), str(APP_DIR)],
+        env=env,
+    )
+    deadline = time.monotonic() + 20
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("API server did not start")
+
+
+async def _poller(client, url: str, headers: dict, count: int, latencies: list, errors: list) -> None:
+    import httpx
+
+    for _ in range(count):
+        start = time.perf_counter()
+        try:
+            response = await client.get(url, headers=headers)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            errors.append(e)
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+
+
+async def _run_level(base: str, endpoint: str, token: str, concurrency: int, requests: int) -> tuple:
+    import httpx
+
+    latencies: list = []
+    errors: list = []
+    headers = {"Authorization": f"Bearer {token}"}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=60) as client:
+        await asyncio.gather(
+            *(_poller(client, endpoint, headers, requests, latencies, errors) for _ in range(concurrency))
+        )
+    return latencies, errors
+
+
+def _percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 100, 300])
+    parser.add_argument("--requests", type=int, default=10, help="Requests per poller")
+    parser.add_argument("--endpoint", default="/api/info")
+    args = parser.parse_args()
+
+    import httpx
+
+    home = tempfile.mkdtemp(prefix="loofi-bench-")
+    env = dict(os.environ, HOME=home, XDG_DATA_HOME=os.path.join(home, ".local", "share"))
+    port = _free_port()
+    server = _start_server(port, env)
+    base = f"http://127.0.0.1:{port}"
+    try:
+        api_key = httpx.post(f"{base}/api/key").json()["api_key"]
+        token = httpx.post(f"{base}/api/token", data={"api_key": api_key}).json()["access_token"]
+
+        print(f"{'clients':>8} {'ok':>7} {'errors':>7} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+        for level in args.concurrency:
+            latencies, errors = asyncio.run(_run_level(base, args.endpoint, token, level, args.requests))
+            if not latencies:
+                print(f"{level:>8} {0:>7} {len(errors):>7}")
+                continue
+            print(
+                f"{level:>8} {len(latencies):>7} {len(errors):>7} "
+                f"{statistics.median(latencies):>9.2f} {_percentile(latencies, 90):>9.2f} "
+                f"{_percentile(latencies, 99):>9.2f} {max(latencies):>9.2f}"
+            )
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
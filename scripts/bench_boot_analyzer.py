@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Boot analysis benchmark: repeated systemd-analyze runs vs the boot history.
+
+Times one Diagnostics boot refresh (get_boot_stats, get_slow_services and
+get_optimization_suggestions, as the Watchtower boot tab calls them):
+
+  legacy   the five sequential ``systemd-analyze`` runs the refresh made
+           before the history (time, blame, then time + blame twice more)
+  cold     the first refresh of a boot: time, blame and critical-chain
+           gathered in parallel, then recorded
+  warm     later refreshes in the same process
+  reopen   a refresh in a freshly started process (history re-read from disk)
+
+By default a stand-in ``systemd-analyze`` script printing canned output is
+put first on PATH, so the numbers show process and parsing overhead on any
+host; --delay adds the time the real command spends querying systemd.
+Pass --real to use the system's systemd-analyze instead.
+
+Usage:
+    python3 scripts/bench_boot_analyzer.py
+    python3 scripts/bench_boot_analyzer.py --delay 0.05 --repeat 10
+    python3 scripts/bench_boot_analyzer.py --real
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "loofi-fedora-tweaks"))
+
+import utils.boot_analyzer as boot_analyzer  # noqa: E402
+from utils.boot_analyzer import BootAnalyzer, BootHistory  # noqa: E402
+
+_STUB = """#!/bin/sh
+sleep {delay}
+case "$1" in
+  blame) i=0; while [ $i -lt 200 ]; do echo "$((i * 37 % 9000))ms unit-$i.service"; i=$((i + 1)); done ;;
+  critical-chain) echo "graphical.target @21.480s"; echo "└─multi-user.target @21.479s" ;;
+  *) echo "Startup finished in 2.5s (firmware) + 1.2s (loader) + 1.1s (kernel) + 2.0s (initrd) + 15.2s (userspace) = 22.0s" ;;
+esac
+"""
+
+
+def _refresh() -> None:
+    BootAnalyzer.get_boot_stats()
+    BootAnalyzer.get_slow_services()
+    BootAnalyzer.get_optimization_suggestions()
+
+
+def _legacy() -> None:
+    for args in ((), ("blame",), ("blame",), (), ("blame",)):
+        output = BootAnalyzer._systemd_analyze(*args)
+        if output is not None:
+            if args:
+                BootAnalyzer._parse_blame(output)
+            else:
+                BootAnalyzer._parse_time(output)
+
+
+def _cold() -> None:
+    boot_analyzer.DEFAULT_HISTORY_PATH.unlink(missing_ok=True)
+    BootHistory.clear_cache()
+    _refresh()
+
+
+def _reopen() -> None:
+    BootHistory.clear_cache()
+    _refresh()
+
+
+def _timed(fn, repeat: int) -> list:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _summary(label: str, samples: list) -> str:
+    ordered = sorted(samples)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return (f"  {label:<7} p50 {statistics.median(ordered):9.3f} ms   "
+            f"p99 {p99:9.3f} ms")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--delay", type=float, default=0.0)
+    parser.add_argument("--real", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if not args.real:
+            stub = Path(tmp) / "systemd-analyze"
+            stub.write_text(_STUB.format(delay=args.delay))
+            stub.chmod(0o755)
+            os.environ["PATH"] = f"{tmp}{os.pathsep}{os.environ['PATH']}"
+        boot_analyzer.DBUS_AVAILABLE = boot_analyzer.DBUS_AVAILABLE and args.real
+        boot_analyzer.DEFAULT_HISTORY_PATH = Path(tmp) / "boot_history.json"
+        if BootAnalyzer.current_boot_id() is None:
+            print("no boot ID on this host; nothing would be cached")
+            return 1
+
+        print(f"Diagnostics boot refresh ({'real' if args.real else 'stub'} systemd-analyze)")
+        print(_summary("legacy", _timed(_legacy, args.repeat)))
+        print(_summary("cold", _timed(_cold, args.repeat)))
+        print(_summary("warm", _timed(_refresh, args.repeat)))
+        print(_summary("reopen", _timed(_reopen, args.repeat)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Largest-directory benchmark: ``du -B1 --max-depth`` vs the native scanner.
+
+Times DiskManager.find_large_directories three ways on one tree:
+
+  du        the subprocess used before the scanner
+  scan      DirectorySizeScanner with refresh=True (every directory listed)
+  cached    a second scan served from the persisted per-directory cache, as
+            a later CLI run or dashboard refresh would see it
+
+and checks that all three agree.  With --drop-caches (root only) the kernel
+page cache is dropped before every sample, so the numbers show a cold disk,
+which is where ``du`` on a large home directory hits its 30 s timeout.
+
+Usage:
+    python3 scripts/bench_dir_sizes.py
+    python3 scripts/bench_dir_sizes.py --path /usr/share --repeat 5
+    sudo python3 scripts/bench_dir_sizes.py --drop-caches --workers 1 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "loofi-fedora-tweaks"))
+
+from utils.dir_sizes import DirSizeCache, DirectorySizeScanner  # noqa: E402
+
+
+def _du(path: str, top_n: int) -> list:
+    output = subprocess.run(
+        ["du", "-B1", "--max-depth=2", path], capture_output=True, text=True, check=False
+    )
+    results = []
+    for line in output.stdout.strip().split("\n"):
+        size, _, dir_path = line.partition("\t")
+        if dir_path and dir_path != path:
+            results.append((dir_path, int(size)))
+    results.sort(key=lambda item: item[1], reverse=True)
+    return results[:top_n]
+
+
+def _drop_caches() -> None:
+    os.sync()
+    with open("/proc/sys/vm/drop_caches", "w") as f:
+        f.write("3\n")
+
+
+def _timed(fn, repeat: int, drop: bool) -> tuple:
+    samples, result = [], None
+    for _ in range(repeat):
+        if drop:
+            _drop_caches()
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples, result
+
+
+def _summary(label: str, samples: list) -> str:
+    ordered = sorted(samples)
+    return (f"  {label:<12} p50 {statistics.median(ordered):9.1f} ms   "
+            f"max {ordered[-1]:9.1f} ms")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--path", default=os.path.expanduser("~"))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, nargs="+", default=[DirectorySizeScanner.WORKERS])
+    parser.add_argument("--drop-caches", action="store_true")
+    args = parser.parse_args()
+
+    path = os.path.abspath(args.path)
+    print(f"{path}, top 5 at depth 2{' (page cache dropped)' if args.drop_caches else ''}")
+    samples, expected = _timed(lambda: _du(path, 5), args.repeat, args.drop_caches)
+    print(_summary("du", samples))
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in args.workers:
+            scanner = DirectorySizeScanner(DirSizeCache(Path(tmp) / f"{workers}.json"), workers)
+            samples, fresh = _timed(
+                lambda: scanner.scan(path, 2, 5, refresh=True), args.repeat, args.drop_caches)
+            print(_summary(f"scan/{workers}", samples))
+            # A new cache object reloads the file, like a fresh process would.
+            scanner.cache = DirSizeCache(scanner.cache.path)
+            samples, cached = _timed(lambda: scanner.scan(path, 2, 5), args.repeat, args.drop_caches)
+            print(_summary(f"cached/{workers}", samples))
+            if not fresh == cached == expected:
+                print("  results differ from du (tree changed while scanning?)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
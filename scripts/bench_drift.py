@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Drift capture benchmark for DriftDetector.capture_snapshot.
+
+Times three ways of capturing the system state:
+
+  legacy  the implementation before the source cache: every collector run
+          one after another, sysctl values via one ``sysctl -n`` each
+  cold    capture_snapshot with an empty cache (collectors in parallel,
+          sysctl read from /proc/sys)
+  warm    capture_snapshot on the following calls, when only sources whose
+          change token moved are collected again
+
+Requires PyQt6 (imported by services.system).
+
+Usage:
+    python3 scripts/bench_drift.py
+    python3 scripts/bench_drift.py --repeat 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "loofi-fedora-tweaks"))
+
+from utils.drift import DriftDetector  # noqa: E402
+
+
+def _legacy_sysctl(detector: DriftDetector) -> str:
+    values = []
+    for key in detector.SYSCTL_KEYS:
+        try:
+            result = subprocess.run(["sysctl", "-n", key], capture_output=True, text=True, timeout=15)
+        except (subprocess.SubprocessError, OSError):
+            continue
+        if result.returncode == 0:
+            values.append(f"{key}={result.stdout.strip()}")
+    return "\n".join(values)
+
+
+def _legacy_capture(detector: DriftDetector) -> None:
+    detector._get_kernel_params()
+    detector._get_layered_packages()
+    detector._get_user_services()
+    detector._get_dnf_config()
+    _legacy_sysctl(detector)
+
+
+def _cold_capture(detector: DriftDetector) -> None:
+    detector.clear_cache()
+    detector.capture_snapshot("bench")
+
+
+def _warm_capture(detector: DriftDetector) -> None:
+    detector.capture_snapshot("bench")
+
+
+def _timed(fn, detector: DriftDetector, repeat: int) -> list:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(detector)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _summary(label: str, samples: list) -> str:
+    ordered = sorted(samples)
+    return (f"  {label:<8} p50 {statistics.median(ordered):9.2f} ms   "
+            f"max {ordered[-1]:9.2f} ms")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        DriftDetector.SNAPSHOTS_DIR = Path(tmp)
+        DriftDetector.CURRENT_SNAPSHOT = Path(tmp) / "current.json"
+        detector = DriftDetector()
+        print(_summary("legacy", _timed(_legacy_capture, detector, args.repeat)))
+        print(_summary("cold", _timed(_cold_capture, detector, args.repeat)))
+        detector.capture_snapshot("bench")
+        print(_summary("warm", _timed(_warm_capture, detector, args.repeat)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
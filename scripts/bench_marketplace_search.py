@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Type-ahead benchmark for the plugin marketplace search index.
+
+Builds a synthetic catalogue of N plugins, then replays typed queries one
+keystroke at a time ("b", "ba", "bac", ...) against PluginSearchIndex and
+against the linear scan PluginMarketplace.search used before the index.
+Reports index build time, per-keystroke latency percentiles and the mean
+result count.  The query cache is cleared before every keystroke, so the
+numbers are cold lookups.
+
+Descriptions draw from a Zipf-distributed vocabulary of a few thousand
+words, so common words match many plugins and rare ones match a few, as
+in a real catalogue.  The queried words sit at random frequency ranks;
+``--worst-case`` makes them the most frequent words of the catalogue
+instead.  "top-N" rows ask for the first N ranked results, which is what
+a type-ahead list shows.
+
+Requires PyQt6 (imported by the plugin marketplace package).
+
+Usage:
+    python3 scripts/bench_marketplace_search.py
+    python3 scripts/bench_marketplace_search.py --plugins 1000 10000 50000 --limit 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "loofi-fedora-tweaks"))
+
+from utils.plugin_marketplace import PluginMetadata  # noqa: E402
+from utils.plugin_search import PluginSearchIndex  # noqa: E402
+
+_WORDS = (
+    "backup sync network monitor firewall docker podman gaming steam audio "
+    "pipewire bluetooth battery power thermal fan kernel driver nvidia amd "
+    "flatpak rpm dnf update cleanup cache disk storage snapshot btrfs zram "
+    "privacy security vpn wireguard ssh terminal theme icon font wallpaper "
+    "clipboard screenshot recorder stream browser mail calendar notes "
+    "developer python rust node container virtual machine boot grub plymouth"
+).split()
+_CATEGORIES = ["Utility", "Network", "Security", "Gaming", "Developer", "System", "Appearance"]
+_QUERIES = ["backup", "network monitor", "pod", "ackup", "thermal fan", "steam gaming", "wire"]
+
+
+def _vocabulary(rng: random.Random, worst_case: bool, size: int = 4000) -> list:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = []
+    while len(words) < size - len(_WORDS):
+        words.append("".join(rng.choices(letters, k=rng.randint(4, 10))))
+    if worst_case:
+        return list(_WORDS) + words
+    words.extend(_WORDS)
+    rng.shuffle(words)
+    return words
+
+
+def _catalogue(size: int, worst_case: bool = False, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    vocab = _vocabulary(rng, worst_case)
+    zipf = [1.0 / (rank + 1) for rank in range(len(vocab))]
+    plugins = []
+    for i in range(size):
+        name = " ".join(rng.choices(vocab, weights=zipf, k=2)).title() + f" {i}"
+        plugins.append(PluginMetadata(
+            id=f"plugin-{i}",
+            name=name,
+            description=" ".join(rng.choices(vocab, weights=zipf, k=12)),
+            category=rng.choice(_CATEGORIES),
+            tags=rng.choices(vocab, weights=zipf, k=3),
+            rating_average=round(rng.uniform(1, 5), 1),
+            rating_count=rng.randint(0, 2000),
+        ))
+    return plugins
+
+
+def _linear_scan(plugins: list, query: str) -> list:
+    """The pre-index implementation of PluginMarketplace.search."""
+    query_lower = query.lower()
+    return [
+        p for p in plugins
+        if query_lower in p.name.lower()
+        or query_lower in p.description.lower()
+        or any(query_lower in tag.lower() for tag in p.tags)
+    ]
+
+
+def _keystrokes():
+    for query in _QUERIES:
+        for end in range(1, len(query) + 1):
+            yield query[:end]
+
+
+def _timed(fn, repeat: int) -> tuple:
+    samples = []
+    counts = []
+    for _ in range(repeat):
+        for prefix in _keystrokes():
+            start = time.perf_counter()
+            counts.append(len(fn(prefix)))
+            samples.append((time.perf_counter() - start) * 1000)
+    return samples, counts
+
+
+def _summary(label: str, timed: tuple) -> str:
+    samples, counts = timed
+    ordered = sorted(samples)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return (f"  {label:<12} p50 {statistics.median(ordered):8.3f} ms   "
+            f"p99 {p99:8.3f} ms   max {ordered[-1]:8.3f} ms   "
+            f"results {statistics.mean(counts):8.1f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--plugins", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5, help="Passes over the keystroke list")
+    parser.add_argument("--limit", type=int, default=50, help="Result cap for the top-N rows")
+    parser.add_argument("--worst-case", action="store_true",
+                        help="Make the queried words the most frequent in the catalogue")
+    args = parser.parse_args()
+
+    for size in args.plugins:
+        plugins = _catalogue(size, args.worst_case)
+        start = time.perf_counter()
+        index = PluginSearchIndex(plugins)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        def indexed(prefix: str, limit=None) -> list:
+            index._query_cache.clear()
+            return index.search(prefix, limit=limit)
+
+        print(f"{size} plugins (index build {build_ms:.1f} ms)")
+        print(_summary(f"top-{args.limit}", _timed(lambda q: indexed(q, args.limit), args.repeat)))
+        print(_summary("indexed", _timed(indexed, args.repeat)))
+        print(_summary("linear", _timed(lambda q: _linear_scan(plugins, q), args.repeat)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Connection-listing benchmark for NetworkMonitor.get_active_connections.
+
+Starts helper processes that hold N bound UDP sockets between them, then
+times three ways of listing every connection with its owning process:
+
+  legacy  the implementation before the socket caches: readlink every fd
+          of every process, then parse the four /proc/net tables
+  cold    get_active_connections with empty caches (sock_diag dump and a
+          full fd walk)
+  warm    get_active_connections on the following calls, when only
+          processes whose fd count changed are re-read
+
+Each helper holds at most ``--per-process`` sockets (bounded by the hard
+RLIMIT_NOFILE) bound to its own 127.0.0.x address, so large counts do not
+run out of ephemeral ports.
+
+Usage:
+    python3 scripts/bench_network_connections.py
+    python3 scripts/bench_network_connections.py --sockets 10000 100000 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import resource
+import socket
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "loofi-fedora-tweaks"))
+
+from utils.network_monitor import NetworkMonitor  # noqa: E402
+
+
+def _hold_sockets(count: int, address: str, ready, release) -> None:
+    _soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    held = []
+    for _ in range(count):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind((address, 0))
+        held.append(sock)
+    ready.set()
+    release.wait()
+
+
+def _start_holders(total: int, per_process: int) -> tuple:
+    ctx = multiprocessing.get_context("fork")
+    release = ctx.Event()
+    holders = []
+    for index, start in enumerate(range(0, total, per_process)):
+        ready = ctx.Event()
+        proc = ctx.Process(
+            target=_hold_sockets,
+            args=(min(per_process, total - start), f"127.0.0.{index + 2}", ready, release),
+            daemon=True,
+        )
+        proc.start()
+        holders.append((proc, ready))
+    for proc, ready in holders:
+        while not ready.wait(0.5):
+            if not proc.is_alive():
+                raise RuntimeError(f"socket holder exited with {proc.exitcode}")
+    return release, [proc for proc, _ready in holders]
+
+
+def _legacy_listing() -> int:
+    """The pre-cache implementation: full fd walk plus /proc/net parsing."""
+    inode_map = {}
+    for pid_str in (entry for entry in os.listdir("/proc") if entry.isdigit()):
+        fd_dir = f"/proc/{pid_str}/fd"
+        try:
+            fds = os.listdir(fd_dir)
+        except OSError:
+            continue
+        name = ""
+        for fd_name in fds:
+            try:
+                target = os.readlink(os.path.join(fd_dir, fd_name))
+            except OSError:
+                continue
+            if target.startswith("socket:["):
+                if not name:
+                    name = NetworkMonitor._get_process_name(int(pid_str))
+                inode_map[target[8:-1]] = (int(pid_str), name)
+    count = 0
+    for _proto, path, is_v6 in NetworkMonitor._SOCKET_TABLES:
+        for entry in NetworkMonitor._parse_proc_net_socket(path, is_v6):
+            inode_map.get(entry["inode"])
+            count += 1
+    return count
+
+
+def _cold_listing() -> int:
+    NetworkMonitor.clear_socket_cache()
+    return len(NetworkMonitor.get_active_connections())
+
+
+def _warm_listing() -> int:
+    return len(NetworkMonitor.get_active_connections())
+
+
+def _timed(fn, repeat: int) -> tuple:
+    samples = []
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples, count
+
+
+def _summary(label: str, timed: tuple) -> str:
+    samples, count = timed
+    ordered = sorted(samples)
+    return (f"  {label:<8} p50 {statistics.median(ordered):9.1f} ms   "
+            f"max {ordered[-1]:9.1f} ms   connections {count}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sockets", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--per-process", type=int, default=None,
+                        help="Sockets per helper process (default: hard fd limit - 64)")
+    args = parser.parse_args()
+    per_process = args.per_process or resource.getrlimit(resource.RLIMIT_NOFILE)[1] - 64
+
+    for total in args.sockets:
+        release, holders = _start_holders(total, per_process)
+        try:
+            NetworkMonitor.clear_socket_cache()
+            diag = "sock_diag" if NetworkMonitor._diag_socket_table("udp", False) is not None else "/proc"
+            print(f"{total} sockets in {len(holders)} process(es), tables via {diag}")
+            print(_summary("legacy", _timed(_legacy_listing, args.repeat)))
+            print(_summary("cold", _timed(_cold_listing, args.repeat)))
+            _warm_listing()
+            print(_summary("warm", _timed(_warm_listing, args.repeat)))
+        finally:
+            release.set()
+            for proc in holders:
+                proc.join(10)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
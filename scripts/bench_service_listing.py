@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Service listing benchmark: systemctl subprocesses vs the D-Bus unit cache.
+
+Times ServiceExplorer.list_services three ways:
+
+  systemctl  the subprocess path (``systemctl list-units`` + ``is-enabled``),
+             against the running system manager
+  live       the SystemdUnitCache path against the running manager, once
+             the initial ListUnits/ListUnitFiles dump is done
+  synthetic  the cache path over N generated units, for hosts without a
+             reachable bus and to show how listing scales with unit count
+
+Each listing is repeated unfiltered, filtered by state and with a search
+string.  Rows whose backend is unavailable on this host are skipped.
+
+Requires PyQt6 (imported by utils.commands).
+
+Usage:
+    python3 scripts/bench_service_listing.py
+    python3 scripts/bench_service_listing.py --units 500 5000 --repeat 50 --user
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "loofi-fedora-tweaks"))
+
+from utils.service_explorer import ServiceExplorer, ServiceScope  # noqa: E402
+from utils.systemd_units import SystemdUnitCache  # noqa: E402
+
+_STATES = [("active", "running"), ("inactive", "dead"), ("failed", "failed"), ("active", "exited")]
+_QUERIES = [{}, {"filter_state": "failed"}, {"search": "net"}]
+
+
+def _synthetic_cache(count: int) -> SystemdUnitCache:
+    cache = SystemdUnitCache()
+    units = []
+    files = []
+    for i in range(count):
+        active, sub = _STATES[i % len(_STATES)]
+        unit_id = f"unit-{i}{'-network' if i % 7 == 0 else ''}.service"
+        units.append((unit_id, f"Synthetic unit {i}", "loaded", active, sub, "", f"/unit/{i}"))
+        files.append((f"/usr/lib/systemd/system/{unit_id}", "enabled" if i % 3 else "disabled"))
+    cache.load(units, files)
+    return cache
+
+
+def _timed(scope: ServiceScope, repeat: int) -> tuple:
+    samples = []
+    count = 0
+    for _ in range(repeat):
+        for query in _QUERIES:
+            start = time.perf_counter()
+            count = max(count, len(ServiceExplorer.list_services(scope, **query)))
+            samples.append((time.perf_counter() - start) * 1000)
+    return samples, count
+
+
+def _summary(label: str, timed: tuple) -> str:
+    samples, count = timed
+    ordered = sorted(samples)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return (f"  {label:<16} p50 {statistics.median(ordered):9.3f} ms   "
+            f"p99 {p99:9.3f} ms   services {count}")
+
+
+def _systemctl_works(scope: ServiceScope) -> bool:
+    cmd = ["systemctl"] + (["--user"] if scope == ServiceScope.USER else []) + ["is-system-running"]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return False
+    return result.stdout.strip() not in ("", "offline", "unknown")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--units", type=int, nargs="+", default=[300, 3000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--user", action="store_true", help="Benchmark the user manager")
+    args = parser.parse_args()
+    scope = ServiceScope.USER if args.user else ServiceScope.SYSTEM
+
+    print(f"{scope.value} manager")
+    if _systemctl_works(scope):
+        with patch.object(SystemdUnitCache, "shared", return_value=None):
+            print(_summary("systemctl", _timed(scope, max(1, args.repeat // 10))))
+    else:
+        print("  systemctl        skipped (no running systemd manager)")
+
+    start = time.perf_counter()
+    live = SystemdUnitCache.shared(user=args.user)
+    if live is not None:
+        print(f"  (initial D-Bus dump {(time.perf_counter() - start) * 1000:.1f} ms)")
+        print(_summary("live", _timed(scope, args.repeat)))
+    else:
+        print("  live             skipped (systemd D-Bus API unavailable)")
+
+    for count in args.units:
+        with patch.object(SystemdUnitCache, "shared", return_value=_synthetic_cache(count)):
+            print(_summary(f"synthetic {count}", _timed(scope, args.repeat)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
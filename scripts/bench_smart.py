@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""SMART benchmark: one ``pkexec smartctl`` per disk vs the batched collector.
+
+Times reading SMART health for every disk, as the Storage tab and
+``storage smart`` do:
+
+  legacy   one privileged ``smartctl -a`` per disk, text output parsed
+           (one polkit prompt per disk before the collector)
+  batch    SmartCollector with refresh=True: every disk in one privileged
+           ``loofi-smart-batch`` run (one prompt)
+  cached   a later read within the TTL, served from the persisted cache
+  reopen   the same in a freshly started process (cache re-read from disk)
+
+Stand-in ``pkexec`` and ``smartctl`` scripts are put first on PATH (and a
+stand-in helper that skips the block-device check is used), so the numbers
+show process and parsing overhead for any number of disks; --delay adds the
+time each prompt (or real drive query) costs.
+
+Usage:
+    python3 scripts/bench_smart.py
+    python3 scripts/bench_smart.py --disks 12 --delay 0.05 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "loofi-fedora-tweaks"))
+
+import utils.storage as storage  # noqa: E402
+from utils.health_timeline import HealthTimeline  # noqa: E402
+from utils.storage import SmartCollector  # noqa: E402
+
+_PKEXEC = """#!/bin/sh
+sleep {delay}
+exec "$@"
+"""
+
+_SMARTCTL = """#!/bin/sh
+for last; do :; done
+case "$1" in
+  --json*) printf '%s\\n' '{json}' | sed "s|DEVICE|$last|" ;;
+  *) cat "{text}" ;;
+esac
+"""
+
+_HELPER = """#!/bin/sh
+for dev; do smartctl --json=c --all "$dev"; echo; done
+"""
+
+_TEXT = """=== START OF INFORMATION SECTION ===
+Device Model:     Bench Disk
+Serial Number:    B0000001
+SMART overall-health self-assessment test result: PASSED
+  5 Reallocated_Sector_Ct   0x0033   100   100   010    Pre-fail  0
+194 Temperature_Celsius     0x0022   070   060   000    Old_age   30
+  9 Power_On_Hours          0x0032   099   099   000    Old_age   1234
+"""
+
+_JSON = {
+    "device": {"name": "DEVICE", "type": "sat"},
+    "model_name": "Bench Disk",
+    "serial_number": "B0000001",
+    "smart_status": {"passed": True},
+    "temperature": {"current": 30},
+    "power_on_time": {"hours": 1234},
+    "ata_smart_attributes": {"table": [
+        {"id": 5, "name": "Reallocated_Sector_Ct", "raw": {"value": 0}},
+        {"id": 194, "name": "Temperature_Celsius", "raw": {"value": 30}},
+        {"id": 9, "name": "Power_On_Hours", "raw": {"value": 1234}},
+    ]},
+}
+
+
+def _legacy(devices: list) -> None:
+    """The per-disk text path the Storage tab used before the collector."""
+    for device in devices:
+        output = subprocess.run(
+            ["pkexec", "smartctl", "-a", device], capture_output=True, text=True, timeout=30
+        ).stdout
+        for line in output.splitlines():
+            if "Device Model:" in line or "Serial Number:" in line:
+                line.split(":", 1)[1].strip()
+            elif "Temperature_Celsius" in line or "Power_On_Hours" in line:
+                int(line.split()[-1])
+
+
+def _timed(fn, repeat: int) -> list:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _summary(label: str, samples: list) -> str:
+    ordered = sorted(samples)
+    return (f"  {label:<7} p50 {statistics.median(ordered):9.3f} ms   "
+            f"max {ordered[-1]:9.3f} ms")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--disks", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--delay", type=float, default=0.0)
+    args = parser.parse_args()
+
+    devices = [f"/dev/sd{chr(ord('a') + i)}" for i in range(args.disks)]
+    with tempfile.TemporaryDirectory() as tmp:
+        text = Path(tmp) / "smartctl.txt"
+        text.write_text(_TEXT)
+        for name, body in (
+            ("pkexec", _PKEXEC.format(delay=args.delay)),
+            ("smartctl", _SMARTCTL.format(json=json.dumps(_JSON, separators=(",", ":")), text=text)),
+            ("loofi-smart-batch", _HELPER),
+        ):
+            stub = Path(tmp) / name
+            stub.write_text(body)
+            stub.chmod(0o755)
+        os.environ["PATH"] = f"{tmp}{os.pathsep}{os.environ['PATH']}"
+        storage.DEFAULT_SMART_CACHE_PATH = Path(tmp) / "smart.json"
+        storage.SMART_BATCH_HELPER = str(Path(tmp) / "loofi-smart-batch")
+        # Keep the bench's readings out of the real health timeline.
+        HealthTimeline.DB_PATH = str(Path(tmp) / "health_timeline.db")
+
+        collector = SmartCollector.shared()
+        if collector.collect(devices, refresh=True)[devices[-1]].model != "Bench Disk":
+            print("stand-in smartctl output was not parsed")
+            return 1
+
+        def reopen() -> None:
+            SmartCollector.clear_cache()
+            SmartCollector.shared().collect(devices)
+
+        print(f"SMART health for {args.disks} disks (prompt delay {args.delay}s)")
+        print(_summary("legacy", _timed(lambda: _legacy(devices), args.repeat)))
+        print(_summary("batch", _timed(lambda: collector.collect(devices, refresh=True), args.repeat)))
+        print(_summary("cached", _timed(lambda: collector.collect(devices), args.repeat)))
+        print(_summary("reopen", _timed(reopen, args.repeat)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Snapshot listing benchmark: re-parsing ``snapper list`` vs the catalogue.
+
+Feeds SnapshotManager a synthetic ``snapper list`` output of N snapshots
+(the privileged command itself is not run, so its own cost, typically a
+pkexec round trip, comes on top of the "parse" row) and times:
+
+  parse      list_snapshots(refresh=True): parse and sort the text output
+  catalogue  list_snapshots served from the persisted catalogue
+  reopen     cached_snapshots after dropping the in-memory catalogue, as a
+             freshly started GUI or CLI would see it
+  retention  apply_retention(10) answered from the catalogue
+
+Requires PyQt6 (imported by utils.commands).
+
+Usage:
+    python3 scripts/bench_snapshot_catalogue.py
+    python3 scripts/bench_snapshot_catalogue.py --snapshots 100 1000 --repeat 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "loofi-fedora-tweaks"))
+
+import utils.snapshot_manager as snapshot_manager  # noqa: E402
+from utils.snapshot_manager import SnapshotCatalogue, SnapshotManager  # noqa: E402
+
+
+def _snapper_output(count: int) -> str:
+    lines = [" # | Date                         | Description",
+             "---+------------------------------+-----------------"]
+    for i in range(1, count + 1):
+        day = 1 + i % 28
+        lines.append(f" {i} | 2024-01-{day:02d} {i % 24:02d}:00:00          | snapshot {i}")
+    return "\n".join(lines) + "\n"
+
+
+def _timed(fn, repeat: int) -> list:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _summary(label: str, samples: list) -> str:
+    ordered = sorted(samples)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return (f"  {label:<10} p50 {statistics.median(ordered):8.3f} ms   "
+            f"p99 {p99:8.3f} ms")
+
+
+def _reopen() -> None:
+    SnapshotCatalogue.clear_cache()
+    SnapshotManager.cached_snapshots(backend="snapper")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--snapshots", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_manager.DEFAULT_CATALOGUE_PATH = Path(tmp) / "snapshots.json"
+        snap_dir = Path(tmp) / ".snapshots"
+        snap_dir.mkdir()
+        snapshot_manager._SNAPSHOT_DIRS["snapper"] = (str(snap_dir),)
+
+        for count in args.snapshots:
+            result = MagicMock(returncode=0, stdout=_snapper_output(count), stderr="")
+            with patch("utils.snapshot_manager.subprocess.run", return_value=result):
+                SnapshotCatalogue.clear_cache()
+                # Age the directory so its stamp is outside the racy window.
+                os.utime(snap_dir, (time.time() - 60, time.time() - 60))
+                print(f"{count} snapper snapshots")
+                print(_summary("parse", _timed(
+                    lambda: SnapshotManager.list_snapshots("snapper", refresh=True), args.repeat)))
+                print(_summary("catalogue", _timed(
+                    lambda: SnapshotManager.list_snapshots("snapper"), args.repeat)))
+                print(_summary("reopen", _timed(_reopen, args.repeat)))
+                print(_summary("retention", _timed(
+                    lambda: SnapshotManager.apply_retention(10, "snapper"), 1)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
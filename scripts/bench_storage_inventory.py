@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Storage view benchmark: lsblk/df subprocesses vs the shared inventory.
+
+Times one Storage tab refresh (``list_disks`` + ``list_mounts``) and one
+dashboard/health tick (usage of every mounted filesystem plus the root
+usage check) three ways:
+
+  subprocess  the lsblk / df fallbacks, as before the inventory
+  cold        a freshly built StorageInventory (sysfs walk, mountinfo read)
+  warm        the shared inventory on later refreshes, when the mount table
+              and block devices did not change
+
+Usage:
+    python3 scripts/bench_storage_inventory.py
+    python3 scripts/bench_storage_inventory.py --repeat 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "loofi-fedora-tweaks"))
+
+from services.hardware.disk import DiskManager  # noqa: E402
+from utils.storage import StorageManager  # noqa: E402
+from utils.storage_inventory import StorageInventory  # noqa: E402
+
+
+def _storage_tab() -> int:
+    return len(StorageManager.list_disks()) + len(StorageManager.list_mounts())
+
+
+def _dashboard_tick() -> int:
+    mounts = DiskManager.get_all_mount_points()
+    DiskManager.get_disk_usage("/")
+    return len(mounts)
+
+
+def _timed(fn, repeat: int, cold: bool = False) -> list:
+    samples = []
+    for _ in range(repeat):
+        if cold:
+            StorageInventory.clear_cache()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _summary(label: str, samples: list) -> str:
+    ordered = sorted(samples)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return (f"    {label:<11} p50 {statistics.median(ordered):8.3f} ms   "
+            f"p99 {p99:8.3f} ms")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    if StorageInventory.shared() is None:
+        print("storage inventory unavailable on this host")
+        return 1
+    for label, fn in (("Storage tab refresh", _storage_tab), ("dashboard tick", _dashboard_tick)):
+        print(label)
+        with patch.object(StorageInventory, "_instance", False):
+            print(_summary("subprocess", _timed(fn, args.repeat)))
+        print(_summary("cold", _timed(fn, args.repeat, cold=True)))
+        StorageInventory.clear_cache()
+        fn()
+        # Let the statvfs memo expire so "warm" measures real refreshes.
+        with patch.object(StorageInventory, "USAGE_TTL", 0):
+            print(_summary("warm", _timed(fn, args.repeat)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -133,6 +133,141 @@ def qapp():
     yield _qapp_instance
 
 
+@pytest.fixture(autouse=True)
+def isolated_marketplace_cache(tmp_path, monkeypatch):
+    """Keep the persistent marketplace index cache out of ~/.cache.
+
+    Each test starts with an empty cache so an index written by one test
+    can never satisfy another test's fetch.
+    """
+    import utils.plugin_cdn_client as plugin_cdn_client
+
+    monkeypatch.setattr(
+        plugin_cdn_client, "DEFAULT_INDEX_CACHE_DIR", tmp_path / "marketplace-cache"
+    )
+    yield
+
+
+@pytest.fixture(autouse=True)
+def isolated_integrity_cache(tmp_path, monkeypatch):
+    """Keep the verified-file digest cache out of ~/.cache.
+
+    core.plugins needs PyQt6; without it there is nothing to isolate.
+    """
+    try:
+        import core.plugins.integrity as integrity
+    except ImportError:
+        yield
+        return
+
+    monkeypatch.setattr(integrity, "DEFAULT_CACHE_PATH", tmp_path / "integrity.json")
+    integrity.VerifiedFileCache.clear_cache()
+    yield
+    integrity.VerifiedFileCache.clear_cache()
+
+
+@pytest.fixture(autouse=True)
+def isolated_snapshot_catalogue(tmp_path, monkeypatch):
+    """Keep the persisted snapshot catalogue out of ~/.cache.
+
+    utils.snapshot_manager needs PyQt6 (via utils.commands); without it
+    there is nothing to isolate.
+    """
+    try:
+        import utils.snapshot_manager as snapshot_manager
+    except ImportError:
+        yield
+        return
+
+    monkeypatch.setattr(snapshot_manager, "DEFAULT_CATALOGUE_PATH", tmp_path / "snapshots.json")
+    snapshot_manager.SnapshotCatalogue.clear_cache()
+    yield
+    snapshot_manager.SnapshotCatalogue.clear_cache()
+
+
+@pytest.fixture(autouse=True)
+def isolated_dir_size_cache(tmp_path, monkeypatch):
+    """Keep the persisted directory size cache out of ~/.cache."""
+    import utils.dir_sizes as dir_sizes
+
+    monkeypatch.setattr(dir_sizes, "DEFAULT_CACHE_PATH", tmp_path / "dir_sizes.json")
+    dir_sizes.DirSizeCache.clear_cache()
+    yield
+    dir_sizes.DirSizeCache.clear_cache()
+
+
+@pytest.fixture(autouse=True)
+def isolated_boot_history(tmp_path, monkeypatch):
+    """Keep recorded boot analyses out of ~/.cache and off the system bus.
+
+    Boot data then comes from the (mocked) systemd-analyze path.
+    """
+    import utils.boot_analyzer as boot_analyzer
+
+    if not hasattr(boot_analyzer, "BootHistory"):
+        # Some UI tests install a stub module in its place.
+        yield
+        return
+
+    monkeypatch.setattr(boot_analyzer, "DEFAULT_HISTORY_PATH", tmp_path / "boot_history.json")
+    monkeypatch.setattr(boot_analyzer, "DBUS_AVAILABLE", False)
+    boot_analyzer.BootHistory.clear_cache()
+    yield
+    boot_analyzer.BootHistory.clear_cache()
+
+
+@pytest.fixture(autouse=True)
+def isolated_smart_cache(tmp_path, monkeypatch):
+    """Keep cached SMART readings out of ~/.cache and their history out of
+    the real health timeline.
+
+    utils.health_timeline needs PyQt6 (via utils.containers); without it
+    there is nothing to isolate.
+    """
+    try:
+        import utils.storage as storage
+        from utils.health_timeline import HealthTimeline
+    except ImportError:
+        yield
+        return
+
+    monkeypatch.setattr(HealthTimeline, "DB_PATH", str(tmp_path / "health_timeline.db"))
+    if not hasattr(storage, "SmartCollector"):
+        yield
+        return
+
+    monkeypatch.setattr(storage, "DEFAULT_SMART_CACHE_PATH", tmp_path / "smart.json")
+    storage.SmartCollector.clear_cache()
+    yield
+    storage.SmartCollector.clear_cache()
+
+
+@pytest.fixture(autouse=True)
+def isolated_storage_inventory(monkeypatch):
+    """Keep storage queries on their (mocked) subprocess/statvfs fallbacks.
+
+    The shared inventory starts out "unavailable" unless a test installs
+    its own, built from fixture files.
+    """
+    from utils.storage_inventory import StorageInventory
+
+    monkeypatch.setattr(StorageInventory, "_instance", False)
+    yield
+
+
+@pytest.fixture(autouse=True)
+def isolated_systemd_units(monkeypatch):
+    """Keep service listings off the real system and session buses.
+
+    Both shared unit caches start out "unavailable", so listings take the
+    (mocked) systemctl path unless a test installs its own cache.
+    """
+    from utils.systemd_units import SystemdUnitCache
+
+    monkeypatch.setattr(SystemdUnitCache, "_instances", {"system": False, "user": False})
+    yield
+
+
 @pytest.fixture
 def mock_subprocess():
     """Patch subprocess.run and subprocess.check_output with MagicMock.
@@ -184,6 +184,81 @@ class TestActionExecutor:
                 assert result.action_id == "op-123"
 
 
+class TestActionExecutorAsync:
+    """Test the asyncio-native execution path."""
+
+    def _run(self, coro_factory):
+        import asyncio
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch("core.executor.action_executor._LOG_DIR", tmpdir), \
+                 patch("core.executor.action_executor._ACTION_LOG_FILE", os.path.join(tmpdir, "log.jsonl")):
+                return asyncio.run(coro_factory())
+
+    def test_successful_execution(self):
+        from utils.action_executor import ActionExecutor
+        result = self._run(lambda: ActionExecutor.run_async("echo", ["hello async"], action_id="a-1"))
+        assert result.success is True
+        assert result.exit_code == 0
+        assert "hello async" in result.stdout
+        assert result.action_id == "a-1"
+
+    def test_failed_execution(self):
+        from utils.action_executor import ActionExecutor
+        result = self._run(lambda: ActionExecutor.run_async("false"))
+        assert result.success is False
+        assert result.exit_code != 0
+
+    def test_command_not_found(self):
+        from utils.action_executor import ActionExecutor
+        result = self._run(lambda: ActionExecutor.run_async("nonexistent_cmd_xyz_12345"))
+        assert result.exit_code == 127
+        assert "not found" in result.message.lower()
+
+    def test_timeout_kills_child(self):
+        from utils.action_executor import ActionExecutor
+        start = time.monotonic()
+        result = self._run(lambda: ActionExecutor.run_async("sleep", ["10"], timeout=1))
+        assert result.success is False
+        assert "timed out" in result.message.lower()
+        assert time.monotonic() - start < 5
+
+    def test_preview_does_not_execute(self):
+        from utils.action_executor import ActionExecutor
+        with patch("asyncio.create_subprocess_exec") as mock_exec:
+            result = self._run(lambda: ActionExecutor.run_async("dnf", ["update"], preview=True))
+        assert result.preview is True
+        mock_exec.assert_not_called()
+
+    def test_global_dry_run(self):
+        from utils.action_executor import ActionExecutor
+        ActionExecutor.set_global_dry_run(True)
+        try:
+            result = self._run(lambda: ActionExecutor.run_async("echo", ["test"]))
+            assert result.preview is True
+        finally:
+            ActionExecutor.set_global_dry_run(False)
+
+    def test_does_not_block_event_loop(self):
+        import asyncio
+        from utils.action_executor import ActionExecutor
+
+        async def scenario():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.05)
+                    ticks += 1
+
+            task = asyncio.ensure_future(ticker())
+            await ActionExecutor.run_async("sleep", ["0.5"])
+            task.cancel()
+            return ticks
+
+        assert self._run(scenario) >= 5
+
+
 class TestActionLog:
     """Test structured action logging."""
 
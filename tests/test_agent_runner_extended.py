@@ -2,6 +2,8 @@
 
 import os
 import sys
+import threading
+import time
 import unittest
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
@@ -970,46 +972,304 @@ class TestAgentSchedulerExtended(unittest.TestCase):
 
     # ==================== _run_loop ====================
 
+    def _stop_at_first_sleep(self, scheduler):
+        """Make the scheduler loop exit when it would go to sleep."""
+        scheduler._wake_event = MagicMock()
+        scheduler._wake_event.wait.side_effect = lambda timeout: scheduler._stop_event.set()
+
+    def _registry(self, agent, state):
+        reg = MagicMock()
+        reg.get_enabled_agents.return_value = [agent]
+        reg.get_agent.return_value = agent
+        reg.get_state.return_value = state
+        return reg
+
     @patch("utils.agent_runner.time.time", return_value=1000)
     @patch("utils.agent_runner.AgentRegistry.instance")
     def test_run_loop_executes_interval_agent(self, mock_instance, mock_time):
-        """Scheduler loop executes eligible interval trigger and saves state."""
+        """Scheduler loop executes a due interval agent and saves only dirty state."""
         scheduler = AgentScheduler()
-        scheduler._stop_event = MagicMock()
-        scheduler._stop_event.is_set.side_effect = [False, True]
-        scheduler._stop_event.wait.return_value = None
-
-        reg = MagicMock()
-        agent = self._agent()
+        self._stop_at_first_sleep(scheduler)
         state = AgentState(agent_id="a1", status=AgentStatus.IDLE, last_run=0)
-        reg.get_enabled_agents.return_value = [agent]
-        reg.get_state.return_value = state
+        reg = self._registry(self._agent(), state)
         mock_instance.return_value = reg
 
         with patch.object(scheduler, "_execute_agent") as mock_exec:
             scheduler._run_loop()
             mock_exec.assert_called_once()
-            reg.save.assert_called_once()
+            reg.save_dirty.assert_called()
+            reg.save.assert_not_called()
 
     @patch("utils.agent_runner.time.time", return_value=1000)
     @patch("utils.agent_runner.AgentRegistry.instance")
     def test_run_loop_skips_non_idle_state(self, mock_instance, mock_time):
         """Scheduler loop skips agents not in idle/running state."""
         scheduler = AgentScheduler()
-        scheduler._stop_event = MagicMock()
-        scheduler._stop_event.is_set.side_effect = [False, True]
-        scheduler._stop_event.wait.return_value = None
-
-        reg = MagicMock()
-        agent = self._agent()
+        self._stop_at_first_sleep(scheduler)
         state = AgentState(agent_id="a1", status=AgentStatus.PAUSED, last_run=0)
-        reg.get_enabled_agents.return_value = [agent]
-        reg.get_state.return_value = state
+        mock_instance.return_value = self._registry(self._agent(), state)
+
+        with patch.object(scheduler, "_execute_agent") as mock_exec:
+            scheduler._run_loop()
+            mock_exec.assert_not_called()
+
+    @patch("utils.agent_runner.time.time", return_value=1100)
+    @patch("utils.agent_runner.AgentRegistry.instance")
+    def test_run_loop_sleeps_until_next_agent(self, mock_instance, mock_time):
+        """With nothing due the loop sleeps exactly until the next fire time."""
+        scheduler = AgentScheduler()
+        self._stop_at_first_sleep(scheduler)
+        agent = self._agent(
+            triggers=[AgentTrigger(trigger_type=TriggerType.INTERVAL, config={"seconds": 300})]
+        )
+        state = AgentState(agent_id="a1", status=AgentStatus.IDLE, last_run=1000)
+        reg = self._registry(agent, state)
         mock_instance.return_value = reg
 
         with patch.object(scheduler, "_execute_agent") as mock_exec:
             scheduler._run_loop()
             mock_exec.assert_not_called()
+        scheduler._wake_event.wait.assert_called_once_with(timeout=200)
+        reg.remove_change_listener.assert_called_once()
+
+    @patch("utils.agent_runner.AgentRegistry.instance")
+    def test_run_loop_idle_sleep_is_capped(self, mock_instance):
+        """Without interval agents the loop sleeps for the maximum interval."""
+        from utils.agent_runner import SCHEDULER_MAX_SLEEP_SECONDS
+
+        scheduler = AgentScheduler()
+        self._stop_at_first_sleep(scheduler)
+        reg = MagicMock()
+        reg.get_enabled_agents.return_value = []
+        mock_instance.return_value = reg
+
+        scheduler._run_loop()
+        scheduler._wake_event.wait.assert_called_once_with(timeout=SCHEDULER_MAX_SLEEP_SECONDS)
+
+    def test_run_due_requeues_after_run(self):
+        """An executed agent is queued again one interval after its run."""
+        scheduler = AgentScheduler()
+        agent = self._agent(
+            triggers=[AgentTrigger(trigger_type=TriggerType.INTERVAL, config={"seconds": 60})]
+        )
+        state = AgentState(agent_id="a1", status=AgentStatus.IDLE, last_run=0)
+        reg = self._registry(agent, state)
+        scheduler._rebuild_queue(reg)
+
+        def run(agent, state, registry, deadline=None):
+            state.last_run = 1005
+
+        with patch.object(scheduler, "_execute_agent", side_effect=run):
+            self.assertEqual(scheduler._run_due(reg, 1000), 1)
+        self.assertEqual([(t, a) for t, _seq, a in scheduler._queue], [(1065, "a1")])
+
+    def test_run_due_drops_disabled_agent(self):
+        """Agents disabled after being queued are not run or re-queued."""
+        scheduler = AgentScheduler()
+        agent = self._agent()
+        reg = self._registry(agent, AgentState(agent_id="a1"))
+        scheduler._rebuild_queue(reg)
+        agent.enabled = False
+
+        with patch.object(scheduler, "_execute_agent") as mock_exec:
+            self.assertEqual(scheduler._run_due(reg, 1000), 0)
+            mock_exec.assert_not_called()
+        self.assertEqual(scheduler._queue, [])
+
+    def test_shortest_interval_trigger_wins(self):
+        """The fire time uses the agent's shortest interval trigger."""
+        agent = self._agent(triggers=[
+            AgentTrigger(trigger_type=TriggerType.INTERVAL, config={"seconds": 600}),
+            AgentTrigger(trigger_type=TriggerType.INTERVAL, config={"seconds": 120}),
+            AgentTrigger(trigger_type=TriggerType.EVENT, config={}),
+        ])
+        self.assertEqual(AgentScheduler._interval_for(agent), 120)
+        self.assertIsNone(AgentScheduler._interval_for(self._agent(triggers=[])))
+
+    def test_registry_change_wakes_loop(self):
+        """Registry changes wake the sleeping loop, which rebuilds its queue."""
+        import tempfile
+
+        from utils.agents import AgentRegistry
+
+        with tempfile.TemporaryDirectory() as tmpdir, \
+                patch.object(AgentRegistry, "_CONFIG_DIR", tmpdir):
+            registry = AgentRegistry()
+            with patch("utils.agent_runner.AgentRegistry.instance", return_value=registry), \
+                    patch.object(AgentScheduler, "_execute_agent"):
+                scheduler = AgentScheduler()
+                rebuilt = threading.Semaphore(0)
+                original = scheduler._rebuild_queue
+
+                def rebuild(reg):
+                    original(reg)
+                    rebuilt.release()
+
+                scheduler._rebuild_queue = rebuild
+                scheduler.start()
+                try:
+                    self.assertTrue(rebuilt.acquire(timeout=5))  # initial build
+                    registry.enable_agent("builtin-sysmon")
+                    self.assertTrue(rebuilt.acquire(timeout=5))
+                    self.assertIn("builtin-sysmon", [a for _t, _s, a in scheduler._queue])
+                finally:
+                    scheduler.stop()
+            self.assertFalse(scheduler.is_running)
+
+    # ==================== worker pool ====================
+
+    def _action(self, action_id, operation="", command=""):
+        return AgentAction(
+            action_id=action_id,
+            name=action_id,
+            description="d",
+            severity=ActionSeverity.LOW,
+            operation=operation,
+            command=command,
+        )
+
+    def test_infer_slots_serializes_package_manager(self):
+        """dnf/flatpak work takes the exclusive package_manager slot."""
+        self.assertEqual(
+            AgentExecutor._infer_slots(self._action("a", operation="updates.check_dnf")),
+            ("network", "package_manager"),
+        )
+        self.assertEqual(
+            AgentExecutor._infer_slots(self._action("b", command="/usr/bin/dnf")),
+            ("background_process", "package_manager"),
+        )
+        self.assertEqual(
+            AgentExecutor._infer_slots(self._action("c", operation="monitor.check_cpu")),
+            ("cpu",),
+        )
+
+    @patch("utils.agent_runner.AgentExecutor.execute_action")
+    def test_run_times_out_waiting_for_slot(self, mock_exec):
+        """An agent whose deadline passes while waiting records a timeout."""
+        from utils.arbitrator import ResourceSlots
+
+        scheduler = AgentScheduler()
+        agent = self._agent(actions=[
+            self._action("u1", operation="updates.check_dnf"),
+            self._action("u2", operation="updates.check_flatpak"),
+        ])
+        state = AgentState(agent_id="a1")
+        slots = ResourceSlots()
+        slots.acquire(["package_manager"])
+
+        with patch.object(AgentExecutor, "_slots", slots), \
+                patch.object(scheduler, "_notify_result"):
+            scheduler._execute_agent(agent, state, MagicMock(), time.monotonic() + 0.05)
+
+        mock_exec.assert_not_called()
+        self.assertEqual(state.error_count, 1)
+        self.assertTrue(state.last_result.data["timeout"])
+        self.assertEqual(state.status, AgentStatus.IDLE)
+
+    @patch("utils.agent_runner.AgentExecutor.execute_action")
+    @patch("utils.agent_runner.AgentRegistry.instance")
+    def test_run_now_reports_busy_slot_instead_of_blocking(self, mock_instance, mock_exec):
+        """A manual run gives up on a slot a scheduled agent holds."""
+        from utils.arbitrator import ResourceSlots
+
+        scheduler = AgentScheduler()
+        agent = self._agent(actions=[
+            self._action("u1", operation="updates.check_dnf"),
+            self._action("u2", operation="monitor.check_cpu"),
+        ])
+        state = AgentState(agent_id="a1")
+        reg = MagicMock()
+        reg.get_agent.return_value = agent
+        reg.get_state.return_value = state
+        mock_instance.return_value = reg
+        slots = ResourceSlots()
+        slots.acquire(["package_manager"])
+
+        started = time.monotonic()
+        with patch.object(AgentExecutor, "_slots", slots), \
+                patch("utils.agent_runner.RUN_NOW_SLOT_WAIT_SECONDS", 0.05), \
+                patch.object(scheduler, "_notify_result"):
+            results = scheduler.run_agent_now("a1")
+
+        self.assertLess(time.monotonic() - started, 1.0)
+        mock_exec.assert_not_called()
+        self.assertEqual(len(results), 1)
+        self.assertFalse(results[0].success)
+        self.assertTrue(results[0].data["resource_busy"])
+        self.assertIn("resource busy", results[0].message)
+        self.assertEqual(state.status, AgentStatus.IDLE)
+
+    @patch("utils.agent_runner.AgentExecutor.execute_action")
+    def test_stop_cancels_waiting_run(self, mock_exec):
+        """stop() wakes an agent run blocked on a busy resource."""
+        from utils.arbitrator import ResourceSlots
+
+        scheduler = AgentScheduler()
+        agent = self._agent(actions=[self._action("u1", operation="updates.check_dnf")])
+        state = AgentState(agent_id="a1")
+        slots = ResourceSlots()
+        slots.acquire(["package_manager"])
+
+        with patch.object(AgentExecutor, "_slots", slots), \
+                patch.object(scheduler, "_notify_result"):
+            worker = threading.Thread(
+                target=scheduler._execute_agent, args=(agent, state, MagicMock())
+            )
+            worker.start()
+            time.sleep(0.05)
+            scheduler.stop()
+            worker.join(2)
+
+        self.assertFalse(worker.is_alive())
+        mock_exec.assert_not_called()
+        self.assertEqual(state.run_count, 0)
+
+    def test_slow_update_check_does_not_delay_monitor(self):
+        """A long package-manager run does not hold up a fast monitoring agent."""
+        import tempfile
+
+        from utils.agents import AgentRegistry
+
+        slow = self._agent(
+            agent_id="slow",
+            triggers=[AgentTrigger(trigger_type=TriggerType.INTERVAL, config={"seconds": 60})],
+            actions=[self._action("dnf", operation="updates.check_dnf")],
+        )
+        fast = self._agent(
+            agent_id="fast",
+            triggers=[AgentTrigger(trigger_type=TriggerType.INTERVAL, config={"seconds": 0.1})],
+            actions=[self._action("cpu", operation="monitor.check_cpu")],
+        )
+        release = threading.Event()
+        fast_runs = []
+
+        def execute(agent, action, state):
+            if agent.agent_id == "slow":
+                release.wait(5)
+            else:
+                fast_runs.append(time.monotonic())
+            return AgentResult(success=True, message="ok", action_id=action.action_id)
+
+        with tempfile.TemporaryDirectory() as tmpdir, \
+                patch.object(AgentRegistry, "_CONFIG_DIR", tmpdir), \
+                patch("utils.agents.BUILTIN_AGENTS", {}):
+            registry = AgentRegistry()
+            registry._agents = {"slow": slow, "fast": fast}
+            scheduler = AgentScheduler()
+            with patch("utils.agent_runner.AgentRegistry.instance", return_value=registry), \
+                    patch.object(AgentExecutor, "execute_action", side_effect=execute), \
+                    patch.object(scheduler, "_notify_result"):
+                scheduler.start()
+                try:
+                    time.sleep(0.6)
+                    self.assertIn("slow", scheduler._inflight)
+                finally:
+                    release.set()
+                    scheduler.stop()
+
+        self.assertGreaterEqual(len(fast_runs), 3)
+        gaps = [b - a for a, b in zip(fast_runs, fast_runs[1:])]
+        self.assertLess(max(gaps), 1.0)
 
     # ==================== _execute_agent ====================
 
@@ -250,6 +250,123 @@ class TestAgentRegistry:
             assert agent.settings["cpu_threshold"] == 95
 
 
+class TestAgentStatePersistence:
+    """Dirty tracking and the append-only state journal."""
+
+    def setup_method(self):
+        from utils.agents import AgentRegistry
+        AgentRegistry.reset()
+
+    def _registry(self, tmpdir):
+        from utils.agents import AgentRegistry
+        AgentRegistry._CONFIG_DIR = tmpdir
+        return AgentRegistry()
+
+    def test_state_dirty_tracking(self):
+        from utils.agents import AgentResult, AgentState
+        state = AgentState(agent_id="a")
+        assert state.is_dirty is False
+        state.record_action(AgentResult(success=True, message="ok"))
+        assert state.is_dirty is True
+        state.mark_clean()
+        assert state.is_dirty is False
+
+    def test_idle_registry_writes_nothing(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            registry = self._registry(tmpdir)
+            registry.save()
+            before = {name: os.stat(os.path.join(tmpdir, name)).st_mtime_ns
+                      for name in os.listdir(tmpdir)}
+            for _ in range(10):
+                assert registry.save_dirty() == 0
+            after = {name: os.stat(os.path.join(tmpdir, name)).st_mtime_ns
+                     for name in os.listdir(tmpdir)}
+            assert after == before
+
+    def test_only_changed_states_appended(self):
+        import json
+        from utils.agents import AgentResult
+        with tempfile.TemporaryDirectory() as tmpdir:
+            registry = self._registry(tmpdir)
+            registry.save()
+            registry.get_state("builtin-sysmon").record_action(
+                AgentResult(success=True, message="ok"))
+            assert registry.save_dirty() == 1
+            with open(registry._journal_file()) as fh:
+                records = [json.loads(line) for line in fh]
+            assert [r["agent_id"] for r in records] == ["builtin-sysmon"]
+
+    def test_journal_replayed_on_load(self):
+        from utils.agents import AgentRegistry, AgentResult
+        with tempfile.TemporaryDirectory() as tmpdir:
+            registry = self._registry(tmpdir)
+            registry.save()
+            registry.get_state("builtin-sysmon").record_action(
+                AgentResult(success=True, message="ok"))
+            registry.save_dirty()
+            with open(registry._journal_file(), "a") as fh:
+                fh.write('{"agent_id": "torn')  # interrupted append
+
+            reloaded = AgentRegistry()
+            state = reloaded.get_state("builtin-sysmon")
+            assert state.run_count == 1
+            assert state.is_dirty is False
+
+    def test_journal_compacted_at_threshold(self):
+        from utils.agents import AgentResult
+        with tempfile.TemporaryDirectory() as tmpdir:
+            registry = self._registry(tmpdir)
+            state = registry.get_state("builtin-sysmon")
+            with patch("utils.agents.STATE_JOURNAL_MAX_RECORDS", 3):
+                for _ in range(3):
+                    state.record_action(AgentResult(success=True, message="ok"))
+                    registry.save_dirty()
+            assert not os.path.exists(registry._journal_file())
+            assert registry._journal_records == 0
+            assert os.path.exists(registry._states_file())
+
+    def test_concurrent_saves_and_state_updates(self, caplog):
+        import json
+        import threading
+        from utils.agents import AgentResult
+        real_replace = os.replace
+
+        def slow_replace(src, dst):
+            time.sleep(0.001)  # let another thread's save run in between
+            real_replace(src, dst)
+
+        with tempfile.TemporaryDirectory() as tmpdir, \
+                patch("utils.agents.os.replace", side_effect=slow_replace):
+            registry = self._registry(tmpdir)
+            errors = []
+
+            def worker(n):
+                try:
+                    for i in range(30):
+                        state = registry.get_state(f"w{n}-{i}")
+                        with registry.state_lock:
+                            state.record_action(AgentResult(success=True, message="ok"))
+                        if i % 2:
+                            registry.save()
+                        else:
+                            registry.save_dirty()
+                except (OSError, RuntimeError, ValueError) as exc:
+                    errors.append(exc)
+
+            threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            registry.save()
+
+            assert errors == []
+            assert "Failed to save" not in caplog.text
+            with open(registry._states_file()) as fh:
+                saved = {s["agent_id"]: s["run_count"] for s in json.load(fh)}
+            assert all(saved[f"w{n}-{i}"] == 1 for n in range(4) for i in range(30))
+            assert not [name for name in os.listdir(tmpdir) if ".tmp." in name]
+
 class TestAgentExecutor:
     """Test agent action execution."""
 
@@ -1,6 +1,8 @@
 """Comprehensive security tests for API server."""
 
-from unittest.mock import MagicMock, patch
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -368,6 +370,175 @@ class TestAuthorization:
             assert "system_type" in data
 
 
+class TestSnapshotCache:
+    """/info and /agents are served from the app-scoped snapshot cache."""
+
+    def test_info_snapshot_reused_across_requests(self, test_client, valid_token):
+        with patch("utils.monitor.SystemMonitor.get_system_health") as mock_health:
+            mock_health.return_value = MagicMock(
+                hostname="test-host",
+                uptime=12345,
+                memory=None,
+                cpu=None,
+                memory_status="good",
+                cpu_status="good",
+            )
+            for _ in range(5):
+                response = test_client.get(
+                    "/api/info",
+                    headers={"Authorization": f"Bearer {valid_token}"},
+                )
+                assert response.status_code == 200
+                assert response.json()["health"]["hostname"] == "test-host"
+            assert mock_health.call_count == 1
+
+    def test_cache_is_per_app_instance(self):
+        first = APIServer().app.state.snapshot_cache
+        second = APIServer().app.state.snapshot_cache
+        assert first is not second
+
+    def test_agents_snapshot_reused_across_requests(self, test_client, valid_token):
+        with patch("api.routes.system.AgentRegistry.instance") as mock_instance:
+            registry = mock_instance.return_value
+            registry.list_agents.return_value = []
+            registry.get_agent_summary.return_value = {"total": 0}
+            for _ in range(3):
+                response = test_client.get(
+                    "/api/agents",
+                    headers={"Authorization": f"Bearer {valid_token}"},
+                )
+                assert response.status_code == 200
+            registry.list_agents.assert_called_once()
+
+
+class TestStreamEndpoints:
+    """/stream/metrics and /stream/events server-sent event streams."""
+
+    def test_metrics_stream_requires_auth(self, test_client):
+        response = test_client.get("/api/stream/metrics")
+        assert response.status_code in (401, 403)
+
+    def test_events_stream_requires_auth(self, test_client):
+        response = test_client.get("/api/stream/events")
+        assert response.status_code in (401, 403)
+
+    def test_unknown_metric_field_rejected(self, test_client, valid_token):
+        response = test_client.get(
+            "/api/stream/metrics?fields=cpu,gpu",
+            headers={"Authorization": f"Bearer {valid_token}"},
+        )
+        assert response.status_code == 400
+        assert "gpu" in response.json()["detail"]
+
+    def test_invalid_topic_rejected(self, test_client, valid_token):
+        response = test_client.get(
+            "/api/stream/events?topics=bad%20topic",
+            headers={"Authorization": f"Bearer {valid_token}"},
+        )
+        assert response.status_code == 400
+
+    def test_metrics_stream_sends_selected_fields(self):
+        # TestClient buffers whole responses, so drive the SSE generator directly.
+        from api.routes.stream import _sse_stream
+        from utils.metrics_stream import MetricsBroadcaster
+
+        sampler = MagicMock(side_effect=lambda fields: {f: {"percent": 1.0} for f in fields})
+        broadcaster = MetricsBroadcaster(sampler=sampler)
+        request = MagicMock()
+
+        async def scenario():
+            subscriber = broadcaster.subscribe(["cpu"], interval=1)
+            stream = _sse_stream(request, subscriber, "metrics", broadcaster.unsubscribe, "tok")
+            frames = [await stream.__anext__(), await stream.__anext__()]
+            await stream.aclose()
+            return frames
+
+        with patch.object(AuthManager, "verify_token", return_value=None):
+            retry, frame = asyncio.run(scenario())
+        assert retry.startswith("retry: ")
+        event, event_id, data = frame.strip().split("\n")
+        assert event == "event: metrics"
+        assert event_id == "id: 1"
+        payload = json.loads(data[len("data: "):])
+        assert payload["cpu"] == {"percent": 1.0}
+        assert "memory" not in payload
+        sampler.assert_called_once_with(frozenset({"cpu"}))
+        assert broadcaster.subscriber_count == 0
+
+    def test_stream_reports_dropped_snapshots(self):
+        from api.routes.stream import _sse_stream
+        from utils.metrics_stream import MetricsBroadcaster
+
+        broadcaster = MetricsBroadcaster(sampler=MagicMock(), queue_size=1)
+
+        async def scenario():
+            subscriber = broadcaster.subscribe(["cpu"], interval=60)
+            broadcaster.unsubscribe(subscriber)
+            subscriber.offer({"seq": 1})
+            subscriber.offer({"seq": 2})
+            stream = _sse_stream(MagicMock(), subscriber, "metrics", broadcaster.unsubscribe, "tok")
+            await stream.__anext__()
+            frame = await stream.__anext__()
+            await stream.aclose()
+            return frame
+
+        with patch.object(AuthManager, "verify_token", return_value=None):
+            payload = json.loads(asyncio.run(scenario()).split("data: ", 1)[1])
+        assert payload == {"seq": 2, "dropped": 1}
+
+    def test_stream_closes_when_token_is_rejected(self):
+        from fastapi import HTTPException
+
+        from api.routes.stream import _sse_stream
+        from utils.metrics_stream import MetricsBroadcaster
+
+        broadcaster = MetricsBroadcaster(sampler=MagicMock())
+        verify = MagicMock(side_effect=[None, HTTPException(status_code=401, detail="Invalid token")])
+
+        async def scenario():
+            subscriber = broadcaster.subscribe(["cpu"], interval=60)
+            broadcaster.unsubscribe(subscriber)
+            subscriber.offer({"seq": 1})
+            subscriber.offer({"seq": 2})
+            stream = _sse_stream(MagicMock(), subscriber, "metrics", broadcaster.unsubscribe, "tok")
+            return [frame async for frame in stream]
+
+        with patch.object(AuthManager, "verify_token", verify):
+            frames = asyncio.run(scenario())
+        assert len(frames) == 2
+        assert '"seq":1' in frames[1]
+        assert broadcaster.subscriber_count == 0
+
+    def test_idle_stream_closes_at_token_expiry(self):
+        import time
+
+        from api.routes.stream import _sse_stream
+        from utils.metrics_stream import MetricsBroadcaster
+
+        broadcaster = MetricsBroadcaster(sampler=MagicMock())
+        request = MagicMock()
+        request.is_disconnected = AsyncMock(return_value=False)
+
+        async def scenario():
+            subscriber = broadcaster.subscribe(["cpu"], interval=60)
+            broadcaster.unsubscribe(subscriber)
+            stream = _sse_stream(request, subscriber, "metrics", broadcaster.unsubscribe, "tok")
+            return await asyncio.wait_for(_collect(stream), timeout=5)
+
+        async def _collect(stream):
+            return [frame async for frame in stream]
+
+        with patch.object(AuthManager, "verify_token", return_value=int(time.time()) + 1):
+            frames = asyncio.run(scenario())
+        assert len(frames) == 1
+        assert frames[0].startswith("retry: ")
+
+    def test_broadcaster_is_per_app_instance(self):
+        first = APIServer().app.state.metrics_broadcaster
+        second = APIServer().app.state.metrics_broadcaster
+        assert first is not second
+
+
 # ============================================================================
 # Error Handling Tests
 # ============================================================================
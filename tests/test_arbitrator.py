@@ -1,6 +1,7 @@
 """Tests for utils/arbitrator.py"""
 import sys
 import os
+import threading
 import unittest
 from unittest.mock import patch, MagicMock
 
@@ -10,7 +11,14 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'loofi-fedora-t
 for _mod in ('PyQt6', 'PyQt6.QtCore', 'PyQt6.QtWidgets', 'PyQt6.QtGui'):
     sys.modules.setdefault(_mod, MagicMock())
 
-from utils.arbitrator import Arbitrator, AgentRequest, Priority, _max_temp  # noqa: E402
+from utils.arbitrator import (  # noqa: E402
+    RESOURCE_CONCURRENCY,
+    AgentRequest,
+    Arbitrator,
+    Priority,
+    ResourceSlots,
+    _max_temp,
+)
 
 
 class TestArbitratorCanProceed(unittest.TestCase):
@@ -201,5 +209,50 @@ class TestArbitratorInit(unittest.TestCase):
         self.assertEqual(arb._cpu_thermal_limit_c, 80.0)
 
 
+class TestResourceSlots(unittest.TestCase):
+    """Tests for per-resource concurrency slots."""
+
+    def test_package_manager_is_exclusive(self):
+        self.assertEqual(RESOURCE_CONCURRENCY["package_manager"], 1)
+        self.assertGreater(RESOURCE_CONCURRENCY["cpu"], 1)
+
+    def test_cap_enforced(self):
+        slots = ResourceSlots({"cpu": 2})
+        self.assertTrue(slots.acquire(["cpu"], timeout=0))
+        self.assertTrue(slots.acquire(["cpu"], timeout=0))
+        self.assertFalse(slots.acquire(["cpu"], timeout=0.01))
+        slots.release(["cpu"])
+        self.assertTrue(slots.acquire(["cpu"], timeout=0))
+        self.assertEqual(slots.in_use("cpu"), 2)
+
+    def test_unknown_resource_is_exclusive(self):
+        slots = ResourceSlots({})
+        self.assertTrue(slots.acquire(["gpu"], timeout=0))
+        self.assertFalse(slots.acquire(["gpu"], timeout=0))
+
+    def test_acquire_is_all_or_nothing(self):
+        slots = ResourceSlots({"network": 2, "package_manager": 1})
+        self.assertTrue(slots.acquire(["package_manager"], timeout=0))
+        self.assertFalse(slots.acquire(["network", "package_manager"], timeout=0))
+        self.assertEqual(slots.in_use("network"), 0)
+
+    def test_waiter_woken_by_release(self):
+        slots = ResourceSlots({"disk": 1})
+        slots.acquire(["disk"])
+        threading.Timer(0.05, slots.release, args=(["disk"],)).start()
+        self.assertTrue(slots.acquire(["disk"], timeout=5))
+
+    def test_cancel_interrupts_waiter(self):
+        slots = ResourceSlots({"disk": 1})
+        slots.acquire(["disk"])
+        cancel = threading.Event()
+
+        def cancel_later():
+            cancel.set()
+            slots.interrupt()
+
+        threading.Timer(0.05, cancel_later).start()
+        self.assertFalse(slots.acquire(["disk"], cancel=cancel))
+
 if __name__ == '__main__':
     unittest.main()
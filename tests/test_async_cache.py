@@ -0,0 +1,128 @@
+"""Tests for utils/async_cache.py — SingleFlightCache."""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "loofi-fedora-tweaks"))
+
+from utils.async_cache import SingleFlightCache
+
+
+class TestSingleFlightCache(unittest.TestCase):
+    """Tests for TTL caching and request coalescing."""
+
+    def test_value_reused_within_ttl(self):
+        cache = SingleFlightCache(ttl=60)
+        calls = []
+
+        async def scenario():
+            first = await cache.get("info", lambda: calls.append(1) or {"n": 1})
+            second = await cache.get("info", lambda: calls.append(1) or {"n": 2})
+            return first, second
+
+        first, second = asyncio.run(scenario())
+        self.assertEqual(first, {"n": 1})
+        self.assertIs(first, second)
+        self.assertEqual(len(calls), 1)
+
+    @patch("utils.async_cache.time.monotonic")
+    def test_value_recomputed_after_ttl(self, mock_clock):
+        cache = SingleFlightCache(ttl=2)
+        values = iter([1, 2])
+        mock_clock.return_value = 100.0
+        self.assertEqual(asyncio.run(cache.get("k", lambda: next(values))), 1)
+        mock_clock.return_value = 103.0
+        self.assertEqual(asyncio.run(cache.get("k", lambda: next(values))), 2)
+
+    def test_concurrent_misses_share_one_computation(self):
+        cache = SingleFlightCache(ttl=60)
+        calls = []
+        release = threading.Event()
+
+        def slow():
+            calls.append(1)
+            release.wait(2)
+            return "snapshot"
+
+        async def scenario():
+            waiters = [asyncio.ensure_future(cache.get("info", slow)) for _ in range(200)]
+            await asyncio.sleep(0.05)
+            release.set()
+            return await asyncio.gather(*waiters)
+
+        results = asyncio.run(scenario())
+        self.assertEqual(set(results), {"snapshot"})
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.computations, 1)
+
+    def test_keys_are_independent(self):
+        cache = SingleFlightCache(ttl=60)
+
+        async def scenario():
+            return await asyncio.gather(cache.get("a", lambda: "A"), cache.get("b", lambda: "B"))
+
+        self.assertEqual(asyncio.run(scenario()), ["A", "B"])
+
+    def test_failures_are_not_cached(self):
+        cache = SingleFlightCache(ttl=60)
+
+        def boom():
+            raise OSError("probe failed")
+
+        with self.assertRaises(OSError):
+            asyncio.run(cache.get("info", boom))
+        self.assertEqual(asyncio.run(cache.get("info", lambda: "ok")), "ok")
+
+    def test_cancelled_waiter_does_not_cancel_flight(self):
+        cache = SingleFlightCache(ttl=60)
+
+        def slow():
+            time.sleep(0.1)
+            return "done"
+
+        async def scenario():
+            impatient = asyncio.ensure_future(cache.get("k", slow))
+            patient = asyncio.ensure_future(cache.get("k", slow))
+            await asyncio.sleep(0.01)
+            impatient.cancel()
+            return await patient
+
+        self.assertEqual(asyncio.run(scenario()), "done")
+        self.assertEqual(cache.computations, 1)
+
+    def test_invalidate(self):
+        cache = SingleFlightCache(ttl=60)
+        values = iter(["old", "new", "newer"])
+        asyncio.run(cache.get("k", lambda: next(values)))
+        cache.invalidate("k")
+        self.assertEqual(asyncio.run(cache.get("k", lambda: next(values))), "new")
+        cache.invalidate()
+        self.assertEqual(asyncio.run(cache.get("k", lambda: next(values))), "newer")
+
+    def test_does_not_block_event_loop(self):
+        cache = SingleFlightCache(ttl=60)
+
+        async def scenario():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.02)
+                    ticks += 1
+
+            task = asyncio.ensure_future(ticker())
+            await cache.get("k", lambda: time.sleep(0.3))
+            task.cancel()
+            return ticks
+
+        self.assertGreaterEqual(asyncio.run(scenario()), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -164,6 +164,9 @@ class TestAuthManagerGenerateApiKey(unittest.TestCase):
 class TestAuthManagerIssueToken(unittest.TestCase):
     """Tests for issue_token JWT generation."""
 
+    def setUp(self):
+        AuthManager.clear_cache()
+
     @patch.object(AuthManager, '_load_auth_data')
     @patch('utils.auth.bcrypt')
     @patch('utils.auth.jwt')
@@ -203,6 +206,9 @@ class TestAuthManagerIssueToken(unittest.TestCase):
 class TestAuthManagerVerifyToken(unittest.TestCase):
     """Tests for verify_token JWT verification."""
 
+    def setUp(self):
+        AuthManager.clear_cache()
+
     @patch.object(AuthManager, '_load_auth_data')
     @patch('utils.auth.jwt')
     def test_verify_token_success(self, mock_jwt, mock_load):
@@ -235,6 +241,123 @@ class TestAuthManagerVerifyToken(unittest.TestCase):
         self.assertEqual(ctx.exception.status_code, 401)
 
 
+class TestAuthManagerCache(unittest.TestCase):
+    """Tests for the in-memory auth state, token and API key caches."""
+
+    def setUp(self):
+        AuthManager.clear_cache()
+        self.addCleanup(AuthManager.clear_cache)
+
+    @patch.object(AuthManager, '_config_stamp', return_value=(1, 10, 99))
+    @patch.object(AuthManager, '_load_auth_data')
+    def test_auth_state_reused_while_file_unchanged(self, mock_load, mock_stamp):
+        mock_load.return_value = {"jwt_secret": "secret"}
+        AuthManager._get_auth_data()
+        AuthManager._get_auth_data()
+        mock_load.assert_called_once()
+
+    @patch.object(AuthManager, '_config_stamp')
+    @patch.object(AuthManager, '_load_auth_data')
+    def test_auth_state_reloaded_on_mtime_change(self, mock_load, mock_stamp):
+        mock_stamp.side_effect = [(1, 10, 99), (2, 10, 99)]
+        mock_load.side_effect = [{"jwt_secret": "old"}, {"jwt_secret": "new"}]
+        self.assertEqual(AuthManager._get_auth_data()["jwt_secret"], "old")
+        self.assertEqual(AuthManager._get_auth_data()["jwt_secret"], "new")
+
+    @patch.object(AuthManager, '_config_stamp', return_value=None)
+    @patch.object(AuthManager, '_load_auth_data')
+    def test_missing_config_file_is_not_cached(self, mock_load, mock_stamp):
+        mock_load.return_value = {"jwt_secret": "ephemeral"}
+        AuthManager._get_auth_data()
+        AuthManager._get_auth_data()
+        self.assertEqual(mock_load.call_count, 2)
+
+    @patch.object(AuthManager, '_config_stamp', return_value=(1, 10, 99))
+    @patch.object(AuthManager, '_load_auth_data', return_value={"jwt_secret": "secret"})
+    @patch('utils.auth.jwt')
+    def test_verified_token_skips_decode(self, mock_jwt, mock_load, mock_stamp):
+        mock_jwt.decode.return_value = {"sub": "loofi-api", "exp": int(__import__("time").time()) + 60}
+        AuthManager.verify_token("tok")
+        AuthManager.verify_token("tok")
+        mock_jwt.decode.assert_called_once()
+
+    @patch.object(AuthManager, '_config_stamp', return_value=(1, 10, 99))
+    @patch.object(AuthManager, '_load_auth_data', return_value={"jwt_secret": "secret"})
+    @patch('utils.auth.time.time', return_value=1000)
+    @patch('utils.auth.jwt')
+    def test_verify_token_returns_exp(self, mock_jwt, mock_time, mock_load, mock_stamp):
+        mock_jwt.decode.return_value = {"exp": 1010}
+        self.assertEqual(AuthManager.verify_token("tok"), 1010)
+        self.assertEqual(AuthManager.verify_token("tok"), 1010)
+        mock_jwt.decode.assert_called_once()
+
+    @patch.object(AuthManager, '_config_stamp', return_value=(1, 10, 99))
+    @patch.object(AuthManager, '_load_auth_data', return_value={"jwt_secret": "secret"})
+    @patch('utils.auth.time.time', return_value=1000)
+    @patch('utils.auth.jwt')
+    def test_remembered_token_expires(self, mock_jwt, mock_time, mock_load, mock_stamp):
+        mock_jwt.decode.return_value = {"exp": 1010}
+        AuthManager.verify_token("tok")
+        mock_time.return_value = 1011
+        mock_jwt.decode.side_effect = _MockInvalidTokenError("expired")
+        mock_jwt.InvalidTokenError = _MockInvalidTokenError
+        from fastapi import HTTPException
+        with self.assertRaises(HTTPException):
+            AuthManager.verify_token("tok")
+
+    @patch.object(AuthManager, '_config_stamp')
+    @patch.object(AuthManager, '_load_auth_data', return_value={"jwt_secret": "secret"})
+    @patch('utils.auth.jwt')
+    def test_config_change_forgets_verified_tokens(self, mock_jwt, mock_load, mock_stamp):
+        mock_stamp.side_effect = [(1, 10, 99), (2, 10, 99)]
+        mock_jwt.decode.return_value = {"exp": int(__import__("time").time()) + 60}
+        AuthManager.verify_token("tok")
+        AuthManager.verify_token("tok")
+        self.assertEqual(mock_jwt.decode.call_count, 2)
+
+    @patch.object(AuthManager, '_config_stamp', return_value=(1, 10, 99))
+    @patch.object(AuthManager, '_load_auth_data', return_value={"jwt_secret": "secret"})
+    @patch('utils.auth.time.time', return_value=1000)
+    @patch('utils.auth.jwt')
+    def test_token_lru_is_bounded(self, mock_jwt, mock_time, mock_load, mock_stamp):
+        mock_jwt.decode.return_value = {"exp": 2000}
+        for i in range(AuthManager._VERIFIED_TOKEN_CACHE_SIZE + 5):
+            AuthManager.verify_token(f"tok-{i}")
+        self.assertEqual(len(AuthManager._verified_tokens), AuthManager._VERIFIED_TOKEN_CACHE_SIZE)
+        self.assertNotIn("tok-0", AuthManager._verified_tokens)
+
+    @patch.object(AuthManager, '_config_stamp', return_value=(1, 10, 99))
+    @patch.object(AuthManager, '_load_auth_data')
+    @patch('utils.auth.bcrypt')
+    @patch('utils.auth.jwt')
+    def test_accepted_api_key_skips_bcrypt(self, mock_jwt, mock_bcrypt, mock_load, mock_stamp):
+        mock_load.return_value = {"jwt_secret": "s", "api_key_hash": "$2b$12$hash"}
+        mock_bcrypt.checkpw.return_value = True
+        mock_jwt.encode.return_value = "jwt"
+        AuthManager.issue_token("key")
+        AuthManager.issue_token("key")
+        mock_bcrypt.checkpw.assert_called_once()
+
+    @patch.object(AuthManager, '_config_stamp', return_value=(1, 10, 99))
+    @patch.object(AuthManager, '_load_auth_data')
+    @patch('utils.auth.bcrypt')
+    def test_other_api_key_still_checked(self, mock_bcrypt, mock_load, mock_stamp):
+        mock_load.return_value = {"jwt_secret": "s", "api_key_hash": "$2b$12$hash"}
+        mock_bcrypt.checkpw.side_effect = [True, False]
+        AuthManager._check_api_key("good", "$2b$12$hash")
+        self.assertFalse(AuthManager._check_api_key("bad", "$2b$12$hash"))
+        self.assertEqual(mock_bcrypt.checkpw.call_count, 2)
+
+    @patch('utils.auth.ConfigManager')
+    def test_save_clears_cache(self, mock_cm):
+        mock_cm.load_config.return_value = {}
+        AuthManager._auth_cache = {"jwt_secret": "stale"}
+        AuthManager._verified_tokens["tok"] = 9999999999
+        AuthManager._save_auth_data({"jwt_secret": "s"})
+        self.assertIsNone(AuthManager._auth_cache)
+        self.assertEqual(len(AuthManager._verified_tokens), 0)
+
+
 class TestAuthManagerVerifyBearerToken(unittest.TestCase):
     """Tests for verify_bearer_token FastAPI dependency."""
 
@@ -3,14 +3,26 @@ Extended tests for BootAnalyzer - Boot performance analysis.
 """
 
 import os
+import shutil
 import sys
+import tempfile
 import unittest
+from pathlib import Path
 from unittest.mock import patch, MagicMock
 
 # Add source path to sys.path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'loofi-fedora-tweaks'))
 
-from utils.boot_analyzer import BootAnalyzer, ServiceTime, BootStats
+import utils.boot_analyzer as boot_analyzer
+from utils.boot_analyzer import (
+    BootAnalysis,
+    BootAnalyzer,
+    BootHistory,
+    BootStats,
+    ServiceTime,
+    blame_from_timestamps,
+    stats_from_timestamps,
+)
 
 
 class TestServiceTimeDataclass(unittest.TestCase):
@@ -406,5 +418,163 @@ class TestServiceTimeSlowFlag(unittest.TestCase):
         self.assertFalse(services[0].is_slow)
 
 
+class TestTimestampComputations(unittest.TestCase):
+    """Boot phases and blame from systemd's monotonic timestamps."""
+
+    def test_stats_with_firmware_and_initrd(self):
+        stats = stats_from_timestamps({
+            "FirmwareTimestampMonotonic": 5_000_000,
+            "LoaderTimestampMonotonic": 1_500_000,
+            "InitRDTimestampMonotonic": 2_000_000,
+            "UserspaceTimestampMonotonic": 4_500_000,
+            "FinishTimestampMonotonic": 20_000_000,
+        })
+        self.assertEqual(
+            (stats.firmware_time, stats.loader_time, stats.kernel_time,
+             stats.initrd_time, stats.userspace_time, stats.total_time),
+            (3.5, 1.5, 2.0, 2.5, 15.5, 25.0),
+        )
+
+    def test_stats_without_initrd_or_firmware(self):
+        stats = stats_from_timestamps({
+            "UserspaceTimestampMonotonic": 3_000_000,
+            "FinishTimestampMonotonic": 10_000_000,
+        })
+        self.assertIsNone(stats.firmware_time)
+        self.assertIsNone(stats.initrd_time)
+        self.assertEqual((stats.kernel_time, stats.userspace_time, stats.total_time), (3.0, 7.0, 10.0))
+
+    def test_unfinished_boot_has_no_stats(self):
+        stats = stats_from_timestamps({"UserspaceTimestampMonotonic": 3_000_000})
+        self.assertIsNone(stats.total_time)
+
+    def test_blame(self):
+        blame = blame_from_timestamps([
+            ("fast.service", {"InactiveExitTimestampMonotonic": 1_000_000,
+                              "ActiveEnterTimestampMonotonic": 1_250_000}),
+            ("slow.service", {"InactiveExitTimestampMonotonic": 1_000_000,
+                              "ActiveEnterTimestampMonotonic": 7_000_000}),
+            ("oneshot.service", {"InactiveExitTimestampMonotonic": 2_000_000,
+                                 "ActiveEnterTimestampMonotonic": 0,
+                                 "ActiveExitTimestampMonotonic": 2_500_000}),
+            ("never.service", {"InactiveExitTimestampMonotonic": 0}),
+        ], slow_threshold=5.0)
+        self.assertEqual([(s.service, s.time_seconds, s.is_slow) for s in blame], [
+            ("slow.service", 6.0, True),
+            ("oneshot.service", 0.5, False),
+            ("fast.service", 0.25, False),
+        ])
+
+
+def _fake_systemd_analyze(total="22.0"):
+    outputs = {
+        (): f"Startup finished in 3.1s (kernel) + 15.2s (userspace) = {total}s",
+        ("blame",): "8.000s slow.service\n1.000s fast.service\n",
+        ("critical-chain",): "graphical.target @22.0s\n",
+    }
+
+    def run(cmd, **kwargs):
+        return MagicMock(returncode=0, stdout=outputs[tuple(cmd[1:-1])])
+    return run
+
+
+class TestBootCache(unittest.TestCase):
+    """The analysis is gathered once per boot and kept in the history."""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, True)
+        self.boot_id = Path(self.tmp) / "boot_id"
+        self.boot_id.write_text("boot-1\n")
+        patcher = patch.object(boot_analyzer, "BOOT_ID_PATH", self.boot_id)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch('utils.boot_analyzer.subprocess.run')
+    def test_second_call_uses_recorded_boot(self, mock_run):
+        mock_run.side_effect = _fake_systemd_analyze()
+        self.assertEqual(BootAnalyzer.get_boot_stats().total_time, 22.0)
+        self.assertEqual(mock_run.call_count, 3)
+        self.assertEqual([s.service for s in BootAnalyzer.get_slow_services()], ["slow.service"])
+        self.assertEqual(BootAnalyzer.get_critical_chain(), "graphical.target @22.0s\n")
+        BootAnalyzer.get_optimization_suggestions()
+        self.assertEqual(mock_run.call_count, 3)
+
+        # A new process reads the same boot back from disk.
+        BootHistory.clear_cache()
+        self.assertEqual(BootAnalyzer.get_blame_data(limit=1)[0].service, "slow.service")
+        self.assertEqual(mock_run.call_count, 3)
+
+    @patch('utils.boot_analyzer.subprocess.run')
+    def test_new_boot_is_analysed_again(self, mock_run):
+        mock_run.side_effect = _fake_systemd_analyze()
+        BootAnalyzer.analyze()
+        self.boot_id.write_text("boot-2\n")
+        mock_run.side_effect = _fake_systemd_analyze(total="30.0")
+        self.assertEqual(BootAnalyzer.get_boot_stats().total_time, 30.0)
+        self.assertEqual(mock_run.call_count, 6)
+        self.assertEqual([b.boot_id for b in BootAnalyzer.get_history()], ["boot-1", "boot-2"])
+
+    @patch('utils.boot_analyzer.subprocess.run')
+    def test_unfinished_boot_is_not_recorded(self, mock_run):
+        mock_run.return_value = MagicMock(returncode=1, stdout="")
+        BootAnalyzer.analyze()
+        BootAnalyzer.analyze()
+        self.assertEqual(mock_run.call_count, 6)
+        self.assertEqual(BootAnalyzer.get_history(), [])
+
+    @patch('utils.boot_analyzer.subprocess.run')
+    def test_dbus_source_preferred(self, mock_run):
+        mock_run.side_effect = _fake_systemd_analyze()
+        structured = (BootStats(total_time=12.0), [ServiceTime("a.service", 1.0)])
+        with patch.object(boot_analyzer, "DBUS_AVAILABLE", True), \
+                patch.object(BootAnalyzer, "_dbus_boot_data", return_value=structured):
+            analysis = BootAnalyzer.analyze()
+        self.assertEqual((analysis.source, analysis.stats.total_time), ("dbus", 12.0))
+        self.assertEqual(analysis.critical_chain, "graphical.target @22.0s\n")
+        mock_run.assert_called_once()
+
+    def test_history_is_trimmed(self):
+        history = BootHistory.shared()
+        with patch.object(BootHistory, "MAX_BOOTS", 3):
+            for i in range(5):
+                history.record(BootAnalysis(f"b{i}", float(i), BootStats(total_time=10.0)))
+        self.assertEqual([b.boot_id for b in BootAnalyzer.get_history()], ["b2", "b3", "b4"])
+        self.assertEqual([b.boot_id for b in BootAnalyzer.get_history(limit=1)], ["b4"])
+
+
+class TestRegressions(unittest.TestCase):
+    """Comparing this boot with the recorded ones."""
+
+    def setUp(self):
+        history = BootHistory.shared()
+        for i, (total, nm) in enumerate([(20.0, 2.0), (22.0, 2.5), (21.0, 2.2)]):
+            history.record(BootAnalysis(
+                f"b{i}", float(i), BootStats(total_time=total, userspace_time=total - 5),
+                [ServiceTime("NetworkManager.service", nm), ServiceTime("steady.service", 1.0)],
+            ))
+        history.record(BootAnalysis(
+            "now", 3.0, BootStats(total_time=30.0, userspace_time=24.0),
+            [ServiceTime("NetworkManager.service", 9.0), ServiceTime("steady.service", 1.2),
+             ServiceTime("new.service", 4.0)],
+        ))
+
+    def test_regressions_against_median(self):
+        with patch.object(BootAnalyzer, "current_boot_id", return_value="now"):
+            regressions = BootAnalyzer.get_regressions()
+            suggestions = BootAnalyzer.get_optimization_suggestions()
+        self.assertEqual(
+            [(r.name, r.kind, r.baseline_seconds, r.current_seconds) for r in regressions],
+            [("total_time", "phase", 21.0, 30.0),
+             ("userspace_time", "phase", 16.0, 24.0),
+             ("NetworkManager.service", "unit", 2.2, 9.0)],
+        )
+        self.assertIn("📈 This boot took 9.0s longer than recent boots.", suggestions)
+
+    def test_no_regressions_before_this_boot_is_recorded(self):
+        with patch.object(BootAnalyzer, "current_boot_id", return_value="unrecorded"):
+            self.assertEqual(BootAnalyzer.get_regressions(), [])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,138 @@
+"""Tests for lazy handler-module loading in the CLI entry point."""
+
+import argparse
+import os
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "loofi-fedora-tweaks"))
+
+import cli.main as cli_main
+
+APP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "loofi-fedora-tweaks"))
+
+# Cumulative `python -X importtime` budget for `import cli.main` (microseconds).
+# Generous enough for cold, uncached bytecode on CI runners; the eager
+# import of every handler module blew well past it.
+CLI_IMPORT_BUDGET_US = 400_000
+
+# Handler modules that must not be imported until their subcommand runs.
+HEAVY_MODULES = (
+    "PyQt6",
+    "services.hardware",
+    "services.system",
+    "utils.plugin_marketplace",
+    "utils.plugin_installer",
+    "utils.storage",
+    "utils.service_explorer",
+    "utils.health_timeline",
+    "utils.firewall_manager",
+    "utils.operations",
+)
+
+
+def _importtime(code):
+    """Run *code* under ``-X importtime`` and return {module: cumulative_us}."""
+    env = dict(os.environ, PYTHONPATH=APP_DIR)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=APP_DIR,
+        timeout=60,
+        check=False,
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = [p.strip() for p in line[len("import time:"):].split("|")]
+        if len(parts) != 3 or not parts[1].isdigit():
+            continue
+        timings[parts[2]] = int(parts[1])
+    return result.returncode, timings
+
+
+class TestLazyImport(unittest.TestCase):
+    """Tests for the _LazyImport placeholder."""
+
+    def test_resolves_on_attribute_access(self):
+        lazy = cli_main._LazyImport("json", "JSONDecoder")
+        self.assertIn("pending", repr(lazy))
+        import json
+
+        self.assertIs(lazy.decode, json.JSONDecoder.decode)
+        self.assertIn("resolved", repr(lazy))
+
+    def test_resolves_on_call(self):
+        lazy = cli_main._LazyImport("collections", "OrderedDict")
+        self.assertEqual(lazy(a=1), {"a": 1})
+
+    @patch("cli.main.importlib.import_module")
+    def test_resolves_only_once(self, mock_import):
+        mock_import.return_value.Thing.value = 42
+        lazy = cli_main._LazyImport("some.module", "Thing")
+        self.assertEqual(lazy.value, 42)
+        self.assertEqual(lazy.value, 42)
+        mock_import.assert_called_once_with("some.module")
+
+    def test_missing_module_raises_on_use(self):
+        lazy = cli_main._LazyImport("nonexistent_loofi_module", "Thing")
+        with self.assertRaises(ImportError):
+            lazy()
+
+    @patch("cli.main.SystemMonitor.get_hostname", return_value="fleet-01")
+    def test_patching_through_placeholder_reaches_real_class(self, mock_hostname):
+        from utils.monitor import SystemMonitor
+
+        self.assertEqual(SystemMonitor.get_hostname(), "fleet-01")
+        self.assertIs(cli_main.SystemMonitor.get_hostname, mock_hostname)
+
+    def test_patch_through_placeholder_is_undone(self):
+        from utils.monitor import SystemMonitor
+
+        original = SystemMonitor.__dict__["get_system_health"]
+        with patch("cli.main.SystemMonitor.get_system_health", return_value="x"):
+            self.assertEqual(SystemMonitor.get_system_health(), "x")
+        self.assertIs(SystemMonitor.__dict__["get_system_health"], original)
+        self.assertIsInstance(original, classmethod)
+
+    @patch("cli.main._print")
+    @patch("cli.main.PresetManager")
+    def test_patched_placeholders_are_used_by_handlers(self, mock_presets, _mock_print):
+        mock_presets.return_value.list_presets.return_value = ["gaming"]
+        args = argparse.Namespace(action="list")
+        self.assertEqual(cli_main.cmd_preset(args), 0)
+        mock_presets.return_value.list_presets.assert_called_once()
+
+
+class TestCliImportBudget(unittest.TestCase):
+    """Import-time checks for `import cli.main` in a fresh interpreter."""
+
+    def test_handler_modules_not_imported_at_load(self):
+        code, timings = _importtime("import cli.main")
+        self.assertEqual(code, 0)
+        loaded = [m for m in HEAVY_MODULES if m in timings]
+        self.assertEqual(loaded, [])
+
+    def test_import_time_within_budget(self):
+        code, timings = _importtime("import cli.main")
+        self.assertEqual(code, 0)
+        self.assertIn("cli.main", timings)
+        self.assertLess(timings["cli.main"], CLI_IMPORT_BUDGET_US)
+
+    def test_help_does_not_load_handler_modules(self):
+        code, timings = _importtime(
+            "import contextlib, io, cli.main as m\n"
+            "with contextlib.redirect_stdout(io.StringIO()):\n"
+            "    m.main([])\n"
+        )
+        self.assertEqual(code, 0)
+        self.assertNotIn("utils.plugin_marketplace", timings)
+
+
+if __name__ == "__main__":
+    unittest.main()
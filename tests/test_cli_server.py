@@ -0,0 +1,195 @@
+"""Tests for cli/server.py — resident CLI server and thin client."""
+
+import io
+import json
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "loofi-fedora-tweaks"))
+
+from cli import server as cli_server
+from cli.server import CliServer, get_socket_path, run_client
+
+
+def _fake_cli_main(argv):
+    """Stand-in for cli.main.main used by the server under test."""
+    if argv and argv[0] == "boom":
+        raise SystemExit(3)
+    if argv and argv[0] == "warn":
+        print("careful", file=sys.stderr)
+        return 1
+    print("ran " + " ".join(argv))
+    return 0
+
+
+class TestGetSocketPath(unittest.TestCase):
+    """Tests for get_socket_path()."""
+
+    @patch.dict(os.environ, {"XDG_RUNTIME_DIR": "/run/user/1000"})
+    def test_uses_xdg_runtime_dir(self):
+        self.assertEqual(get_socket_path(), "/run/user/1000/loofi-fedora-tweaks/cli.sock")
+
+    @patch("cli.server.os.getuid", return_value=1234)
+    @patch.dict(os.environ, {}, clear=True)
+    def test_falls_back_to_tmp(self, _mock_uid):
+        self.assertEqual(get_socket_path(), "/tmp/loofi-fedora-tweaks-1234/cli.sock")
+
+
+class TestRunClientWithoutServer(unittest.TestCase):
+    """run_client() behaviour when nothing is listening."""
+
+    def test_returns_none_when_socket_missing(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        self.assertIsNone(run_client(["info"], socket_path=os.path.join(tmp, "cli.sock")))
+
+
+class TestCliServerRoundTrip(unittest.TestCase):
+    """End-to-end tests over a real unix socket."""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.sock_path = os.path.join(self.tmp, "run", "cli.sock")
+        self.server = CliServer(socket_path=self.sock_path)
+        patcher = patch("cli.main.main", side_effect=_fake_cli_main)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.server.start()
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.thread.join(timeout=5)
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _call(self, argv):
+        out, err = io.StringIO(), io.StringIO()
+        code = run_client(argv, socket_path=self.sock_path, stdout=out, stderr=err)
+        return code, out.getvalue(), err.getvalue()
+
+    def test_streams_stdout_and_exit_code(self):
+        code, out, err = self._call(["--json", "info"])
+        self.assertEqual(code, 0)
+        self.assertEqual(out, "ran --json info\n")
+        self.assertEqual(err, "")
+
+    def test_forwards_stderr_and_nonzero_exit(self):
+        code, out, err = self._call(["warn"])
+        self.assertEqual(code, 1)
+        self.assertEqual(err, "careful\n")
+
+    def test_system_exit_code_is_forwarded(self):
+        code, _out, _err = self._call(["boom"])
+        self.assertEqual(code, 3)
+
+    def test_repeated_calls_reuse_server(self):
+        for _ in range(5):
+            code, out, _err = self._call(["info"])
+            self.assertEqual(code, 0)
+            self.assertEqual(out, "ran info\n")
+
+    def test_socket_is_user_private(self):
+        self.assertEqual(os.stat(self.sock_path).st_mode & 0o777, 0o600)
+        self.assertEqual(os.stat(os.path.dirname(self.sock_path)).st_mode & 0o777, 0o700)
+
+    def test_invalid_request_is_rejected(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(self.sock_path)
+        sock.sendall(b'{"argv": "info"}\n')
+        frames = [json.loads(line) for line in sock.makefile("rb")]
+        sock.close()
+        self.assertEqual(frames[-1], {"exit_code": 2})
+
+    def test_second_server_refuses_live_socket(self):
+        with self.assertRaises(RuntimeError):
+            CliServer(socket_path=self.sock_path).start()
+
+    def test_client_ignores_server_of_another_user(self):
+        out, err = io.StringIO(), io.StringIO()
+        with patch("cli.server._peer_uid", return_value=os.getuid() + 1):
+            code = run_client(["info"], socket_path=self.sock_path, stdout=out, stderr=err)
+        self.assertIsNone(code)
+        self.assertEqual(out.getvalue(), "")
+        self.assertIn(f"uid {os.getuid() + 1}", err.getvalue())
+
+
+class TestCliServerHousekeeping(unittest.TestCase):
+    """Socket preparation and warm-up."""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def test_stale_socket_is_replaced(self):
+        path = os.path.join(self.tmp, "cli.sock")
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(path)
+        stale.close()
+        server = CliServer(socket_path=path)
+        server.start()
+        self.addCleanup(server.close)
+        self.assertTrue(cli_server._server_alive(path))
+
+    def test_close_removes_socket(self):
+        path = os.path.join(self.tmp, "cli.sock")
+        server = CliServer(socket_path=path)
+        server.start()
+        server.close()
+        self.assertFalse(os.path.exists(path))
+
+    def test_symlinked_socket_dir_is_refused(self):
+        target = os.path.join(self.tmp, "elsewhere")
+        os.mkdir(target, 0o700)
+        link = os.path.join(self.tmp, "run")
+        os.symlink(target, link)
+        with self.assertRaises(RuntimeError):
+            CliServer(socket_path=os.path.join(link, "cli.sock")).start()
+        self.assertEqual(os.listdir(target), [])
+
+    def test_loose_socket_dir_is_refused(self):
+        directory = os.path.join(self.tmp, "run")
+        os.mkdir(directory)
+        os.chmod(directory, 0o755)
+        with self.assertRaises(RuntimeError):
+            CliServer(socket_path=os.path.join(directory, "cli.sock")).start()
+
+    def test_socket_dir_of_another_user_is_refused(self):
+        with patch("cli.server.os.getuid", return_value=os.getuid() + 1):
+            with self.assertRaises(RuntimeError):
+                CliServer(socket_path=os.path.join(self.tmp, "cli.sock")).start()
+        self.assertFalse(os.path.exists(os.path.join(self.tmp, "cli.sock")))
+
+    @patch("cli.server._peer_uid", return_value=os.getuid() + 1)
+    def test_rejects_foreign_uid(self, _mock_uid):
+        handler = cli_server._CliRequestHandler.__new__(cli_server._CliRequestHandler)
+        handler.request = MagicMock()
+        handler.rfile = MagicMock()
+        handler.wfile = io.BytesIO()
+        handler.server = MagicMock()
+        handler.handle()
+        handler.rfile.readline.assert_not_called()
+        handler.server.cli_server.execute.assert_not_called()
+
+    def test_parser_is_built_once(self):
+        import cli.main as cli_main
+
+        self.assertIs(cli_main._build_parser(), cli_main._build_parser())
+
+    def test_warm_up_resolves_lazy_imports(self):
+        import cli.main as cli_main
+
+        lazy = cli_main._LazyImport("json", "dumps")
+        with patch.dict(cli_main.__dict__, {"_WarmTarget": lazy}):
+            self.assertGreaterEqual(CliServer(socket_path="unused").warm_up(), 1)
+        self.assertIn("resolved", repr(lazy))
+
+
+if __name__ == "__main__":
+    unittest.main()
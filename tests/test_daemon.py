@@ -229,15 +229,15 @@ class TestDaemonRun(unittest.TestCase):
         Daemon._running = True
         Daemon._last_power_state = None
 
-    @patch('utils.daemon.time.sleep')
+    @patch.object(Daemon, '_teardown')
+    @patch.object(Daemon, '_setup')
+    @patch.object(Daemon, 'run_once')
     @patch('utils.daemon.signal.signal')
     @patch.object(Daemon, 'run_boot_tasks')
-    @patch.object(Daemon, 'run_due_tasks')
-    @patch.object(Daemon, 'check_power_triggers')
-    def test_run_registers_signal_handlers(self, mock_power, mock_due, mock_boot, mock_signal, mock_sleep):
+    def test_run_registers_signal_handlers(self, mock_boot, mock_signal, mock_once, mock_setup, mock_teardown):
         """run() registers SIGTERM and SIGINT handlers."""
         # Stop after first iteration
-        mock_sleep.side_effect = lambda x: setattr(Daemon, '_running', False)
+        mock_once.side_effect = lambda: setattr(Daemon, '_running', False)
 
         Daemon.run()
 
@@ -246,40 +246,280 @@ class TestDaemonRun(unittest.TestCase):
         self.assertIn(signal.SIGTERM, signal_nums)
         self.assertIn(signal.SIGINT, signal_nums)
 
-    @patch('utils.daemon.time.sleep')
+    @patch.object(Daemon, '_teardown')
+    @patch.object(Daemon, '_setup')
+    @patch.object(Daemon, 'run_once')
     @patch('utils.daemon.signal.signal')
     @patch.object(Daemon, 'run_boot_tasks')
-    @patch.object(Daemon, 'run_due_tasks')
-    @patch.object(Daemon, 'check_power_triggers')
-    def test_run_calls_boot_tasks_on_startup(self, mock_power, mock_due, mock_boot, mock_signal, mock_sleep):
+    def test_run_calls_boot_tasks_on_startup(self, mock_boot, mock_signal, mock_once, mock_setup, mock_teardown):
         """run() calls run_boot_tasks on startup."""
-        mock_sleep.side_effect = lambda x: setattr(Daemon, '_running', False)
+        mock_once.side_effect = lambda: setattr(Daemon, '_running', False)
 
         Daemon.run()
 
         mock_boot.assert_called_once()
+        mock_setup.assert_called_once()
+        mock_teardown.assert_called_once()
 
-    @patch('utils.daemon.time.time')
-    @patch('utils.daemon.time.sleep')
+    @patch.object(Daemon, '_teardown')
+    @patch.object(Daemon, '_setup')
+    @patch.object(Daemon, 'run_once')
     @patch('utils.daemon.signal.signal')
     @patch.object(Daemon, 'run_boot_tasks')
-    @patch.object(Daemon, 'run_due_tasks')
-    @patch.object(Daemon, 'check_power_triggers')
-    def test_run_stops_on_running_false(self, mock_power, mock_due, mock_boot, mock_signal, mock_sleep, mock_time):
+    def test_run_stops_on_running_false(self, mock_boot, mock_signal, mock_once, mock_setup, mock_teardown):
         """run() stops when _running is set to False."""
-        mock_time.return_value = 1000
         call_count = [0]
 
-        def stop_after_iterations(x):
+        def stop_after_iterations():
             call_count[0] += 1
             if call_count[0] >= 2:
                 Daemon._running = False
 
-        mock_sleep.side_effect = stop_after_iterations
+        mock_once.side_effect = stop_after_iterations
 
         Daemon.run()
 
         self.assertFalse(Daemon._running)
+        self.assertEqual(mock_once.call_count, 2)
+
+    @patch.object(Daemon, '_wait')
+    @patch.object(Daemon, '_teardown')
+    @patch.object(Daemon, '_setup')
+    @patch.object(Daemon, 'run_once')
+    @patch('utils.daemon.signal.signal')
+    @patch.object(Daemon, 'run_boot_tasks')
+    def test_run_backs_off_on_error(self, mock_boot, mock_signal, mock_once, mock_setup, mock_teardown, mock_wait):
+        """run() backs off after a loop error instead of spinning."""
+        calls = []
+
+        def once():
+            calls.append(1)
+            if len(calls) == 1:
+                raise OSError("boom")
+            Daemon._running = False
+
+        mock_once.side_effect = once
+
+        Daemon.run()
+
+        mock_wait.assert_called_once_with(60)
+        mock_teardown.assert_called_once()
+
+
+class TestDaemonTimers(unittest.TestCase):
+    """Tests for the deadline heap."""
+
+    def setUp(self):
+        Daemon._timers = []
+        Daemon._deadlines = {}
+
+    def tearDown(self):
+        Daemon._timers = []
+        Daemon._deadlines = {}
+
+    def test_next_deadline_is_earliest(self):
+        """next_deadline() returns the earliest scheduled deadline."""
+        Daemon.schedule("b", 200.0)
+        Daemon.schedule("a", 100.0)
+        self.assertEqual(Daemon.next_deadline(), 100.0)
+
+    def test_rescheduling_supersedes_old_deadline(self):
+        """A job rescheduled later no longer fires at its old deadline."""
+        Daemon.schedule("tasks", 100.0)
+        Daemon.schedule("tasks", 500.0)
+        self.assertEqual(Daemon.pop_expired(200.0), [])
+        self.assertEqual(Daemon.next_deadline(), 500.0)
+
+    def test_clearing_deadline(self):
+        """schedule(job, None) disarms the job."""
+        Daemon.schedule("tasks", 100.0)
+        Daemon.schedule("tasks", None)
+        self.assertIsNone(Daemon.next_deadline())
+
+    def test_pop_expired_returns_due_jobs_in_order(self):
+        """pop_expired() returns every job due at or before now."""
+        Daemon.schedule("power", 30.0)
+        Daemon.schedule("tasks", 10.0)
+        Daemon.schedule("plugin_updates", 90.0)
+        self.assertEqual(Daemon.pop_expired(30.0), ["tasks", "power"])
+        self.assertEqual(Daemon.next_deadline(), 90.0)
+
+
+class TestDaemonRunOnce(unittest.TestCase):
+    """Tests for one iteration of the deadline-driven loop."""
+
+    def setUp(self):
+        Daemon._running = True
+        Daemon._timers = []
+        Daemon._deadlines = {}
+        Daemon._power_events.clear()
+        Daemon._watcher = None
+        Daemon._pulse = None
+        Daemon._wakeups = 0
+        Daemon._idle_wakeups = 0
+
+    def tearDown(self):
+        self.setUp()
+        Daemon._last_power_state = None
+
+    @patch.object(Daemon, '_wait')
+    @patch('utils.daemon.time.time', return_value=1000.0)
+    def test_sleeps_until_next_deadline(self, mock_time, mock_wait):
+        """run_once() sleeps exactly until the earliest deadline."""
+        Daemon.schedule(Daemon.JOB_TASKS, 1250.0)
+        Daemon.schedule(Daemon.JOB_PLUGINS, 5000.0)
+
+        self.assertFalse(Daemon.run_once())
+
+        mock_wait.assert_called_once_with(250.0)
+
+    @patch.object(Daemon, '_wait')
+    @patch('utils.daemon.time.time', return_value=1000.0)
+    def test_sleep_capped_without_deadlines(self, mock_time, mock_wait):
+        """With nothing scheduled the loop sleeps MAX_SLEEP."""
+        Daemon.run_once()
+        mock_wait.assert_called_once_with(Daemon.MAX_SLEEP)
+
+    @patch.object(Daemon, '_wait')
+    @patch.object(Daemon, 'schedule_tasks')
+    @patch.object(Daemon, 'run_due_tasks')
+    @patch('utils.daemon.time.time', return_value=1000.0)
+    def test_expired_task_timer_runs_tasks(self, mock_time, mock_due, mock_schedule, mock_wait):
+        """An expired task deadline runs due tasks and re-arms the timer."""
+        Daemon.schedule(Daemon.JOB_TASKS, 999.0)
+
+        self.assertTrue(Daemon.run_once())
+
+        mock_due.assert_called_once()
+        mock_schedule.assert_called_once_with(after_run=True)
+
+    @patch.object(Daemon, '_wait')
+    @patch.object(Daemon, 'check_power_triggers')
+    @patch('utils.daemon.time.time', return_value=1000.0)
+    def test_power_polling_only_without_pulse(self, mock_time, mock_check, mock_wait):
+        """The power timer re-arms itself only when D-Bus events are unavailable."""
+        Daemon.schedule(Daemon.JOB_POWER, 1000.0)
+        Daemon.run_once()
+        self.assertEqual(Daemon._deadlines[Daemon.JOB_POWER], 1000.0 + Daemon.POWER_CHECK_INTERVAL)
+
+        Daemon._pulse = MagicMock()
+        Daemon.schedule(Daemon.JOB_POWER, 1000.0)
+        Daemon.run_once()
+        self.assertNotIn(Daemon.JOB_POWER, Daemon._deadlines)
+        self.assertEqual(mock_check.call_count, 2)
+
+    @patch.object(Daemon, '_wait')
+    @patch.object(Daemon, 'handle_power_state')
+    def test_pulse_power_events_are_handled(self, mock_handle, mock_wait):
+        """Power states queued by SystemPulse are handled on the main loop."""
+        Daemon._on_pulse_power_state("battery")
+        self.assertTrue(Daemon.run_once())
+        mock_handle.assert_called_once_with("battery")
+
+    @patch.object(Daemon, '_wait')
+    @patch('utils.daemon.time.time', return_value=1000.0)
+    def test_pulse_failure_switches_to_polling(self, mock_time, mock_wait):
+        """If the Pulse listener exits, power state is polled instead."""
+        Daemon._pulse = MagicMock()
+        Daemon._power_events.append(None)
+        Daemon.run_once()
+        self.assertIsNone(Daemon._pulse)
+        self.assertEqual(Daemon._deadlines[Daemon.JOB_POWER], 1000.0 + Daemon.POWER_CHECK_INTERVAL)
+
+    @patch.object(Daemon, '_wait')
+    @patch.object(Daemon, 'schedule_tasks')
+    def test_config_change_recomputes_deadlines(self, mock_schedule, mock_wait):
+        """A scheduler.json change re-arms the task timer without polling."""
+        Daemon._watcher = MagicMock(uses_inotify=True)
+        Daemon._watcher.read_changes.return_value = {Path("scheduler.json")}
+        self.assertTrue(Daemon.run_once())
+        mock_schedule.assert_called_once_with()
+
+    @patch.object(Daemon, '_wait')
+    @patch('utils.daemon.time.time', return_value=1000.0)
+    def test_idle_wakeups_are_counted(self, mock_time, mock_wait):
+        """Wake-ups with nothing to do are reported by get_wakeup_stats()."""
+        Daemon._started_at = 1000.0 - 7200
+        for _ in range(3):
+            Daemon.run_once()
+        stats = Daemon.get_wakeup_stats()
+        self.assertEqual(stats["wakeups"], 3)
+        self.assertEqual(stats["idle_wakeups"], 2)
+        self.assertEqual(stats["idle_wakeups_per_hour"], 1.0)
+
+
+class TestDaemonScheduleTasks(unittest.TestCase):
+    """Tests for arming the task timer from ScheduledTask deadlines."""
+
+    def setUp(self):
+        Daemon._timers = []
+        Daemon._deadlines = {}
+
+    def tearDown(self):
+        self.setUp()
+
+    def _scheduler(self, next_due):
+        mock_scheduler = MagicMock()
+        mock_scheduler.get_next_due_time.return_value = next_due
+        return patch.dict('sys.modules', {'utils.scheduler': MagicMock(TaskScheduler=mock_scheduler)})
+
+    def test_deadline_from_next_due_time(self):
+        """The timer fires at the earliest task deadline."""
+        due = MagicMock()
+        due.timestamp.return_value = 5000.0
+        with self._scheduler(due):
+            Daemon.schedule_tasks()
+        self.assertEqual(Daemon._deadlines[Daemon.JOB_TASKS], 5000.0)
+
+    def test_no_time_based_tasks_disarms_timer(self):
+        """Without time-based tasks the task timer is cleared."""
+        Daemon.schedule(Daemon.JOB_TASKS, 10.0)
+        with self._scheduler(None):
+            Daemon.schedule_tasks()
+        self.assertNotIn(Daemon.JOB_TASKS, Daemon._deadlines)
+
+    @patch('utils.daemon.time.time', return_value=1000.0)
+    def test_still_due_task_is_retried_later(self, mock_time):
+        """A task still due right after running is retried CHECK_INTERVAL later."""
+        due = MagicMock()
+        due.timestamp.return_value = 1000.0
+        with self._scheduler(due):
+            Daemon.schedule_tasks(after_run=True)
+        self.assertEqual(Daemon._deadlines[Daemon.JOB_TASKS], 1000.0 + Daemon.CHECK_INTERVAL)
+
+
+class TestDaemonWake(unittest.TestCase):
+    """Tests for interrupting the sleep."""
+
+    def setUp(self):
+        read_fd, write_fd = os.pipe()
+        os.set_blocking(read_fd, False)
+        os.set_blocking(write_fd, False)
+        Daemon._wake_fds = (read_fd, write_fd)
+        Daemon._watcher = None
+
+    def tearDown(self):
+        Daemon._teardown()
+        Daemon._running = True
+
+    def test_wake_interrupts_wait(self):
+        """wake() from another thread ends _wait() early."""
+        import threading
+        import time
+
+        threading.Timer(0.05, Daemon.wake).start()
+        start = time.monotonic()
+        self.assertTrue(Daemon._wait(30))
+        self.assertLess(time.monotonic() - start, 5)
+
+    def test_wait_times_out_without_events(self):
+        """_wait() returns False when nothing happens."""
+        self.assertFalse(Daemon._wait(0.01))
+
+    def test_signal_handler_wakes_loop(self):
+        """The shutdown signal handler also interrupts the sleep."""
+        Daemon.signal_handler(signal.SIGTERM, None)
+        self.assertTrue(Daemon._wait(30))
 
 
 class TestDaemonConstants(unittest.TestCase):
@@ -0,0 +1,42 @@
+"""Tests for utils/dbus_loop.py — the shared D-Bus signal loop."""
+
+import os
+import sys
+import threading
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "loofi-fedora-tweaks"))
+
+from utils import dbus_loop
+
+
+class TestEnsureRunning(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch.object(dbus_loop, "_thread", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_starts_a_single_loop(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        with patch.object(dbus_loop, "GLIB_AVAILABLE", True), \
+                patch.object(dbus_loop, "DBusGMainLoop") as integration, \
+                patch.object(dbus_loop, "GLib") as glib:
+            glib.MainLoop.return_value.run.side_effect = release.wait
+            dbus_loop.ensure_running()
+            dbus_loop.ensure_running()
+
+        integration.assert_called_once_with(set_as_default=True)
+        glib.MainLoop.assert_called_once_with()
+        self.assertTrue(dbus_loop._thread.daemon)
+
+    def test_missing_bindings_raise(self):
+        with patch.object(dbus_loop, "GLIB_AVAILABLE", False):
+            with self.assertRaises(OSError):
+                dbus_loop.ensure_running()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,9 +9,11 @@ stubs are used instead of a real QApplication so tests run headless.
 import importlib
 import os
 import sys
+import threading
 import types
 import unittest
 from enum import Enum
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
 
 # Add source path
@@ -429,6 +431,8 @@ def _install_diagnostics_stubs():
             Unchecked=types.SimpleNamespace(value=0),
         ),
     )
+    qt_core.QTimer = MagicMock()
+    qt_core.pyqtSignal = _DummySignal
 
     # -- PyQt6 package --
     pyqt = types.ModuleType("PyQt6")
@@ -617,13 +621,14 @@ class FakeResult:
 
 class FakeBootStats:
     def __init__(
-        self, total=None, firmware=None, loader=None, kernel=None, userspace=None
+        self, total=None, firmware=None, loader=None, kernel=None, userspace=None, initrd=None
     ):
         self.total_time = total
         self.firmware_time = firmware
         self.loader_time = loader
         self.kernel_time = kernel
         self.userspace_time = userspace
+        self.initrd_time = initrd
 
 
 class FakeSlowService:
@@ -714,7 +719,10 @@ def _make_watchtower(mock_sm, mock_ba, mock_jm, mock_us, mock_usc):
     """Instantiate _WatchtowerSubTab with all managers pre-configured."""
     _setup_watchtower_mocks(mock_sm, mock_us, mock_usc, mock_ba, mock_jm)
     mod = _get_module()
-    return mod._WatchtowerSubTab()
+    tab = mod._WatchtowerSubTab()
+    # Let the listener worker finish while the manager patches are active.
+    tab._services_thread.join(5)
+    return tab
 
 
 def _setup_boot_mocks(mock_km, mock_zm, mock_sb):
@@ -871,6 +879,49 @@ class TestRefreshServices(unittest.TestCase):
         self.assertIn("3", tab.service_log.toPlainText())
 
 
+# ===========================================================================
+# _WatchtowerSubTab — live service updates
+# ===========================================================================
+
+
+@patch(f"{_M}.configure_top_tabs", MagicMock())
+@patch(f"{_M}.JournalManager", new_callable=MagicMock)
+@patch(f"{_M}.BootAnalyzer", new_callable=MagicMock)
+@patch(f"{_M}.UnitScope", new_callable=MagicMock)
+@patch(f"{_M}.UnitState", new_callable=MagicMock)
+@patch(f"{_M}.ServiceManager", new_callable=MagicMock)
+class TestServiceListener(unittest.TestCase):
+    """The unit-change listener is connected off the GUI thread and released."""
+
+    def test_listener_connected_on_worker_thread(self, sm, us, usc, ba, jm):
+        """Connecting the unit caches does not run on the constructing thread."""
+        threads = []
+        sm.add_change_listener.side_effect = lambda cb: threads.append(threading.current_thread())
+        tab = _make_watchtower(sm, ba, jm, us, usc)
+
+        sm.add_change_listener.assert_called_once_with(tab._services_listener)
+        self.assertIsNot(threads[0], threading.current_thread())
+
+    def test_cleanup_removes_listener_once(self, sm, us, usc, ba, jm):
+        """cleanup() unsubscribes the same callback, only once."""
+        tab = _make_watchtower(sm, ba, jm, us, usc)
+        tab.cleanup()
+        tab.cleanup()
+
+        sm.remove_change_listener.assert_called_once_with(tab._services_listener)
+
+    def test_closed_while_connecting_removes_listener(self, sm, us, usc, ba, jm):
+        """A tab destroyed before the worker finished leaves no listener behind."""
+        closed = threading.Event()
+        closed.set()
+        listener = MagicMock()
+
+        _get_module()._watch_services(closed, listener)
+
+        sm.remove_change_listener.assert_called_once_with(listener)
+        listener.assert_not_called()
+
+
 # ===========================================================================
 # _WatchtowerSubTab — _service_action
 # ===========================================================================
@@ -1057,6 +1108,35 @@ class TestBootAnalysis(unittest.TestCase):
         self.assertIn("Disable unneeded", text)
         self.assertIn("readahead", text)
 
+    def test_boot_history_chart(self, sm, us, usc, ba, jm):
+        """Recorded boots are charted with the current one marked."""
+        tab = _make_watchtower(sm, ba, jm, us, usc)
+        ba.get_boot_stats.return_value = FakeBootStats()
+        ba.get_slow_services.return_value = []
+        ba.get_optimization_suggestions.return_value = []
+        ba.get_history.return_value = [
+            SimpleNamespace(boot_id="old", recorded_at=0, stats=FakeBootStats(total=20.0)),
+            SimpleNamespace(boot_id="now", recorded_at=0, stats=FakeBootStats(total=30.0)),
+        ]
+        ba.current_boot_id.return_value = "now"
+        ba.get_regressions.return_value = [
+            SimpleNamespace(name="total_time", kind="phase", baseline_seconds=20.0, current_seconds=30.0),
+        ]
+        tab._refresh_boot_analysis()
+        text = tab.boot_history_label.text()
+        self.assertIn("30.0s (this boot)", text)
+        self.assertIn("total: 20.0s \u2192 30.0s", text)
+
+    def test_no_boot_history(self, sm, us, usc, ba, jm):
+        """Without recorded boots the history says so."""
+        tab = _make_watchtower(sm, ba, jm, us, usc)
+        ba.get_boot_stats.return_value = FakeBootStats()
+        ba.get_slow_services.return_value = []
+        ba.get_optimization_suggestions.return_value = []
+        ba.get_history.return_value = []
+        tab._refresh_boot_analysis()
+        self.assertIn("No boots", tab.boot_history_label.text())
+
 
 # ===========================================================================
 # _WatchtowerSubTab — _refresh_journal
@@ -0,0 +1,152 @@
+"""Tests for utils/dir_sizes.py — native incremental directory size scanner."""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "loofi-fedora-tweaks"))
+
+from utils.dir_sizes import DirSizeCache, DirectorySizeScanner
+
+
+def _write(path, size):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+
+
+def _du(path):
+    """Allocated bytes of *path*'s subtree, every inode once (du -B1 -s)."""
+    seen, total = set(), 0
+    for dirpath, _dirs, files in os.walk(path):
+        for name in [""] + files:
+            st = os.lstat(os.path.join(dirpath, name) if name else dirpath)
+            if (st.st_dev, st.st_ino) not in seen:
+                seen.add((st.st_dev, st.st_ino))
+                total += st.st_blocks * 512
+    return total
+
+
+class _TreeCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, True)
+        self.root = os.path.join(self.tmp, "home")
+        _write(os.path.join(self.root, "big", "a.bin"), 200_000)
+        _write(os.path.join(self.root, "big", "deep", "inner", "b.bin"), 100_000)
+        _write(os.path.join(self.root, "small", "c.txt"), 5_000)
+        _write(os.path.join(self.root, "top.bin"), 50_000)
+        self.cache = DirSizeCache(os.path.join(self.tmp, "cache.json"))
+        self.scanner = DirectorySizeScanner(self.cache, workers=2)
+
+    def scan(self, **kwargs):
+        return dict(self.scanner.scan(self.root, top_n=10, **kwargs))
+
+    def path(self, *parts):
+        return os.path.join(self.root, *parts)
+
+
+class TestScan(_TreeCase):
+    """Sizes and depth semantics match du -B1 --max-depth."""
+
+    def test_reports_depth_one_and_two_like_du(self):
+        sizes = self.scan()
+        self.assertEqual(set(sizes), {self.path("big"), self.path("small"), self.path("big", "deep")})
+        for path, size in sizes.items():
+            self.assertEqual(size, _du(path), path)
+
+    def test_sorted_and_limited(self):
+        result = self.scanner.scan(self.root, max_depth=1, top_n=1)
+        self.assertEqual(result, [(self.path("big"), _du(self.path("big")))])
+
+    def test_hard_links_counted_once_and_symlinks_not_followed(self):
+        os.link(self.path("big", "a.bin"), self.path("small", "a-link.bin"))
+        os.symlink(self.path("big"), self.path("small", "big-link"))
+        sizes = self.scan()
+        link_bytes = os.lstat(self.path("big", "a.bin")).st_blocks * 512
+        # Whichever directory reaches the inode first gets it.
+        self.assertEqual(sizes[self.path("big")] + sizes[self.path("small")],
+                         _du(self.path("big")) + _du(self.path("small")) - link_bytes)
+        self.assertNotIn(self.path("small", "big-link"), sizes)
+
+    def test_missing_root(self):
+        self.assertEqual(self.scanner.scan(os.path.join(self.tmp, "nope")), [])
+
+    def test_progress_streams_partial_top(self):
+        reports = []
+        with patch.object(DirectorySizeScanner, "PROGRESS_INTERVAL", 0), \
+                patch.object(DirectorySizeScanner, "BATCH_SIZE", 1):
+            self.scanner.scan(self.root, progress=reports.append)
+        self.assertTrue(reports)
+        self.assertTrue(all(len(report) <= 5 for report in reports))
+
+
+class TestCache(_TreeCase):
+    """Unchanged directories are served from the persisted cache."""
+
+    def setUp(self):
+        super().setUp()
+        # Freshly created directories are inside the racy window.
+        patcher = patch("utils.json_store.RACY_SECONDS", -60)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_unchanged_tree_is_not_listed_again(self):
+        first = self.scan()
+        with patch("utils.dir_sizes.os.scandir") as scandir:
+            self.assertEqual(self.scan(), first)
+        scandir.assert_not_called()
+
+    def test_only_changed_directories_are_listed(self):
+        self.scan()
+        _write(self.path("small", "new.bin"), 80_000)
+        real_scandir = os.scandir
+        with patch("utils.dir_sizes.os.scandir", side_effect=real_scandir) as scandir:
+            sizes = self.scan()
+        self.assertEqual([c.args[0] for c in scandir.call_args_list], [self.path("small")])
+        self.assertEqual(sizes[self.path("small")], _du(self.path("small")))
+
+    def test_refresh_lists_everything(self):
+        self.scan()
+        real_scandir = os.scandir
+        with patch("utils.dir_sizes.os.scandir", side_effect=real_scandir) as scandir:
+            self.scan(refresh=True)
+        self.assertEqual(scandir.call_count, 5)
+
+    def test_persisted_and_pruned(self):
+        self.scan()
+        shutil.rmtree(self.path("big", "deep"))
+        reopened = DirSizeCache(self.cache.path)
+        DirectorySizeScanner(reopened).scan(self.root)
+        entries = DirSizeCache(self.cache.path).snapshot()
+        self.assertIn(self.path("big"), entries)
+        self.assertFalse([p for p in entries if "deep" in p])
+
+    def test_racy_directories_are_not_stored(self):
+        with patch("utils.json_store.RACY_SECONDS", 3600):
+            self.scan()
+        self.assertEqual(self.cache.snapshot(), {})
+
+
+class TestDiskManager(_TreeCase):
+    """DiskManager.find_large_directories uses the scanner, not du."""
+
+    @patch("services.hardware.disk.subprocess.run")
+    def test_find_large_directories(self, mock_run):
+        from services.hardware.disk import DiskManager
+
+        reports = []
+        with patch.object(DirectorySizeScanner, "PROGRESS_INTERVAL", 0):
+            dirs = DiskManager.find_large_directories(self.root, top_n=2, progress=reports.append)
+        mock_run.assert_not_called()
+        self.assertEqual([d.path for d in dirs], [self.path("big"), self.path("big", "deep")])
+        self.assertEqual(dirs[0].size_bytes, _du(self.path("big")))
+        self.assertTrue(reports)
+
+
+if __name__ == "__main__":
+    unittest.main()
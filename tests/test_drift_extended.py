@@ -508,5 +508,130 @@ class TestHashFunctions(unittest.TestCase):
         self.assertEqual(hash1, hash2)
 
 
+class TestCachedCollection(unittest.TestCase):
+    """Tests for change-token caching and native sysctl reads."""
+
+    def setUp(self):
+        """Point snapshot storage and state sources at a temp directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        root = Path(self.temp_dir)
+        self.patches = [
+            patch.object(DriftDetector, "SNAPSHOTS_DIR", root / "snapshots"),
+            patch.object(DriftDetector, "CURRENT_SNAPSHOT", root / "snapshots" / "current.json"),
+            patch.object(DriftDetector, "DNF_CONF", root / "dnf.conf"),
+            patch.object(DriftDetector, "SYSCTL_ROOT", root / "sys"),
+            patch("utils.json_store.RACY_SECONDS", 0),
+        ]
+        for p in self.patches:
+            p.start()
+        (root / "dnf.conf").write_text("[main]\n")
+        (root / "sys" / "vm").mkdir(parents=True)
+        (root / "sys" / "vm" / "swappiness").write_text("60\n")
+        self.detector = DriftDetector()
+
+    def tearDown(self):
+        """Stop patches and clean up."""
+        for p in self.patches:
+            p.stop()
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_sysctl_values_read_from_proc_sys(self):
+        """_get_sysctl_values reads /proc/sys files and skips missing keys."""
+        with patch("utils.drift.subprocess.run") as mock_run:
+            self.assertEqual(self.detector._get_sysctl_values(), "vm.swappiness=60")
+        mock_run.assert_not_called()
+
+    def test_unchanged_sources_are_not_collected_again(self):
+        """A second capture reuses every source whose token is unchanged."""
+        with patch.object(DriftDetector, "_get_layered_packages", return_value=["vim"]) as packages, \
+                patch.object(DriftDetector, "_packages_token", return_value=("rpmdb", 1)), \
+                patch.object(DriftDetector, "_get_user_services", return_value=[]), \
+                patch.object(DriftDetector, "_user_services_token", return_value=("units", 1)):
+            first = self.detector.capture_snapshot("test")
+            second = self.detector.capture_snapshot("test")
+        self.assertEqual(packages.call_count, 1)
+        self.assertEqual(first.installed_packages_hash, second.installed_packages_hash)
+        self.assertEqual(second.layered_packages, ["vim"])
+
+    def test_changed_token_triggers_collection(self):
+        """Modifying dnf.conf invalidates only the dnf source."""
+        with patch.object(DriftDetector, "_get_layered_packages", return_value=[]), \
+                patch.object(DriftDetector, "_get_user_services", return_value=[]):
+            before = self.detector.capture_snapshot("test")
+            DriftDetector.DNF_CONF.write_text("[main]\nmax_parallel_downloads=10\n")
+            after = self.detector.capture_snapshot("test")
+        self.assertNotEqual(before.dnf_config_hash, after.dnf_config_hash)
+
+    def test_sysctl_is_always_collected(self):
+        """sysctl has no change token and is re-read on every capture."""
+        with patch.object(DriftDetector, "_get_layered_packages", return_value=[]), \
+                patch.object(DriftDetector, "_get_user_services", return_value=[]):
+            before = self.detector.capture_snapshot("test")
+            (DriftDetector.SYSCTL_ROOT / "vm" / "swappiness").write_text("10\n")
+            after = self.detector.capture_snapshot("test")
+        self.assertNotEqual(before.sysctl_hash, after.sysctl_hash)
+
+    def test_missing_token_disables_caching(self):
+        """A source without a usable token is collected every time."""
+        with patch.object(DriftDetector, "_get_layered_packages", return_value=[]) as packages, \
+                patch.object(DriftDetector, "_packages_token", return_value=None), \
+                patch.object(DriftDetector, "_get_user_services", return_value=[]):
+            self.detector.capture_snapshot("test")
+            self.detector.capture_snapshot("test")
+        self.assertEqual(packages.call_count, 2)
+
+    def test_cached_lists_are_copied(self):
+        """Mutating a snapshot list does not corrupt the cache."""
+        with patch.object(DriftDetector, "_get_layered_packages", return_value=["vim"]), \
+                patch.object(DriftDetector, "_packages_token", return_value=("rpmdb", 1)), \
+                patch.object(DriftDetector, "_get_user_services", return_value=[]):
+            self.detector.capture_snapshot("test").layered_packages.append("emacs")
+            self.assertEqual(self.detector.capture_snapshot("test").layered_packages, ["vim"])
+
+    def test_clear_cache_forces_collection(self):
+        """clear_cache() drops cached values."""
+        with patch.object(DriftDetector, "_get_layered_packages", return_value=[]) as packages, \
+                patch.object(DriftDetector, "_packages_token", return_value=("rpmdb", 1)), \
+                patch.object(DriftDetector, "_get_user_services", return_value=[]):
+            self.detector.capture_snapshot("test")
+            self.detector.clear_cache()
+            self.detector.capture_snapshot("test")
+        self.assertEqual(packages.call_count, 2)
+
+    def test_packages_token_follows_ostree_deployments(self):
+        """A new rpm-ostree deployment or staged deployment changes the packages token."""
+        root = Path(self.temp_dir) / "ostree" / "deploy"
+        deploy = root / "fedora" / "deploy"
+        deploy.mkdir(parents=True)
+        staged = Path(self.temp_dir) / "staged-deployment"
+        for path in (deploy, root / "fedora", root):
+            os.utime(path, ns=(1, 1))
+        with patch.object(DriftDetector, "RPMDB_PATHS", ()), \
+                patch.object(DriftDetector, "OSTREE_DEPLOY_ROOT", root), \
+                patch.object(DriftDetector, "OSTREE_STAGED", staged):
+            before = self.detector._packages_token()
+            (deploy / "abc123.0").mkdir()
+            os.utime(deploy, ns=(2, 2))
+            after_deploy = self.detector._packages_token()
+            staged.write_text("{}")
+            os.utime(staged, ns=(3, 3))
+            after_staged = self.detector._packages_token()
+        self.assertIsNotNone(before)
+        self.assertNotEqual(before, after_deploy)
+        self.assertNotEqual(after_deploy, after_staged)
+
+    def test_user_services_token_follows_wants_directory(self):
+        """Adding a symlink to a .wants/ directory changes the services token."""
+        unit_dir = Path(self.temp_dir) / "user"
+        wants = unit_dir / "default.target.wants"
+        wants.mkdir(parents=True)
+        with patch.object(DriftDetector, "USER_UNIT_DIRS", (unit_dir,)):
+            before = self.detector._user_services_token()
+            os.utime(wants, ns=(1, 1))
+            (wants / "foo.service").symlink_to("/dev/null")
+            self.assertNotEqual(before, self.detector._user_services_token())
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,129 @@
+"""Tests for utils/file_watcher.py — inotify watcher with polling fallback."""
+
+import os
+import select
+import shutil
+import struct
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "loofi-fedora-tweaks"))
+
+from utils import file_watcher
+from utils.file_watcher import FileWatcher
+
+
+def _event(wd, mask, name=b""):
+    padded = name + b"\0" * (16 - len(name) % 16) if name else b""
+    return struct.pack("iIII", wd, mask, 0, len(padded)) + padded
+
+
+class _WatcherTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        self.target = self.tmp / "scheduler.json"
+
+
+class TestFileWatcherInotify(_WatcherTestCase):
+    """Kernel-backed change notifications."""
+
+    def setUp(self):
+        super().setUp()
+        self.watcher = FileWatcher()
+        self.addCleanup(self.watcher.close)
+        if not self.watcher.uses_inotify:
+            self.skipTest("inotify not available")
+        self.assertTrue(self.watcher.watch(self.tmp, names={"scheduler.json"}))
+
+    def _wait_readable(self):
+        readable, _, _ = select.select([self.watcher.fileno()], [], [], 5)
+        return bool(readable)
+
+    def test_write_is_reported(self):
+        self.target.write_text("{}")
+        self.assertTrue(self._wait_readable())
+        self.assertEqual(self.watcher.read_changes(), {self.target})
+
+    def test_atomic_replace_is_reported(self):
+        tmp_file = self.tmp / ".scheduler.json.tmp"
+        tmp_file.write_text("{}")
+        os.replace(tmp_file, self.target)
+        self.assertTrue(self._wait_readable())
+        self.assertIn(self.target, self.watcher.read_changes())
+
+    def test_other_files_are_ignored(self):
+        (self.tmp / "other.json").write_text("{}")
+        self.assertEqual(self.watcher.read_changes(), set())
+
+    def test_read_changes_never_blocks(self):
+        self.assertEqual(self.watcher.read_changes(), set())
+
+    def test_unwatch_stops_reporting(self):
+        self.watcher.unwatch(self.tmp)
+        self.assertEqual(self.watcher.watched, set())
+        self.target.write_text("{}")
+        self.assertEqual(self.watcher.read_changes(), set())
+
+
+class TestFileWatcherEventParsing(_WatcherTestCase):
+    """Decoding of raw inotify event buffers."""
+
+    def setUp(self):
+        super().setUp()
+        self.watcher = FileWatcher(use_inotify=False)
+        self.watcher._names[self.tmp] = {"scheduler.json"}
+        self.watcher._wds[1] = self.tmp
+
+    def test_named_event(self):
+        buf = _event(1, file_watcher.IN_CLOSE_WRITE, b"scheduler.json")
+        self.assertEqual(self.watcher._parse_events(buf), {self.target})
+
+    def test_overflow_reports_everything(self):
+        buf = _event(-1, file_watcher.IN_Q_OVERFLOW)
+        self.assertEqual(self.watcher._parse_events(buf), {self.target})
+
+    def test_ignored_removes_watch(self):
+        self.watcher._parse_events(_event(1, file_watcher.IN_IGNORED))
+        self.assertNotIn(1, self.watcher._wds)
+
+    def test_multiple_events_in_one_buffer(self):
+        buf = _event(1, file_watcher.IN_CREATE, b"other") + _event(
+            1, file_watcher.IN_MOVED_TO, b"scheduler.json"
+        )
+        self.assertEqual(self.watcher._parse_events(buf), {self.target})
+
+
+class TestFileWatcherPolling(_WatcherTestCase):
+    """Stat-stamp fallback when inotify is unavailable."""
+
+    def setUp(self):
+        super().setUp()
+        self.watcher = FileWatcher(use_inotify=False)
+        self.watcher.watch(self.tmp, names={"scheduler.json"})
+
+    def test_no_fileno_when_polling(self):
+        self.assertFalse(self.watcher.uses_inotify)
+        self.assertIsNone(self.watcher.fileno())
+
+    def test_create_modify_delete_detected(self):
+        self.target.write_text("{}")
+        self.assertEqual(self.watcher.read_changes(), {self.target})
+        self.assertEqual(self.watcher.read_changes(), set())
+
+        self.target.write_text('{"tasks": []}')
+        self.assertEqual(self.watcher.read_changes(), {self.target})
+
+        self.target.unlink()
+        self.assertEqual(self.watcher.read_changes(), {self.target})
+
+    @patch("utils.file_watcher._load_libc", return_value=None)
+    def test_missing_libc_falls_back(self, _mock_libc):
+        self.assertFalse(FileWatcher().uses_inotify)
+
+
+if __name__ == "__main__":
+    unittest.main()
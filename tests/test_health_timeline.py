@@ -109,6 +109,24 @@ class TestRecordMetric(unittest.TestCase):
         result = self.ht.record_metric("load_avg", 2.5)
         self.assertTrue(result.success)
 
+    def test_record_metrics_batch(self):
+        """Several metrics are recorded together, metadata included."""
+        result = self.ht.record_metrics([
+            ("smart_temperature", 30.0, "C", {"device": "/dev/sda"}),
+            ("smart_temperature", 41.0, "C", {"device": "/dev/nvme0n1"}),
+            ("smart_power_on_hours", 1234.0, "h", None),
+        ])
+        self.assertTrue(result.success)
+
+        metrics = self.ht.get_metrics("smart_temperature", hours=1)
+        self.assertEqual([m["metadata"]["device"] for m in metrics], ["/dev/sda", "/dev/nvme0n1"])
+
+    def test_record_metrics_empty_type(self):
+        """A batch containing an empty metric type is rejected as a whole."""
+        result = self.ht.record_metrics([("cpu_temp", 60.0, "C", None), ("", 1.0, "", None)])
+        self.assertFalse(result.success)
+        self.assertEqual(self.ht.get_metrics("cpu_temp", hours=1), [])
+
 
 # ---------------------------------------------------------------------------
 # TestRecordSnapshot — full system snapshot recording
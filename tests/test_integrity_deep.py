@@ -10,7 +10,8 @@ from unittest.mock import MagicMock, patch
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'loofi-fedora-tweaks'))
 
-from core.plugins.integrity import IntegrityVerifier, VerificationResult
+from core.plugins import integrity
+from core.plugins.integrity import IntegrityVerifier, VerificationResult, VerifiedFileCache
 
 
 class TestVerifyChecksum(unittest.TestCase):
@@ -200,6 +201,97 @@ class TestVerifyDirectoryChecksums(unittest.TestCase):
         self.assertFalse(result.success)
 
 
+def _write_old(path, content):
+    """Write *content* and backdate it past the racy-timestamp window."""
+    path.write_bytes(content)
+    old = path.stat().st_mtime_ns - 60 * 10**9
+    os.utime(path, ns=(old, old))
+
+
+class TestVerifiedFileCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = Path(self.tmp.name)
+        self.cache_path = self.root / "cache" / "integrity.json"
+        patcher = patch.object(integrity, "DEFAULT_CACHE_PATH", self.cache_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        VerifiedFileCache.clear_cache()
+        self.addCleanup(VerifiedFileCache.clear_cache)
+
+    def test_unchanged_files_are_not_reread(self):
+        files = [self.root / f"f{i}.py" for i in range(4)]
+        for i, path in enumerate(files):
+            _write_old(path, b"x" * i)
+        first = IntegrityVerifier.hash_files(files)
+        self.assertEqual(first[files[2]], hashlib.sha256(b"xx").hexdigest())
+
+        VerifiedFileCache.clear_cache()  # a new launch reads the cache from disk
+        with patch.object(integrity, "sha256_file") as mock_hash:
+            second = IntegrityVerifier.hash_files(files)
+        mock_hash.assert_not_called()
+        self.assertEqual(first, second)
+
+    def test_changed_file_is_rehashed(self):
+        path = self.root / "plugin.py"
+        _write_old(path, b"old")
+        IntegrityVerifier.hash_files([path])
+        _write_old(path, b"new!")
+        self.assertEqual(
+            IntegrityVerifier.hash_files([path])[path], hashlib.sha256(b"new!").hexdigest()
+        )
+
+    def test_restored_mtime_does_not_hide_rewrite(self):
+        path = self.root / "plugin.py"
+        _write_old(path, b"aaaa")
+        st = path.stat()
+        IntegrityVerifier.hash_files([path])
+        path.write_bytes(b"bbbb")
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        result = IntegrityVerifier.verify_directory_checksums(
+            self.root, {"plugin.py": hashlib.sha256(b"aaaa").hexdigest()}
+        )
+        self.assertFalse(result.success)
+
+    def test_recently_modified_files_are_not_cached(self):
+        path = self.root / "fresh.py"
+        path.write_bytes(b"fresh")
+        IntegrityVerifier.hash_files([path])
+        self.assertFalse(self.cache_path.exists())
+
+    def test_corrupt_cache_is_ignored(self):
+        self.cache_path.parent.mkdir(parents=True)
+        self.cache_path.write_text("{not json")
+        path = self.root / "a.py"
+        _write_old(path, b"hello")
+        self.assertEqual(
+            IntegrityVerifier.hash_files([path])[path], hashlib.sha256(b"hello").hexdigest()
+        )
+
+    def test_unreadable_file_maps_to_none(self):
+        missing = self.root / "gone.py"
+        self.assertEqual(IntegrityVerifier.hash_files([missing]), {missing: None})
+
+
+class TestParallelHashing(unittest.TestCase):
+    def test_blobs_hashed_in_parallel_match_serial(self):
+        blobs = {f"f{i}": bytes([i]) * 200_000 for i in range(6)}
+        expected = {name: hashlib.sha256(data).hexdigest() for name, data in blobs.items()}
+        self.assertEqual(integrity.sha256_blobs(blobs), expected)
+
+    def test_generate_checksums_uses_worker_pool(self):
+        with tempfile.TemporaryDirectory() as d:
+            for i in range(5):
+                (Path(d) / f"m{i}.py").write_bytes(b"%d" % i)
+            with patch.object(integrity, "ThreadPoolExecutor",
+                              wraps=integrity.ThreadPoolExecutor) as mock_pool:
+                result = IntegrityVerifier.generate_checksums(Path(d))
+            self.assertEqual(result["m3.py"], hashlib.sha256(b"3").hexdigest())
+            if integrity.HASH_WORKERS > 1:
+                mock_pool.assert_called_once()
+
+
 class TestVerifyPublisherMetadata(unittest.TestCase):
     def test_not_verified(self):
         result = IntegrityVerifier.verify_publisher_metadata(
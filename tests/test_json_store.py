@@ -0,0 +1,81 @@
+"""Tests for utils/json_store.py — shared persisted JSON store plumbing."""
+
+import json
+import os
+import stat
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "loofi-fedora-tweaks"))
+
+from utils.json_store import JsonStore, is_racy, write_private_json
+
+
+class _Store(JsonStore):
+    DATA_KEY = "items"
+    LABEL = "test store"
+    path_default = None
+
+    @classmethod
+    def default_path(cls):
+        return cls.path_default
+
+
+class _OtherStore(_Store):
+    pass
+
+
+class TestJsonStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = Path(self.tmp.name) / "cache" / "store.json"
+        _Store.path_default = self.path
+        self.addCleanup(_Store.clear_cache)
+        self.addCleanup(_OtherStore.clear_cache)
+
+    def test_shared_is_per_class_and_path(self):
+        store = _Store.shared()
+        self.assertIs(_Store.shared(self.path), store)
+        self.assertIsNot(_OtherStore.shared(self.path), store)
+        self.assertIsInstance(_OtherStore.shared(self.path), _OtherStore)
+
+    def test_clear_cache_only_forgets_own_class(self):
+        store, other = _Store.shared(), _OtherStore.shared()
+        _Store.clear_cache()
+        self.assertIsNot(_Store.shared(), store)
+        self.assertIs(_OtherStore.shared(), other)
+
+    def test_write_is_private_and_reloaded_by_other_instance(self):
+        writer, reader = _Store(self.path), _Store(self.path)
+        writer._data = {"a": 1}
+        writer._write()
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+        reader._sync()
+        self.assertEqual(reader._data, {"a": 1})
+        self.assertEqual(os.listdir(self.path.parent), ["store.json"])
+
+    def test_other_format_reads_empty(self):
+        self.path.parent.mkdir(parents=True)
+        self.path.write_text(json.dumps({"format": 99, "items": {"a": 1}}))
+        store = _Store(self.path)
+        store._sync()
+        self.assertEqual(store._data, {})
+
+    def test_failed_write_leaves_no_temp_file(self):
+        with patch("utils.json_store.os.replace", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                write_private_json(self.path, {})
+        self.assertEqual(os.listdir(self.path.parent), [])
+
+    def test_is_racy(self):
+        self.assertTrue(is_racy(10 * 10**9, now=10.5))
+        self.assertFalse(is_racy(10 * 10**9, now=20.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
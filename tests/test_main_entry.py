@@ -4,7 +4,7 @@ Tests for main.py — Application entry point.
 Covers:
 - _notify_error (desktop notification fallback)
 - _check_pyqt6 (PyQt6 pre-flight check)
-- main() with --daemon, --cli, --web, and GUI mode
+- main() with --daemon, --cli, --cli-server/--cli-client, --web, and GUI mode
 """
 
 import os
@@ -103,6 +103,43 @@ class TestMainCLI(unittest.TestCase):
         mock_cli.assert_called_once_with(["status"])
 
 
+class TestMainCLIServer(unittest.TestCase):
+    """Tests for main() --cli-server and --cli-client modes."""
+
+    @patch("sys.argv", ["loofi-fedora-tweaks", "--cli-client", "--json", "info"])
+    @patch("cli.main.main")
+    @patch("cli.server.run_client", return_value=0)
+    def test_client_forwards_to_server(self, mock_client, mock_cli):
+        from main import main
+        with self.assertRaises(SystemExit) as cm:
+            main()
+        self.assertEqual(cm.exception.code, 0)
+        mock_client.assert_called_once_with(["--json", "info"])
+        mock_cli.assert_not_called()
+
+    @patch("sys.argv", ["loofi-fedora-tweaks", "--cli-client", "info"])
+    @patch("cli.main.main", return_value=4)
+    @patch("cli.server.run_client", return_value=None)
+    def test_client_falls_back_without_server(self, mock_client, mock_cli):
+        from main import main
+        with self.assertRaises(SystemExit) as cm:
+            main()
+        self.assertEqual(cm.exception.code, 4)
+        mock_cli.assert_called_once_with(["info"])
+
+    @patch("sys.argv", ["loofi-fedora-tweaks", "--cli-server"])
+    @patch("signal.signal")
+    @patch("cli.server.CliServer")
+    def test_server_mode(self, mock_server_cls, mock_signal):
+        mock_server = MagicMock()
+        mock_server.serve_forever.side_effect = KeyboardInterrupt
+        mock_server_cls.return_value = mock_server
+        from main import main
+        main()
+        mock_server.warm_up.assert_called_once()
+        mock_server.serve_forever.assert_called_once()
+
+
 class TestMainWeb(unittest.TestCase):
     """Tests for main() --web mode."""
 
@@ -0,0 +1,234 @@
+"""Tests for utils/metrics_stream.py — shared metrics sampler and event bridge."""
+
+import asyncio
+import os
+import sys
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "loofi-fedora-tweaks"))
+
+from utils.event_bus import Event
+from utils.metrics_stream import (
+    DEFAULT_EVENT_TOPICS,
+    MAX_INTERVAL_SECONDS,
+    METRIC_FIELDS,
+    MIN_INTERVAL_SECONDS,
+    EventStreamBridge,
+    MetricsBroadcaster,
+    StreamSubscriber,
+    clamp_interval,
+    parse_fields,
+    parse_topics,
+)
+
+
+class _CountingSampler:
+    """Blocking sampler stand-in that records every call."""
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, fields):
+        with self._lock:
+            self.calls.append(fields)
+            n = len(self.calls)
+        return {field: {"n": n} for field in fields}
+
+
+class TestParsing(unittest.TestCase):
+    """Tests for query-parameter parsing helpers."""
+
+    def test_fields_default_to_all(self):
+        self.assertEqual(parse_fields(None), frozenset(METRIC_FIELDS))
+        self.assertEqual(parse_fields(" , "), frozenset(METRIC_FIELDS))
+
+    def test_fields_subset(self):
+        self.assertEqual(parse_fields("cpu, memory"), frozenset({"cpu", "memory"}))
+
+    def test_unknown_field_rejected(self):
+        with self.assertRaises(ValueError):
+            parse_fields("cpu,gpu")
+
+    def test_topics_default_and_validation(self):
+        self.assertEqual(parse_topics(""), frozenset(DEFAULT_EVENT_TOPICS))
+        self.assertEqual(parse_topics("agent.a1.success"), frozenset({"agent.a1.success"}))
+        with self.assertRaises(ValueError):
+            parse_topics("bad topic!")
+        with self.assertRaises(ValueError):
+            parse_topics(",".join(f"t{i}" for i in range(100)))
+
+    def test_interval_clamped(self):
+        self.assertEqual(clamp_interval(0.01), MIN_INTERVAL_SECONDS)
+        self.assertEqual(clamp_interval(1e6), MAX_INTERVAL_SECONDS)
+        self.assertEqual(clamp_interval(3), 3.0)
+
+
+class TestStreamSubscriber(unittest.TestCase):
+    """Tests for per-client backpressure."""
+
+    def test_full_queue_drops_oldest(self):
+        async def scenario():
+            subscriber = StreamSubscriber(frozenset({"cpu"}), queue_size=2)
+            for n in range(5):
+                subscriber.offer({"n": n})
+            return subscriber, [await subscriber.get(), await subscriber.get()]
+
+        subscriber, items = asyncio.run(scenario())
+        self.assertEqual(items, [{"n": 3}, {"n": 4}])
+        self.assertEqual(subscriber.dropped, 3)
+
+
+class TestMetricsBroadcaster(unittest.TestCase):
+    """Tests for the single shared sampling loop."""
+
+    def test_many_clients_share_one_sample_per_tick(self):
+        sampler = _CountingSampler()
+        broadcaster = MetricsBroadcaster(sampler=sampler)
+
+        async def scenario():
+            subscribers = [broadcaster.subscribe(["cpu"], interval=0.5) for _ in range(50)]
+            first = [await s.get() for s in subscribers]
+            second = [await s.get() for s in subscribers]
+            for s in subscribers:
+                broadcaster.unsubscribe(s)
+            return first, second
+
+        first, second = asyncio.run(scenario())
+        self.assertEqual(len(sampler.calls), 2)
+        self.assertEqual({m["seq"] for m in first}, {1})
+        self.assertEqual({m["seq"] for m in second}, {2})
+
+    def test_fields_filtered_per_client(self):
+        sampler = _CountingSampler()
+        broadcaster = MetricsBroadcaster(sampler=sampler)
+
+        async def scenario():
+            cpu_only = broadcaster.subscribe(["cpu"], interval=1)
+            both = broadcaster.subscribe(["cpu", "memory"], interval=1)
+            got = await cpu_only.get(), await both.get()
+            broadcaster.unsubscribe(cpu_only)
+            broadcaster.unsubscribe(both)
+            return got
+
+        cpu_msg, both_msg = asyncio.run(scenario())
+        self.assertIn("cpu", cpu_msg)
+        self.assertNotIn("memory", cpu_msg)
+        self.assertIn("memory", both_msg)
+        self.assertEqual(sampler.calls, [frozenset({"cpu", "memory"})])
+
+    def test_late_subscriber_reuses_recent_sample(self):
+        sampler = _CountingSampler()
+        broadcaster = MetricsBroadcaster(sampler=sampler)
+
+        async def scenario():
+            early = broadcaster.subscribe(["cpu"], interval=5)
+            await early.get()
+            late = broadcaster.subscribe(["cpu"], interval=5)
+            message = late.queue.get_nowait()
+            broadcaster.unsubscribe(early)
+            broadcaster.unsubscribe(late)
+            return message
+
+        message = asyncio.run(scenario())
+        self.assertEqual(message["seq"], 1)
+        self.assertEqual(len(sampler.calls), 1)
+
+    def test_slow_client_does_not_block_others(self):
+        sampler = _CountingSampler()
+        broadcaster = MetricsBroadcaster(sampler=sampler, queue_size=1)
+
+        async def scenario():
+            slow = broadcaster.subscribe(["cpu"], interval=0.5)
+            fast = broadcaster.subscribe(["cpu"], interval=0.5)
+            seqs = [(await fast.get())["seq"] for _ in range(3)]
+            broadcaster.unsubscribe(slow)
+            broadcaster.unsubscribe(fast)
+            return slow, seqs
+
+        slow, seqs = asyncio.run(scenario())
+        self.assertEqual(seqs, [1, 2, 3])
+        self.assertGreaterEqual(slow.dropped, 2)
+        self.assertEqual(slow.queue.qsize(), 1)
+
+    def test_loop_stops_without_subscribers(self):
+        broadcaster = MetricsBroadcaster(sampler=_CountingSampler())
+
+        async def scenario():
+            subscriber = broadcaster.subscribe(["cpu"], interval=60)
+            await subscriber.get()
+            task = broadcaster._task
+            broadcaster.unsubscribe(subscriber)
+            await asyncio.wait_for(task, timeout=2)
+            return task
+
+        task = asyncio.run(scenario())
+        self.assertTrue(task.done())
+        self.assertIsNone(broadcaster._task)
+        self.assertEqual(broadcaster.subscriber_count, 0)
+
+    def test_sampler_failure_is_not_fatal(self):
+        sampler = MagicMock(side_effect=[OSError("proc gone"), {"cpu": {"percent": 5.0}}])
+        broadcaster = MetricsBroadcaster(sampler=sampler)
+
+        async def scenario():
+            subscriber = broadcaster.subscribe(["cpu"], interval=0.5)
+            message = await asyncio.wait_for(subscriber.get(), timeout=5)
+            broadcaster.unsubscribe(subscriber)
+            return message
+
+        self.assertEqual(asyncio.run(scenario())["cpu"], {"percent": 5.0})
+        self.assertEqual(broadcaster.samples, 1)
+
+    @patch("utils.monitor.SystemMonitor.get_cpu_info", return_value=None)
+    def test_default_sampler_serializes_samples(self, _mock_cpu):
+        broadcaster = MetricsBroadcaster()
+        snapshot = broadcaster._default_sampler(frozenset({"memory", "load"}))
+        self.assertIsNone(snapshot["load"])
+        self.assertIn("percent", snapshot["memory"])
+
+
+class TestEventStreamBridge(unittest.TestCase):
+    """Tests for mirroring EventBus topics onto client streams."""
+
+    def test_one_bus_subscription_per_topic(self):
+        bus = MagicMock()
+        bridge = EventStreamBridge(bus=bus)
+
+        async def scenario():
+            first = bridge.subscribe(["system.power.battery"])
+            second = bridge.subscribe(["system.power.battery", "system.storage.low"])
+            self.assertEqual(bus.subscribe.call_count, 2)
+            bridge.unsubscribe(first)
+            bus.unsubscribe.assert_not_called()
+            bridge.unsubscribe(second)
+
+        asyncio.run(scenario())
+        self.assertEqual(bus.unsubscribe.call_count, 2)
+        self.assertEqual(bridge.topics, frozenset())
+
+    def test_events_delivered_from_bus_threads(self):
+        bus = MagicMock()
+        bridge = EventStreamBridge(bus=bus)
+
+        async def scenario():
+            subscriber = bridge.subscribe(["system.power.battery"])
+            other = bridge.subscribe(["system.storage.low"])
+            event = Event(topic="system.power.battery", data={"level": 12}, source="pulse")
+            worker = threading.Thread(target=bridge._on_event, args=(event,))
+            worker.start()
+            worker.join()
+            message = await asyncio.wait_for(subscriber.get(), timeout=2)
+            return message, other.queue.qsize()
+
+        message, other_pending = asyncio.run(scenario())
+        self.assertEqual(message["topic"], "system.power.battery")
+        self.assertEqual(message["data"], {"level": 12})
+        self.assertEqual(message["source"], "pulse")
+        self.assertEqual(other_pending, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
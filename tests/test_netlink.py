@@ -0,0 +1,142 @@
+"""Tests for utils/netlink.py — rtnetlink link/address cache and sock_diag."""
+
+import os
+import socket
+import sys
+import threading
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "loofi-fedora-tweaks"))
+
+from utils import netlink
+from utils.netlink import LinkAddressCache
+
+
+def _attr(attr_type, payload):
+    length = netlink.RTATTR.size + len(payload)
+    pad = b"\0" * (netlink._align(length) - length)
+    return netlink.RTATTR.pack(length, attr_type) + payload + pad
+
+
+def _message(msg_type, body):
+    return netlink.NLMSGHDR.pack(netlink.NLMSGHDR.size + len(body), msg_type, 0, 0, 0) + body
+
+
+def _link(index, name, operstate, msg_type=netlink.RTM_NEWLINK):
+    body = netlink.IFINFOMSG.pack(0, 1, index, 0, 0)
+    body += _attr(netlink.IFLA_IFNAME, name.encode() + b"\0")
+    body += _attr(netlink.IFLA_OPERSTATE, bytes([operstate]))
+    return _message(msg_type, body)
+
+
+def _addr(index, address, msg_type=netlink.RTM_NEWADDR):
+    body = netlink.IFADDRMSG.pack(socket.AF_INET, 24, 0, 0, index)
+    body += _attr(netlink.IFA_LOCAL, socket.inet_aton(address))
+    return _message(msg_type, body)
+
+
+class _FakeCache(LinkAddressCache):
+    """Cache whose state is driven by hand-built messages, not a socket."""
+
+    def __init__(self):
+        self._links = {}
+        self._by_name = {}
+        self._lock = threading.Lock()
+
+    def feed(self, buf):
+        for msg_type, _flags, body in netlink.iter_messages(buf):
+            self._apply(self._links, msg_type, body)
+        self._by_name = {link.name: idx for idx, link in self._links.items()}
+
+
+class TestMessageParsing(unittest.TestCase):
+    """Decoding of rtnetlink messages."""
+
+    def test_iter_messages_splits_buffer(self):
+        buf = _link(2, "eth0", 6) + _addr(2, "10.0.0.5")
+        types = [msg_type for msg_type, _flags, _body in netlink.iter_messages(buf)]
+        self.assertEqual(types, [netlink.RTM_NEWLINK, netlink.RTM_NEWADDR])
+
+    def test_truncated_message_is_ignored(self):
+        buf = _link(2, "eth0", 6)
+        self.assertEqual(list(netlink.iter_messages(buf[:-4])), [])
+
+    def test_parse_attrs(self):
+        attrs = netlink.parse_attrs(_attr(3, b"wlan0\0") + _attr(16, b"\x06"))
+        self.assertEqual(attrs, {3: b"wlan0\0", 16: b"\x06"})
+
+
+class TestLinkAddressCacheUpdates(unittest.TestCase):
+    """Applying link/address notifications."""
+
+    def setUp(self):
+        self.cache = _FakeCache()
+        self.cache.feed(_link(2, "eth0", netlink.IF_OPER_UP) + _addr(2, "192.168.1.5"))
+
+    def test_initial_state(self):
+        self.assertEqual(self.cache.get("eth0"), (True, "192.168.1.5"))
+        self.assertIsNone(self.cache.get("wlan0"))
+
+    def test_link_down_and_rename(self):
+        self.cache.feed(_link(2, "lan0", 2))
+        self.assertIsNone(self.cache.get("eth0"))
+        self.assertEqual(self.cache.get("lan0"), (False, "192.168.1.5"))
+
+    def test_primary_address_follows_add_and_delete(self):
+        self.cache.feed(_addr(2, "192.168.1.6"))
+        self.assertEqual(self.cache.get("eth0")[1], "192.168.1.5")
+        self.cache.feed(_addr(2, "192.168.1.5", netlink.RTM_DELADDR))
+        self.assertEqual(self.cache.get("eth0")[1], "192.168.1.6")
+
+    def test_deleted_link_disappears(self):
+        self.cache.feed(_link(2, "eth0", 2, netlink.RTM_DELLINK))
+        self.assertEqual(self.cache.snapshot(), {})
+
+
+class TestLinkAddressCacheLive(unittest.TestCase):
+    """Against the running kernel."""
+
+    def setUp(self):
+        try:
+            self.cache = LinkAddressCache()
+        except OSError as e:
+            self.skipTest(f"rtnetlink unavailable: {e}")
+        self.addCleanup(self.cache.close)
+
+    def test_loopback_address_is_dumped(self):
+        state = self.cache.get("lo")
+        self.assertIsNotNone(state)
+        self.assertEqual(state[1], "127.0.0.1")
+
+    def test_idle_refresh_reports_no_change(self):
+        self.cache.refresh()
+        self.assertFalse(self.cache.refresh())
+
+    @patch("utils.netlink.open_socket", side_effect=OSError(97, "unsupported"))
+    def test_unavailable_netlink_raises(self, _mock_open):
+        with self.assertRaises(OSError):
+            LinkAddressCache()
+
+
+class TestInetDiagDump(unittest.TestCase):
+    """sock_diag socket listing against the running kernel."""
+
+    def test_lists_bound_udp_socket(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.addCleanup(sock.close)
+        sock.bind(("127.0.0.1", 0))
+        try:
+            rows = netlink.inet_diag_dump(socket.AF_INET, socket.IPPROTO_UDP)
+        except OSError as e:
+            self.skipTest(f"sock_diag unavailable: {e}")
+        inode = os.fstat(sock.fileno()).st_ino
+        match = [row for row in rows if row[5] == inode]
+        self.assertEqual(len(match), 1)
+        _state, src, sport, _dst, dport, _inode = match[0]
+        self.assertEqual(socket.inet_ntoa(src[:4]), "127.0.0.1")
+        self.assertEqual((sport, dport), (sock.getsockname()[1], 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
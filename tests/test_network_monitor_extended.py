@@ -15,6 +15,11 @@ class TestNetworkMonitorExtended(unittest.TestCase):
 
     def setUp(self):
         NetworkMonitor._previous_readings = {}
+        NetworkMonitor.clear_socket_cache()
+        # Socket tables come from the mocked /proc parser, not sock_diag.
+        diag = patch.object(NetworkMonitor, "_diag_socket_table", return_value=None)
+        diag.start()
+        self.addCleanup(diag.stop)
 
     # ------------------------------------------------------------------ #
     #  InterfaceStats dataclass
@@ -131,6 +136,7 @@ class TestNetworkMonitorExtended(unittest.TestCase):
     #  get_all_interfaces
     # ------------------------------------------------------------------ #
 
+    @patch.object(NetworkMonitor, "_address_cache", return_value=None)
     @patch("utils.network_monitor.time.monotonic")
     @patch.object(NetworkMonitor, "get_interface_ip", return_value="192.168.1.2")
     @patch.object(NetworkMonitor, "_is_interface_up", return_value=True)
@@ -143,6 +149,7 @@ class TestNetworkMonitorExtended(unittest.TestCase):
         mock_up,
         mock_ip,
         mock_mono,
+        mock_cache,
     ):
         """Second call computes positive send/receive rates from previous counters."""
         mock_mono.side_effect = [100.0, 101.0]
@@ -178,6 +185,7 @@ class TestNetworkMonitorExtended(unittest.TestCase):
         result = NetworkMonitor.get_all_interfaces()
         self.assertEqual(result, [])
 
+    @patch.object(NetworkMonitor, "_address_cache", return_value=None)
     @patch("utils.network_monitor.time.monotonic", return_value=1000.0)
     @patch.object(NetworkMonitor, "_is_interface_up", return_value=False)
     @patch.object(NetworkMonitor, "_classify_interface", return_value="ethernet")
@@ -188,6 +196,7 @@ class TestNetworkMonitorExtended(unittest.TestCase):
         mock_class,
         mock_up,
         mock_mono,
+        mock_cache,
     ):
         """Interface that is down gets empty IP address without calling get_interface_ip."""
         mock_read.return_value = {
@@ -207,6 +216,29 @@ class TestNetworkMonitorExtended(unittest.TestCase):
         self.assertFalse(result[0].is_up)
         self.assertEqual(result[0].ip_address, "")
 
+    @patch("utils.network_monitor.subprocess.run")
+    @patch.object(NetworkMonitor, "_is_interface_up")
+    @patch.object(NetworkMonitor, "_classify_interface", return_value="other")
+    @patch.object(NetworkMonitor, "_read_proc_net_dev")
+    def test_get_all_interfaces_uses_link_cache(self, mock_read, mock_class, mock_up, mock_run):
+        """With the netlink cache, no per-interface sysfs reads or ip processes happen."""
+        counters = {"bytes_recv": 1, "packets_recv": 1, "bytes_sent": 1, "packets_sent": 1}
+        mock_read.return_value = {f"veth{i}": dict(counters) for i in range(20)}
+        cache = MagicMock()
+        cache.snapshot.return_value = {f"veth{i}": (i % 2 == 0, f"10.0.0.{i}") for i in range(20)}
+        NetworkMonitor._type_cache = {}
+
+        with patch.object(NetworkMonitor, "_address_cache", return_value=cache):
+            first = NetworkMonitor.get_all_interfaces()
+            NetworkMonitor.get_all_interfaces()
+
+        mock_run.assert_not_called()
+        mock_up.assert_not_called()
+        self.assertEqual(mock_class.call_count, 20)  # classified once per interface
+        self.assertEqual(cache.refresh.call_count, 2)
+        self.assertEqual((first[2].is_up, first[2].ip_address), (True, "10.0.0.2"))
+        self.assertEqual((first[3].is_up, first[3].ip_address), (False, ""))
+
     # ------------------------------------------------------------------ #
     #  get_active_connections
     # ------------------------------------------------------------------ #
@@ -764,5 +796,192 @@ class TestNetworkMonitorExtended(unittest.TestCase):
         self.assertEqual(NetworkMonitor._get_process_name(1), "")
 
 
+class TestConnectionSnapshot(unittest.TestCase):
+    """Connection listings share one snapshot per SNAPSHOT_TTL."""
+
+    CONNECTIONS = [
+        ConnectionInfo("tcp", "0.0.0.0", 22, "0.0.0.0", 0, "LISTEN", 1, "sshd"),
+        ConnectionInfo("tcp", "10.0.0.1", 22, "10.0.0.2", 5000, "ESTABLISHED", 1, "sshd"),
+        ConnectionInfo("udp", "0.0.0.0", 53, "0.0.0.0", 0, "CLOSE", 2, "dnsmasq"),
+        ConnectionInfo("udp", "10.0.0.1", 4000, "10.0.0.9", 53, "ESTABLISHED", 3, "curl"),
+    ]
+
+    def setUp(self):
+        NetworkMonitor.clear_socket_cache()
+        self.addCleanup(NetworkMonitor.clear_socket_cache)
+
+    @patch.object(NetworkMonitor, "_scan_connections")
+    def test_callers_share_snapshot(self, mock_scan):
+        """Listings within SNAPSHOT_TTL scan the socket tables once."""
+        mock_scan.return_value = list(self.CONNECTIONS)
+        self.assertEqual(len(NetworkMonitor.get_active_connections()), 4)
+        NetworkMonitor.get_listening_sockets()
+        NetworkMonitor.get_active_connections().clear()
+        self.assertEqual(len(NetworkMonitor.get_active_connections()), 4)
+        self.assertEqual(mock_scan.call_count, 1)
+
+    @patch.object(NetworkMonitor, "_scan_connections", return_value=[])
+    def test_expired_snapshot_is_rescanned(self, mock_scan):
+        """A snapshot older than SNAPSHOT_TTL is replaced."""
+        NetworkMonitor.get_active_connections()
+        stamp, connections = NetworkMonitor._snapshot
+        NetworkMonitor._snapshot = (stamp - NetworkMonitor.SNAPSHOT_TTL, connections)
+        NetworkMonitor.get_active_connections()
+        self.assertEqual(mock_scan.call_count, 2)
+
+    @patch.object(NetworkMonitor, "_scan_connections")
+    def test_listening_sockets(self, mock_scan):
+        """Listening means TCP LISTEN or unconnected UDP."""
+        mock_scan.return_value = list(self.CONNECTIONS)
+        listening = NetworkMonitor.get_listening_sockets()
+        self.assertEqual([(c.protocol, c.local_port) for c in listening], [("tcp", 22), ("udp", 53)])
+
+
+class TestIncrementalInodeMap(unittest.TestCase):
+    """The socket inode -> process map only re-reads changed processes."""
+
+    def setUp(self):
+        NetworkMonitor.clear_socket_cache()
+        self.addCleanup(NetworkMonitor.clear_socket_cache)
+        # pid -> {fd: link target}
+        self.procs = {
+            100: {"0": "/dev/null", "3": "socket:[11]"},
+            200: {"3": "socket:[21]", "4": "socket:[22]"},
+        }
+        self.readlinks = []
+        for target, fake in (
+            ("listdir", self._listdir),
+            ("readlink", self._readlink),
+            ("stat", self._stat),
+        ):
+            patcher = patch(f"utils.network_monitor.os.{target}", side_effect=fake)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = patch.object(
+            NetworkMonitor, "_get_process_name", side_effect=lambda pid: f"p{pid}"
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _listdir(self, path):
+        if path == "/proc":
+            return [str(pid) for pid in self.procs] + ["self"]
+        return list(self.procs[int(path.split("/")[2])])
+
+    def _readlink(self, path):
+        parts = path.split("/")
+        self.readlinks.append(int(parts[2]))
+        return self.procs[int(parts[2])][parts[4]]
+
+    def _stat(self, path):
+        return MagicMock(st_size=len(self.procs[int(path.split("/")[2])]))
+
+    def test_unchanged_processes_are_not_reread(self):
+        """A second call with no fd changes reads no links."""
+        first = NetworkMonitor._build_inode_pid_map({"11", "21"})
+        self.assertEqual(first["22"], (200, "p200"))
+        self.readlinks.clear()
+        self.assertEqual(NetworkMonitor._build_inode_pid_map({"11", "21"}), first)
+        self.assertEqual(self.readlinks, [])
+
+    def test_new_and_changed_processes_are_read(self):
+        """New pids and pids whose fd count changed are revisited."""
+        NetworkMonitor._build_inode_pid_map()
+        self.readlinks.clear()
+        self.procs[100]["5"] = "socket:[12]"
+        self.procs[300] = {"3": "socket:[31]"}
+        mapping = NetworkMonitor._build_inode_pid_map({"12", "31"})
+        self.assertEqual(mapping["12"], (100, "p100"))
+        self.assertEqual(mapping["31"], (300, "p300"))
+        self.assertNotIn(200, self.readlinks)
+
+    def test_exited_process_is_evicted(self):
+        """Sockets of a pid that disappeared from /proc are dropped."""
+        NetworkMonitor._build_inode_pid_map()
+        del self.procs[200]
+        mapping = NetworkMonitor._build_inode_pid_map()
+        self.assertNotIn("21", mapping)
+        self.assertIn("11", mapping)
+
+    def test_swapped_socket_triggers_rescan(self):
+        """An unknown wanted inode with unchanged fd counts forces a rescan."""
+        NetworkMonitor._build_inode_pid_map({"11"})
+        self.procs[100]["3"] = "socket:[13]"
+        mapping = NetworkMonitor._build_inode_pid_map({"13"})
+        self.assertEqual(mapping["13"], (100, "p100"))
+        self.assertNotIn("11", mapping)
+
+    def test_known_unowned_inode_does_not_rescan(self):
+        """Inodes no readable process owns only trigger one rescan."""
+        NetworkMonitor._build_inode_pid_map({"99"})
+        NetworkMonitor._build_inode_pid_map({"99"})
+        self.readlinks.clear()
+        NetworkMonitor._build_inode_pid_map({"99"})
+        self.assertEqual(self.readlinks, [])
+
+    def test_full_scan_interval(self):
+        """Every process is re-read once FULL_SCAN_INTERVAL has elapsed."""
+        NetworkMonitor._build_inode_pid_map()
+        NetworkMonitor._last_full_scan -= NetworkMonitor.FULL_SCAN_INTERVAL
+        self.readlinks.clear()
+        NetworkMonitor._build_inode_pid_map()
+        self.assertEqual(sorted(set(self.readlinks)), [100, 200])
+
+
+class TestSockDiagTables(unittest.TestCase):
+    """Socket tables read through sock_diag."""
+
+    def setUp(self):
+        NetworkMonitor.clear_socket_cache()
+        self.addCleanup(NetworkMonitor.clear_socket_cache)
+
+    @patch("utils.network_monitor.inet_diag_dump")
+    def test_entries_match_proc_format(self, mock_dump):
+        """sock_diag rows are converted to the /proc parser's dict shape."""
+        mapped = b"\x00" * 10 + b"\xff\xff" + bytes([10, 0, 0, 1])
+        mock_dump.return_value = [
+            (10, bytes(16), 22, bytes(16), 0, 501),
+            (12, mapped, 443, bytes.fromhex("20010db8" + "00" * 11 + "01"), 50000, 0),
+        ]
+        rows = NetworkMonitor._diag_socket_table("tcp6", True)
+        self.assertEqual(rows[0], {
+            "local_addr": "::", "local_port": 22, "remote_addr": "::",
+            "remote_port": 0, "state": "0A", "inode": "501",
+        })
+        self.assertEqual(rows[1]["local_addr"], "10.0.0.1")
+        self.assertEqual(rows[1]["remote_addr"], "2001:db8::1")
+        self.assertEqual(rows[1]["state"], "03")
+
+    @patch.object(NetworkMonitor, "_parse_proc_net_socket", return_value=[])
+    @patch("utils.network_monitor.inet_diag_dump", side_effect=OSError(2, "No such file"))
+    def test_unavailable_diag_falls_back_to_proc(self, mock_dump, mock_parse):
+        """A failing sock_diag protocol is read from /proc and not retried."""
+        NetworkMonitor._read_socket_table("udp", "/proc/net/udp", False)
+        NetworkMonitor._read_socket_table("udp", "/proc/net/udp", False)
+        self.assertEqual(mock_dump.call_count, 1)
+        self.assertEqual(mock_parse.call_count, 2)
+        mock_parse.assert_called_with("/proc/net/udp", False)
+
+    def test_live_tables_match_proc(self):
+        """On this kernel, sock_diag and /proc list the same sockets."""
+        import socket
+
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.addCleanup(listener.close)
+        listener.bind(("127.0.0.1", 0))
+        listener.listen()
+        rows = NetworkMonitor._diag_socket_table("tcp", False)
+        if rows is None:
+            self.skipTest("sock_diag unavailable")
+        port = listener.getsockname()[1]
+        diag = [r for r in rows if r["local_port"] == port]
+        proc = [
+            r for r in NetworkMonitor._parse_proc_net_socket("/proc/net/tcp", False)
+            if r["local_port"] == port
+        ]
+        self.assertEqual(diag, proc)
+        self.assertEqual(diag[0]["inode"], str(os.fstat(listener.fileno()).st_ino))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,8 +1,11 @@
 """Tests for utils.plugin_cdn_client — PluginCdnClient CDN index retrieval."""
 
 import os
+import shutil
 import sys
+import tempfile
 import unittest
+from pathlib import Path
 from unittest.mock import MagicMock
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "loofi-fedora-tweaks"))
@@ -11,6 +14,8 @@ from utils.plugin_cdn_client import (
     DEFAULT_CDN_BASE_URL,
     DEFAULT_CACHE_TTL_SECONDS,
     CdnFetchConfig,
+    IndexCacheEntry,
+    IndexDiskCache,
     PluginCdnClient,
 )
 
@@ -280,5 +285,69 @@ class TestFetchIndex(unittest.TestCase):
         self.assertEqual(client._cached_index, unsigned)
 
 
+# ---------------------------------------------------------------------------
+# IndexDiskCache
+# ---------------------------------------------------------------------------
+
+
+class TestIndexDiskCache(unittest.TestCase):
+    """Tests for the persistent parsed-index cache."""
+
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        self.cache = IndexDiskCache(self.tmpdir / "cache")
+
+    def _entry(self, **kwargs) -> IndexCacheEntry:
+        return IndexCacheEntry(fields=["id", "version"], rows=[["a", "1.0"]], **kwargs)
+
+    def test_round_trip(self):
+        entry = self._entry(url="https://cdn/x.json", etag='"v1"', fetched_at=100.0)
+        self.assertTrue(self.cache.store("k", entry))
+        loaded = self.cache.load("k")
+        self.assertEqual(loaded, entry)
+        self.assertEqual(list(self.cache.directory.iterdir()), [self.cache.path_for("k")])
+
+    def test_missing_and_corrupt_files(self):
+        self.assertIsNone(self.cache.load("k"))
+        self.cache.directory.mkdir(parents=True)
+        self.cache.path_for("k").write_text("{not json")
+        self.assertIsNone(self.cache.load("k"))
+
+    def test_other_format_ignored(self):
+        self.cache.store("k", self._entry())
+        path = self.cache.path_for("k")
+        path.write_text(path.read_text().replace('"format":1', '"format":0'))
+        self.assertIsNone(self.cache.load("k"))
+
+    def test_unwritable_directory(self):
+        blocker = self.tmpdir / "file"
+        blocker.write_text("")
+        self.assertFalse(IndexDiskCache(blocker / "cache").store("k", self._entry()))
+
+    def test_freshness_and_validators(self):
+        entry = self._entry(etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT",
+                            fetched_at=1000.0)
+        self.assertTrue(entry.is_fresh(60, now=1059))
+        self.assertFalse(entry.is_fresh(60, now=1060))
+        self.assertFalse(entry.is_fresh(60, now=999))
+        self.assertEqual(entry.validators, {
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+        })
+        self.assertEqual(self._entry().validators, {})
+
+    def test_client_cache_key_and_disable(self):
+        client = PluginCdnClient(CdnFetchConfig(cache_dir=str(self.tmpdir)))
+        self.assertEqual(client.disk_cache.directory, self.tmpdir)
+        self.assertNotEqual(client.cache_key("o", "r", "main"), client.cache_key("o", "r", "dev"))
+        self.assertIsNone(PluginCdnClient(CdnFetchConfig(disk_cache=False)).disk_cache)
+
+    def test_fetch_records_source_url(self):
+        client = PluginCdnClient()
+        client.fetch_index("owner", "repo", "main", MagicMock(return_value=_valid_signed_index()))
+        self.assertEqual(client.source_url, client._candidate_urls("owner", "repo", "main")[0])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,13 +1,16 @@
 """Tests for PluginLoader hot-reload flow and rollback behavior."""
 import os
+import shutil
 import sys
+import tempfile
 from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "loofi-fedora-tweaks"))
 
-from core.plugins.loader import PluginLoader, HotReloadRequest
+from core.plugins.loader import PluginLoader, HotReloadRequest, HotReloadResult
+from core.plugins.watcher import PluginWatcher
 from core.plugins.registry import PluginRegistry
 from core.plugins.metadata import PluginMetadata
 
@@ -199,3 +202,127 @@ class TestPluginHotReload:
         result = loader.request_reload(HotReloadRequest(plugin_id=" "))
         assert result.reloaded is False
         assert result.message == "Plugin ID is required"
+
+
+class _FakeLoader:
+    """Loader double exposing the two calls PluginWatcher relies on."""
+
+    def __init__(self, plugin_dirs):
+        self.plugin_dirs = dict(plugin_dirs)
+        self.requests = []
+
+    def external_plugin_dirs(self):
+        return dict(self.plugin_dirs)
+
+    def request_reload(self, request):
+        self.requests.append(request)
+        return HotReloadResult(plugin_id=request.plugin_id, reloaded=True, message="ok")
+
+
+class TestPluginWatcher:
+    """Filesystem-watch driven, debounced hot reload."""
+
+    use_inotify = False
+
+    def setup_method(self):
+        self.root = Path(tempfile.mkdtemp())
+        for name in ("alpha", "beta"):
+            plugin_dir = self.root / name
+            (plugin_dir / "lib").mkdir(parents=True)
+            (plugin_dir / "plugin.py").write_text("x = 1\n")
+        self.loader = _FakeLoader({"alpha": self.root / "alpha", "beta": self.root / "beta"})
+        self.watcher = PluginWatcher(self.loader, debounce=0.5, max_delay=2.0,
+                                     use_inotify=self.use_inotify)
+
+    def teardown_method(self):
+        self.watcher.close()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _touch(self, rel, text="y = 2\n"):
+        path = self.root / rel
+        path.write_text(text)
+        os.utime(path, ns=(path.stat().st_mtime_ns + 10**9,) * 2)
+
+    def test_only_changed_plugin_is_reloaded_after_debounce(self):
+        """Edits are held for the debounce window, then reload one plugin."""
+        self._touch("alpha/plugin.py")
+        assert self.watcher.poll(now=100.0) == []
+        assert self.watcher.next_deadline() == 100.5
+
+        results = self.watcher.poll(now=100.6)
+        assert [r.plugin_id for r in results] == ["alpha"]
+        assert self.loader.requests == [
+            HotReloadRequest(plugin_id="alpha", changed_files=("plugin.py",), reason="filesystem")
+        ]
+        assert self.watcher.next_deadline() is None
+
+    def test_burst_is_coalesced_into_one_request(self):
+        """Several writes within the window produce a single reload."""
+        self._touch("alpha/plugin.py")
+        self.watcher.poll(now=10.0)
+        self._touch("alpha/lib/util.py")
+        self.watcher.poll(now=10.4)
+        assert self.loader.requests == []
+
+        self.watcher.poll(now=11.0)
+        assert len(self.loader.requests) == 1
+        assert self.loader.requests[0].changed_files == ("lib/util.py", "plugin.py")
+
+    def test_continuous_writes_are_bounded_by_max_delay(self):
+        """A never-ending burst still reloads once max_delay has passed."""
+        for step in range(5):
+            self._touch("beta/plugin.py", text=f"v = {step}\n")
+            self.watcher.poll(now=20.0 + step * 0.4)
+        self._touch("beta/plugin.py", text="v = 99\n")
+        self.watcher.poll(now=22.0)
+        assert [r.plugin_id for r in self.loader.requests] == ["beta"]
+
+    def test_bytecode_writes_are_ignored(self):
+        """__pycache__ written by the reload itself never triggers another."""
+        (self.root / "alpha" / "__pycache__").mkdir()
+        (self.root / "alpha" / "__pycache__" / "plugin.cpython-312.pyc").write_bytes(b"\0")
+        self.watcher.poll(now=1.0)
+        self.watcher.poll(now=5.0)
+        assert self.loader.requests == []
+
+    def test_unloaded_plugin_is_no_longer_watched(self):
+        """Watches follow the loader's set of external plugins."""
+        del self.loader.plugin_dirs["alpha"]
+        self.watcher.refresh()
+        self._touch("alpha/plugin.py")
+        self.watcher.poll(now=1.0)
+        self.watcher.poll(now=5.0)
+        assert self.loader.requests == []
+
+    def test_replaced_plugin_directory_is_rewatched(self):
+        """An update that swaps the directory keeps hot reload working."""
+        staged = self.root / ".staged"
+        shutil.copytree(self.root / "alpha", staged)
+        shutil.rmtree(self.root / "alpha")
+        os.replace(staged, self.root / "alpha")
+        self.watcher.poll(now=1.0)
+        self.watcher.poll(now=5.0)
+        assert [r.plugin_id for r in self.loader.requests] == ["alpha"]
+
+        self._touch("alpha/lib/new.py")
+        self.watcher.poll(now=10.0)
+        self.watcher.poll(now=15.0)
+        assert self.loader.requests[-1].changed_files == ("lib/new.py",)
+
+
+class TestPluginWatcherInotify(TestPluginWatcher):
+    """Same behaviour with kernel notifications."""
+
+    use_inotify = True
+
+    def setup_method(self):
+        super().setup_method()
+        if not self.watcher.uses_inotify:
+            import pytest
+            pytest.skip("inotify not available")
+
+    def test_idle_watcher_has_nothing_to_do(self):
+        """Without changes there is no deadline and poll() does no work."""
+        assert self.watcher.fileno() is not None
+        assert self.watcher.timeout(30.0) == 30.0
+        assert self.watcher.poll() == []
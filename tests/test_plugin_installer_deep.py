@@ -390,5 +390,175 @@ class TestUpdateNotInstalled(unittest.TestCase):
         self.assertIn("not installed", result.error.lower())
 
 
+
+def _plugin_archive(directory, plugin_id, version):
+    """Build a .loofi-plugin archive and return (path, sha256)."""
+    import hashlib
+    import tarfile
+
+    src = Path(directory) / f"src-{plugin_id}-{version}"
+    src.mkdir()
+    (src / "plugin.py").write_text(f"VERSION = {version!r}\n")
+    (src / "manifest.json").write_text(json.dumps({
+        "id": plugin_id, "name": plugin_id, "version": version,
+        "description": "d", "author": "a", "entrypoint": "plugin.py",
+    }))
+    archive = Path(directory) / f"{plugin_id}-{version}.loofi-plugin"
+    with tarfile.open(archive, "w:gz") as tar:
+        for name in ("plugin.py", "manifest.json"):
+            tar.add(src / name, arcname=name)
+    return archive, hashlib.sha256(archive.read_bytes()).hexdigest()
+
+
+class TestBatchedUpdates(unittest.TestCase):
+    """check_updates() / update_many(): one index fetch, parallel downloads."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.plugins_dir = Path(self.tmpdir) / "plugins"
+        self.plugins_dir.mkdir()
+        self.archives = {}
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _installer(self):
+        from utils.plugin_installer import PluginInstaller
+
+        with patch("utils.plugin_installer.PluginMarketplace"):
+            return PluginInstaller(self.plugins_dir)
+
+    def _install(self, inst, plugin_id, version):
+        archive, _sha = _plugin_archive(self.tmpdir, plugin_id, f"{version}-installed")
+        target = self.plugins_dir / plugin_id
+        inst._extract_archive(archive, target)
+        manifest = json.loads((target / "manifest.json").read_text())
+        manifest["version"] = version
+        (target / "manifest.json").write_text(json.dumps(manifest))
+        state = inst._load_state()
+        state[plugin_id] = {"version": version, "enabled": True}
+        inst._save_state(state)
+
+    def _meta(self, plugin_id, version, checksum=None):
+        from utils.plugin_marketplace import PluginMetadata
+
+        archive, sha = _plugin_archive(self.tmpdir, plugin_id, version)
+        url = f"https://example.invalid/{plugin_id}-{version}"
+        self.archives[url] = archive
+        return PluginMetadata(
+            id=plugin_id, name=plugin_id, version=version,
+            download_url=url, checksum_sha256=checksum or sha,
+        )
+
+    def _urlopen(self, delay=0.0, stats=None):
+        import io
+        import threading
+        import time
+
+        lock = threading.Lock()
+
+        def urlopen(req, timeout=None):
+            if stats is not None:
+                with lock:
+                    stats["active"] += 1
+                    stats["peak"] = max(stats["peak"], stats["active"])
+            time.sleep(delay)
+            if stats is not None:
+                with lock:
+                    stats["active"] -= 1
+            return io.BytesIO(self.archives[req.full_url].read_bytes())
+
+        return urlopen
+
+    def test_check_updates_fetches_index_once(self):
+        from utils.plugin_marketplace import MarketplaceResult
+
+        inst = self._installer()
+        for plugin_id in ("a", "b", "c"):
+            self._install(inst, plugin_id, "1.0")
+        index = [self._meta("a", "2.0"), self._meta("b", "1.0"), self._meta("zz", "9.9")]
+        inst.marketplace.fetch_index.return_value = MarketplaceResult(success=True, data=index)
+
+        result = inst.check_updates(["a", "b", "c", "not-installed"])
+
+        self.assertTrue(result.success)
+        inst.marketplace.fetch_index.assert_called_once()
+        inst.marketplace.get_plugin_info.assert_not_called()
+        self.assertEqual(
+            [(u["plugin_id"], u["current_version"], u["new_version"]) for u in result.data],
+            [("a", "1.0", "2.0")],
+        )
+
+    def test_check_updates_index_failure(self):
+        from utils.plugin_marketplace import MarketplaceResult
+
+        inst = self._installer()
+        self._install(inst, "a", "1.0")
+        inst.marketplace.fetch_index.return_value = MarketplaceResult(success=False, error="offline")
+        result = inst.check_updates()
+        self.assertFalse(result.success)
+        self.assertEqual(result.error, "offline")
+
+    def test_update_many_downloads_in_parallel(self):
+        inst = self._installer()
+        ids = [f"p{i}" for i in range(6)]
+        for plugin_id in ids:
+            self._install(inst, plugin_id, "1.0")
+        updates = [{"plugin_id": pid, "metadata": self._meta(pid, "2.0")} for pid in ids]
+        stats = {"active": 0, "peak": 0}
+
+        with patch("utils.plugin_installer.urllib.request.urlopen", self._urlopen(0.1, stats)):
+            results = inst.update_many(updates, max_workers=3)
+
+        self.assertTrue(all(r.success for r in results), [r.error for r in results])
+        self.assertEqual(stats["peak"], 3)
+        state = inst._load_state()
+        for plugin_id in ids:
+            self.assertEqual(state[plugin_id]["version"], "2.0")
+            manifest = json.loads((self.plugins_dir / plugin_id / "manifest.json").read_text())
+            self.assertEqual(manifest["version"], "2.0")
+            self.assertTrue((self.plugins_dir / ".backups" / f"{plugin_id}-1.0").is_dir())
+        self.assertEqual(
+            sorted(p.name for p in self.plugins_dir.iterdir()),
+            sorted(ids + [".backups", "state.json"]),
+        )
+
+    def test_bad_checksum_leaves_plugin_untouched(self):
+        inst = self._installer()
+        self._install(inst, "a", "1.0")
+        before = (self.plugins_dir / "a" / "plugin.py").read_text()
+        updates = [{"plugin_id": "a", "metadata": self._meta("a", "2.0", checksum="0" * 64)}]
+
+        with patch("utils.plugin_installer.urllib.request.urlopen", self._urlopen()):
+            results = inst.update_many(updates)
+
+        self.assertFalse(results[0].success)
+        self.assertIn("Integrity verification failed", results[0].error)
+        self.assertEqual((self.plugins_dir / "a" / "plugin.py").read_text(), before)
+        self.assertEqual(inst._load_state()["a"]["version"], "1.0")
+
+    def test_failed_swap_restores_old_version(self):
+        inst = self._installer()
+        self._install(inst, "a", "1.0")
+        updates = [{"plugin_id": "a", "metadata": self._meta("a", "2.0")}]
+        real_rename = os.rename
+
+        def rename(src, dst):
+            if Path(src).name == ".staging-a":
+                raise OSError("disk error")
+            return real_rename(src, dst)
+
+        with patch("utils.plugin_installer.urllib.request.urlopen", self._urlopen()), \
+                patch("utils.plugin_installer.os.rename", side_effect=rename):
+            results = inst.update_many(updates)
+
+        self.assertFalse(results[0].success)
+        manifest = json.loads((self.plugins_dir / "a" / "manifest.json").read_text())
+        self.assertEqual(manifest["version"], "1.0")
+        self.assertFalse((self.plugins_dir / ".staging-a").exists())
+
+    def test_update_many_empty(self):
+        self.assertEqual(self._installer().update_many([]), [])
+
 if __name__ == "__main__":
     unittest.main()
@@ -8,6 +8,7 @@ from utils.plugin_marketplace import (
     PluginMarketplace,
     PluginMetadata,
 )
+from utils.plugin_search import PluginSearchIndex
 import json
 import os
 import sys
@@ -502,6 +503,29 @@ class TestPluginMarketplaceSearch:
         assert len(result.data) == 1
 
 
+    @patch.object(PluginMarketplace, 'fetch_index')
+    def test_search_index_built_once_per_fetch(self, mock_fetch_index):
+        """search() reuses the index until fetch_index() returns a new list."""
+        plugins = [
+            PluginMetadata(id="backup-tool", name="Backup Tool", description="Backup utility"),
+            PluginMetadata(id="net", name="Network Monitor", description="Monitor network"),
+        ]
+        mock_fetch_index.return_value = MarketplaceResult(success=True, data=plugins)
+        mp = PluginMarketplace()
+
+        with patch("utils.plugin_marketplace.PluginSearchIndex",
+                   wraps=PluginSearchIndex) as index_cls:
+            mp.search(query="back")
+            mp.search(query="monitor")
+            assert index_cls.call_count == 1
+
+            mock_fetch_index.return_value = MarketplaceResult(success=True, data=list(plugins))
+            result = mp.search(query="monitor", limit=1)
+            assert index_cls.call_count == 2
+
+        assert [p.id for p in result.data] == ["net"]
+
+
 class TestPluginMarketplaceGetPlugin:
     """Tests for get_plugin() by ID."""
 
@@ -1,6 +1,10 @@
 """Tests for CDN-first plugin marketplace behavior and fallback paths."""
+import io
+import json
 import os
 import sys
+import time
+import urllib.error
 from unittest.mock import patch
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "loofi-fedora-tweaks"))
@@ -118,3 +122,123 @@ class TestPluginMarketplaceCdnProvider:
         assert result.success is True
         assert result.offline is True
         assert result.source == "cache"
+
+
+class _Response(io.BytesIO):
+    def __init__(self, payload: dict, etag: str = '"v1"'):
+        super().__init__(json.dumps(payload).encode("utf-8"))
+        self.headers = {"ETag": etag, "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+
+
+class TestPersistentIndexCache:
+    """Disk cache: warm starts offline, TTL, and conditional revalidation."""
+
+    @staticmethod
+    def _age_disk_cache(mp: PluginMarketplace) -> None:
+        disk = mp.cdn_client.disk_cache
+        key = mp._index_cache_key()
+        entry = disk.load(key)
+        entry.fetched_at = time.time() - mp.cdn_client.config.cache_ttl_seconds - 1
+        disk.store(key, entry)
+
+    @patch("utils.plugin_marketplace.urllib.request.urlopen")
+    def test_warm_start_needs_no_network(self, mock_urlopen):
+        mock_urlopen.return_value = _Response(_signed_index("warm"))
+        first = PluginMarketplace().fetch_index()
+        assert first.source == "network"
+
+        mock_urlopen.reset_mock()
+        second = PluginMarketplace().fetch_index()
+
+        assert second.success is True
+        assert second.source == "cache"
+        assert [p.id for p in second.data] == ["warm"]
+        assert second.data[0] == first.data[0]
+        mock_urlopen.assert_not_called()
+
+    @patch("utils.plugin_marketplace.urllib.request.urlopen")
+    def test_stale_entry_revalidated_with_304(self, mock_urlopen):
+        mock_urlopen.return_value = _Response(_signed_index("kept"), etag='"abc"')
+        mp = PluginMarketplace()
+        mp.fetch_index()
+        self._age_disk_cache(mp)
+
+        mock_urlopen.reset_mock()
+        mock_urlopen.side_effect = urllib.error.HTTPError(
+            "https://cdn", 304, "Not Modified", {}, None)
+        result = PluginMarketplace().fetch_index()
+
+        assert result.success is True
+        assert [p.id for p in result.data] == ["kept"]
+        request = mock_urlopen.call_args[0][0]
+        assert mock_urlopen.call_count == 1
+        assert request.get_header("If-none-match") == '"abc"'
+        assert request.get_header("If-modified-since") == "Mon, 01 Jan 2024 00:00:00 GMT"
+        assert mp.cdn_client.disk_cache.load(mp._index_cache_key()).is_fresh(3600)
+
+    @patch("utils.plugin_marketplace.urllib.request.urlopen")
+    def test_stale_entry_replaced_when_modified(self, mock_urlopen):
+        mock_urlopen.return_value = _Response(_signed_index("old"))
+        mp = PluginMarketplace()
+        mp.fetch_index()
+        self._age_disk_cache(mp)
+
+        mock_urlopen.return_value = _Response(_signed_index("new"), etag='"v2"')
+        result = PluginMarketplace().fetch_index()
+
+        assert result.source == "network"
+        assert [p.id for p in result.data] == ["new"]
+        assert mp.cdn_client.disk_cache.load(mp._index_cache_key()).etag == '"v2"'
+
+    @patch("utils.plugin_marketplace.urllib.request.urlopen")
+    def test_revalidated_index_with_bad_signature_is_rejected(self, mock_urlopen):
+        mock_urlopen.return_value = _Response(_signed_index("trusted"), etag='"v1"')
+        mp = PluginMarketplace()
+        mp.fetch_index()
+        self._age_disk_cache(mp)
+
+        tampered = _signed_index("tampered")
+        tampered["signature"] = {"algorithm": "ed25519"}
+        mock_urlopen.return_value = _Response(tampered, etag='"v2"')
+        result = PluginMarketplace().fetch_index()
+
+        assert [p.id for p in result.data] == ["trusted"]
+        entry = mp.cdn_client.disk_cache.load(mp._index_cache_key())
+        assert entry.etag == '"v1"'
+        assert not entry.is_fresh(mp.cdn_client.config.cache_ttl_seconds)
+
+    @patch("utils.plugin_marketplace.urllib.request.urlopen")
+    def test_cold_start_offline_uses_stale_disk_entry(self, mock_urlopen):
+        mock_urlopen.return_value = _Response(_signed_index("offline"))
+        mp = PluginMarketplace()
+        mp.fetch_index()
+        self._age_disk_cache(mp)
+
+        mock_urlopen.side_effect = urllib.error.URLError("no network")
+        result = PluginMarketplace().fetch_index()
+
+        assert result.success is True
+        assert result.offline is True
+        assert [p.id for p in result.data] == ["offline"]
+
+    @patch.object(PluginMarketplace, "_fetch_json")
+    def test_disk_cache_can_be_disabled(self, mock_fetch_json):
+        from utils.plugin_cdn_client import CdnFetchConfig, PluginCdnClient
+
+        mock_fetch_json.return_value = _signed_index()
+        for _ in range(2):
+            mp = PluginMarketplace()
+            mp.cdn_client = PluginCdnClient(CdnFetchConfig(disk_cache=False))
+            mp.fetch_index()
+
+        assert mock_fetch_json.call_count == 2
+
+    def test_unknown_cached_fields_are_ignored(self):
+        mp = PluginMarketplace()
+        plugin = mp._parse_plugin_entry(_signed_index()["plugins"][0])
+        entry = mp._plugins_to_entry([plugin])
+        entry.fields.append("future_field")
+        for row in entry.rows:
+            row.append("x")
+
+        assert mp._plugins_from_entry(entry) == [plugin]
@@ -350,30 +350,32 @@ class TestDaemonAutoUpdate(unittest.TestCase):
         mock_loader_cls.return_value = mock_loader
 
         # Mock installer
+        update = {
+            "plugin_id": "test-plugin",
+            "current_version": "1.0.0",
+            "new_version": "1.1.0",
+            "metadata": Mock(),
+        }
         mock_installer = Mock()
-        mock_installer.check_update = Mock(return_value=InstallerResult(
+        mock_installer.check_updates = Mock(return_value=InstallerResult(
             success=True,
-            plugin_id="test-plugin",
-            version="1.0.0",
-            data={
-                "update_available": True,
-                "current_version": "1.0.0",
-                "new_version": "1.1.0"
-            }
+            plugin_id="",
+            data=[update]
         ))
-        mock_installer.update = Mock(return_value=InstallerResult(
+        mock_installer.update_many = Mock(return_value=[InstallerResult(
             success=True,
             plugin_id="test-plugin",
             version="1.1.0"
-        ))
+        )])
         mock_installer_cls.return_value = mock_installer
 
         # Run update check
         Daemon.check_plugin_updates()
 
-        # Verify update was called
-        mock_installer.check_update.assert_called_once_with("test-plugin")
-        mock_installer.update.assert_called_once_with("test-plugin")
+        # Verify one batched check and one batched update
+        mock_installer.check_updates.assert_called_once_with(["test-plugin"])
+        mock_installer.update_many.assert_called_once_with([update])
+        mock_installer.check_update.assert_not_called()
 
     @patch('utils.daemon.PluginInstaller')
     @patch('utils.daemon.PluginLoader')
@@ -392,7 +394,7 @@ class TestDaemonAutoUpdate(unittest.TestCase):
         Daemon.check_plugin_updates()
 
         # Verify no update check was performed
-        mock_installer.check_update.assert_not_called()
+        mock_installer.check_updates.assert_not_called()
 
     @patch('utils.daemon.PluginInstaller')
     @patch('utils.daemon.PluginLoader')
@@ -417,7 +419,7 @@ class TestDaemonAutoUpdate(unittest.TestCase):
         Daemon.check_plugin_updates()
 
         # Verify no update check for disabled plugin
-        mock_installer.check_update.assert_not_called()
+        mock_installer.check_updates.assert_not_called()
 
 
 class TestPluginInstallerCheckUpdate(unittest.TestCase):
@@ -0,0 +1,161 @@
+"""Tests for utils/plugin_search.py — prebuilt marketplace search index."""
+
+import os
+import random
+import sys
+import threading
+import time
+import unittest
+from collections import OrderedDict
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "loofi-fedora-tweaks"))
+
+from utils.plugin_search import PluginSearchIndex, tokenize
+
+
+def _plugin(plugin_id, name, description="", category="Utility", tags=(),
+            rating_average=None, rating_count=0):
+    return SimpleNamespace(
+        id=plugin_id, name=name, description=description, category=category,
+        tags=list(tags), rating_average=rating_average, rating_count=rating_count,
+    )
+
+
+def _ids(plugins):
+    return [p.id for p in plugins]
+
+
+class TestTokenize(unittest.TestCase):
+    """Tests for query/field tokenisation."""
+
+    def test_lowercases_and_splits_punctuation(self):
+        self.assertEqual(tokenize("Backup-Tool v2, NOW!"), ["backup", "tool", "v2", "now"])
+
+
+class TestMatching(unittest.TestCase):
+    """Which plugins a query matches."""
+
+    def setUp(self):
+        self.plugins = [
+            _plugin("backup", "Backup Tool", "Snapshot your home directory", tags=["files"]),
+            _plugin("net", "Network Monitor", "Watch traffic", category="Network"),
+            _plugin("fw", "Firewall Panel", "Manage network zones", category="Security",
+                    tags=["network"]),
+        ]
+        self.index = PluginSearchIndex(self.plugins)
+
+    def test_empty_query_keeps_catalogue_order(self):
+        self.assertEqual(_ids(self.index.search("")), ["backup", "net", "fw"])
+        self.assertEqual(_ids(self.index.search("  ", category="security")), ["fw"])
+
+    def test_prefix_and_case_insensitive(self):
+        self.assertEqual(_ids(self.index.search("BACK")), ["backup"])
+        self.assertEqual(_ids(self.index.search("sn")), ["backup"])
+
+    def test_infix_match_needs_three_characters(self):
+        self.assertEqual(_ids(self.index.search("ackup")), ["backup"])
+        self.assertEqual(self.index.search("ck"), [])
+
+    def test_every_word_must_match(self):
+        self.assertEqual(_ids(self.index.search("network zones")), ["fw"])
+        self.assertEqual(self.index.search("network backup"), [])
+
+    def test_category_filter(self):
+        self.assertEqual(_ids(self.index.search("network", category="NETWORK")), ["net"])
+        self.assertEqual(self.index.search("network", category="Gaming"), [])
+
+    def test_positions_refer_to_catalogue(self):
+        self.assertEqual(self.index.search_positions("firewall"), [2])
+
+    def test_results_are_copies(self):
+        first = self.index.search("network")
+        first.clear()
+        self.assertEqual(len(self.index.search("network")), 2)
+
+
+class TestRanking(unittest.TestCase):
+    """Relevance and popularity ordering."""
+
+    def test_name_beats_tag_beats_description(self):
+        index = PluginSearchIndex([
+            _plugin("desc", "Alpha", "A vpn helper"),
+            _plugin("tag", "Beta", tags=["vpn"]),
+            _plugin("name", "VPN Manager"),
+        ])
+        self.assertEqual(_ids(index.search("vpn")), ["name", "tag", "desc"])
+
+    def test_exact_beats_prefix_beats_infix(self):
+        index = PluginSearchIndex([
+            _plugin("infix", "Autosync"),
+            _plugin("prefix", "Syncthing"),
+            _plugin("exact", "Sync"),
+        ])
+        self.assertEqual(_ids(index.search("sync")), ["exact", "prefix", "infix"])
+
+    def test_popularity_breaks_ties(self):
+        index = PluginSearchIndex([
+            _plugin("few", "Theme Pack A", rating_average=5.0, rating_count=2),
+            _plugin("many", "Theme Pack B", rating_average=4.6, rating_count=900),
+            _plugin("none", "Theme Pack C"),
+        ])
+        self.assertEqual(_ids(index.search("theme")), ["many", "few", "none"])
+
+    def test_phrase_in_name_ranks_first(self):
+        index = PluginSearchIndex([
+            _plugin("scattered", "Monitor", "network tools", rating_count=1000, rating_average=5),
+            _plugin("phrase", "Network Monitor"),
+        ])
+        self.assertEqual(_ids(index.search("network monitor")), ["phrase", "scattered"])
+
+    def test_limit_returns_top_results(self):
+        plugins = [_plugin(f"p{i}", f"Game Tool {i}", rating_count=i) for i in range(20)]
+        index = PluginSearchIndex(plugins)
+        full = _ids(index.search("game"))
+        self.assertEqual(_ids(index.search("game", limit=5)), full[:5])
+        self.assertEqual(_ids(index.search("game tool", limit=3)), _ids(index.search("game tool"))[:3])
+        self.assertEqual(full[0], "p19")
+        self.assertEqual(len(index.search("", limit=4)), 4)
+
+
+class _SlowCache(OrderedDict):
+    """Query cache that yields between a lookup and its use."""
+
+    def get(self, key, default=None):
+        value = super().get(key, default)
+        time.sleep(0.0005)
+        return value
+
+
+class TestQueryCache(unittest.TestCase):
+    """The per-index query cache is shared by concurrent searches."""
+
+    @patch("utils.plugin_search.QUERY_CACHE_SIZE", 4)
+    def test_concurrent_searches_evicting_entries(self):
+        index = PluginSearchIndex([_plugin(f"p{i}", f"Tool {i}") for i in range(6)])
+        queries = [f"tool {i}" for i in range(6)]
+        expected = {query: _ids(index.search(query)) for query in queries}
+        index._query_cache = _SlowCache()
+        errors = []
+
+        def worker(seed):
+            rng = random.Random(seed)
+            try:
+                for _ in range(100):
+                    query = rng.choice(queries)
+                    self.assertEqual(_ids(index.search(query)), expected[query])
+            except (AssertionError, KeyError) as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(index._query_cache), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,6 +12,7 @@ from unittest.mock import patch, MagicMock
 # Add source path to sys.path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'loofi-fedora-tweaks'))
 
+from utils.network_monitor import ConnectionInfo
 from utils.ports import PortAuditor, OpenPort
 
 
@@ -49,53 +50,50 @@ class TestOpenPortDataclass(unittest.TestCase):
 # ---------------------------------------------------------------------------
 
 class TestScanPorts(unittest.TestCase):
-    """Tests for scan_ports with mocked ss output."""
+    """Tests for scan_ports with a mocked socket snapshot."""
 
-    SS_OUTPUT = (
-        "Netid  State  Recv-Q  Send-Q  Local Address:Port  Peer Address:Port\n"
-        "tcp    LISTEN 0       128     0.0.0.0:22          0.0.0.0:*\n"
-        "tcp    LISTEN 0       128     127.0.0.1:8080      0.0.0.0:*\n"
-        "udp    UNCONN 0       0       0.0.0.0:5353        0.0.0.0:*\n"
-    )
+    LISTENING = [
+        ConnectionInfo("tcp", "0.0.0.0", 22, "0.0.0.0", 0, "LISTEN", 812, "sshd"),
+        ConnectionInfo("tcp6", "::1", 8080, "::", 0, "LISTEN", 0, ""),
+        ConnectionInfo("udp", "0.0.0.0", 5353, "0.0.0.0", 0, "CLOSE", 640, "avahi-daemon"),
+    ]
 
-    @patch.object(PortAuditor, '_enhance_with_process_info')
-    @patch('utils.ports.subprocess.run')
-    def test_scan_ports_parses_ss_output(self, mock_run, mock_enhance):
-        """scan_ports parses ss output into OpenPort list."""
-        mock_run.return_value = MagicMock(returncode=0, stdout=self.SS_OUTPUT)
+    @patch('utils.ports.NetworkMonitor.get_listening_sockets')
+    def test_scan_ports_reads_socket_snapshot(self, mock_listening):
+        """scan_ports converts listening sockets into OpenPort entries."""
+        mock_listening.return_value = self.LISTENING
 
         ports = PortAuditor.scan_ports()
 
         self.assertEqual(len(ports), 3)
-        port_numbers = [p.port for p in ports]
-        self.assertIn(22, port_numbers)
-        self.assertIn(8080, port_numbers)
+        self.assertEqual([p.port for p in ports], [22, 8080, 5353])
+        self.assertEqual([p.protocol for p in ports], ["TCP", "TCP", "UDP"])
+        self.assertEqual((ports[0].process, ports[0].pid), ("sshd", 812))
+        self.assertEqual((ports[1].process, ports[1].pid), ("unknown", 0))
 
-    @patch.object(PortAuditor, '_enhance_with_process_info')
-    @patch('utils.ports.subprocess.run')
-    def test_scan_ports_detects_risky_port(self, mock_run, mock_enhance):
+    @patch('utils.ports.NetworkMonitor.get_listening_sockets')
+    def test_scan_ports_detects_risky_port(self, mock_listening):
         """scan_ports marks known risky ports."""
-        mock_run.return_value = MagicMock(returncode=0, stdout=self.SS_OUTPUT)
+        mock_listening.return_value = self.LISTENING
 
         ports = PortAuditor.scan_ports()
 
         ssh_ports = [p for p in ports if p.port == 22]
         self.assertEqual(len(ssh_ports), 1)
         self.assertTrue(ssh_ports[0].is_risky)
+        self.assertTrue(ssh_ports[0].risk_reason.startswith("SSH:"))
 
-    @patch('utils.ports.subprocess.run')
-    def test_scan_ports_nonzero_exit(self, mock_run):
-        """scan_ports returns empty list on error."""
-        mock_run.return_value = MagicMock(returncode=1, stdout="")
+    @patch('utils.ports.NetworkMonitor.get_listening_sockets', return_value=[])
+    def test_scan_ports_no_listeners(self, mock_listening):
+        """scan_ports returns empty list when nothing listens."""
+        self.assertEqual(PortAuditor.scan_ports(), [])
 
-        ports = PortAuditor.scan_ports()
-        self.assertEqual(ports, [])
-
-    @patch('utils.ports.subprocess.run', side_effect=OSError("ss not found"))
-    def test_scan_ports_exception(self, mock_run):
-        """scan_ports returns empty list on OSError exception."""
-        ports = PortAuditor.scan_ports()
-        self.assertEqual(ports, [])
+    @patch('utils.ports.subprocess.run')
+    @patch('utils.ports.NetworkMonitor.get_listening_sockets', return_value=[])
+    def test_scan_ports_does_not_run_ss(self, mock_listening, mock_run):
+        """scan_ports no longer spawns ss."""
+        PortAuditor.scan_ports()
+        mock_run.assert_not_called()
 
 
 # ---------------------------------------------------------------------------
@@ -5,6 +5,8 @@ import os
 import sys
 import tempfile
 import unittest
+from pathlib import Path
+from unittest.mock import patch
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'loofi-fedora-tweaks'))
 
@@ -118,6 +120,210 @@ class TestProfileStore(unittest.TestCase):
         self.assertEqual(len(payload["profiles"]), 1)
 
 
+def _backdate(path, seconds=60):
+    """Move a file's mtime out of the racy window so its stamp is trusted."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 10**9))
+
+
+class TestProfileStoreIndex(unittest.TestCase):
+    """Tests for the cached key -> record index."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        ProfileStore.clear_cache()
+        self.addCleanup(ProfileStore.clear_cache)
+        self.dir = Path(self.tmp.name)
+        for i in range(5):
+            path = self.dir / f"p{i}.json"
+            path.write_text(json.dumps({"name": f"P{i}", "settings": {"n": i}}))
+            _backdate(path)
+        _backdate(self.dir)
+        self.store = ProfileStore(self.tmp.name, {})
+        self.store.list_profiles()
+
+    def _count_parses(self):
+        return patch.object(
+            ProfileStore, "_read_custom_file", autospec=True,
+            side_effect=ProfileStore._read_custom_file,
+        )
+
+    def test_lookup_does_not_reparse_unchanged_files(self):
+        with self._count_parses() as parse:
+            other = ProfileStore(self.tmp.name, {})
+            self.assertEqual(other.get_profile("p3").settings, {"n": 3})
+            self.assertIsNone(other.get_profile("missing"))
+            self.assertEqual(len(other.list_profiles()), 5)
+        parse.assert_not_called()
+
+    def test_returned_records_are_copies(self):
+        self.store.get_profile("p1").settings["n"] = 99
+        self.assertEqual(self.store.get_profile("p1").settings, {"n": 1})
+
+    def test_in_place_edit_reparses_only_that_file(self):
+        path = self.dir / "p2.json"
+        path.write_text(json.dumps({"name": "Edited", "settings": {}}))
+        with self._count_parses() as parse:
+            self.assertEqual(self.store.get_profile("p2").name, "Edited")
+        self.assertEqual(parse.call_count, 1)
+
+    def test_files_added_by_another_writer_are_found(self):
+        (self.dir / "late.json").write_text(json.dumps({"name": "Late"}))
+        self.assertEqual(self.store.get_profile("late").name, "Late")
+
+    def test_save_and_delete_update_index_incrementally(self):
+        record = ProfileRecord(key="fresh", name="Fresh", settings={"a": 1})
+        with self._count_parses() as parse:
+            ok, _msg, _path = self.store.save_custom_profile(record)
+            self.assertTrue(ok)
+            self.assertEqual(self.store.get_profile("fresh").settings, {"a": 1})
+        # Only the written file is (re)read; it stays untrusted while racy.
+        self.assertEqual({call.args[1].name for call in parse.call_args_list}, {"fresh.json"})
+
+        ok, _msg = self.store.delete_custom_profile("fresh")
+        self.assertTrue(ok)
+        self.assertIsNone(self.store.get_profile("fresh"))
+        self.assertEqual(len(self.store.list_profiles()), 5)
+
+
+class TestProfileBundleStreaming(unittest.TestCase):
+    """Tests for file-based bundle export/import."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        ProfileStore.clear_cache()
+        self.addCleanup(ProfileStore.clear_cache)
+        self.source = ProfileStore(os.path.join(self.tmp.name, "src"), {"gaming": {"name": "Gaming"}})
+        self.target = ProfileStore(os.path.join(self.tmp.name, "dst"), {"gaming": {"name": "Gaming"}})
+        self.bundle_path = os.path.join(self.tmp.name, "bundle.json")
+
+    def test_export_is_valid_bundle_json(self):
+        for i in range(3):
+            self.source.save_custom_profile(ProfileRecord(key=f"k{i}", name=f"K {i}", settings={"i": i}))
+        ok, _msg = self.source.export_bundle(self.bundle_path, include_builtins=True)
+        self.assertTrue(ok)
+        with open(self.bundle_path, encoding="utf-8") as fh:
+            payload = json.load(fh)
+        self.assertEqual(payload["kind"], "profile_bundle")
+        self.assertEqual([p["key"] for p in payload["profiles"]], ["gaming", "k0", "k1", "k2"])
+        self.assertEqual(ProfileBundle.from_dict(payload).profiles[3].settings, {"i": 2})
+
+    def test_roundtrip_through_small_read_chunks(self):
+        for i in range(20):
+            self.source.save_custom_profile(
+                ProfileRecord(key=f"k{i}", name=f"K {i}", description="x" * 50, settings={"v": [i, 1.5, None]})
+            )
+        self.source.export_bundle(self.bundle_path)
+        with patch("core.profiles.storage._READ_CHUNK", 7):
+            ok, _msg, data = self.target.import_bundle(self.bundle_path)
+        self.assertTrue(ok)
+        self.assertEqual(len(data["imported"]), 20)
+        self.assertEqual(self.target.get_profile("k7").settings, {"v": [7, 1.5, None]})
+
+    def test_profiles_key_may_follow_other_fields(self):
+        with open(self.bundle_path, "w", encoding="utf-8") as fh:
+            json.dump({"meta": {"profiles": "decoy"}, "profiles": [
+                {"key": "a", "name": "A"}, {"key": "gaming", "name": "G"},
+            ], "schema_version": 1}, fh)
+        ok, msg, data = self.target.import_bundle(self.bundle_path)
+        self.assertTrue(ok)
+        self.assertEqual(msg, "Bundle imported.")
+        self.assertEqual(data["imported"], ["a"])
+        self.assertEqual(data["skipped"], ["gaming"])
+
+    def test_invalid_entry_rejects_whole_bundle(self):
+        with open(self.bundle_path, "w", encoding="utf-8") as fh:
+            json.dump({"profiles": [{"key": "a", "name": "A"}, "bogus"]}, fh)
+        ok, msg, data = self.target.import_bundle(self.bundle_path)
+        self.assertFalse(ok)
+        self.assertEqual(msg, "Invalid bundle payload: Each profile entry in bundle must be a dictionary")
+        self.assertEqual(data, {})
+        self.assertIsNone(self.target.get_profile("a"))
+
+    def test_truncated_bundle_imports_nothing(self):
+        for i in range(5):
+            self.source.save_custom_profile(ProfileRecord(key=f"k{i}", name=f"K {i}"))
+        self.source.export_bundle(self.bundle_path)
+        with open(self.bundle_path, encoding="utf-8") as fh:
+            text = fh.read()
+        with open(self.bundle_path, "w", encoding="utf-8") as fh:
+            fh.write(text[:text.index('"k3"')])
+        with patch("core.profiles.storage._READ_CHUNK", 16):
+            ok, msg, data = self.target.import_bundle(self.bundle_path)
+        self.assertFalse(ok)
+        self.assertTrue(msg.startswith("Failed to read bundle file:"))
+        self.assertEqual(data, {})
+        self.assertEqual(self.target.list_profiles()[1:], [])
+
+    def test_file_and_payload_imports_reject_the_same_bundles(self):
+        entry = {"key": "a", "name": "A"}
+        cases = [
+            {"schema_version": "two", "profiles": [entry]},
+            {"schema_version": 1, "profiles": "not a list"},
+            {"profiles": None, "profile_bundle": [entry]},
+            {"profile_bundle": ["bogus"], "profiles": [entry]},
+            {"profiles": [entry, "bogus"]},
+            {"kind": "profile_bundle"},
+        ]
+        for payload in cases:
+            with self.subTest(payload=payload):
+                with open(self.bundle_path, "w", encoding="utf-8") as fh:
+                    json.dump(payload, fh)
+                from_file = self.target.import_bundle(self.bundle_path, overwrite=True)
+                from_payload = self.target.import_bundle_data(payload, overwrite=True)
+                self.assertEqual(from_file[:2], from_payload[:2])
+
+    def test_repeated_profiles_key_uses_last_list(self):
+        with open(self.bundle_path, "w", encoding="utf-8") as fh:
+            fh.write('{"profiles": ["bogus"], "profiles": [{"key": "b", "name": "B"}]}')
+        ok, _msg, data = self.target.import_bundle(self.bundle_path)
+        self.assertTrue(ok)
+        self.assertEqual(data["imported"], ["b"])
+
+    def test_trailing_data_imports_nothing(self):
+        with open(self.bundle_path, "w", encoding="utf-8") as fh:
+            fh.write('{"profiles": [{"key": "a", "name": "A"}]} []')
+        ok, msg, _data = self.target.import_bundle(self.bundle_path)
+        self.assertFalse(ok)
+        self.assertTrue(msg.startswith("Failed to read bundle file:"))
+        self.assertIsNone(self.target.get_profile("a"))
+
+    def test_entries_are_saved_while_second_pass_reads(self):
+        for i in range(3):
+            self.source.save_custom_profile(ProfileRecord(key=f"k{i}", name=f"K {i}"))
+        self.source.export_bundle(self.bundle_path)
+        decoded = []
+        original = ProfileStore._bundle_record
+
+        def record(item):
+            decoded.append(item["key"])
+            return original(item)
+
+        saved_after = []
+        save = self.target.save_custom_profile
+
+        def save_custom_profile(rec, overwrite=False):
+            saved_after.append(len(decoded))
+            return save(rec, overwrite=overwrite)
+
+        with patch.object(ProfileStore, "_bundle_record", staticmethod(record)), \
+                patch.object(self.target, "save_custom_profile", save_custom_profile):
+            ok, _msg, _data = self.target.import_bundle(self.bundle_path)
+        self.assertTrue(ok)
+        # Three checks in the first pass, then each entry is saved as soon as it is decoded.
+        self.assertEqual(saved_after, [4, 5, 6])
+
+    def test_non_bundle_file_imports_nothing(self):
+        with open(self.bundle_path, "w", encoding="utf-8") as fh:
+            json.dump({"name": "not a bundle"}, fh)
+        ok, msg, _data = self.target.import_bundle(self.bundle_path)
+        self.assertFalse(ok)
+        self.assertIn("profiles", msg)
+        self.assertEqual(self.target.list_profiles()[1:], [])
+
+
 class TestProfileBundle(unittest.TestCase):
     """Tests for ProfileBundle serialization."""
 
@@ -85,7 +85,7 @@ class TestSystemPulseInit(unittest.TestCase):
 
     def test_init_defaults(self):
         pulse = SystemPulse()
-        self.assertIsNone(pulse._loop)
+        self.assertEqual(pulse._matches, [])
         self.assertFalse(pulse._stop_event.is_set())
         self.assertIsNone(pulse._system_bus)
         self.assertIsNone(pulse._last_power_state)
@@ -168,43 +168,44 @@ class TestStartWithDbus(unittest.TestCase):
     """Test start() when DBus IS available."""
 
     @patch("utils.pulse.DBUS_AVAILABLE", True)
-    @patch("utils.pulse.GLib")
     @patch("utils.pulse.dbus")
-    @patch("utils.pulse.DBusGMainLoop")
-    def test_start_registers_and_runs_loop(self, mock_mainloop, mock_dbus, mock_glib):
+    @patch("utils.pulse.dbus_loop")
+    def test_start_registers_on_shared_loop(self, mock_loop, mock_dbus):
         pulse = SystemPulse()
         mock_bus = MagicMock()
         mock_dbus.SystemBus.return_value = mock_bus
-        mock_loop = MagicMock()
-        mock_glib.MainLoop.return_value = mock_loop
+        match = MagicMock()
 
-        # Patch the registration methods to avoid real DBus calls
-        with patch.object(pulse, "_register_upower_signals"):
+        def register():
+            pulse._matches.append(match)
+            # Signals are served by the shared loop; start() returns on stop().
+            pulse.stop()
+
+        with patch.object(pulse, "_register_upower_signals", side_effect=register):
             with patch.object(pulse, "_register_networkmanager_signals"):
                 with patch.object(pulse, "_register_monitor_signals"):
                     pulse.start()
 
-        mock_mainloop.assert_called_once_with(set_as_default=True)
+        mock_loop.ensure_running.assert_called_once_with()
         mock_dbus.SystemBus.assert_called_once()
-        self.assertFalse(pulse._stop_event.is_set())
-        mock_glib.MainLoop.assert_called_once()
-        mock_loop.run.assert_called_once()
+        match.remove.assert_called_once()
+        self.assertEqual(pulse._matches, [])
 
     @patch("utils.pulse.DBUS_AVAILABLE", True)
-    @patch(
-        "utils.pulse.DBusGMainLoop", side_effect=OSError("Operation not permitted")
-    )
-    def test_start_expected_dbus_error_uses_polling(self, mock_mainloop):
+    @patch("utils.pulse.dbus_loop")
+    def test_start_expected_dbus_error_uses_polling(self, mock_loop):
         """Expected DBus errors fall back to polling."""
+        mock_loop.ensure_running.side_effect = OSError("Operation not permitted")
         pulse = SystemPulse()
         with patch.object(pulse, "_run_polling_fallback") as mock_poll:
             pulse.start()
             mock_poll.assert_called_once()
 
     @patch("utils.pulse.DBUS_AVAILABLE", True)
-    @patch("utils.pulse.DBusGMainLoop", side_effect=RuntimeError("Unexpected crash"))
-    def test_start_unexpected_error_uses_polling(self, mock_mainloop):
+    @patch("utils.pulse.dbus_loop")
+    def test_start_unexpected_error_uses_polling(self, mock_loop):
         """Unexpected DBus errors also fall back to polling."""
+        mock_loop.ensure_running.side_effect = RuntimeError("Unexpected crash")
         pulse = SystemPulse()
         with patch.object(pulse, "_run_polling_fallback") as mock_poll:
             pulse.start()
@@ -231,18 +232,19 @@ class TestStartWithoutDbus(unittest.TestCase):
 class TestStop(unittest.TestCase):
     """Test stop method."""
 
-    def test_stop_with_loop(self):
+    def test_stop_sets_event(self):
         pulse = SystemPulse()
-        pulse._loop = MagicMock()
         pulse.stop()
         self.assertTrue(pulse._stop_event.is_set())
-        pulse._loop.quit.assert_called_once()
 
-    def test_stop_without_loop(self):
+    def test_remove_signal_receivers(self):
         pulse = SystemPulse()
-        pulse._loop = None
-        pulse.stop()
-        self.assertTrue(pulse._stop_event.is_set())
+        matches = [MagicMock(), MagicMock()]
+        pulse._matches = list(matches)
+        pulse._remove_signal_receivers()
+        for match in matches:
+            match.remove.assert_called_once()
+        self.assertEqual(pulse._matches, [])
 
 
 # ---------------------------------------------------------------------------
@@ -59,6 +59,51 @@ class TestScheduledTask(unittest.TestCase):
         self.assertTrue(task.is_due())
 
 
+class TestNextDue(unittest.TestCase):
+    """Tests for deadline computation used by the daemon's timer heap."""
+
+    def _task(self, **kwargs):
+        defaults = dict(id="t", name="x", action=TaskAction.CLEANUP.value, schedule=TaskSchedule.HOURLY.value)
+        defaults.update(kwargs)
+        return ScheduledTask(**defaults)
+
+    def test_next_due_is_last_run_plus_period(self):
+        """Periodic tasks are next due one period after last_run."""
+        from datetime import datetime, timedelta
+
+        task = self._task(schedule=TaskSchedule.DAILY.value, last_run="2026-02-13T10:00:00")
+        self.assertEqual(task.next_due(), datetime(2026, 2, 13, 10) + timedelta(days=1))
+
+    def test_next_due_never_run_is_now(self):
+        """A task that never ran is due immediately."""
+        from datetime import datetime
+
+        now = datetime(2026, 2, 13, 12)
+        self.assertEqual(self._task().next_due(now), now)
+
+    def test_next_due_none_for_triggers_and_disabled(self):
+        """Boot, power-triggered and disabled tasks have no deadline."""
+        self.assertIsNone(self._task(schedule=TaskSchedule.ON_BOOT.value).next_due())
+        self.assertIsNone(self._task(schedule=TaskSchedule.ON_AC.value).next_due())
+        self.assertIsNone(self._task(enabled=False).next_due())
+
+    def test_get_next_due_time_is_earliest(self):
+        """get_next_due_time() returns the earliest deadline across tasks."""
+        from datetime import datetime
+
+        tasks = [
+            self._task(id="a", schedule=TaskSchedule.WEEKLY.value, last_run="2026-02-13T10:00:00"),
+            self._task(id="b", schedule=TaskSchedule.HOURLY.value, last_run="2026-02-13T10:00:00"),
+            self._task(id="c", schedule=TaskSchedule.ON_BOOT.value),
+        ]
+        self.assertEqual(TaskScheduler.get_next_due_time(tasks), datetime(2026, 2, 13, 11))
+
+    @patch.object(TaskScheduler, 'list_tasks', return_value=[])
+    def test_get_next_due_time_none_without_tasks(self, mock_list):
+        """No time-based tasks means no deadline."""
+        self.assertIsNone(TaskScheduler.get_next_due_time())
+
+
 class TestTaskScheduler(unittest.TestCase):
     """Tests for TaskScheduler behavior."""
 
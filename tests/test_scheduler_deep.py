@@ -8,9 +8,12 @@ import json
 import os
 import subprocess
 import sys
+import tempfile
 import unittest
+from dataclasses import replace
 from datetime import datetime, timedelta
-from unittest.mock import MagicMock, mock_open, patch
+from pathlib import Path
+from unittest.mock import MagicMock, patch
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'loofi-fedora-tweaks'))
 
@@ -20,6 +23,35 @@ from utils.scheduler import (
 )
 
 
+class _TempConfig:
+    """Point TaskScheduler at a throwaway config dir with a fresh store."""
+
+    def __enter__(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        self.path = self.dir / "scheduler.json"
+        self._patches = [
+            patch.object(TaskScheduler, "CONFIG_DIR", self.dir),
+            patch.object(TaskScheduler, "CONFIG_FILE", self.path),
+        ]
+        for p in self._patches:
+            p.start()
+        TaskScheduler.clear_cache()
+        return self
+
+    def write(self, text):
+        """Replace the file the way another process would."""
+        tmp = self.dir / ".external"
+        tmp.write_text(text)
+        os.replace(tmp, self.path)
+
+    def __exit__(self, *exc):
+        TaskScheduler.clear_cache()
+        for p in reversed(self._patches):
+            p.stop()
+        self._tmp.cleanup()
+
+
 # ---------------------------------------------------------------------------
 # ScheduledTask dataclass
 # ---------------------------------------------------------------------------
@@ -108,6 +140,12 @@ class TestScheduledTask(unittest.TestCase):
 class TestTaskSchedulerCRUD(unittest.TestCase):
     """list / save / add / remove / enable / update_last_run."""
 
+    def setUp(self):
+        TaskScheduler.clear_cache()
+
+    def tearDown(self):
+        TaskScheduler.clear_cache()
+
     def _sample_data(self):
         return {"tasks": [
             {"id": "a", "name": "A", "action": "cleanup", "schedule": "daily", "enabled": True, "last_run": None, "preset_name": None},
@@ -120,52 +158,35 @@ class TestTaskSchedulerCRUD(unittest.TestCase):
         mock_file.exists.return_value = False
         self.assertEqual(TaskScheduler.list_tasks(), [])
 
-    @patch("builtins.open", new_callable=mock_open, read_data='{"tasks":[]}')
-    @patch("utils.scheduler.TaskScheduler.CONFIG_FILE")
-    @patch("utils.scheduler.TaskScheduler.CONFIG_DIR")
-    def test_list_tasks_empty_list(self, mock_dir, mock_file, _open):
-        mock_dir.mkdir = MagicMock()
-        mock_file.exists.return_value = True
-        self.assertEqual(TaskScheduler.list_tasks(), [])
+    def test_list_tasks_empty_list(self):
+        with _TempConfig() as cfg:
+            cfg.write('{"tasks":[]}')
+            self.assertEqual(TaskScheduler.list_tasks(), [])
 
-    @patch("builtins.open", new_callable=mock_open, read_data='INVALID')
-    @patch("utils.scheduler.TaskScheduler.CONFIG_FILE")
-    @patch("utils.scheduler.TaskScheduler.CONFIG_DIR")
-    def test_list_tasks_corrupt_json(self, mock_dir, mock_file, _open):
-        mock_dir.mkdir = MagicMock()
-        mock_file.exists.return_value = True
-        self.assertEqual(TaskScheduler.list_tasks(), [])
+    def test_list_tasks_corrupt_json(self):
+        with _TempConfig() as cfg:
+            cfg.write('INVALID')
+            self.assertEqual(TaskScheduler.list_tasks(), [])
 
-    @patch("builtins.open", new_callable=mock_open)
-    @patch("utils.scheduler.TaskScheduler.CONFIG_FILE")
-    @patch("utils.scheduler.TaskScheduler.CONFIG_DIR")
-    def test_list_tasks_with_data(self, mock_dir, mock_file, mopen):
-        mock_dir.mkdir = MagicMock()
-        mock_file.exists.return_value = True
-        mopen.return_value.read.return_value = json.dumps(self._sample_data())
-        mopen.return_value.__enter__ = lambda s: s
-        mopen.return_value.__exit__ = MagicMock(return_value=False)
-        # Use json.load mock
-        with patch("json.load", return_value=self._sample_data()):
+    def test_list_tasks_with_data(self):
+        with _TempConfig() as cfg:
+            cfg.write(json.dumps(self._sample_data()))
             tasks = TaskScheduler.list_tasks()
         self.assertEqual(len(tasks), 1)
         self.assertEqual(tasks[0].id, "a")
 
-    @patch("builtins.open", new_callable=mock_open)
-    @patch("utils.scheduler.TaskScheduler.CONFIG_FILE")
-    @patch("utils.scheduler.TaskScheduler.CONFIG_DIR")
-    def test_save_tasks_success(self, mock_dir, mock_file, mopen):
-        mock_dir.mkdir = MagicMock()
-        task = ScheduledTask(id="x", name="X", action="cleanup", schedule="daily")
-        result = TaskScheduler.save_tasks([task])
+    def test_save_tasks_success(self):
+        with _TempConfig() as cfg:
+            task = ScheduledTask(id="x", name="X", action="cleanup", schedule="daily")
+            result = TaskScheduler.save_tasks([task])
+            data = json.loads(cfg.path.read_text())
         self.assertTrue(result)
+        self.assertEqual(data["tasks"][0]["id"], "x")
 
     @patch("builtins.open", side_effect=OSError("disk full"))
-    @patch("utils.scheduler.TaskScheduler.CONFIG_FILE")
-    @patch("utils.scheduler.TaskScheduler.CONFIG_DIR")
-    def test_save_tasks_failure(self, mock_dir, mock_file, _open):
-        mock_dir.mkdir = MagicMock()
-        self.assertFalse(TaskScheduler.save_tasks([]))
+    def test_save_tasks_failure(self, _open):
+        with _TempConfig():
+            self.assertFalse(TaskScheduler.save_tasks([]))
 
     @patch.object(TaskScheduler, "save_tasks", return_value=True)
     @patch.object(TaskScheduler, "list_tasks", return_value=[])
@@ -220,36 +241,178 @@ class TestTaskSchedulerCRUD(unittest.TestCase):
 # ---------------------------------------------------------------------------
 class TestTaskSchedulerQueries(unittest.TestCase):
 
-    @patch.object(TaskScheduler, "list_tasks")
-    def test_get_due_tasks(self, mock_list):
+    def setUp(self):
+        self.cfg = _TempConfig()
+        self.cfg.__enter__()
+        self.addCleanup(self.cfg.__exit__, None, None, None)
+
+    def test_get_due_tasks(self):
         stale = ScheduledTask(id="s", name="S", action="cleanup", schedule="daily", last_run=None)
         fresh = ScheduledTask(id="f", name="F", action="cleanup", schedule="daily",
                               last_run=datetime.now().isoformat())
-        mock_list.return_value = [stale, fresh]
+        TaskScheduler.save_tasks([stale, fresh])
         due = TaskScheduler.get_due_tasks()
         self.assertEqual(len(due), 1)
         self.assertEqual(due[0].id, "s")
 
-    @patch.object(TaskScheduler, "list_tasks")
-    def test_get_power_trigger_tasks_battery(self, mock_list):
+    def test_get_due_tasks_matches_is_due(self):
+        now = datetime.now()
+        tasks = [
+            ScheduledTask(id=f"t{i}", name="T", action="cleanup", schedule=schedule,
+                          enabled=i % 5 != 0, last_run=(now - age).isoformat())
+            for i, (schedule, age) in enumerate(
+                (s, timedelta(minutes=m))
+                for s in ("hourly", "daily", "weekly", "on_boot")
+                for m in (5, 90, 60 * 30, 60 * 24 * 9)
+            )
+        ]
+        tasks.append(ScheduledTask(id="bad", name="B", action="cleanup",
+                                   schedule="daily", last_run="garbage"))
+        TaskScheduler.save_tasks(tasks)
+        expected = {t.id for t in tasks if t.is_due()}
+        self.assertEqual({t.id for t in TaskScheduler.get_due_tasks()}, expected)
+
+    def test_get_power_trigger_tasks_battery(self):
         t = ScheduledTask(id="b", name="B", action="cleanup", schedule="on_battery")
-        mock_list.return_value = [t]
+        TaskScheduler.save_tasks([t])
         self.assertEqual(len(TaskScheduler.get_power_trigger_tasks(True)), 1)
         self.assertEqual(len(TaskScheduler.get_power_trigger_tasks(False)), 0)
 
-    @patch.object(TaskScheduler, "list_tasks")
-    def test_get_power_trigger_tasks_ac(self, mock_list):
+    def test_get_power_trigger_tasks_ac(self):
         t = ScheduledTask(id="a", name="A", action="cleanup", schedule="on_ac")
-        mock_list.return_value = [t]
-        self.assertEqual(len(TaskScheduler.get_power_trigger_tasks(False)), 1)
+        off = ScheduledTask(id="o", name="O", action="cleanup", schedule="on_ac", enabled=False)
+        TaskScheduler.save_tasks([t, off])
+        self.assertEqual([t.id for t in TaskScheduler.get_power_trigger_tasks(False)], ["a"])
 
-    @patch.object(TaskScheduler, "list_tasks")
-    def test_get_boot_tasks(self, mock_list):
+    def test_get_boot_tasks(self):
         boot = ScheduledTask(id="b", name="B", action="cleanup", schedule="on_boot")
         daily = ScheduledTask(id="d", name="D", action="cleanup", schedule="daily")
-        mock_list.return_value = [boot, daily]
+        TaskScheduler.save_tasks([boot, daily])
         self.assertEqual(len(TaskScheduler.get_boot_tasks()), 1)
 
+    def test_get_next_due_time_from_index(self):
+        now = datetime.now()
+        last = now - timedelta(minutes=30)
+        TaskScheduler.save_tasks([
+            ScheduledTask(id="h", name="H", action="cleanup", schedule="hourly",
+                          last_run=last.isoformat()),
+            ScheduledTask(id="d", name="D", action="cleanup", schedule="daily",
+                          last_run=now.isoformat()),
+        ])
+        self.assertEqual(TaskScheduler.get_next_due_time(), last + timedelta(hours=1))
+
+    def test_get_next_due_time_never_run_is_now(self):
+        TaskScheduler.save_tasks([
+            ScheduledTask(id="n", name="N", action="cleanup", schedule="weekly"),
+        ])
+        before = datetime.now()
+        self.assertGreaterEqual(TaskScheduler.get_next_due_time(), before)
+        self.assertLessEqual(TaskScheduler.get_next_due_time(), datetime.now())
+
+    def test_get_next_due_time_without_time_tasks(self):
+        TaskScheduler.save_tasks([
+            ScheduledTask(id="b", name="B", action="cleanup", schedule="on_boot"),
+        ])
+        self.assertIsNone(TaskScheduler.get_next_due_time())
+
+
+# ---------------------------------------------------------------------------
+# TaskScheduler — in-memory store
+# ---------------------------------------------------------------------------
+class TestTaskStore(unittest.TestCase):
+    """Load-once caching, atomic writes and batched saves."""
+
+    def setUp(self):
+        self.cfg = _TempConfig()
+        self.cfg.__enter__()
+        self.addCleanup(self.cfg.__exit__, None, None, None)
+        self.task = ScheduledTask(id="a", name="A", action="cleanup", schedule="daily")
+
+    def test_file_read_once(self):
+        TaskScheduler.save_tasks([self.task])
+        TaskScheduler.clear_cache()
+        with patch("utils.scheduler.json.load", wraps=json.load) as mock_load:
+            for _ in range(5):
+                TaskScheduler.list_tasks()
+                TaskScheduler.get_due_tasks()
+        self.assertEqual(mock_load.call_count, 1)
+
+    def test_external_change_reloaded(self):
+        TaskScheduler.save_tasks([self.task])
+        self.assertEqual(len(TaskScheduler.list_tasks()), 1)
+        other = dict(self.task.to_dict(), id="b")
+        self.cfg.write(json.dumps({"tasks": [self.task.to_dict(), other]}))
+        self.assertEqual([t.id for t in TaskScheduler.list_tasks()], ["a", "b"])
+
+    def test_returned_tasks_are_copies(self):
+        TaskScheduler.save_tasks([self.task])
+        TaskScheduler.list_tasks()[0].enabled = False
+        self.assertTrue(TaskScheduler.list_tasks()[0].enabled)
+
+    def test_failed_write_leaves_file_intact(self):
+        self.cfg.write(json.dumps({"tasks": [self.task.to_dict()]}))
+        before = self.cfg.path.read_text()
+        with patch("utils.scheduler.os.replace", side_effect=OSError("read-only")):
+            self.assertFalse(TaskScheduler.save_tasks([]))
+        self.assertEqual(self.cfg.path.read_text(), before)
+        self.assertEqual(os.listdir(self.cfg.dir), ["scheduler.json"])
+
+    def test_last_run_updates_are_batched(self):
+        TaskScheduler.save_tasks([self.task])
+        with patch.object(TaskScheduler, "SAVE_DEBOUNCE_SECONDS", 60), \
+                patch("utils.scheduler.os.replace", wraps=os.replace) as mock_replace:
+            for _ in range(3):
+                self.assertTrue(TaskScheduler.update_last_run("a"))
+            self.assertIsNotNone(TaskScheduler.list_tasks()[0].last_run)
+            self.assertEqual(TaskScheduler.get_due_tasks(), [])
+            mock_replace.assert_not_called()
+            self.assertTrue(TaskScheduler.flush())
+        self.assertEqual(mock_replace.call_count, 1)
+        saved = json.loads(self.cfg.path.read_text())["tasks"][0]
+        self.assertIsNotNone(saved["last_run"])
+
+    def test_debounce_timer_writes(self):
+        TaskScheduler.save_tasks([self.task])
+        with patch.object(TaskScheduler, "SAVE_DEBOUNCE_SECONDS", 0.01):
+            TaskScheduler.update_last_run("a")
+            timer = TaskScheduler._flush_timer
+            timer.join(5)
+        saved = json.loads(self.cfg.path.read_text())["tasks"][0]
+        self.assertIsNotNone(saved["last_run"])
+
+    def test_pending_last_run_survives_external_change(self):
+        TaskScheduler.save_tasks([self.task])
+        with patch.object(TaskScheduler, "SAVE_DEBOUNCE_SECONDS", 60):
+            TaskScheduler.update_last_run("a")
+            other = dict(self.task.to_dict(), id="b")
+            self.cfg.write(json.dumps({"tasks": [self.task.to_dict(), other]}))
+            tasks = {t.id: t for t in TaskScheduler.list_tasks()}
+            TaskScheduler.flush()
+        self.assertEqual(set(tasks), {"a", "b"})
+        self.assertIsNotNone(tasks["a"].last_run)
+
+    def test_flush_keeps_external_edit_made_after_last_run_update(self):
+        TaskScheduler.save_tasks([self.task])
+        with patch.object(TaskScheduler, "SAVE_DEBOUNCE_SECONDS", 60):
+            TaskScheduler.update_last_run("a")
+            disabled = dict(self.task.to_dict(), enabled=False)
+            other = dict(self.task.to_dict(), id="b")
+            self.cfg.write(json.dumps({"tasks": [disabled, other]}))
+            self.assertTrue(TaskScheduler.flush())
+        saved = {t["id"]: t for t in json.loads(self.cfg.path.read_text())["tasks"]}
+        self.assertEqual(set(saved), {"a", "b"})
+        self.assertFalse(saved["a"]["enabled"])
+        self.assertIsNotNone(saved["a"]["last_run"])
+
+    def test_debounced_edit_is_not_reloaded_away(self):
+        TaskScheduler.save_tasks([self.task])
+        with patch.object(TaskScheduler, "SAVE_DEBOUNCE_SECONDS", 60):
+            TaskScheduler.save_tasks([replace(self.task, name="Renamed")], debounce=True)
+            self.cfg.write(json.dumps({"tasks": [self.task.to_dict()]}))
+            self.assertTrue(TaskScheduler.flush())
+        saved = json.loads(self.cfg.path.read_text())["tasks"][0]
+        self.assertEqual(saved["name"], "Renamed")
+
 
 # ---------------------------------------------------------------------------
 # TaskScheduler — execute_task
@@ -12,6 +12,7 @@ from utils.service_explorer import (
     ServiceExplorer, ServiceInfo, ServiceResult,
     ServiceScope, ServiceState,
 )
+from utils.systemd_units import SystemdUnitCache
 
 
 class TestServiceInfo(unittest.TestCase):
@@ -235,6 +236,44 @@ class TestServiceExplorerList(unittest.TestCase):
         self.assertEqual(services, [])
 
 
+class TestServiceExplorerCachedList(unittest.TestCase):
+    """list_services served from the D-Bus unit cache."""
+
+    def setUp(self):
+        self.cache = SystemdUnitCache()
+        self.cache.load(
+            [
+                ("sshd.service", "OpenSSH server daemon", "loaded", "active", "running", "", "/u/sshd"),
+                ("cups.service", "CUPS Scheduler", "loaded", "failed", "failed", "", "/u/cups"),
+                ("crond.service", "Command Scheduler", "loaded", "inactive", "dead", "", "/u/crond"),
+            ],
+            [("/usr/lib/systemd/system/sshd.service", "enabled")],
+        )
+        patcher = patch('utils.service_explorer.SystemdUnitCache.shared', return_value=self.cache)
+        self.mock_shared = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch('utils.service_explorer.subprocess.run')
+    def test_cached_listing_runs_no_subprocess(self, mock_run):
+        """Listing, filtering and search are in-memory."""
+        services = ServiceExplorer.list_services(ServiceScope.USER)
+        self.assertEqual([s.name for s in services], ["crond", "cups", "sshd"])
+        self.assertEqual(services[2].enabled, "enabled")
+        self.assertEqual(services[0].scope, ServiceScope.USER)
+        self.mock_shared.assert_called_with(user=True)
+        self.assertEqual(
+            [s.name for s in ServiceExplorer.list_services(filter_state="failed")], ["cups"])
+        self.assertEqual(
+            [s.name for s in ServiceExplorer.list_services(search="openssh")], ["sshd"])
+        mock_run.assert_not_called()
+
+    def test_listing_follows_cache_updates(self):
+        """Property changes show up in the next listing."""
+        self.cache.apply_properties("/u/cups", {"ActiveState": "active", "SubState": "running"})
+        summary = ServiceExplorer.get_summary()
+        self.assertEqual((summary["active"], summary["failed"]), (2, 0))
+
+
 class TestServiceExplorerDetails(unittest.TestCase):
     """Tests for ServiceExplorer.get_service_details()."""
 
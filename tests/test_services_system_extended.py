@@ -20,6 +20,7 @@ from services.system.services import (
     UnitScope,
     UnitState,
 )
+from utils.systemd_units import SystemdUnitCache
 
 
 # ---------------------------------------------------------------------------
@@ -435,6 +436,53 @@ class TestListUnits(unittest.TestCase):
         self.assertTrue(units[0].is_gaming)
 
 
+# ---------------------------------------------------------------------------
+# TestCachedListUnits — list_units() from the D-Bus unit cache
+# ---------------------------------------------------------------------------
+
+class TestCachedListUnits(unittest.TestCase):
+    """Tests for list_units() and change listeners backed by SystemdUnitCache."""
+
+    def setUp(self):
+        self.cache = SystemdUnitCache()
+        self.cache.load(
+            [
+                ("steam.service", "Steam", "loaded", "active", "running", "", "/u/steam"),
+                ("cups.service", "CUPS", "loaded", "failed", "failed", "", "/u/cups"),
+            ],
+            [],
+        )
+        patcher = patch("services.system.services.SystemdUnitCache.shared", return_value=self.cache)
+        self.mock_shared = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch("services.system.services.subprocess.run")
+    def test_list_units_from_cache(self, mock_run):
+        """list_units filters cached units without running systemctl."""
+        units = ServiceManager.list_units(UnitScope.SYSTEM, "all")
+        self.assertEqual([u.name for u in units], ["cups", "steam"])
+        self.assertTrue(units[1].is_gaming)
+        self.assertEqual([u.name for u in ServiceManager.list_units(UnitScope.SYSTEM, "failed")], ["cups"])
+        self.assertEqual([u.name for u in ServiceManager.list_units(UnitScope.USER, "gaming")], ["steam"])
+        mock_run.assert_not_called()
+
+    def test_change_listener_hears_unit_changes(self):
+        """add_change_listener forwards cache notifications."""
+        callback = MagicMock()
+        self.assertTrue(ServiceManager.add_change_listener(callback))
+        self.cache.apply_unit_removed("cups.service")
+        self.assertGreaterEqual(callback.call_count, 1)
+        ServiceManager.remove_change_listener(callback)
+        callback.reset_mock()
+        self.cache.apply_unit_removed("steam.service")
+        callback.assert_not_called()
+
+    def test_change_listener_without_bus(self):
+        """Without a unit cache there are no live updates."""
+        self.mock_shared.return_value = None
+        self.assertFalse(ServiceManager.add_change_listener(MagicMock()))
+
+
 # ---------------------------------------------------------------------------
 # TestGetFailedUnits — get_failed_units()
 # ---------------------------------------------------------------------------
@@ -7,7 +7,7 @@ from subprocess import CalledProcessError
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "loofi-fedora-tweaks"))
 
-from utils.snapshot_manager import SnapshotManager, SnapshotInfo, SnapshotBackend
+from utils.snapshot_manager import SnapshotManager, SnapshotInfo, SnapshotBackend, SnapshotCatalogue
 
 
 # ---------------------------------------------------------------------------
@@ -698,5 +698,139 @@ class TestVersionFromStderr(unittest.TestCase):
         self.assertEqual(btrfs.version, "btrfs-progs v6.7")
 
 
+# ---------------------------------------------------------------------------
+# TestSnapshotCatalogue
+# ---------------------------------------------------------------------------
+
+_SNAPPER_LIST = MagicMock(
+    returncode=0,
+    stdout=(
+        " # | Date                         | Description\n"
+        "---+------------------------------+-----------------\n"
+        " 1 | 2024-01-11 10:00:00          | oldest\n"
+        " 2 | 2024-01-12 10:00:00          | newest\n"
+    ),
+    stderr="",
+)
+
+
+class TestSnapshotCatalogue(unittest.TestCase):
+    """Tests for the persisted snapshot catalogue behind list_snapshots."""
+
+    def setUp(self):
+        import tempfile
+        self.tmp = tempfile.mkdtemp()
+        self.snap_dir = os.path.join(self.tmp, "snapshots")
+        os.mkdir(self.snap_dir)
+        os.utime(self.snap_dir, (1, 1))
+        dirs = patch.dict("utils.snapshot_manager._SNAPSHOT_DIRS", {"snapper": (self.snap_dir,)})
+        dirs.start()
+        self.addCleanup(dirs.stop)
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    @patch('utils.snapshot_manager.subprocess.run', return_value=_SNAPPER_LIST)
+    def test_repeated_listing_uses_catalogue(self, mock_run):
+        """list, count and retention share one list command."""
+        first = SnapshotManager.list_snapshots(backend="snapper")
+        self.assertEqual(SnapshotManager.get_snapshot_count(backend="snapper"), 2)
+        ops = SnapshotManager.apply_retention(max_snapshots=1, backend="snapper")
+        self.assertEqual(mock_run.call_count, 1)
+        self.assertEqual([snap.id for snap in first], ["2", "1"])
+        self.assertEqual(ops[0][1], ["snapper", "delete", "1"])
+
+    @patch('utils.snapshot_manager.subprocess.run', return_value=_SNAPPER_LIST)
+    def test_catalogue_persists_across_processes(self, mock_run):
+        """A fresh in-memory catalogue is served from the file on disk."""
+        SnapshotManager.list_snapshots(backend="snapper")
+        SnapshotCatalogue.clear_cache()
+        cached = SnapshotManager.list_snapshots(backend="snapper")
+        self.assertEqual(mock_run.call_count, 1)
+        self.assertEqual(cached[0].description, "newest")
+
+    @patch('utils.snapshot_manager.subprocess.run', return_value=_SNAPPER_LIST)
+    def test_directory_change_invalidates(self, mock_run):
+        """A new entry in the snapshot directory forces a relist."""
+        SnapshotManager.list_snapshots(backend="snapper")
+        os.mkdir(os.path.join(self.snap_dir, "3"))
+        SnapshotManager.list_snapshots(backend="snapper")
+        self.assertEqual(mock_run.call_count, 2)
+
+    @patch('utils.snapshot_manager.subprocess.run', return_value=_SNAPPER_LIST)
+    def test_create_and_delete_invalidate(self, mock_run):
+        """Building a create or delete operation drops the catalogue."""
+        SnapshotManager.list_snapshots(backend="snapper")
+        SnapshotManager.create_snapshot("pre-update", backend="snapper")
+        SnapshotManager.list_snapshots(backend="snapper")
+        SnapshotManager.delete_snapshot("1", backend="snapper")
+        self.assertIsNone(SnapshotManager.cached_snapshots(backend="snapper"))
+        SnapshotManager.list_snapshots(backend="snapper")
+        self.assertEqual(mock_run.call_count, 3)
+
+    @patch('utils.snapshot_manager.subprocess.run', return_value=_SNAPPER_LIST)
+    def test_listing_taken_while_operation_runs_is_dropped(self, mock_run):
+        """A listing stored before the create completed is not served after it."""
+        SnapshotManager.create_snapshot("pre-update", backend="snapper")
+        SnapshotManager.list_snapshots(backend="snapper")
+        self.assertIsNotNone(SnapshotManager.cached_snapshots(backend="snapper"))
+        SnapshotManager.invalidate_catalogue("snapper")
+        self.assertIsNone(SnapshotManager.cached_snapshots(backend="snapper"))
+        SnapshotManager.list_snapshots(backend="snapper")
+        self.assertEqual(mock_run.call_count, 2)
+
+    @patch('utils.snapshot_manager.subprocess.run', return_value=_SNAPPER_LIST)
+    def test_refresh_bypasses_catalogue(self, mock_run):
+        """refresh=True always re-runs the list command."""
+        SnapshotManager.list_snapshots(backend="snapper")
+        SnapshotManager.list_snapshots(backend="snapper", refresh=True)
+        self.assertEqual(mock_run.call_count, 2)
+
+    @patch('utils.snapshot_manager.subprocess.run')
+    def test_cancelled_prompt_is_not_catalogued(self, mock_run):
+        """A dismissed pkexec prompt is not stored as an empty listing."""
+        mock_run.return_value = MagicMock(
+            returncode=126, stdout="", stderr="Request dismissed")
+        self.assertEqual(SnapshotManager.list_snapshots(backend="snapper"), [])
+        self.assertIsNone(SnapshotManager.cached_snapshots(backend="snapper"))
+
+        mock_run.return_value = _SNAPPER_LIST
+        self.assertEqual(SnapshotManager.get_snapshot_count(backend="snapper"), 2)
+        self.assertEqual(mock_run.call_count, 2)
+
+    @patch('utils.snapshot_manager.subprocess.run')
+    def test_backend_error_is_not_catalogued(self, mock_run):
+        """A non-zero exit with partial output is not trusted either."""
+        mock_run.return_value = MagicMock(
+            returncode=1, stdout=_SNAPPER_LIST.stdout, stderr="Unknown config.")
+        self.assertEqual(SnapshotManager.list_snapshots(backend="snapper"), [])
+        self.assertIsNone(SnapshotManager.cached_snapshots(backend="snapper"))
+
+    def test_stale_generation_is_not_stored(self):
+        """A listing started before an invalidation is discarded."""
+        catalogue = SnapshotCatalogue(os.path.join(self.tmp, "catalogue.json"))
+        generation = catalogue.generation("snapper")
+        catalogue.invalidate("snapper")
+        snap = SnapshotInfo("1", "a", "snapper", 1.0, "", "a")
+        self.assertFalse(catalogue.store("snapper", generation, None, [snap]))
+        self.assertIsNone(catalogue.lookup("snapper"))
+
+    def test_racy_directory_is_not_stored(self):
+        """A directory modified within RACY_SECONDS is not trusted."""
+        catalogue = SnapshotCatalogue(os.path.join(self.tmp, "catalogue.json"))
+        stamp = [[self.snap_dir, 1, 10 * 10**9]]
+        self.assertFalse(catalogue.store("snapper", 0, stamp, [], now=10.5))
+
+    def test_unverifiable_listing_expires(self):
+        """Without a visible snapshot directory the listing has a TTL."""
+        catalogue = SnapshotCatalogue(os.path.join(self.tmp, "catalogue.json"))
+        snap = SnapshotInfo("0", "a", "timeshift", 1.0, "", "a")
+        with patch.dict("utils.snapshot_manager._SNAPSHOT_DIRS", {"timeshift": ()}):
+            self.assertTrue(catalogue.store("timeshift", 0, None, [snap], now=1000.0))
+            self.assertEqual(len(catalogue.lookup("timeshift", now=1100.0)), 1)
+            self.assertIsNone(catalogue.lookup("timeshift", now=1000.0 + SnapshotCatalogue.UNVERIFIED_TTL + 1))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -16,6 +16,10 @@ from utils.storage import (
     MountInfo, StorageResult,
 )
 
+SMART_HELPER = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), '..', 'loofi-fedora-tweaks', 'config', 'loofi-smart-batch'
+))
+
 
 SAMPLE_LSBLK_JSON = json.dumps({
     "blockdevices": [
@@ -103,27 +107,42 @@ class TestStorageListBlockDevices(unittest.TestCase):
         self.assertEqual(devices, [])
 
 
+def _smartctl_json(device, model="Samsung SSD 870 EVO 500GB", passed=True,
+                   temperature=30, hours=1234, reallocated=0):
+    """One line of ``smartctl --json=c --all`` output for an ATA disk."""
+    return json.dumps({
+        "device": {"name": device, "type": "sat"},
+        "model_name": model,
+        "serial_number": "S1234567890",
+        "smart_status": {"passed": passed},
+        "temperature": {"current": temperature},
+        "power_on_time": {"hours": hours},
+        "ata_smart_attributes": {"table": [
+            {"id": 5, "name": "Reallocated_Sector_Ct", "raw": {"value": reallocated}},
+            {"id": 194, "name": "Temperature_Celsius", "raw": {"value": temperature}},
+        ]},
+    })
+
+
+def _disk(path):
+    return BlockDevice(name=path.rsplit("/", 1)[-1], path=path, size="1T", device_type="disk")
+
+
 class TestStorageSmartHealth(unittest.TestCase):
     """Tests for get_smart_health()."""
 
-    SMARTCTL_OUTPUT = """
-smartctl 7.3 2022-02-28 r5338 [x86_64-linux-6.5.0]
-=== START OF INFORMATION SECTION ===
-Device Model:     Samsung SSD 870 EVO 500GB
-Serial Number:    S1234567890
-=== START OF READ SMART DATA SECTION ===
-SMART overall-health self-assessment test result: PASSED
-
-ID# ATTRIBUTE_NAME          FLAG     VALUE WORST THRESH TYPE      RAW_VALUE
-  5 Reallocated_Sector_Ct   0x0033   100   100   010    Pre-fail  0
-194 Temperature_Celsius     0x0022   070   060   000    Old_age   30
-  9 Power_On_Hours          0x0032   099   099   000    Old_age   1234
-"""
+    def setUp(self):
+        patcher = patch.object(StorageManager, "list_disks", return_value=[])
+        self.list_disks = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch('utils.storage.SMART_BATCH_HELPER', SMART_HELPER)
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
     @patch('utils.storage.subprocess.run')
     def test_smart_health_parsed(self, mock_run):
         mock_run.return_value = MagicMock(
-            returncode=0, stdout=self.SMARTCTL_OUTPUT
+            returncode=0, stdout=_smartctl_json("/dev/sda") + "\n"
         )
         health = StorageManager.get_smart_health("/dev/sda")
         self.assertEqual(health.device, "/dev/sda")
@@ -133,15 +152,32 @@ ID# ATTRIBUTE_NAME          FLAG     VALUE WORST THRESH TYPE      RAW_VALUE
         self.assertEqual(health.temperature_c, 30)
         self.assertEqual(health.power_on_hours, 1234)
         self.assertEqual(health.reallocated_sectors, 0)
+        self.assertEqual(health.attributes["Temperature_Celsius"], 30)
+        cmd = mock_run.call_args[0][0]
+        self.assertEqual(cmd, ["pkexec", SMART_HELPER, "/dev/sda"])
 
     @patch('utils.storage.subprocess.run')
     def test_smart_health_failed(self, mock_run):
         mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout="SMART overall-health self-assessment test result: FAILED\n"
+            returncode=8, stdout=_smartctl_json("/dev/sda", passed=False, reallocated=12)
         )
         health = StorageManager.get_smart_health("/dev/sda")
         self.assertFalse(health.health_passed)
+        self.assertEqual(health.reallocated_sectors, 12)
+
+    @patch('utils.storage.subprocess.run')
+    def test_smart_health_nvme(self, mock_run):
+        mock_run.return_value = MagicMock(returncode=0, stdout=json.dumps({
+            "device": {"name": "/dev/nvme0n1", "type": "nvme"},
+            "model_name": "WD Black SN850",
+            "smart_status": {"passed": True},
+            "temperature": {"current": 41},
+            "power_on_time": {"hours": 900},
+            "nvme_smart_health_information_log": {"percentage_used": 3, "media_errors": 0},
+        }))
+        health = StorageManager.get_smart_health("/dev/nvme0n1")
+        self.assertEqual(health.temperature_c, 41)
+        self.assertEqual(health.attributes, {"percentage_used": 3, "media_errors": 0})
 
     @patch('utils.storage.subprocess.run')
     def test_smart_timeout(self, mock_run):
@@ -157,6 +193,134 @@ ID# ATTRIBUTE_NAME          FLAG     VALUE WORST THRESH TYPE      RAW_VALUE
         self.assertEqual(health.device, "/dev/sda")
         self.assertEqual(health.model, "")
 
+    @patch('utils.storage.subprocess.run')
+    def test_invalid_device_not_passed_to_shell(self, mock_run):
+        health = StorageManager.get_smart_health("/dev/sda; reboot")
+        mock_run.assert_not_called()
+        self.assertEqual(health.model, "")
+
+
+class TestSmartCollector(unittest.TestCase):
+    """Batched, cached SMART collection."""
+
+    def setUp(self):
+        patcher = patch.object(StorageManager, "list_disks", return_value=[
+            _disk("/dev/sda"), _disk("/dev/sdb"), _disk("/dev/nvme0n1"), _disk("/dev/zram0"),
+        ])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch('utils.storage.subprocess.run', side_effect=self._smartctl)
+        self.mock_run = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch('utils.storage.SMART_BATCH_HELPER', SMART_HELPER)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @staticmethod
+    def _smartctl(cmd, **kwargs):
+        devices = cmd[2:] if cmd[1] == SMART_HELPER else cmd[-1:]
+        return MagicMock(returncode=0, stdout="".join(_smartctl_json(d) + "\n" for d in devices))
+
+    def test_all_disks_in_one_privileged_call(self):
+        healths = StorageManager.get_all_smart_health()
+        self.assertEqual(set(healths), {"/dev/sda", "/dev/sdb", "/dev/nvme0n1"})
+        self.assertEqual(self.mock_run.call_count, 1)
+        self.assertTrue(all(h.model for h in healths.values()))
+
+    def test_single_disk_check_refreshes_every_disk(self):
+        StorageManager.get_smart_health("/dev/sdb")
+        self.assertEqual(self.mock_run.call_count, 1)
+        StorageManager.get_smart_health("/dev/sda")
+        StorageManager.get_all_smart_health()
+        self.assertEqual(self.mock_run.call_count, 1)
+        self.assertEqual(StorageManager.cached_smart_health("/dev/nvme0n1").model,
+                         "Samsung SSD 870 EVO 500GB")
+
+    def test_ttl_expiry_and_refresh(self):
+        from utils.storage import SmartCollector
+
+        collector = SmartCollector.shared()
+        collector.collect(["/dev/sda"], now=1000.0)
+        collector.collect(["/dev/sda"], now=1000.0 + collector.ttl - 1)
+        self.assertEqual(self.mock_run.call_count, 1)
+        collector.collect(["/dev/sda"], now=1000.0 + collector.ttl + 1)
+        self.assertEqual(self.mock_run.call_count, 2)
+        collector.collect(["/dev/sda"], refresh=True)
+        self.assertEqual(self.mock_run.call_count, 3)
+
+    @patch('utils.settings.SettingsManager.instance')
+    def test_ttl_from_settings(self, mock_instance):
+        from utils.storage import SmartCollector
+
+        mock_instance.return_value.get.return_value = 5
+        self.assertEqual(SmartCollector.shared().ttl, 300)
+
+    def test_cache_persisted_across_processes(self):
+        from utils.storage import SmartCollector
+
+        StorageManager.get_all_smart_health()
+        SmartCollector.clear_cache()
+        self.assertIsNotNone(StorageManager.cached_smart_health("/dev/sda"))
+        StorageManager.get_all_smart_health()
+        self.assertEqual(self.mock_run.call_count, 1)
+
+    def test_failures_not_cached(self):
+        self.mock_run.side_effect = OSError("cancelled")
+        StorageManager.get_all_smart_health()
+        self.assertIsNone(StorageManager.cached_smart_health("/dev/sda"))
+
+    def test_helper_gets_device_paths_only(self):
+        StorageManager.get_all_smart_health()
+        cmd = self.mock_run.call_args[0][0]
+        self.assertEqual(cmd[:2], ["pkexec", SMART_HELPER])
+        self.assertEqual(set(cmd[2:]), {"/dev/sda", "/dev/sdb", "/dev/nvme0n1"})
+
+    def test_without_helper_one_smartctl_per_disk(self):
+        with patch('utils.storage.SMART_BATCH_HELPER', "/nonexistent/loofi-smart-batch"):
+            healths = StorageManager.get_all_smart_health()
+        commands = [c[0][0] for c in self.mock_run.call_args_list]
+        self.assertEqual(len(commands), 3)
+        self.assertTrue(all(cmd[:2] == ["pkexec", "smartctl"] for cmd in commands))
+        self.assertTrue(all(h.model for h in healths.values()))
+
+    def test_without_helper_dismissed_prompt_is_not_repeated(self):
+        self.mock_run.side_effect = None
+        self.mock_run.return_value = MagicMock(returncode=126, stdout="")
+        with patch('utils.storage.SMART_BATCH_HELPER', "/nonexistent/loofi-smart-batch"):
+            StorageManager.get_all_smart_health()
+        self.assertEqual(self.mock_run.call_count, 1)
+
+    def test_history_recorded_in_timeline(self):
+        from utils.health_timeline import HealthTimeline
+
+        StorageManager.get_all_smart_health()
+        temps = HealthTimeline().get_metrics("smart_temperature")
+        self.assertEqual(len(temps), 3)
+        self.assertEqual(temps[0]["value"], 30)
+        self.assertIn(temps[0]["metadata"]["device"], {"/dev/sda", "/dev/sdb", "/dev/nvme0n1"})
+
+
+class TestSmartBatchHelper(unittest.TestCase):
+    """The privileged helper refuses anything but block device nodes."""
+
+    def _run(self, *args):
+        import subprocess
+        return subprocess.run(["sh", SMART_HELPER, *args], capture_output=True, text=True, timeout=10)
+
+    def test_rejects_non_device_arguments(self):
+        for arg in ("/etc/shadow", "/dev/../etc/shadow", "/dev/sda;reboot", "-a", "/dev/null"):
+            with self.subTest(arg=arg):
+                result = self._run(arg)
+                self.assertEqual(result.returncode, 2)
+                self.assertEqual(result.stdout, "")
+
+    def test_no_arguments_reads_nothing(self):
+        result = self._run()
+        self.assertEqual((result.returncode, result.stdout), (0, ""))
+
+    def test_is_executable(self):
+        self.assertTrue(os.access(SMART_HELPER, os.X_OK))
+
 
 class TestStorageMounts(unittest.TestCase):
     """Tests for list_mounts()."""
@@ -0,0 +1,264 @@
+"""Tests for utils/storage_inventory.py — native block device and mount inventory."""
+
+import os
+import select
+import shutil
+import sys
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "loofi-fedora-tweaks"))
+
+from utils.storage_inventory import (
+    StorageInventory,
+    df_size,
+    lsblk_size,
+    parse_mountinfo,
+)
+
+
+def _write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+class _FakeTree:
+    """A /sys/block, /run/udev/data and mountinfo layout under a temp dir."""
+
+    def __init__(self, root):
+        self.root = root
+        self.sys_block = os.path.join(root, "sys", "block")
+        self.udev = os.path.join(root, "udev")
+        self.mountinfo = os.path.join(root, "mountinfo")
+        os.makedirs(self.sys_block)
+        os.makedirs(self.udev)
+
+    def device(self, name, dev, sectors, removable="0", ro="0", model="", slaves=(), backing=None):
+        base = os.path.join(self.sys_block, name)
+        _write(os.path.join(base, "dev"), f"{dev}\n")
+        _write(os.path.join(base, "size"), f"{sectors}\n")
+        _write(os.path.join(base, "removable"), f"{removable}\n")
+        _write(os.path.join(base, "ro"), f"{ro}\n")
+        os.makedirs(os.path.join(base, "slaves"))
+        os.makedirs(os.path.join(base, "holders"))
+        for slave in slaves:
+            os.makedirs(os.path.join(base, "slaves", slave))
+        if model:
+            _write(os.path.join(base, "device", "model"), f"{model}   \n")
+        if backing is not None:
+            _write(os.path.join(base, "loop", "backing_file"), backing)
+        return base
+
+    def partition(self, disk, name, dev, sectors):
+        base = os.path.join(self.sys_block, disk, name)
+        _write(os.path.join(base, "dev"), f"{dev}\n")
+        _write(os.path.join(base, "size"), f"{sectors}\n")
+        _write(os.path.join(base, "partition"), "1\n")
+        _write(os.path.join(base, "ro"), "0\n")
+
+    def udev_props(self, dev, **props):
+        _write(os.path.join(self.udev, f"b{dev}"), "".join(f"E:{k}={v}\n" for k, v in props.items()))
+
+    def inventory(self):
+        return StorageInventory(
+            mountinfo=self.mountinfo, sys_block=self.sys_block,
+            udev_data=self.udev, watch_uevents=False,
+        )
+
+
+class TestFormatting(unittest.TestCase):
+    """Parsing mountinfo and formatting sizes."""
+
+    def test_parse_mountinfo_with_optional_fields_and_escapes(self):
+        text = (
+            "29 1 8:2 / / rw,relatime shared:1 - btrfs /dev/sda2 rw,subvol=/root\n"
+            "40 29 8:17 / /run/media/user/My\\040Disk rw,nosuid shared:20 master:1 - vfat /dev/sdb1 rw\n"
+            "garbage line\n"
+        )
+        mounts = parse_mountinfo(text)
+        self.assertEqual(len(mounts), 2)
+        self.assertEqual((mounts[0].source, mounts[0].target, mounts[0].fstype), ("/dev/sda2", "/", "btrfs"))
+        self.assertEqual(mounts[1].target, "/run/media/user/My Disk")
+        self.assertEqual(mounts[1].dev, "8:17")
+
+    def test_lsblk_size(self):
+        self.assertEqual(lsblk_size(0), "0B")
+        self.assertEqual(lsblk_size(256 * 1024 ** 3), "256G")
+        self.assertEqual(lsblk_size(int(476.94 * 1024 ** 3)), "476.9G")
+        self.assertEqual(lsblk_size(1536), "1.5K")
+
+    def test_df_size_rounds_up(self):
+        self.assertEqual(df_size(0), "0")
+        self.assertEqual(df_size(int(9.81 * 1024 ** 3)), "9.9G")
+        self.assertEqual(df_size(int(19.02 * 1024 ** 3)), "20G")
+        self.assertEqual(df_size(int(9.99 * 1024 ** 2)), "10M")
+
+
+class TestBlockDevices(unittest.TestCase):
+    """Block device listing from a fake sysfs tree."""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, True)
+        tree = _FakeTree(self.tmp)
+        tree.device("sda", "8:0", 1000215216, model="Samsung SSD 870")
+        tree.partition("sda", "sda1", "8:1", 2097152)
+        tree.partition("sda", "sda2", "8:2", 998115983)
+        tree.udev_props("8:2", ID_FS_TYPE="btrfs", ID_FS_LABEL="fedora", ID_FS_UUID="abcd")
+        tree.udev_props("8:0", ID_SERIAL_SHORT="S5XYZ")
+        tree.device("sdb", "8:16", 60437492, removable="1")
+        tree.device("loop0", "7:0", 0)
+        tree.device("loop1", "7:1", 4096, backing="/var/lib/image.img")
+        tree.device("ram0", "1:0", 8192)
+        tree.device("dm-0", "253:0", 998115983, slaves=("sda2",))
+        _write(tree.mountinfo, "29 1 0:34 /root / rw - btrfs /dev/sda2 rw\n"
+                               "30 29 8:1 / /boot rw - ext4 /dev/sda1 rw\n")
+        self.inventory = tree.inventory()
+        self.addCleanup(self.inventory.close)
+
+    def test_lists_disks_with_partitions_in_order(self):
+        names = [(d.name, d.device_type, d.parent) for d in self.inventory.block_devices()]
+        self.assertEqual(names, [
+            ("loop1", "loop", ""),
+            ("sda", "disk", ""),
+            ("sda1", "part", "sda"),
+            ("sda2", "part", "sda"),
+            ("sdb", "disk", ""),
+        ])
+
+    def test_device_attributes(self):
+        devices = {d.name: d for d in self.inventory.block_devices()}
+        sda = devices["sda"]
+        self.assertEqual(sda.model, "Samsung SSD 870")
+        self.assertEqual(sda.serial, "S5XYZ")
+        self.assertEqual(lsblk_size(sda.size_bytes), "476.9G")
+        self.assertEqual((devices["sda2"].fstype, devices["sda2"].label, devices["sda2"].uuid),
+                         ("btrfs", "fedora", "abcd"))
+        self.assertTrue(devices["sdb"].rm)
+        self.assertTrue(devices["sdb"].hotplug)
+
+    def test_mountpoints_by_device_number_and_source(self):
+        devices = {d.name: d for d in self.inventory.block_devices()}
+        self.assertEqual(devices["sda1"].mountpoint, "/boot")
+        self.assertEqual(devices["sda1"].fstype, "ext4")
+        # btrfs reports an anonymous device number; the source path matches.
+        with patch("utils.storage_inventory.os.path.realpath", side_effect=lambda p: p):
+            self.inventory._blocks = None
+            devices = {d.name: d for d in self.inventory.block_devices()}
+        self.assertEqual(devices["sda2"].mountpoint, "/")
+
+    def test_block_list_is_cached_until_ttl(self):
+        self.inventory.block_devices()
+        with patch.object(self.inventory, "_read_blocks", return_value=[]) as reread:
+            self.inventory.block_devices()
+            reread.assert_not_called()
+            self.inventory._blocks_read_at -= StorageInventory.BLOCK_TTL + 1
+            self.assertEqual(self.inventory.block_devices(), [])
+            reread.assert_called_once()
+
+    def test_block_uevent_invalidates(self):
+        self.inventory.block_devices()
+        events = MagicMock()
+        events.recv.side_effect = [b"add@/devices/virtual/block/sdc\0SUBSYSTEM=block\0", BlockingIOError()]
+        self.inventory._uevents = events
+        self.assertTrue(self.inventory.refresh())
+        self.assertIsNone(self.inventory._blocks)
+
+
+class TestMountsAndUsage(unittest.TestCase):
+    """Mount table tracking and statvfs memoisation."""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, True)
+        tree = _FakeTree(self.tmp)
+        self.data = os.path.join(self.tmp, "data")
+        self.bind = os.path.join(self.data, "bind")
+        os.makedirs(self.bind)
+        _write(tree.mountinfo, (
+            f"1 0 8:1 / {self.data} rw - ext4 /dev/sda1 rw\n"
+            f"2 1 8:1 /sub {self.bind} rw - ext4 /dev/sda1 rw\n"
+            f"3 0 0:5 / {self.tmp} rw - proc proc rw\n"
+            f"4 0 0:6 / {self.tmp}/tmp rw - tmpfs tmpfs rw\n"
+        ))
+        self.inventory = tree.inventory()
+        self.addCleanup(self.inventory.close)
+
+    def test_mount_for_picks_deepest_mount(self):
+        self.assertEqual(self.inventory.mount_for(os.path.join(self.bind, "x")).target, self.bind)
+        self.assertEqual(self.inventory.mount_for(self.data).target, self.data)
+
+    def test_filesystems_skip_pseudo_and_bind_duplicates(self):
+        targets = [m.target for m, _usage in self.inventory.filesystems(real_only=True)]
+        self.assertEqual(targets, [self.data])
+
+    def test_usage_is_memoised(self):
+        fake = SimpleNamespace(f_blocks=1000, f_bfree=400, f_bavail=300, f_frsize=4096)
+        with patch("utils.storage_inventory.os.statvfs", return_value=fake) as statvfs:
+            first = self.inventory.usage(self.data)
+            self.inventory.usage(self.data)
+        statvfs.assert_called_once()
+        self.assertEqual(first.used, 600 * 4096)
+        self.assertEqual(first.percent_used, 60.0)
+        self.assertEqual(first.df_percent, "67%")
+
+    def test_mount_change_rereads_table_and_drops_usage(self):
+        self.inventory.usage(self.data)
+        with open(self.inventory._mount_file.name, "a") as f:
+            f.write(f"5 1 8:2 / {self.data}/new rw - xfs /dev/sda2 rw\n")
+        poller = MagicMock()
+        poller.poll.return_value = [(self.inventory._mount_file.fileno(), select.POLLPRI)]
+        self.inventory._poller = poller
+        generation = self.inventory.generation
+        self.assertTrue(self.inventory.refresh())
+        self.assertEqual(self.inventory.generation, generation + 1)
+        self.assertEqual(self.inventory._usage, {})
+        self.assertIn(f"{self.data}/new", [m.target for m in self.inventory.mounts()])
+
+    def test_shared_is_none_without_sysfs(self):
+        with patch.object(StorageInventory, "_instance", None), \
+                patch("utils.storage_inventory.os.path.isdir", return_value=False):
+            self.assertIsNone(StorageInventory.shared())
+
+
+class TestConsumers(unittest.TestCase):
+    """StorageManager and DiskManager read from the shared inventory."""
+
+    def setUp(self):
+        self.inventory = MagicMock()
+        patcher = patch.object(StorageInventory, "_instance", self.inventory)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch("utils.storage.subprocess.run")
+    def test_storage_manager_mounts_without_subprocess(self, mock_run):
+        from utils.storage import StorageManager
+        from utils.storage_inventory import MountRecord, SpaceUsage
+
+        mount = MountRecord("/dev/sda2", "/", "btrfs", "rw", "0:34", "/root")
+        usage = SpaceUsage(total=100 * 1024 ** 3, used=40 * 1024 ** 3, free=50 * 1024 ** 3, percent_used=40.0)
+        self.inventory.filesystems.return_value = [(mount, usage)]
+        mounts = StorageManager.list_mounts()
+        mock_run.assert_not_called()
+        self.inventory.filesystems.assert_called_once_with(real_only=True)
+        self.assertEqual(mounts[0].to_dict(), {
+            "source": "/dev/sda2", "target": "/", "fstype": "btrfs",
+            "size": "100G", "used": "40G", "avail": "50G", "use_percent": "45%",
+        })
+
+    def test_disk_manager_usage_from_inventory(self):
+        from services.hardware.disk import DiskManager
+        from utils.storage_inventory import SpaceUsage
+
+        self.inventory.usage_for.return_value = SpaceUsage(total=1000, used=250, free=700, percent_used=25.0)
+        usage = DiskManager.get_disk_usage("/home")
+        self.assertEqual((usage.mount_point, usage.free_bytes, usage.percent_used), ("/home", 700, 25.0))
+        self.inventory.usage_for.return_value = None
+        self.assertIsNone(DiskManager.get_disk_usage("/missing"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+"""Tests for utils/systemd_units.py — D-Bus fed systemd unit cache."""
+
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "loofi-fedora-tweaks"))
+
+from utils import systemd_units
+from utils.systemd_units import SystemdUnitCache
+
+
+def _row(unit_id, active="active", sub="running", description=""):
+    path = "/org/freedesktop/systemd1/unit/" + unit_id.replace(".", "_2e").replace("-", "_2d")
+    return (unit_id, description or unit_id, "loaded", active, sub, "", path, 0, "", "/")
+
+
+UNITS = [
+    _row("sshd.service", description="OpenSSH server daemon"),
+    _row("cups.service", "inactive", "dead", "CUPS Scheduler"),
+    _row("getty@tty1.service", description="Getty on tty1"),
+    _row("dbus.socket", description="D-Bus System Message Bus Socket"),
+]
+UNIT_FILES = [
+    ("/usr/lib/systemd/system/sshd.service", "enabled"),
+    ("/usr/lib/systemd/system/cups.service", "disabled"),
+    ("/usr/lib/systemd/system/getty@.service", "enabled"),
+]
+
+
+class TestUnitCacheState(unittest.TestCase):
+    """Applying the initial dump and change signals."""
+
+    def setUp(self):
+        self.cache = SystemdUnitCache()
+        self.cache.load(UNITS, UNIT_FILES)
+        self.changes = []
+        self.cache.add_listener(lambda: self.changes.append(True))
+
+    def test_load_keeps_services_only(self):
+        names = sorted(unit.name for unit in self.cache.services())
+        self.assertEqual(names, ["cups", "getty@tty1", "sshd"])
+
+    def test_enablement_from_unit_files_and_templates(self):
+        self.assertEqual(self.cache.get("sshd").unit_file_state, "enabled")
+        self.assertEqual(self.cache.get("cups").unit_file_state, "disabled")
+        self.assertEqual(self.cache.get("getty@tty1").unit_file_state, "enabled")
+
+    def test_properties_changed_updates_state(self):
+        path = self.cache.get("cups").path
+        self.assertTrue(self.cache.apply_properties(path, {"ActiveState": "active", "SubState": "running"}))
+        self.assertEqual(self.cache.get("cups").active_state, "active")
+        self.assertEqual(self.changes, [True])
+
+    def test_unchanged_properties_do_not_notify(self):
+        path = self.cache.get("sshd").path
+        self.cache.apply_properties(path, {"ActiveState": "active"})
+        self.assertEqual(self.changes, [])
+        self.assertFalse(self.cache.apply_properties("/unknown", {"ActiveState": "failed"}))
+
+    def test_unit_new_and_removed(self):
+        self.cache.apply_unit_new("podman.service", "/unit/podman", {
+            "Description": "Podman API", "ActiveState": "activating", "SubState": "start",
+        })
+        self.assertEqual(self.cache.get("podman").active_state, "activating")
+        self.cache.apply_unit_removed("podman.service")
+        self.assertIsNone(self.cache.get("podman"))
+        self.assertEqual(len(self.changes), 2)
+
+    def test_unit_files_changed(self):
+        self.cache.apply_unit_files([("/etc/systemd/system/cups.service", "masked")])
+        self.assertEqual(self.cache.get("cups").unit_file_state, "masked")
+        self.assertEqual(self.cache.get("sshd").unit_file_state, "")
+
+    def test_services_returns_copies(self):
+        self.cache.services()[0].active_state = "failed"
+        self.assertNotIn("failed", {unit.active_state for unit in self.cache.services()})
+
+    def test_failing_listener_does_not_break_updates(self):
+        self.cache.add_listener(MagicMock(side_effect=RuntimeError("deleted widget")))
+        self.cache.apply_unit_removed("cups.service")
+        self.assertIsNone(self.cache.get("cups"))
+
+
+class TestUnitCacheSignals(unittest.TestCase):
+    """D-Bus handler glue, with the bus replaced by mocks."""
+
+    def setUp(self):
+        self.cache = SystemdUnitCache()
+        self.cache._manager = MagicMock()
+        self.cache._manager.ListUnits.return_value = UNITS
+        self.cache._manager.ListUnitFiles.return_value = UNIT_FILES
+        self.cache.resync()
+
+    def test_invalidated_properties_are_refetched(self):
+        path = self.cache.get("sshd").path
+        with patch.object(self.cache, "_unit_properties", return_value={"ActiveState": "failed"}) as fetch:
+            self.cache._on_properties_changed(systemd_units.UNIT_INTERFACE, {}, ["ActiveState"], path=path)
+        fetch.assert_called_once_with(path)
+        self.assertEqual(self.cache.get("sshd").active_state, "failed")
+
+    def test_other_interfaces_are_ignored(self):
+        path = self.cache.get("sshd").path
+        self.cache._on_properties_changed(
+            "org.freedesktop.systemd1.Service", {"ActiveState": "failed"}, [], path=path)
+        self.assertEqual(self.cache.get("sshd").active_state, "active")
+
+    def test_non_service_unit_new_is_ignored(self):
+        with patch.object(self.cache, "_unit_properties") as fetch:
+            self.cache._on_unit_new("tmp.mount", "/unit/tmp_2emount")
+        fetch.assert_not_called()
+
+    def test_reload_finished_resyncs(self):
+        self.cache._manager.ListUnits.return_value = UNITS[:1]
+        self.cache._on_reloading(True)
+        self.assertIsNotNone(self.cache.get("cups"))
+        self.cache._on_reloading(False)
+        self.assertIsNone(self.cache.get("cups"))
+
+
+class TestSharedCache(unittest.TestCase):
+    """Availability handling of SystemdUnitCache.shared."""
+
+    def setUp(self):
+        SystemdUnitCache._instances = {}
+        self.addCleanup(setattr, SystemdUnitCache, "_instances", {})
+
+    @patch.object(systemd_units, "DBUS_AVAILABLE", False)
+    def test_missing_bindings_mean_unavailable(self):
+        self.assertIsNone(SystemdUnitCache.shared())
+        self.assertIs(SystemdUnitCache._instances["system"], False)
+
+    @patch.object(SystemdUnitCache, "connect")
+    def test_instances_are_per_bus(self, mock_connect):
+        system = SystemdUnitCache.shared()
+        user = SystemdUnitCache.shared(user=True)
+        self.assertIsNot(system, user)
+        self.assertTrue(user.user)
+        self.assertIs(SystemdUnitCache.shared(), system)
+        self.assertEqual(mock_connect.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -613,6 +613,21 @@ class TestSnapshotTabSmoke(unittest.TestCase):
         self.assertIsNotNone(t)
         self.assertEqual(t._METADATA.id, "snapshots")
 
+    @patch("PyQt6.QtCore.QTimer.singleShot")
+    def test_relists_when_operation_finishes(self, mock_single_shot):
+        from ui.snapshot_tab import SnapshotTab
+        t = SnapshotTab()
+        with patch("ui.snapshot_tab.SnapshotManager") as mgr, \
+                patch.object(t.runner, "run_command"):
+            mgr.list_snapshots.return_value = []
+            t._start_snapshot_op("pkexec", ["snapper", "delete", "1"], "Deleting", "snapper")
+            mgr.invalidate_catalogue.assert_not_called()
+            t.on_command_finished(0)
+            mgr.invalidate_catalogue.assert_called_once_with("snapper")
+            mgr.list_snapshots.assert_called_once_with(refresh=False)
+            t.on_command_finished(0)
+            mgr.invalidate_catalogue.assert_called_once()
+
 
 # ---------------------------------------------------------------------------
 # CommandPalette deeper method tests